@@ -0,0 +1,169 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+VARIABLE_DIRECTORIO = "DIRECTORIO_SESIONES" # Variable de entorno con el directorio del caché en disco
+NUM_CANDADOS = 64 # Número de candados entre los que se reparten las sesiones
+
+class AlmacenSesiones:
+    """
+        Esta clase guarda del lado del servidor el estado de cada sesión de la aplicación (los
+        elementos de la gráfica, la tabla de grados, la copia de los elementos sin resultados,
+        etc.), para que el navegador sólo mande el Id de su sesión en lugar de todo el estado
+        en cada callback (las páginas le regresan sólo los cambios, con parchar_lista).
+
+        Las sesiones se guardan en memoria; cuando se llena la capacidad se descarta la que
+        lleva más tiempo sin usarse. Si se da un directorio, cada sesión también se escribe en
+        disco como JSON, de modo que las sesiones descartadas se recuperan y varios procesos
+        del servidor (por ejemplo, con gunicorn) comparten las mismas sesiones.
+
+        El estado de una sesión es un diccionario con valores que se puedan escribir como
+        JSON, y se guarda como texto JSON. Cada vez que se abre una sesión se decodifica una
+        copia nueva, así que un callback que falla a la mitad no deja la sesión guardada a medio
+        cambiar: sólo cuenta lo que se guarda con guardar. Mientras una sesión está abierta,
+        otro hilo que quiera abrirla espera, de modo que los callbacks de una misma sesión no
+        se encimen (entre procesos distintos no hay esta garantía).
+    """
+    def __init__(self, inicial, capacidad=256, directorio=None):
+        """
+            Parámetros
+            ----------
+            inicial: Función sin parámetros que regresa el estado de una sesión nueva
+            capacidad: Número máximo de sesiones guardadas en memoria
+            directorio: Directorio del caché en disco, o None para guardar sólo en memoria
+        """
+        self.inicial = inicial
+        self.capacidad = capacidad
+        self.directorio = directorio
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self.__sesiones = OrderedDict() # Id -> (texto JSON del estado, fecha de modificación del archivo)
+        self.__candado = threading.Lock()
+        self.__candados_sesiones = [threading.Lock() for _ in range(NUM_CANDADOS)]
+
+    @contextmanager
+    def abrir(self, sesion):
+        """
+            Este administrador de contexto abre una sesión: espera a que ningún otro hilo la
+            tenga abierta y regresa una copia de su estado. Si la sesión no existe (o el Id no
+            es válido) se crea una nueva con el estado inicial. Los cambios al estado se
+            conservan sólo si se llama a guardar antes de cerrar la sesión.
+            Parámetros
+            ----------
+            sesion: Id de la sesión, o None
+            Regresa
+            -------
+            Una tupla (Id de la sesión, estado)
+        """
+        if not self.__es_id(sesion):
+            sesion = uuid.uuid4().hex
+        with self.__candados_sesiones[hash(sesion) % NUM_CANDADOS]:
+            yield sesion, self.__cargar(sesion)
+
+    def guardar(self, sesion, estado):
+        """
+            Este método guarda el estado de una sesión (en memoria y, si hay directorio, en disco)
+        """
+        texto = json.dumps(estado, separators=(',', ':'), default=_a_json)
+        with self.__candado:
+            marca = self.__escribir(sesion, texto)
+            self.__sesiones[sesion] = (texto, marca)
+            self.__sesiones.move_to_end(sesion)
+            self.__recortar()
+
+    def descartar(self, sesion):
+        """
+            Este método borra una sesión de la memoria y del disco
+        """
+        with self.__candado:
+            self.__sesiones.pop(sesion, None)
+            if self.directorio and self.__es_id(sesion):
+                try:
+                    os.remove(self.__ruta(sesion))
+                except FileNotFoundError:
+                    pass
+
+    def __len__(self):
+        return len(self.__sesiones)
+
+    def __cargar(self, sesion):
+        """
+            Este método regresa una copia nueva del estado guardado de una sesión
+        """
+        with self.__candado:
+            guardada = self.__sesiones.get(sesion)
+            marca = self.__marca(sesion)
+            # Si otro proceso escribió la sesión después, la copia en memoria ya no sirve
+            if guardada is None or guardada[1] != marca:
+                guardada = (self.__leer(sesion, marca), marca)
+                if guardada[0] is not None:
+                    self.__sesiones[sesion] = guardada
+                    self.__recortar()
+            if sesion in self.__sesiones:
+                self.__sesiones.move_to_end(sesion)
+        return self.inicial() if guardada[0] is None else json.loads(guardada[0])
+
+    def __recortar(self):
+        while len(self.__sesiones) > self.capacidad:
+            self.__sesiones.popitem(last=False)
+
+    def __es_id(self, sesion):
+        # El Id llega del navegador y se usa como nombre de archivo, así que sólo se aceptan los que genera uuid4
+        return isinstance(sesion, str) and re.fullmatch(r"[0-9a-f]{32}", sesion) is not None
+
+    def __ruta(self, sesion):
+        return os.path.join(self.directorio, sesion + ".json")
+
+    def __marca(self, sesion):
+        if not self.directorio:
+            return None
+        try:
+            return os.stat(self.__ruta(sesion)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def __leer(self, sesion, marca):
+        # Regresa el texto guardado en disco, o None si la sesión no está en disco
+        if marca is None:
+            return None
+        try:
+            with open(self.__ruta(sesion), 'r') as f:
+                texto = f.read()
+            json.loads(texto)
+            return texto
+        except (OSError, ValueError):
+            return None
+
+    def __escribir(self, sesion, texto):
+        if not self.directorio:
+            return None
+        # Se escribe en un archivo temporal y luego se renombra, para que nunca se lea una sesión a medias
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, 'w') as f:
+                f.write(texto)
+            os.replace(temporal, self.__ruta(sesion))
+        except BaseException:
+            os.remove(temporal)
+            raise
+        return os.stat(self.__ruta(sesion)).st_mtime_ns
+
+def _a_json(valor):
+    # Los resultados de los algoritmos pueden traer números de NumPy, que json no sabe escribir
+    if hasattr(valor, 'tolist'):
+        return valor.tolist()
+    raise TypeError(f"{type(valor).__name__} no se puede guardar como JSON")
+
+def directorio_sesiones(nombre):
+    """
+        Esta función regresa el directorio del caché en disco de una página, dentro del
+        directorio de la variable de entorno DIRECTORIO_SESIONES, o None si no está definida
+        (en ese caso las sesiones sólo se guardan en memoria)
+    """
+    base = os.environ.get(VARIABLE_DIRECTORIO)
+    return os.path.join(base, nombre) if base else None
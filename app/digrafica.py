@@ -1,8 +1,14 @@
-import copy
+import hashlib
+import heapq
 import operator
 import math
 from typing import MappingView
 from estructuras_datos import *
+from lector_aristas import leer_registros
+from grafica_compacta import GraficaCompacta
+from formato_binario import escribir_binario, abrir_binario, DIGRAFICA
+from columnas import recolector_pausado, columna, nombres_nodos
+from floyd_vectorizado import floyd_warshall, MatrizFloyd
 
 class Arco:
     """
@@ -36,8 +42,12 @@ class Digrafica:
     """
     def __init__(self):
         self.__digrafica = {} # Estructura donde se va a guardar la gráfica
+        self.__nodos = {} # Índice nombre -> nodo para búsquedas en tiempo constante
+        self.__arcos = {} # Índice (origen, destino) -> arcos entre ese par de nodos
+        self.__arcos_id = {} # Índice Id -> arco
         self.__num_nodos = 0 # Contador de nodos
         self.__num_arcos = 0 # Contador de arcos
+        self.__bitacora = Bitacora() # Cambios que se pueden deshacer con restaurar()
 
     def buscar_nodo(self, nombre):
         """
@@ -50,10 +60,7 @@ class Digrafica:
             True si el nodo se encuentra en la digráfica.
             None si el nodo no se encuentra en la digráfica. 
         """
-        for nodo in self.__digrafica:
-            if nodo.nombre == nombre:
-                return nodo
-        return False 
+        return self.__nodos.get(nombre, False)
 
     def agregar_nodo(self, nombre):
         """
@@ -74,9 +81,34 @@ class Digrafica:
         # con dos listas vacías, la lista de nodos "entrantes" y la lista de nodos "salientes"
         nodo = Nodo(nombre, etiqueta=None)
         self.__digrafica[nodo] = {"entrantes":[], "salientes":[]}
+        self.__nodos[nombre] = nodo
 
         # El número de nodos en la digráfica se incrementa y se regresa True
         self.__num_nodos += 1
+        self.__bitacora.anotar(self.__deshacer_agregar_nodo, nodo)
+        return True
+
+    def editar_nombre_nodo(self, nombre_actual, nombre_nuevo):
+        """
+            Este método edita el nombre de un nodo
+            Parámetros
+            ----------
+            nombre_actual: Nombre actual del nodo
+            nombre_nuevo: Nombre nuevo del nodo
+            Regresa
+            -------
+            True: Si el nombre pudo cambiarse
+            False: Si el nodo no existe o el nombre nuevo ya está en uso
+        """
+        nodo = self.buscar_nodo(nombre_actual)
+        if not nodo or self.buscar_nodo(nombre_nuevo):
+            return False
+
+        # El índice de nombres se actualiza junto con el nombre del nodo
+        self.__nodos.pop(nombre_actual)
+        nodo.nombre = nombre_nuevo
+        self.__nodos[nombre_nuevo] = nodo
+        self.__bitacora.anotar(self.__deshacer_editar_nombre_nodo, nodo, nombre_actual)
         return True
 
     def agregar_arco(self, a, b, peso=None, Id=None):
@@ -87,6 +119,10 @@ class Digrafica:
             a: Nodo de origen.
             b: Nodo destino.
             peso: Peso del arco.
+            Id: Identificador del arco.
+            Regresa
+            -------
+            El objeto de la clase Arco que se agregó.
         """
         # Se agregan los nodos a y b (Esto porque le damos la opción al usuario de 
         # agregar arcos directamente sin la necesidad de que los nodos ya existan
@@ -111,14 +147,23 @@ class Digrafica:
         self.__digrafica[nodo_b]["entrantes"].append(arco)
         nodo_b.grado_negativo += 1
 
+        # El arco se registra en los índices por par de nodos y por Id
+        self.__arcos.setdefault((nodo_a, nodo_b), []).append(arco)
+        id_anterior = None
+        if Id is not None:
+            id_anterior = self.__arcos_id.get(Id)
+            self.__arcos_id[Id] = arco
+
         # El contador de arcos se incrementa
         self.__num_arcos += 1
+        self.__bitacora.anotar(self.__deshacer_agregar_arco, arco, id_anterior)
         
-        return True
+        return arco
 
     def leer_digrafica(self, archivo):
         """
-            Este método lee una digráfica desde un archivo
+            Este método lee una digráfica desde un archivo. El archivo se lee por bloques y
+            cada línea se agrega en cuanto se lee, así que no se guarda completo en memoria.
             Parámetros
             ----------
             archivo: Ruta del archivo de texto en donde se encuentra la información
@@ -126,19 +171,14 @@ class Digrafica:
                      a -> Para agregar el nodo a
                      a,b -> Para agregar el arco (a,b)
                      a,b,5 -> Para agregar el arco (a,b) con peso 5
+                     Las líneas vacías se ignoran; si una línea no tiene este formato se
+                     lanza ValueError con el número de línea.
         """
-        file1 = open(archivo, 'r') 
-        Lines = file1.readlines() 
-
-        for line in Lines:
-            line = line.strip().split(",")
-            length = len(line)
-            if length == 1:
-                self.agregar_nodo(line[0])
-            elif length == 2:
-                self.agregar_arco(line[0], line[1])
-            elif length == 3:
-                self.agregar_arco(line[0], line[1], float(line[2]))
+        for campos in leer_registros(archivo, {1: 1, 2: 2, 3: 2}):
+            if len(campos) == 1:
+                self.agregar_nodo(campos[0])
+            else:
+                self.agregar_arco(*campos)
 
     def buscar_arco(self, a, b, peso=None):
         """
@@ -162,33 +202,45 @@ class Digrafica:
         if not nodo_a:
             return False
         
-        # Si el nodo de origen sí existe, entonces se busca el arco en sus salientes
-        
+        # Si el nodo de origen sí existe, entonces se toman únicamente los arcos que
+        # van de a hacia b desde el índice por par de nodos
+        arcos = self.__arcos.get((nodo_a, self.buscar_nodo(b)), [])
+
         if peso == None:
             peso_minimo = math.inf
             arco_minimo = None
-            for arco in self.__digrafica[nodo_a]["salientes"]:
-                # Si no se ha especificado un peso, entonces solamente se compara el 
-                # nombre del nodo destino y buscamos el de peso menor
-                if arco.destino.nombre == b and arco.peso < peso_minimo:
+            for arco in arcos:
+                # Si no se ha especificado un peso, entonces buscamos el de peso menor
+                if arco.peso < peso_minimo:
                         arco_minimo = arco
                         peso_minimo = arco.peso
       
             return arco_minimo
               
         else:
-            for arco in self.__digrafica[nodo_a]["salientes"]:
-                # Si el peso se ha especificado, entonces se compara el nombre del nodo 
-                # destino y el peso del arco
-                if arco.destino.nombre == b and arco.peso == peso:
+            for arco in arcos:
+                # Si el peso se ha especificado, entonces se compara el peso del arco
+                if arco.peso == peso:
                     return arco
         
         # Si se recorrieron todos los salientes del nodo de origen y no se encontró
         # el arco buscado, entonces se regresa False
         return False
+
+    def buscar_arco_id(self, Id):
+        """
+            Este método busca un arco por su identificador
+            Parámetros
+            ----------
+            Id: Identificador del arco a buscar.
+            Regresa
+            -------
+            arco: Si existe, el objeto de la clase Arco con ese Id.
+            False: Si el arco no existe.
+        """
+        return self.__arcos_id.get(Id, False)
     
-    
-    def eliminar_arco(self, a, b, peso=None):
+    def eliminar_arco(self, a=None, b=None, peso=None, obj_arco=None):
         """
             Este método elimina un arco de la digráfica
             Parámetros
@@ -196,6 +248,8 @@ class Digrafica:
             a: Nodo de origen del arco
             b: Nodo destino del arco
             peso (None por default): peso del arco
+            obj_arco (None por default): Objeto del arco a eliminar. Si se proporciona,
+                                         no se busca el arco por sus atributos.
             Regresa
             -------
             True: Si el arco pudo eliminarse (si existía)
@@ -203,24 +257,33 @@ class Digrafica:
         """    
 
         # Se busca el arco
-        arco = self.buscar_arco(a, b, peso)
+        if not obj_arco:
+            arco = self.buscar_arco(a, b, peso)
+        else:
+            arco = obj_arco
 
         # Si existe el arco, entonces se procede a elminarlo
         if arco:
             # El arco se elimina de los salientes del nodo de origen y el peso positivo
             # de éste se decrementa
             nodo_origen = arco.origen
-            self.__digrafica[nodo_origen]["salientes"].remove(arco)
+            i = self.__digrafica[nodo_origen]["salientes"].index(arco)
+            del self.__digrafica[nodo_origen]["salientes"][i]
             nodo_origen.grado_positivo -= 1
 
             # El arco se elimina de los entrantes del nodo destino y el peso negativo
             # de éste se decrementa
             nodo_destino = arco.destino
-            self.__digrafica[nodo_destino]["entrantes"].remove(arco)
+            j = self.__digrafica[nodo_destino]["entrantes"].index(arco)
+            del self.__digrafica[nodo_destino]["entrantes"][j]
             nodo_destino.grado_negativo -= 1
 
+            # El arco se elimina de los índices
+            k, quito_id = self.__quitar_de_indices(arco)
+
             # Se decrementa el número de arcos de la digráfica
             self.__num_arcos -= 1
+            self.__bitacora.anotar(self.__deshacer_eliminar_arco, arco, i, j, k, quito_id)
 
             # Se regresa True para indicar que el arco se pudo eliminar
             return True
@@ -247,22 +310,49 @@ class Digrafica:
             # Se eliminan todos los arcos salientes
             while self.__digrafica[nodo]["salientes"]:
                 arco = self.__digrafica[nodo]["salientes"][0]
-                self.eliminar_arco(arco.origen.nombre, arco.destino.nombre)
+                self.eliminar_arco(obj_arco=arco)
             
             # Se eliminan todos los arcos entrantes
             while self.__digrafica[nodo]["entrantes"]:
                 arco = self.__digrafica[nodo]["entrantes"][0]
-                self.eliminar_arco(arco.origen.nombre, arco.destino.nombre)
+                self.eliminar_arco(obj_arco=arco)
 
             # Cuando todos los arcos incidentes en el nodo se hayan eliminado procedemos a 
             # eliminar el nodo de la digráfica y decrementamos el contador de nodos
+            if self.__bitacora.instantaneas:
+                self.__bitacora.anotar(self.__deshacer_eliminar_nodo, nodo, self.__posicion_nodo(nodo))
             self.__digrafica.pop(nodo)
+            self.__nodos.pop(nodo.nombre)
             self.__num_nodos -= 1
 
             return True
         else:
             return False
     
+    def __quitar_de_indices(self, arco):
+        """
+            Este método quita un arco de los índices por par de nodos y por Id
+            Parámetros
+            ----------
+            arco: Objeto del arco que se va a quitar
+            Regresa
+            -------
+            La posición que tenía el arco entre los arcos de su par de nodos, y True si se
+            quitó su Id del índice
+        """
+        llave = (arco.origen, arco.destino)
+        arcos = self.__arcos[llave]
+        k = arcos.index(arco)
+        del arcos[k]
+        if not arcos:
+            self.__arcos.pop(llave)
+
+        # Sólo se quita el Id si apunta a este mismo arco
+        if arco.Id is not None and self.__arcos_id.get(arco.Id) is arco:
+            self.__arcos_id.pop(arco.Id)
+            return k, True
+        return k, False
+
     def obtener_grado(self, nombre, tipo="positivo"):
         """
             Este método obtiene el grado positivo de un nodo de la gráfica
@@ -324,12 +414,12 @@ class Digrafica:
             # Se eliminan todos los arcos salientes
             while self.__digrafica[nodo]["salientes"]:
                 arco = self.__digrafica[nodo]["salientes"][0]
-                self.eliminar_arco(arco.origen.nombre, arco.destino.nombre)
+                self.eliminar_arco(obj_arco=arco)
             
             # Se eliminan todos los arcos entrantes
             while self.__digrafica[nodo]["entrantes"]:
                 arco = self.__digrafica[nodo]["entrantes"][0]
-                self.eliminar_arco(arco.origen.nombre, arco.destino.nombre)
+                self.eliminar_arco(obj_arco=arco)
             
             # Se regresa True
             return True
@@ -341,47 +431,263 @@ class Digrafica:
         """
             Este método limpia la gráfica
         """
+        self.__bitacora.anotar(self.__deshacer_vaciar_grafica, self.__digrafica, self.__nodos, self.__arcos,
+                               self.__arcos_id, self.__num_nodos, self.__num_arcos)
         self.__digrafica = {}
+        self.__nodos = {}
+        self.__arcos = {}
+        self.__arcos_id = {}
         self.__num_nodos = 0
         self.__num_arcos = 0
     
 
     def copiar(self):
         """
-            Este método realiza una copia de la gráfica
+            Este método realiza una copia de la digráfica. Los nodos y arcos se copian uno por uno
+            (sólo sus atributos y referencias), en lugar de pasar por copy.deepcopy
             Regresa
             -------
-            Objeto de la clase Digráfica que representa la copia del objeto actual.
+            Objeto de la clase Digrafica que representa la copia del objeto actual.
         """
-        return copy.deepcopy(self)
-    
-    def __limpiar_etiquetas(self, tipo):
+        copia = Digrafica()
+        nodos = {nodo: copia_superficial(nodo) for nodo in self.__digrafica}
+        arcos = {}
+        for entrada in self.__digrafica.values():
+            for arco in entrada["salientes"]:
+                nuevo = copia_superficial(arco)
+                nuevo.origen = nodos[arco.origen]
+                nuevo.destino = nodos[arco.destino]
+                arcos[arco] = nuevo
+        for nodo, entrada in self.__digrafica.items():
+            copia.__digrafica[nodos[nodo]] = {"entrantes": [arcos[arco] for arco in entrada["entrantes"]],
+                                        "salientes": [arcos[arco] for arco in entrada["salientes"]]}
+        copia.__nodos = {nombre: nodos[nodo] for nombre, nodo in self.__nodos.items()}
+        copia.__arcos = {(nodos[a], nodos[b]): [arcos[arco] for arco in lista]
+                         for (a, b), lista in self.__arcos.items()}
+        copia.__arcos_id = {Id: arcos[arco] for Id, arco in self.__arcos_id.items()}
+        copia.__num_nodos = self.__num_nodos
+        copia.__num_arcos = self.__num_arcos
+        return copia
+
+    def instantanea(self):
         """
-            Este método limpia las etiquetas de los nodos y/o aristas de la gráfica
+            Este método toma una instantánea de la digráfica, que se puede recuperar después con
+            restaurar(). No se copia nada: a partir de aquí cada cambio anota cómo deshacerse,
+            así que tomar y restaurar la instantánea cuesta lo mismo que los cambios hechos
+            Regresa
+            -------
+            La instantánea, que se le pasa a restaurar() o a confirmar()
+        """
+        return self.__bitacora.instantanea()
+
+    def restaurar(self, instantanea):
+        """
+            Este método deshace los cambios (nodos, arcos, nombres) hechos después de tomar la
+            instantánea y la cierra, junto con las que se tomaron después de ella. Los atributos
+            que se cambian directamente en los objetos (como el peso de un arco) no se deshacen
             Parámetros
             ----------
-            tipo: Tipo del objeto del que deseamos eliminar las etiquetas
-                - "nodos": Para limpiar las etiquetas de los nodos
-                - "arcos": Para limpiar las etiquetas de los arcos
-                - "todo": Para limpiar las etiquetas de todos los arcos y aristas
+            instantanea: Instantánea regresada por instantanea()
         """
-        if tipo == "nodos":
-            for nodo in self.__digrafica:
-                nodo.etiqueta = None
-        elif tipo == "aristas":
-            for nodo in self.__digrafica:
-                for arco in self.__digrafica[nodo]["entrantes"]:
-                    arco.etiqueta = None
-                for arco in self.__digrafica[nodo]["salientes"]:
-                    arco.etiqueta = None
-        elif tipo == "todo":
-            for nodo in self.__digrafica:
-                for arco in self.__digrafica[nodo]["entrantes"]:
-                    arco.etiqueta = None
-                for arco in self.__digrafica[nodo]["salientes"]:
-                    arco.etiqueta = None
+        self.__bitacora.restaurar(instantanea)
+
+    def confirmar(self, instantanea):
+        """
+            Este método cierra la instantánea conservando los cambios
+            Parámetros
+            ----------
+            instantanea: Instantánea regresada por instantanea()
+        """
+        self.__bitacora.confirmar(instantanea)
+
+    def __posicion_nodo(self, nodo):
+        """
+            Este método regresa la posición del nodo en el orden de la digráfica. Casi siempre
+            se eliminan los últimos nodos agregados, así que primero se revisa el último
+        """
+        if next(reversed(self.__digrafica)) is nodo:
+            return len(self.__digrafica) - 1
+        return list(self.__digrafica).index(nodo)
+
+    def __deshacer_agregar_nodo(self, nodo):
+        self.__digrafica.pop(nodo)
+        self.__nodos.pop(nodo.nombre)
+        self.__num_nodos -= 1
+
+    def __deshacer_editar_nombre_nodo(self, nodo, nombre_anterior):
+        self.__nodos.pop(nodo.nombre)
+        nodo.nombre = nombre_anterior
+        self.__nodos[nombre_anterior] = nodo
+
+    def __deshacer_agregar_arco(self, arco, id_anterior):
+        self.__digrafica[arco.origen]["salientes"].pop()
+        arco.origen.grado_positivo -= 1
+        self.__digrafica[arco.destino]["entrantes"].pop()
+        arco.destino.grado_negativo -= 1
+        llave = (arco.origen, arco.destino)
+        self.__arcos[llave].pop()
+        if not self.__arcos[llave]:
+            self.__arcos.pop(llave)
+        if arco.Id is not None:
+            if id_anterior is None:
+                self.__arcos_id.pop(arco.Id)
+            else:
+                self.__arcos_id[arco.Id] = id_anterior
+        self.__num_arcos -= 1
+
+    def __deshacer_eliminar_arco(self, arco, i, j, k, quito_id):
+        self.__digrafica[arco.origen]["salientes"].insert(i, arco)
+        arco.origen.grado_positivo += 1
+        self.__digrafica[arco.destino]["entrantes"].insert(j, arco)
+        arco.destino.grado_negativo += 1
+        self.__arcos.setdefault((arco.origen, arco.destino), []).insert(k, arco)
+        if quito_id:
+            self.__arcos_id[arco.Id] = arco
+        self.__num_arcos += 1
+
+    def __deshacer_eliminar_nodo(self, nodo, posicion):
+        # El nodo regresa a su lugar en el orden de la digráfica, que es el orden en el que lo
+        # recorren los algoritmos
+        entrada = {"entrantes": [], "salientes": []}
+        if posicion == len(self.__digrafica):
+            self.__digrafica[nodo] = entrada
         else:
-            raise ValueError(f"Error en el tipo dado ({tipo}). Valores aceptados: 'nodos', 'aristas', 'todos'")
+            elementos = list(self.__digrafica.items())
+            elementos.insert(posicion, (nodo, entrada))
+            self.__digrafica = dict(elementos)
+        self.__nodos[nodo.nombre] = nodo
+        self.__num_nodos += 1
+
+    def __deshacer_vaciar_grafica(self, digrafica, nodos, arcos, arcos_id, num_nodos, num_arcos):
+        self.__digrafica = digrafica
+        self.__nodos = nodos
+        self.__arcos = arcos
+        self.__arcos_id = arcos_id
+        self.__num_nodos = num_nodos
+        self.__num_arcos = num_arcos
+    
+    def compactar(self):
+        """
+            Este método construye una copia compacta (CSR) de la digráfica
+            Regresa
+            -------
+            Objeto de la clase GraficaCompacta
+        """
+        return GraficaCompacta(self.__digrafica, [self.__digrafica[nodo]["salientes"] for nodo in self.__digrafica])
+
+    def guardar_binario(self, archivo):
+        """
+            Este método guarda la digráfica en un archivo binario (ver formato_binario), que se
+            abre mucho más rápido que el archivo de texto
+            Parámetros
+            ----------
+            archivo: Ruta del archivo
+        """
+        escribir_binario(self.compactar(), archivo, DIGRAFICA)
+
+    def leer_binario(self, archivo):
+        """
+            Este método lee una digráfica desde un archivo escrito con guardar_binario
+            Parámetros
+            ----------
+            archivo: Ruta del archivo
+        """
+        with abrir_binario(archivo) as mapeada:
+            if mapeada.tipo != DIGRAFICA:
+                raise ValueError(f"{archivo} no guarda una digráfica")
+            nombres = mapeada.nombres
+            for nombre in nombres:
+                self.agregar_nodo(nombre)
+            for i, j, peso, Id in zip(mapeada.colas.tolist(), mapeada.cabezas.tolist(), mapeada.pesos.tolist(), mapeada.ids()):
+                self.agregar_arco(nombres[i], nombres[j], None if math.isnan(peso) else peso, Id)
+
+    @classmethod
+    def desde_arreglos(cls, origenes, destinos, pesos=None, ids=None, nodos=()):
+        """
+            Este método construye una digráfica a partir de columnas (listas, arreglos de NumPy
+            o Series de pandas) en una sola pasada: los nodos se crean una vez y los arcos se
+            agregan directamente a las listas y a los índices, sin pasar por agregar_arco. El
+            resultado es el mismo que agregar los nodos y después los arcos en orden.
+            Parámetros
+            ----------
+            origenes: Columna con el nombre del nodo de origen de cada arco
+            destinos: Columna con el nombre del nodo destino de cada arco
+            pesos: Columna con el peso de cada arco (None si no tienen peso)
+            ids: Columna con el Id de cada arco (None si no tienen Id)
+            nodos: Nombres de nodos que se agregan antes que los arcos (por ejemplo, los
+                   nodos aislados)
+            Regresa
+            -------
+            La digráfica
+        """
+        origenes = columna(origenes, len(origenes))
+        destinos = columna(destinos, len(origenes))
+        pesos = columna(pesos, len(origenes))
+        ids = columna(ids, len(origenes))
+
+        with recolector_pausado():
+            digrafica = cls()
+            for nombre in nombres_nodos(columna(nodos, len(nodos)), origenes, destinos):
+                nodo = Nodo(nombre, etiqueta=None)
+                digrafica.__digrafica[nodo] = {"entrantes":[], "salientes":[]}
+                digrafica.__nodos[nombre] = nodo
+            indice = digrafica.__nodos
+            listas = digrafica.__digrafica
+            arcos = digrafica.__arcos
+            arcos_id = digrafica.__arcos_id
+
+            for a, b, peso, Id in zip(origenes, destinos, pesos, ids):
+                nodo_a = indice[a]
+                nodo_b = indice[b]
+                arco = Arco(nodo_a, nodo_b, peso, Id=Id)
+                listas[nodo_a]["salientes"].append(arco)
+                listas[nodo_b]["entrantes"].append(arco)
+                nodo_a.grado_positivo += 1
+                nodo_b.grado_negativo += 1
+                par = arcos.get((nodo_a, nodo_b))
+                if par is None:
+                    arcos[(nodo_a, nodo_b)] = [arco]
+                else:
+                    par.append(arco)
+                if Id is not None:
+                    arcos_id[Id] = arco
+
+            digrafica.__num_nodos = len(indice)
+            digrafica.__num_arcos = len(origenes)
+        return digrafica
+
+    def a_dataframe(self):
+        """
+            Este método regresa los arcos de la digráfica en un DataFrame de pandas, con las
+            columnas origen, destino, peso e Id, en el orden de los salientes de cada nodo.
+            Los nodos aislados no aparecen; los pesos que faltan quedan como NaN.
+        """
+        import pandas as pd
+
+        arcos = [arco for nodo in self.__digrafica for arco in self.__digrafica[nodo]["salientes"]]
+        return pd.DataFrame({
+            "origen": [arco.origen.nombre for arco in arcos],
+            "destino": [arco.destino.nombre for arco in arcos],
+            "peso": [arco.peso for arco in arcos],
+            "Id": pd.Series([arco.Id for arco in arcos], dtype=object),
+        })
+
+    def huella(self):
+        """
+            Este método calcula una huella (hash) de la digráfica a partir de sus nodos y de
+            los extremos, peso e Id de sus arcos, en el orden en el que se agregaron. Dos
+            digráficas con la misma huella dan los mismos resultados en los algoritmos.
+            Regresa
+            -------
+            Cadena hexadecimal con la huella
+        """
+        h = hashlib.sha1()
+        for nodo in self.__digrafica:
+            h.update(repr(nodo.nombre).encode())
+            for arco in self.__digrafica[nodo]["salientes"]:
+                h.update(repr((arco.destino.nombre, arco.peso, arco.Id)).encode())
+            h.update(b";")
+        return h.hexdigest()
 
     def __str__(self):
         """
@@ -411,27 +717,44 @@ class Digrafica:
         return resultado 
     
 
-    def __recuperar_ruta(self, nodo_actual, nodo_inicial, bool = None):
+    def __recuperar_ruta(self, nodo_actual, nodo_inicial, etiquetas):
         # Comenzamos la recuperación de la ruta en el nodo actual
         ruta = []
-        arista_antecesor = nodo_actual.etiqueta["antecesor"]
+        arista_antecesor = etiquetas[nodo_actual]["antecesor"]
         # Recuperamos arcos mientras el nodo actual no sea el nodo inicial
         while arista_antecesor != nodo_inicial:
             # Tomamos el antecesor del nodo actual mediante su etiqueta
-            #antecesor = nodo_actual.etiqueta["antecesor"]
+            #antecesor = etiquetas[nodo_actual]["antecesor"]
             # Se busca el objeto Arco que va desde el antecesor hasta el nodo actual y 
             # se agrega al principio de la lista, así terminaremos con la ruta ya ordenada
             ruta.insert(0, arista_antecesor)
             # Se actualiza el nodo actual
-            arista_antecesor = arista_antecesor.origen.etiqueta["antecesor"]
+            arista_antecesor = etiquetas[arista_antecesor.origen]["antecesor"]
         # Una vez que alcancemos el nodo inicial en la recuperación de la ruta, ésta
         # se regresa
-        if (bool):
-            self.__limpiar_etiquetas("nodos")
         return ruta
 
 
-    def dijkstra(self, nodo_inicial, nodo_final=None):
+    def dijkstra(self, nodo_inicial, nodo_final=None, etiquetas=None):
+        """
+            Este método encuentra las rutas más cortas desde el nodo inicial con el algoritmo de
+            Dijkstra. Las etiquetas de los nodos (tipo, antecesor, longitud de la ruta y orden)
+            se guardan en un contexto de la ejecución, no en los nodos, así que la digráfica no
+            cambia.
+            Parámetros
+            ----------
+            nodo_inicial: Nombre del nodo inicial
+            nodo_final: Si se especifica, se regresa sólo la ruta hasta este nodo
+            etiquetas: Objeto de la clase Etiquetas donde se guardan las etiquetas, para
+                       consultarlas después (por ejemplo, las longitudes de las rutas). Si no se
+                       da, se usa uno nuevo
+            Regresa
+            -------
+            La lista de arcos de la ruta hasta el nodo final (vacía si no existe), o la lista de
+            arcos antecesores de los nodos alcanzados si no se especificó nodo final
+        """
+        if etiquetas is None:
+            etiquetas = Etiquetas()
         # Se obtienen los nodos inicial y final
         a = self.buscar_nodo(nodo_inicial)
         if not a:
@@ -446,19 +769,26 @@ class Digrafica:
 
         # el nodo inicial se etiqueta como temporal, como antecesor de él mismo y con una longitud
         # de ruta de 0, además se agrega a la lista de nodos etiquetados temporalmente
-        a.etiqueta = {"tipo_etiqueta":"temporal", "antecesor":a, "longitud_ruta":0}
-        X = [a]
+        # X es un montículo binario de tuplas (longitud, orden, nodo). Cuando la etiqueta de un
+        # nodo mejora se agrega una nueva entrada en lugar de actualizar la anterior, y las
+        # entradas viejas se descartan al sacarlas (eliminación perezosa). El orden es el de la
+        # primera vez que se etiquetó el nodo, así los empates se resuelven igual que con la lista
+        etiquetas[a] = {"tipo_etiqueta":"temporal", "antecesor":a, "longitud_ruta":0, "orden":0}
+        X = [(0, 0, a)]
+        orden = 1
 
         # El algoritmo continúa hasta que se acaben los nodos etiquetados temporalmente
         # o encontremos la ruta más corta hasta el nodo final z
         while X:
             # Se obtiene el nodo en X con la longitud de ruta más pequeña
-            x = min(X, key=lambda nodo: nodo.etiqueta["longitud_ruta"])
+            longitud, _, x = heapq.heappop(X)
 
-            # x se elimina del conjunto de vértices marcados temporalmente y se marca de forma
-            # definitiva
-            X.remove(x)
-            x.etiqueta["tipo_etiqueta"] = "definitiva"
+            # Si el nodo ya es definitivo o la entrada es vieja, entonces se descarta
+            if etiquetas[x]["tipo_etiqueta"] == "definitiva" or longitud != etiquetas[x]["longitud_ruta"]:
+                continue
+
+            # x se marca de forma definitiva
+            etiquetas[x]["tipo_etiqueta"] = "definitiva"
 
             # Si x = z recuperamos la ruta y la regresamos. En caso de no especificar el nodo final
             # el algoritmo va a continuar hasta agotar la lista de nodos etiquetados temporalmente
@@ -466,7 +796,7 @@ class Digrafica:
             # En este último caso esta condición también nos sirve ya que z siempre será None y
             # x nunca será None por lo tanto, siempre x != z
             if x == z:
-                return self.__recuperar_ruta(x, a, False)
+                return self.__recuperar_ruta(x, a, etiquetas)
             
             # Si x != z, entonces se iteran los salientes de x:
             for arco in self.__digrafica[x]["salientes"]:
@@ -475,18 +805,20 @@ class Digrafica:
                 # Si no tiene etiqueta, entonces se marca como temporal, con antecesor = x y
                 # longitud de L(x) + w(arco). Además, se agrega a la lista de nodos etiquetados
                 # temporalmente
-                if not v.etiqueta:
-                    v.etiqueta = {"tipo_etiqueta":"temporal", "antecesor":arco, "longitud_ruta":x.etiqueta["longitud_ruta"] + arco.peso}
-                    X.append(v)
+                if not etiquetas[v]:
+                    etiquetas[v] = {"tipo_etiqueta":"temporal", "antecesor":arco, "longitud_ruta":etiquetas[x]["longitud_ruta"] + arco.peso, "orden":orden}
+                    heapq.heappush(X, (etiquetas[v]["longitud_ruta"], orden, v))
+                    orden += 1
 
                 # Si v tiene etiqueta temporal, entonces se revisa si la ruta desde x es mejor que
                 # la que ya tenía
-                elif v.etiqueta["tipo_etiqueta"] == "temporal":
+                elif etiquetas[v]["tipo_etiqueta"] == "temporal":
                     # Si la longitud de la ruta viniendo desde x mejora la etiqueta de v, entonces
                     # se actualiza esta longitud y su antecesor ahora será X.
-                    if x.etiqueta["longitud_ruta"] + arco.peso < v.etiqueta["longitud_ruta"]:
-                        v.etiqueta["longitud_ruta"] = x.etiqueta["longitud_ruta"] + arco.peso 
-                        v.etiqueta["antecesor"] = arco
+                    if etiquetas[x]["longitud_ruta"] + arco.peso < etiquetas[v]["longitud_ruta"]:
+                        etiquetas[v]["longitud_ruta"] = etiquetas[x]["longitud_ruta"] + arco.peso 
+                        etiquetas[v]["antecesor"] = arco
+                        heapq.heappush(X, (etiquetas[v]["longitud_ruta"], etiquetas[v]["orden"], v))
         
         # Si llegamos hasta este punto y el usuario había especificado un nodo final, entonces
         # significa que no existe una ruta desde el nodo inicial hasta el nodo final, por lo tanto
@@ -495,17 +827,22 @@ class Digrafica:
         if nodo_final:
             return []
         else:
+            # La unión de las rutas más cortas es exactamente el conjunto de arcos antecesores
+            # de los nodos alcanzados, así que no es necesario recuperar cada ruta
             rutas = []
             for nodo in self.__digrafica:
                 # Buscaremos rutas siempre y cuando el nodo tenga etiqueta, de lo contrario
                 # no fue marcado por el algoritmo ya que no existe algúna trayectoria desde el
                 # vértice inicial hasta este nodo
-                if nodo != a and nodo.etiqueta:
-                    rutas =list(set().union(rutas,self.__recuperar_ruta(nodo, a,False)))
+                if nodo != a and etiquetas[nodo]:
+                    rutas.append(etiquetas[nodo]["antecesor"])
             return rutas
 
 
-    def dijkstra_general(self, nodo_inicial, nodo_final=None):
+    def dijkstra_general(self, nodo_inicial, nodo_final=None, etiquetas=None):
+        # Las etiquetas de los nodos se guardan en el contexto de esta ejecución (ver dijkstra)
+        if etiquetas is None:
+            etiquetas = Etiquetas()
         # Se buscan los dos nodos
 
         nodo_inicial = self.buscar_nodo(nodo_inicial)
@@ -516,7 +853,7 @@ class Digrafica:
             raise ValueError(f"Error. El nodo final {nodo_final} no existe en la digráfica" )
         
         # Se encuentra la arborescencia temporal con dijkstra normal
-        arborescencia = self.dijkstra(nodo_inicial.nombre, None)
+        arborescencia = self.dijkstra(nodo_inicial.nombre, None, etiquetas)
    
         # Obtenemos las aristas sin usar
         aristas_sin_usar = []
@@ -527,7 +864,7 @@ class Digrafica:
                 # únicamente tomaremos en cuenta los arcos cuyos extremos tengan etiqueta porque
                 # en caso contrario, significa que no existe ruta desde el vértice inicial hasta
                 # el nodo sin etiqueta
-                if arco not in arborescencia and arco.origen.etiqueta and arco.destino.etiqueta:
+                if arco not in arborescencia and etiquetas[arco.origen] and etiquetas[arco.destino]:
                     aristas_sin_usar.append(arco)
            
       
@@ -538,10 +875,10 @@ class Digrafica:
             a = aristas_sin_usar[i]
           
             # Comparamos si la arista sin usar mejora la arborescencia
-            if a.origen.etiqueta["longitud_ruta"] + a.peso < a.destino.etiqueta["longitud_ruta"]:
+            if etiquetas[a.origen]["longitud_ruta"] + a.peso < etiquetas[a.destino]["longitud_ruta"]:
                 
                 # Si la arista sin usar mejora la ruta, primero checamos si no forma un ciclo negativo
-                arista_antecesor = a.origen.etiqueta["antecesor"] 
+                arista_antecesor = etiquetas[a.origen]["antecesor"] 
                 # lista donde guardaremos las aristas del ciclo, en caso de que se encuentre uno              
                 ciclo = []
                 # elemento para identificar si se regresa un ciclo
@@ -557,16 +894,16 @@ class Digrafica:
                     # If que revisa si los nodos del arista son ancestros
                     if arista_antecesor.origen ==  a.origen :
                         # calculamos la longitud del ciclo
-                        longitud_ciclo = a.origen.etiqueta["longitud_ruta"] + a.peso - a.destino.etiqueta["longitud_ruta"]
+                        longitud_ciclo = etiquetas[a.origen]["longitud_ruta"] + a.peso - etiquetas[a.destino]["longitud_ruta"]
                         # agreamos la longitud del ciclo como último elemento de la lista
                         ciclo.append(longitud_ciclo)
                         return ciclo, None
      
                     
-                    arista_antecesor = arista_antecesor.origen.etiqueta["antecesor"]
+                    arista_antecesor = etiquetas[arista_antecesor.origen]["antecesor"]
                 
                 if(a.destino == nodo_inicial):
-                        longitud_ciclo = a.origen.etiqueta["longitud_ruta"] + a.peso - a.destino.etiqueta["longitud_ruta"]
+                        longitud_ciclo = etiquetas[a.origen]["longitud_ruta"] + a.peso - etiquetas[a.destino]["longitud_ruta"]
                         ciclo.append(longitud_ciclo)
                         return ciclo, None
                 # Si no se formó ningún ciclo negativo, entonces eliminamos la nueva arista de 
@@ -574,21 +911,21 @@ class Digrafica:
                 # mejorada se elimina de la arborescencia y se agrega a las aristas sin usar.
                 aristas_sin_usar.remove(a)
                 arborescencia.append(a)
-                aristas_sin_usar.append(a.destino.etiqueta["antecesor"])
+                aristas_sin_usar.append(etiquetas[a.destino]["antecesor"])
              
-                arborescencia.remove(a.destino.etiqueta["antecesor"])
+                arborescencia.remove(etiquetas[a.destino]["antecesor"])
 
                 # Se actualiza el antecesor del destino de la nueva arista
-                a.destino.etiqueta["antecesor"] = a
+                etiquetas[a.destino]["antecesor"] = a
 
                 # Se calcula el valor con el cuál se van a actualizar las etiquetas de los 
                 # descendientes del nodo actualizado
-                delta = a.origen.etiqueta["longitud_ruta"] + a.peso - a.destino.etiqueta["longitud_ruta"]
+                delta = etiquetas[a.origen]["longitud_ruta"] + a.peso - etiquetas[a.destino]["longitud_ruta"]
 
                 # Se ejecuta una búsqueda a profundidad para actualizar a los descendientes
                 visitados = []
   
-                self.dfs(a.destino,visitados, arborescencia, delta)
+                self.dfs(a.destino, visitados, arborescencia, delta, etiquetas)
                 
                 # Como ahora existe una nueva arista sin usar, entonces volvemos a recorrer la
                 # lista de aristas sin usar desde el principio
@@ -602,16 +939,16 @@ class Digrafica:
         # hacia dicho nodo final. En caso contrario se regresa la arborescencia completa
 
         if n_final:
-            if not n_final.etiqueta:
+            if not etiquetas[n_final]:
                 return [], None
             else:
-                return self.__recuperar_ruta(n_final, nodo_inicial, True), None
+                return self.__recuperar_ruta(n_final, nodo_inicial, etiquetas), None
 
         # recuperamos las rutas del origen a los demas nodos
         rutas = []
         for nodo in lista_nodos:
             try:
-                rutas.append([nodo, self.__recuperar_ruta(nodo,nodo_inicial,False)])
+                rutas.append([nodo, self.__recuperar_ruta(nodo, nodo_inicial, etiquetas)])
             except:
                 rutas.append([nodo, None])
 
@@ -620,13 +957,56 @@ class Digrafica:
 
 
 
-    def dfs(self, node,visited, arborescencia, delta):
-        if node not in visited:
-            visited.append(node) 
-            node.etiqueta["longitud_ruta"] += delta
-            for saliente in self.__digrafica[node]["salientes"]:   
-               if saliente in arborescencia:  
-                   self.dfs(saliente.destino,visited,arborescencia,delta)  
+    def arbol_rutas_cortas(self, nodo_inicial, general=False):
+        """
+            Este método encuentra el árbol de rutas más cortas desde un nodo y lo regresa
+            como un diccionario, para poder guardarlo y consultarlo después.
+            Parámetros
+            ----------
+            nodo_inicial: Nombre del nodo raíz
+            general: True para usar dijkstra_general (admite pesos negativos), False para dijkstra
+            Regresa
+            -------
+            Diccionario nombre -> (longitud de la ruta, arco antecesor) de los nodos alcanzados;
+            el antecesor de la raíz es None. Si se encontró un ciclo negativo, se regresa la lista
+            del ciclo tal como la regresa dijkstra_general.
+        """
+        etiquetas = Etiquetas()
+        if general:
+            arborescencia, rutas = self.dijkstra_general(nodo_inicial, None, etiquetas)
+            if rutas is None:
+                return arborescencia
+        else:
+            self.dijkstra(nodo_inicial, None, etiquetas)
+
+        raiz = self.buscar_nodo(nodo_inicial)
+        arbol = {}
+        for nodo in self.__digrafica:
+            if etiquetas[nodo]:
+                antecesor = None if nodo == raiz else etiquetas[nodo]["antecesor"]
+                arbol[nodo.nombre] = (etiquetas[nodo]["longitud_ruta"], antecesor)
+        return arbol
+
+    def dfs(self, node, visited, arborescencia, delta, etiquetas):
+        """
+            Este método suma delta a la longitud de la ruta de node y de todos sus descendientes
+            en la arborescencia, recorriéndolos con una pila en lugar de recursión. Las
+            longitudes están en etiquetas, el contexto de la ejecución de dijkstra_general
+        """
+        en_arborescencia = set(arborescencia)
+        marcados = set(visited)
+        pila = Pila()
+        pila.apilar(node)
+        while not pila.es_vacia():
+            node = pila.desapilar()
+            if node in marcados:
+                continue
+            marcados.add(node)
+            visited.append(node)
+            etiquetas[node]["longitud_ruta"] += delta
+            for saliente in self.__digrafica[node]["salientes"]:
+                if saliente in en_arborescencia:
+                    pila.apilar(saliente.destino)
     
     def genera_matriz(self,nodos): 
         # Lista de listas donde guardaremos los elementos de la matriz
@@ -637,6 +1017,13 @@ class Digrafica:
             # Lista que corresponde a los renglones de la matriz del algoritmo
             # donde guardaremos los elementos (aristas y pesos) correspondientes a cada nodo
             lista_nodo = []
+
+            # Arco de peso mínimo desde el nodo hacia cada uno de sus vecinos (el primero en caso de empate)
+            minimos = {}
+            for arco in self.__digrafica[nodo]["salientes"]:
+                if arco.destino not in minimos or arco.peso < minimos[arco.destino].peso:
+                    minimos[arco.destino] = arco
+
             # Recorremos los nodos para buscar si hay un arco del nodo(nodos de los renglones de la matriz) al nodo2(nodos de las columnas)
             for nodo2 in nodos:
 
@@ -649,7 +1036,7 @@ class Digrafica:
                 # otros casos
                 else:
                     # si existe un arco entre el nodo1 y nodo2, recuperamos el de peso minimo y lo metemos a la matriz
-                    arco = self.buscar_arco(nodo.nombre,nodo2.nombre)
+                    arco = minimos.get(nodo2)
 
                     # revisamos si se encontró dicho arco
                     if (arco):
@@ -674,56 +1061,26 @@ class Digrafica:
         if nodo_origen == None:
             return None, None
 
-        # Creamos una lista con los nodos de la gráfica
-        nodos = []
-        for nodo in self.__digrafica:
-            nodos.append(nodo)
-            
-        # Ordenamos los nodos de acuerdo a sus nombres
-        nodos.sort(key=lambda a:a.nombre)
-
-        # Generamos la matriz inicial del algoritmo
-        lista_matriz = self.genera_matriz(nodos)
-
-        # Obtenemos la cantidad de nodos de la gráfica
-        num_nodos = len(nodos)
-
-        # Hacemos las iteraciones del algoritmo
-        for k in range(num_nodos):
-            for i in range(num_nodos):
-                for j in range(num_nodos):
-
-                    # Revisamos que no haya infinitos
-                    if((lista_matriz[i][k][1] != math.inf) and (lista_matriz[k][j][1] != math.inf) ):
-
-                        # Si el nuevo peso es menor al actual, actualizamos el peso y el nodo de origen 
-                        if (lista_matriz[i][j][1]) > (lista_matriz[i][k][1] + lista_matriz[k][j][1]):
-                            
-                            # Revisamos si un elemento de la diagonal cambió de valor, para ver si hay ciclo
-                            if(i == j ):
-                               
-                                # si uno de los elementos de la diagonal de la matriz cambia de valor, entonces hay un ciclo.
-
-                                # Actualizamos los valores de la dupla del elemento ij (arco y longitud)
-                                lista_matriz[i][j][0] = self.buscar_arco(lista_matriz[k][j][0].origen.nombre,nodos[j].nombre)
-                                lista_matriz[i][j][1]= lista_matriz[i][k][1] + lista_matriz[k][j][1]
-                                if not destino:
-                              
-                                    # recuperamos la ruta del ciclo
-                                    ruta_ciclo = []
-                                    ruta_ciclo = self.regresar_ruta_ciclo(i,j,lista_matriz,nodos)
-                                
-                                    return ruta_ciclo, lista_matriz
-                             
-                            else:
-                                # si el nuevo peso es menor, actualizamos el arco del elemento ij de la matriz    
-                                lista_matriz[i][j][0] = self.buscar_arco(lista_matriz[k][j][0].origen.nombre,nodos[j].nombre)
-
-                                # Si el nuevo peso es menor actualizamos le peso del elemento ij
-                                lista_matriz[i][j][1]= lista_matriz[i][k][1] + lista_matriz[k][j][1]
+        # Construimos la copia compacta de la digráfica y ordenamos los nodos de acuerdo
+        # a sus nombres, que es el orden de los renglones de la matriz
+        compacta = self.compactar()
+        orden = sorted(range(compacta.num_nodos), key=lambda i: compacta.nombres[i])
+        nodos = compacta.objetos_nodos(orden)
 
+        # Aplicamos el algoritmo sobre matrices de NumPy. El algoritmo se detiene en cuanto un
+        # elemento de la diagonal cambia de valor (ciclo negativo), haya o no destino: con un ciclo
+        # negativo las rutas de la matriz no terminan y recuperarlas no acabaría nunca
+        distancias, antecesores, ciclo = floyd_warshall(compacta, orden)
+        lista_matriz = MatrizFloyd(distancias, antecesores, nodos, compacta.arcos)
+
+        if ciclo is not None:
+            # recuperamos la ruta del ciclo
+            ruta_ciclo = self.regresar_ruta_ciclo(ciclo, ciclo, lista_matriz, nodos)
+            return ruta_ciclo, lista_matriz
+
+        if not origen:
+            raise ValueError(f"Error. El nodo inicial {nodo_origen} no existe en la digráfica")
 
-      
         # recuperamos la ruta
         ruta_corta = self.recuperar_ruta_floyd(lista_matriz,origen,nodos,destino)
 
@@ -734,9 +1091,12 @@ class Digrafica:
         
         destino = self.buscar_nodo(destino)
 
+        # Índice nodo -> posición en la lista de nodos (renglón/columna de la matriz)
+        posiciones = {n: i for i, n in enumerate(lista_nodos)}
+
         # Obtenemos la posición del nodo de origen dentro de la lista de nodos, 
         # para saber de que renglon de la matriz obtendremos las rutas
-        posicion_nodo = lista_nodos.index(nodo)
+        posicion_nodo = posiciones[nodo]
 
         # lista de rutas desde el nodo origen hasta los demas nodos
         rutas = []
@@ -754,15 +1114,14 @@ class Digrafica:
             # caso donde obtendremos la ruta del nodo origen a los demas    
             else:
                 # obtenemos la posición del nodo destino
-                try:
-                    posicion_nodo1 = lista_nodos.index(destino)
-                except:
+                posicion_nodo1 = posiciones.get(destino)
+                if posicion_nodo1 is None:
                     return None
 
                 if matriz[posicion_nodo][posicion_nodo1][1] == math.inf:
                     return None
                 if type(matriz[posicion_nodo][posicion_nodo][0])!= Nodo:
-                    posicion_nodo1 = lista_nodos.index(matriz[posicion_nodo][posicion_nodo][0].origen)
+                    posicion_nodo1 = posiciones[matriz[posicion_nodo][posicion_nodo][0].origen]
                     ruta_ciclo = self.regresar_ruta_ciclo(posicion_nodo,posicion_nodo,matriz,lista_nodos)
                     return ruta_ciclo
                 # ciclo para recuperar ruta del origen al nodo correspondiente (destino)
@@ -773,7 +1132,7 @@ class Digrafica:
                     if(posicion_nodo == posicion_nodo1):
                         
                         if type(matriz[posicion_nodo][posicion_nodo1][0])!= Nodo:
-                            posicion_nodo1 = lista_nodos.index(matriz[posicion_nodo][posicion_nodo1][0].origen)
+                            posicion_nodo1 = posiciones[matriz[posicion_nodo][posicion_nodo1][0].origen]
                             ruta_ciclo = self.regresar_ruta_ciclo(posicion_nodo,posicion_nodo1,matriz,lista_nodos)
                             return ruta_ciclo
                     # si encontramos un elemento con peso infinito o un nodo, detenemos el ciclo
@@ -789,7 +1148,7 @@ class Digrafica:
                    
                     # actualizamo la posición del nodo destino, que será el origen del nodo destino anterior
                     
-                    posicion_nodo1 = lista_nodos.index(matriz[posicion_nodo][posicion_nodo1][0].origen)
+                    posicion_nodo1 = posiciones[matriz[posicion_nodo][posicion_nodo1][0].origen]
 
                 # invertimos la lista para ordenar los arcos
 
@@ -811,7 +1170,7 @@ class Digrafica:
                 # caso donde obtendremos la ruta del nodo origen a los demas    
                 else:
                     # obtenemos la posición del nodo destino
-                    posicion_nodo1 = lista_nodos.index(nodo1)
+                    posicion_nodo1 = posiciones[nodo1]
 
                     # ciclo para recuperar ruta del origen al nodo correspondiente (destino)
                     while(True):
@@ -824,7 +1183,7 @@ class Digrafica:
                         ruta_hacia_nodo.append(matriz[posicion_nodo][posicion_nodo1])
 
                         # actualizamo la posición del nodo destino, que será el origen del nodo destino anterior
-                        posicion_nodo1 = lista_nodos.index(matriz[posicion_nodo][posicion_nodo1][0].origen)
+                        posicion_nodo1 = posiciones[matriz[posicion_nodo][posicion_nodo1][0].origen]
 
                   
 
@@ -835,6 +1194,7 @@ class Digrafica:
         return rutas
     
     def regresar_ruta_ciclo(self, i, j, lista_matriz, nodos):
+        posiciones = {n: k for k, n in enumerate(nodos)}
         ruta_ciclo = []
         # agregamos un identificador para detectar que se regresó un ciclo y agregamos la longitud del ciclo (dupla)
         ruta_ciclo.append(['ciclo',lista_matriz[i][j][1]])
@@ -856,7 +1216,7 @@ class Digrafica:
             ruta_ciclo.append(lista_matriz[i][posicion_nodo1])
             
             # actualizamo la posición del nodo destino, que será el origen del nodo destino anterior
-            posicion_nodo1 = nodos.index(lista_matriz[i][posicion_nodo1][0].origen)
+            posicion_nodo1 = posiciones[lista_matriz[i][posicion_nodo1][0].origen]
             
             # cuando volvemos al origen, ya tenemos el ciclo completo
             if(lista_matriz[i][posicion_nodo1][0].origen == nodo_ciclo):
@@ -1,4 +1,4 @@
-import dash  # pip install dash
+import dash  # pip install dash==2.9 or higher (for dash.Patch)
 import dash_cytoscape as cyto  # pip install dash-cytoscape==0.2.0 or higher
 import dash_html_components as html
 import dash_core_components as dcc
@@ -8,12 +8,25 @@ import pandas as pd  # pip install pandas
 import plotly.express as px
 import random
 from digrafica import *
+from servicio_rutas import ServicioRutas
 import base64
 import digraph
 import uuid
+import copy
+from elementos_cytoscape import copia_para_resultados, componentes_a_json, parchar_elementos, parchar_lista, llave_fila, decodificar_archivo, elementos_grafica, ArchivoInvalido, LIMITE_ARCHIVO
+from almacen_sesiones import AlmacenSesiones, directorio_sesiones
 
 from main import app
 
+# Árboles de rutas más cortas guardados entre callbacks mientras la digráfica no cambie
+servicio_rutas = ServicioRutas()
+
+# ----- Server-side store with the directed graph of each session -----
+# The elements, the degrees table and the copy of the elements without results stay in the server,
+# so the browser only sends and receives the id of its session instead of the whole directed graph
+digraph_store = AlmacenSesiones(lambda: {'elements': {'nodes': [], 'edges': []}, 'table': [], 'copy': None},
+                                directorio=directorio_sesiones("digraph"))
+
 # ----- Dropdown menu for algorithm selection -----
 algorithms = ["Find shortest path between two nodes using Dijkstra's algorithm",
               "Find shortest path between two nodes using general Dijkstra's algorithm",
@@ -269,7 +282,7 @@ layout = html.Div(children=[
         id='nodes-info-digraph', data=[['a', 1]] # The first element is the first node name that we will use
     ),
     dcc.Store(
-        id='digraph-copy', data=None
+        id='digraph-session', data=None # Id of the session in the server-side store and revision of the elements
     ),
  
     # 1- No nodes selected when edit node button is clicked
@@ -335,7 +348,7 @@ layout = html.Div(children=[
             dbc.Row([
                 dcc.Upload([
                     dbc.Button("Upload directed graph from file", className="mr-1", color="success"),
-                ], id="upload-digraph-obj")
+                ], id="upload-digraph-obj", max_size=LIMITE_ARCHIVO)
                 
             ], justify="center")
         ], md=6),
@@ -453,7 +466,7 @@ layout = html.Div(children=[
      Output("number-of-edges-label-digraph", "children"), Output('nodes-info-digraph', 'data'), 
      Output('upload-digraph-obj', 'contents'),
      Output('result-text-digraph', 'children'), Output('result-div-digraph', 'style'),
-     Output('digraph-copy', 'data'), Output('show-matrix-btn', 'style'), Output('matrix-table', 'children'),
+     Output('digraph-session', 'data'), Output('show-matrix-btn', 'style'), Output('matrix-table', 'children'),
      Output('select-nodes-modal-info', 'data')],
 
     [Input("add-node-btn-digraph", "n_clicks"), Input("done-btn-edit-nodes-modal-digraph", "n_clicks"),
@@ -463,16 +476,74 @@ layout = html.Div(children=[
      Input('upload-digraph-obj', 'contents'), Input('run-algorithm-btn-digraph', 'n_clicks'),
      Input('clear-result-btn-digraph', 'n_clicks'), Input('done-btn-select-source-and-target-nodes-modal', 'n_clicks')],
     
-    [State("digraph", "elements"), State("nodes-degrees-table-digraph", "children"), 
-     State("number-of-nodes-label-digraph", "children"), State("edit-nodes-modal-body-digraph", "children"), 
+    [State("number-of-nodes-label-digraph", "children"), State("edit-nodes-modal-body-digraph", "children"), 
      State("digraph", "selectedNodeData"), State("number-of-edges-label-digraph", "children"), 
      State("edit-edges-modal-body-digraph", "children"), State("digraph", "selectedEdgeData"), 
      State('nodes-info-digraph', 'data'), State('select-algorithm-dropown-digraph', 'value'), 
      State('result-text-digraph', 'children'), State('result-div-digraph', 'style'), 
-     State('digraph-copy', 'data'), State('matrix-modal-body', 'children'),
-     State('select-source-and-target-nodes-modal-body', 'children')]
+     State('digraph-session', 'data'), State('select-source-and-target-nodes-modal-body', 'children')]
 )
 def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
+    add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
+    run_algorithm_btn, clear_result_btn, done_btn_select_source_and_target_nodes_modal, number_of_nodes, 
+    edit_nodes_modal_body_childrens, selected_node_data, number_of_edges, edit_edges_modal_body_childrens, 
+    selected_edge_data, nodes_info, select_algorithm_dropdown, result_text_children, result_div_style, 
+    session_data, select_source_and_target_nodes_modal_children):
+    if not dash.callback_context.triggered:
+        return dash.no_update
+
+    # The Store keeps the Id of the session and the revision of the elements the browser has
+    if not isinstance(session_data, dict):
+        session_data = {}
+
+    # Load a fresh copy of the directed graph of this session from the server-side store. Callbacks of the
+    # same session wait for each other, and nothing is kept unless the callback gets to guardar.
+    # The matrix of the previous result is never read (the algorithms build a new one), so it isn't stored
+    with digraph_store.abrir(session_data.get('id')) as (session_id, session):
+        # The callback changes the elements and the table in place, so keep what the browser has now
+        previous_elements, previous_table = copy.deepcopy((session['elements'], session['table']))
+        outputs = updateDigraphElements(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
+            add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
+            run_algorithm_btn, clear_result_btn, done_btn_select_source_and_target_nodes_modal, session['elements'], 
+            session['table'], number_of_nodes, edit_nodes_modal_body_childrens, selected_node_data, number_of_edges, 
+            edit_edges_modal_body_childrens, selected_edge_data, nodes_info, select_algorithm_dropdown, 
+            result_text_children, result_div_style, session['copy'], [], select_source_and_target_nodes_modal_children)
+        if outputs is dash.no_update:
+            return dash.no_update
+
+        # Save the new directed graph; the copy of the elements without results never leaves the server
+        graph_elements, nodes_degrees_table_children, *other_outputs = outputs
+        nodes_degrees_table = componentes_a_json(nodes_degrees_table_children)
+        # The browser has the stored elements only if it got the response that saved them
+        synced = 'revision' in session and session['revision'] == session_data.get('revision')
+        matrix_shown = session.get('matrix_shown', False)
+        session['elements'] = graph_elements
+        session['table'] = nodes_degrees_table
+        session['copy'] = other_outputs[7]
+        session['revision'] = session.get('revision', 0) + 1
+        session['matrix_shown'] = bool(other_outputs[9])
+        digraph_store.guardar(session_id, session)
+    other_outputs[7] = {'id': session_id, 'revision': session['revision']}
+
+    # Send only the changes to the elements and the degree table. Everything is sent when the browser
+    # doesn't have the stored elements (a new session, one the store no longer had, or a response
+    # the browser dropped because a newer one was on its way)
+    if synced:
+        elements_output, table_output = dash.Patch(), dash.Patch()
+        if not parchar_elementos(elements_output, previous_elements, graph_elements):
+            elements_output = dash.no_update
+        if not parchar_lista(table_output, previous_table, nodes_degrees_table, llave_fila):
+            table_output = dash.no_update
+    else:
+        elements_output, table_output = graph_elements, nodes_degrees_table
+
+    # The matrix is only sent when there is a new one, or to clear the one the browser shows
+    if synced and not other_outputs[9] and not matrix_shown:
+        other_outputs[9] = dash.no_update
+
+    return [elements_output, table_output, *other_outputs]
+
+def updateDigraphElements(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
     add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
     run_algorithm_btn, clear_result_btn, done_btn_select_source_and_target_nodes_modal, graph_elements, 
     nodes_degrees_table_children, number_of_nodes, edit_nodes_modal_body_childrens, selected_node_data, 
@@ -489,7 +560,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Add node case -----
         if btn_triggered == "add-node-btn-digraph":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
 
             # Getting an unique initial name
@@ -550,7 +621,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Edit nodes case -----
         elif btn_triggered == "done-btn-edit-nodes-modal-digraph":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
 
             for children in edit_nodes_modal_body_childrens:
@@ -612,7 +683,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ---- Edit nodes button alert handle -----
         elif btn_triggered == "edit-nodes-btn-digraph":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             print("Selected node data")
@@ -625,7 +696,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Remove nodes case ------
         elif btn_triggered == "remove-nodes-btn-digraph":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if selected_node_data:
@@ -673,7 +744,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Add Edge case -----
         elif btn_triggered == "add-edge-btn-digraph":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             # When no node is selected
@@ -754,7 +825,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Edit edges case -----
         elif btn_triggered == "done-btn-edit-edges-modal-digraph":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             for c in edit_edges_modal_body_childrens:
                 # Getting the info of the edges
@@ -859,7 +930,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ---- Edit edges button alert handle -----
         elif btn_triggered == "edit-edges-btn-digraph":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if not selected_edge_data:
@@ -871,7 +942,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Remove edges case -----
         elif btn_triggered == "remove-edges-btn-digraph":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if not selected_edge_data:
@@ -910,147 +981,37 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
     
         # ----- Upload Graph Case -----
         elif btn_triggered == 'upload-digraph-obj':
-            # Read the file and convert it to list of elements
-            content_type, content_string = upload_graph_contents.split(',')
-            graph = [x.replace(" ", "").split(",") for x in base64.b64decode(content_string).decode('ascii').strip().split("\n") if x] 
-            print(graph)
-
+            # Read the file (plain or gzip-compressed text) and build the elements in a single pass
             alert = None
-            # Validate the data format
-            for element in graph:
-                # Just accept edges (a,b) or single nodes (a)
-                if len(element) > 3:
-                    alert = 7
-                    break
-                # validate if  weight is a number in case the element is an edge
-                if len(element) == 3:
-                    try:
-                        float(element[2])
-                    except:
-                        alert = 7
-                        break
+            try:
+                new_nodes, new_edges, nodes_degrees = elementos_grafica(decodificar_archivo(upload_graph_contents), dirigida=True)
+            except ArchivoInvalido as error:
+                # The file is too large, or it doesn't have the expected format
+                alert = 11 if error.motivo == "tamano" else 7
 
-            
             # If file format is ok, then we proceed to create the graph in the interface
             if not alert:
-                # Resetting all variables
-                new_nodes = []
-                new_edges = []
-                number_of_edges = 0
-                number_of_nodes = 0
-                data_info = ['a', 1]
-
-                # To store nodes degrees and then create the table
-                nodes_degrees = {}
-
-                # Check if the elements are nodes or edges and add it to UI and data structure
-                for element in graph:
-                    element_splitted = element
-                    # When it's a single node
-                    if len(element_splitted) == 1:
-                        # Check if node name is already in use
-                        for node in new_nodes:
-                            if element_splitted[0] == node['data']['label']:
-                                continue
-                        
-                        # If node doesn't exist, then add it to the new nodes
-                        node = {'data': {'id': str(uuid.uuid1()), 'label': element_splitted[0], 'positive_degree':0,'negative_degree':0},
-                                         'position': {'x':random.uniform(0,500),'y':random.uniform(0,500)},
-                                         'classes':'node'}
-                        new_nodes.append(node)
-
-                        # Adding the node to the degrees dict
-                        nodes_degrees[element_splitted[0]] = {'positive_degree':0, 'negative_degree':0}
-                        number_of_nodes += 1
-
-                    # When it's an edge
-                    else:
-                        # To store nodes ids
-                        node1_id = None
-                        node2_id = None
-
-                        # Check if node1 name is already in use
-                        node_already_exists = False
-                        for node in new_nodes:
-                            if node['data']['label'] == element_splitted[0]:
-                                node_already_exists = True
-                                node1_id = node['data']['id']
-                                break
-                        
-                        # If node 1 doesn't exists, then add it to the new nodes
-                        if not node_already_exists:
-                            node1_id = str(uuid.uuid1())
-                            node = {'data': {'id': node1_id, 'label': element_splitted[0], 'positive_degree':0, 'negative_degree':0},
-                                    'position': {'x':random.uniform(0,500),'y':random.uniform(0,500)},
-                                    'classes':'node'}
-                            new_nodes.append(node)
-                            number_of_nodes += 1
-
-                            # Adding it to the degrees dict
-                            nodes_degrees[element_splitted[0]] = {'positive_degree':0, 'negative_degree':0}
-                        
-                        # Check if node2 name is already in use
-                        node_already_exists = False
-                        for node in new_nodes:
-                            if node['data']['label'] == element_splitted[1]:
-                                node_already_exists = True
-                                node2_id = node['data']['id']
-                                break
-                        
-                        # If node 1 doesn't exists, then add it to the new nodes
-                        if not node_already_exists:
-                            node2_id = str(uuid.uuid1())
-                            node = {'data': {'id': node2_id, 'label': element_splitted[1], 'positive_degree':0, 'negative_degree':0},
-                                    'position': {'x':random.uniform(0,500),'y':random.uniform(0,500)},
-                                    'classes':'node'}
-                            new_nodes.append(node)
-                            number_of_nodes += 1
-
-                            # Adding it to the degrees dict
-                            nodes_degrees[element_splitted[1]] = {'positive_degree':0, 'negative_degree':0}
-                        
-                        # After nodes managing, add the edge between them
-                        edge_id = str(uuid.uuid1())
-                        try:
-                            weight = element_splitted[2]
-                        except:
-                            weight = 0
-
-                        edge = {'data': { 'source': node1_id, 
-                                'target': node2_id, 'weight': weight, 'id':edge_id, 
-                                'source_node':element_splitted[0], 'target_node':element_splitted[1]},
-                                'classes':'edge'}
-                        new_edges.append(edge)
-                        number_of_edges += 1
-
-                        # Update the edge nodes degrees
-                        nodes_degrees[element_splitted[0]]['positive_degree'] += 1
-                        nodes_degrees[element_splitted[1]]['negative_degree'] += 1
-                
                 # Updating the graph elements
                 graph_elements['nodes'] = new_nodes
                 graph_elements['edges'] = new_edges
+                number_of_nodes = len(new_nodes)
+                number_of_edges = len(new_edges)
 
                 # Creating the table
                 nodes_degrees_table_children = []
-                for node in nodes_degrees .items():   
+                for node in nodes_degrees.items():   
                     nodes_degrees_table_children.append(html.Tr(
                         [
                             html.Td(node[0], style={"text-align":"center"}), 
-                            html.Td(node[1]['positive_degree'],  style={"text-align":"center"}),
-                            html.Td(node[1]['negative_degree'],  style={"text-align":"center"})
+                            html.Td(node[1][0],  style={"text-align":"center"}),
+                            html.Td(node[1][1],  style={"text-align":"center"})
                         ], className="table-primary"))
             
             # Clean the upload content so we can upload a diferent file
             upload_graph_contents = ""
 
             print("READ GRAPH CASE")
-            print("Nodes")
-            for n in graph_elements['nodes']:
-                print(n)
-            print("\n\nEdges")
-            for e in graph_elements['edges']:
-                print(e)
+            print(len(graph_elements['nodes']), "nodes,", len(graph_elements['edges']), "edges")
             print("------------------------------\n")
 
             return graph_elements, nodes_degrees_table_children, number_of_nodes, alert, number_of_edges, nodes_info, "",result_text_children, result_div_style, None, {'display':'None'}, [], None
@@ -1063,9 +1024,11 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
             open_select_nodes_modal = None
 
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
 
-            graph_elements_copy = copy.deepcopy(graph_elements)
+            # The original elements are kept to clear the result later; only the copy is painted
+            graph_elements_copy = graph_elements
+            graph_elements = copia_para_resultados(graph_elements)
             alert = None
 
             if len(graph_elements['nodes']) == 0 and len(graph_elements['edges']) == 0:
@@ -1074,15 +1037,13 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
 
             if not alert:    
 
-                # Creat a Grafica object
-                g = Digrafica()
-                # Adding all nodes
-                for node in graph_elements['nodes']:
-                    g.agregar_nodo(node['data']['label'])
-                # Adding all edges
-                for edge in graph_elements['edges']:
-                    g.agregar_arco(edge['data']['source_node'], edge['data']['target_node'],
-                                   peso=float(edge['data']['weight']), Id=edge['data']['id'])
+                # Creat a Digrafica object with all nodes and edges in a single pass
+                edges = [edge['data'] for edge in graph_elements['edges']]
+                g = Digrafica.desde_arreglos([edge['source_node'] for edge in edges],
+                                             [edge['target_node'] for edge in edges],
+                                             pesos=[float(edge['weight']) for edge in edges],
+                                             ids=[edge['id'] for edge in edges],
+                                             nodos=[node['data']['label'] for node in graph_elements['nodes']])
                 
                 # ----- ALGORITHM TO RUN -----
                 # Dijkstra between two nodes
@@ -1107,7 +1068,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
                             result_div_style = {'display':''}
                             # Running the algorithm
                             path_original, rutas = g.dijkstra_general(selected_node_data[0]['label'])
-                            path = copy.deepcopy(path_original)
+                            path = path_original
                             
                             # Check if path exists
                             if not path:
@@ -1177,7 +1138,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
                             show_matrix_btn_style = {'display':''}
                             # Running the algorithm
                             path_original, matrix = g.floyd(selected_node_data[0]['label'])
-                            path = copy.deepcopy(path_original)
+                            path = path_original
 
                             print("RESULTADOS DE FLOYD")
                             for p in path_original:
@@ -1283,9 +1244,11 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
             open_select_nodes_modal = None
 
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
 
-            graph_elements_copy = copy.deepcopy(graph_elements)
+            # The original elements are kept to clear the result later; only the copy is painted
+            graph_elements_copy = graph_elements
+            graph_elements = copia_para_resultados(graph_elements)
             alert = None
 
             print(select_source_and_target_nodes_modal_children)
@@ -1299,22 +1262,20 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
                 node1 = selected_node_data[0]['label']
                 node2 = selected_node_data[1]['label']
 
-            # Creat a Grafica object
-            g = Digrafica()
-            # Adding all nodes
-            for node in graph_elements['nodes']:
-                g.agregar_nodo(node['data']['label'])
-            # Adding all edges
-            for edge in graph_elements['edges']:
-                g.agregar_arco(edge['data']['source_node'], edge['data']['target_node'],
-                               float(edge['data']['weight']), edge['data']['id'])
+            # Creat a Digrafica object with all nodes and edges in a single pass
+            edges = [edge['data'] for edge in graph_elements['edges']]
+            g = Digrafica.desde_arreglos([edge['source_node'] for edge in edges],
+                                         [edge['target_node'] for edge in edges],
+                                         pesos=[float(edge['weight']) for edge in edges],
+                                         ids=[edge['id'] for edge in edges],
+                                         nodos=[node['data']['label'] for node in graph_elements['nodes']])
             
             # ----- ALGORITHM TO RUN -----
             if select_algorithm_dropdown == "Find shortest path between two nodes using Dijkstra's algorithm":
                     
                 result_div_style = {'display':''}
                 # Running the algorithm
-                path = g.dijkstra(node1, node2)
+                path = servicio_rutas.consultar(g, [(node1, node2)])[0]
 
                 
                 # Check if path exists
@@ -1364,7 +1325,7 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
                 
                 result_div_style = {'display':''}
                 # Running the algorithm
-                path, rutas = g.dijkstra_general(node1, node2)
+                path = servicio_rutas.consultar(g, [(node1, node2)], general=True)[0]
                 
                 # Check if path exists
                 if not path:
@@ -1502,14 +1463,14 @@ def updateDigraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
 
         elif btn_triggered == 'done-btn-select-source-and-target-nodes-modal':
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             None
         # ----- Clear result case -----
         elif btn_triggered == 'clear-result-btn-digraph':
             alert = None
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             result_text_children = []
             result_div_style = {'display':'None'}
@@ -1684,6 +1645,9 @@ def manageAlert(alert_info):
     elif alert_info == 10:
         text = "Error. Algorithm expects just one source node. Please, select only one node and try again"
         show = True
+    elif alert_info == 11:
+        text = "Error. The file is too large. Please, upload a smaller (or gzip-compressed) file"
+        show = True
     return text, show
 
 # ----- callback to display 
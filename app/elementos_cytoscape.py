@@ -0,0 +1,384 @@
+import base64
+import json
+import math
+import random
+import uuid
+import zlib
+
+def copia_para_resultados(elementos):
+    """
+        Esta función copia los elementos de Cytoscape (el diccionario con las listas 'nodes' y
+        'edges') antes de pintar en ellos el resultado de un algoritmo, para guardar los
+        originales y poder borrar el resultado después.
+
+        Los callbacks sólo cambian las clases de los elementos y algunos valores de su 'data'
+        (el peso, las restricciones), así que basta con copiar el diccionario de cada elemento,
+        su 'data' y las listas que hay en 'data'. Lo demás (posiciones, etiquetas, Ids) se
+        comparte con los originales en lugar de copiarse con copy.deepcopy.
+        Parámetros
+        ----------
+        elementos: Diccionario con las listas 'nodes' y 'edges'
+        Regresa
+        -------
+        La copia de los elementos, que es la que se pinta
+    """
+    return {llave: [_copiar_elemento(elemento) for elemento in lista] for llave, lista in elementos.items()}
+
+def _copiar_elemento(elemento):
+    copia = dict(elemento)
+    if 'data' in elemento:
+        copia['data'] = {llave: list(valor) if isinstance(valor, list) else valor
+                         for llave, valor in elemento['data'].items()}
+    return copia
+
+def componentes_a_json(valor):
+    """
+        Esta función convierte componentes de Dash (por ejemplo, las filas html.Tr de una tabla)
+        a los diccionarios {'props', 'type', 'namespace'} con los que Dash los manda al navegador
+        y los regresa como State. Así, lo que se guarda del lado del servidor tiene la misma forma
+        que tendría si hubiera ido y vuelto del navegador.
+    """
+    if hasattr(valor, 'to_plotly_json'):
+        valor = valor.to_plotly_json()
+    if isinstance(valor, dict):
+        return {llave: componentes_a_json(v) for llave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [componentes_a_json(v) for v in valor]
+    return valor
+
+def parchar_lista(parche, anterior, nueva, llave):
+    """
+        Esta función escribe en un dash.Patch (o en la parte de uno que corresponde a una
+        lista) las operaciones que convierten la lista anterior en la nueva, para que el
+        navegador reciba sólo lo que cambió en lugar de la lista completa.
+
+        Los elementos se reconocen por su llave: los que ya no están se borran, los nuevos se
+        insertan y de los que cambiaron se mandan sólo los valores distintos (por ejemplo, las
+        clases de una arista que se pintó). Si hay llaves repetidas, si los elementos cambiaron
+        de orden o si se borran e insertan más elementos de los que tiene la lista nueva, se
+        manda la lista completa.
+        Parámetros
+        ----------
+        parche: dash.Patch de la lista
+        anterior: Lista que tiene el navegador
+        nueva: Lista que debe tener el navegador
+        llave: Función que regresa la llave de un elemento
+        Regresa
+        -------
+        True si se escribió alguna operación, False si las listas son iguales
+    """
+    if anterior == nueva:
+        return False
+    llaves_anteriores = [llave(elemento) for elemento in anterior]
+    llaves_nuevas = [llave(elemento) for elemento in nueva]
+    anteriores = dict(zip(llaves_anteriores, anterior))
+    nuevas = set(llaves_nuevas)
+
+    borrados = [i for i, llave_anterior in enumerate(llaves_anteriores) if llave_anterior not in nuevas]
+    insertados = [j for j, llave_nueva in enumerate(llaves_nuevas) if llave_nueva not in anteriores]
+    quedan = [llave_anterior for llave_anterior in llaves_anteriores if llave_anterior in nuevas]
+    if (len(anteriores) != len(anterior) or len(nuevas) != len(nueva)
+            or quedan != [llave_nueva for llave_nueva in llaves_nuevas if llave_nueva in anteriores]
+            or len(borrados) + len(insertados) > len(nueva)):
+        parche.clear()
+        parche.extend(nueva)
+        return True
+
+    # Se borra de atrás hacia adelante para que no se recorran los índices que faltan; después,
+    # la lista del navegador coincide con la nueva hasta cada índice que se inserta o cambia
+    for i in reversed(borrados):
+        del parche[i]
+    final = len(quedan)
+    agregados = []
+    for j, (llave_nueva, elemento) in enumerate(zip(llaves_nuevas, nueva)):
+        if llave_nueva in anteriores:
+            _parchar_valor(parche, j, anteriores[llave_nueva], elemento)
+        elif j == final:
+            # Los elementos que van al final se agregan juntos
+            agregados.append(elemento)
+            final += 1
+        else:
+            parche.insert(j, elemento)
+            final += 1
+    if agregados:
+        parche.extend(agregados)
+    return True
+
+def _parchar_valor(parche, llave, anterior, nuevo):
+    """
+        Esta función escribe en parche[llave] los cambios de un valor. En los diccionarios sólo
+        se mandan las llaves que cambiaron y en las listas del mismo tamaño sólo las posiciones
+        que cambiaron; cualquier otro valor que cambió se manda completo.
+    """
+    if anterior == nuevo:
+        return
+    if isinstance(anterior, list) and isinstance(nuevo, list) and len(anterior) == len(nuevo):
+        for i, (valor_anterior, valor) in enumerate(zip(anterior, nuevo)):
+            _parchar_valor(parche[llave], i, valor_anterior, valor)
+        return
+    if not (isinstance(anterior, dict) and isinstance(nuevo, dict)):
+        parche[llave] = nuevo
+        return
+    for llave_anterior in anterior:
+        if llave_anterior not in nuevo:
+            del parche[llave][llave_anterior]
+    for llave_nueva, valor in nuevo.items():
+        if llave_nueva in anterior:
+            _parchar_valor(parche[llave], llave_nueva, anterior[llave_nueva], valor)
+        else:
+            parche[llave][llave_nueva] = valor
+
+def parchar_elementos(parche, anteriores, nuevos):
+    """
+        Esta función escribe en un dash.Patch los cambios de los elementos de Cytoscape (el
+        diccionario con las listas 'nodes' y 'edges'). Los nodos y las aristas se reconocen
+        por su Id.
+        Regresa
+        -------
+        True si se escribió alguna operación
+    """
+    cambio = False
+    for llave, lista in nuevos.items():
+        cambio |= parchar_lista(parche[llave], anteriores.get(llave, []), lista, _id_elemento)
+    return cambio
+
+def _id_elemento(elemento):
+    return elemento['data']['id']
+
+def llave_fila(fila):
+    """
+        Esta función regresa la llave de una fila de la tabla de grados (ya convertida con
+        componentes_a_json) para parchar_lista: el contenido de su primera celda, que es la
+        etiqueta del nodo. Si la fila no tiene esa forma, la llave es la fila completa.
+    """
+    try:
+        return json.dumps(fila['props']['children'][0]['props']['children'], default=str)
+    except (KeyError, IndexError, TypeError):
+        return json.dumps(fila, sort_keys=True, default=str)
+
+LIMITE_ARCHIVO = 16 * 1024 * 1024 # Tamaño máximo (en bytes, ya descomprimido) de un archivo subido
+
+class ArchivoInvalido(ValueError):
+    """
+        Esta excepción indica que un archivo subido no se pudo leer. El motivo dice qué falló,
+        para que cada página muestre su alerta:
+        'tamano': El archivo es más grande que el límite
+        'formato': El archivo no es texto, o alguna línea no tiene el formato
+        'repetido': Hay dos nodos con la misma etiqueta
+        'inexistente': Hay un arco desde o hacia un nodo que no existe
+        'restricciones': Alguna restricción no es un número o es negativa
+        'restricciones_nodo': Las restricciones de algún nodo no son consistentes
+        'restricciones_arco': Las restricciones de algún arco no son consistentes
+        'costo': Algún costo no es un número o es infinito
+    """
+    def __init__(self, motivo, linea=None):
+        super().__init__(motivo if linea is None else f"{motivo} (línea {linea})")
+        self.motivo = motivo
+        self.linea = linea
+
+def decodificar_archivo(contenido, limite=LIMITE_ARCHIVO):
+    """
+        Esta función decodifica el contenido de un dcc.Upload ('data:<tipo>;base64,<datos>').
+        Acepta texto UTF-8 (o ASCII) y archivos comprimidos con gzip, que se descomprimen por
+        partes: en cuanto el texto pasa del límite se deja de descomprimir, así que un archivo
+        pequeño que se expande demasiado no llega a ocupar la memoria.
+        Parámetros
+        ----------
+        contenido: Cadena que regresa dcc.Upload
+        limite: Tamaño máximo del archivo, en bytes
+        Regresa
+        -------
+        El texto del archivo. Si no se puede leer se lanza ArchivoInvalido.
+    """
+    datos = contenido.split(",", 1)[-1]
+    # Cada 4 caracteres de base64 son 3 bytes, así que el tamaño se revisa antes de decodificar
+    if len(datos) // 4 * 3 > limite + 2:
+        raise ArchivoInvalido("tamano")
+    try:
+        crudo = base64.b64decode(datos)
+    except ValueError:
+        raise ArchivoInvalido("formato") from None
+    if crudo[:2] == b"\x1f\x8b":
+        crudo = _descomprimir(crudo, limite)
+    elif len(crudo) > limite:
+        raise ArchivoInvalido("tamano")
+    try:
+        return crudo.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ArchivoInvalido("formato") from None
+
+def _descomprimir(crudo, limite):
+    """
+        Esta función descomprime un archivo gzip (de uno o varios miembros) sin pasar del límite
+    """
+    partes = []
+    total = 0
+    descompresor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pendiente = crudo
+    try:
+        while True:
+            parte = descompresor.decompress(pendiente, limite + 1 - total)
+            total += len(parte)
+            if total > limite:
+                raise ArchivoInvalido("tamano")
+            partes.append(parte)
+            if descompresor.unconsumed_tail:
+                pendiente = descompresor.unconsumed_tail
+            elif descompresor.eof and descompresor.unused_data:
+                pendiente = descompresor.unused_data
+                descompresor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            else:
+                break
+    except zlib.error:
+        raise ArchivoInvalido("formato") from None
+    if not descompresor.eof:
+        # El archivo está incompleto
+        raise ArchivoInvalido("formato")
+    return b"".join(partes)
+
+def filas_archivo(texto):
+    """
+        Esta función separa el texto de un archivo en líneas y cada línea en campos (sin
+        espacios). Las líneas vacías se ignoran.
+        Regresa
+        -------
+        Un generador con el número de línea y la lista de campos de cada línea
+    """
+    for numero, linea in enumerate(texto.splitlines(), 1):
+        campos = linea.replace(" ", "").strip().split(",")
+        if campos != [""]:
+            yield numero, campos
+
+def elementos_grafica(texto, dirigida=False):
+    """
+        Esta función construye los elementos de Cytoscape de una gráfica o digráfica a partir
+        del texto de un archivo, en una sola pasada. Cada línea es un nodo ('a'), una arista o
+        arco ('a,b') o una arista o arco con peso ('a,b,5'). Los nodos se buscan en un
+        diccionario por etiqueta, así que construir los elementos toma O(n+m).
+        Parámetros
+        ----------
+        texto: Texto del archivo
+        dirigida: True para una digráfica. Los nodos llevan entonces sus grados positivo y
+                  negativo en 'positive_degree' y 'negative_degree'
+        Regresa
+        -------
+        nodes: Lista de nodos de Cytoscape, en el orden en el que aparecen
+        edges: Lista de aristas o arcos de Cytoscape
+        grados: Diccionario etiqueta -> grado (o [grado positivo, grado negativo] si dirigida)
+        Si alguna línea no tiene el formato se lanza ArchivoInvalido.
+    """
+    nodos = {}
+    aristas = []
+    grados = {}
+    for numero, campos in filas_archivo(texto):
+        if len(campos) > 3 or "" in campos[:2] or (len(campos) == 3 and not _es_numero(campos[2])):
+            raise ArchivoInvalido("formato", numero)
+        for etiqueta in campos[:2]:
+            if etiqueta not in nodos:
+                nodos[etiqueta] = _nodo(etiqueta, positive_degree=0, negative_degree=0) if dirigida else _nodo(etiqueta)
+                grados[etiqueta] = [0, 0] if dirigida else 0
+        if len(campos) == 1:
+            continue
+
+        origen, destino = campos[0], campos[1]
+        aristas.append({'data': {'source': nodos[origen]['data']['id'], 'target': nodos[destino]['data']['id'],
+                                 'weight': campos[2] if len(campos) == 3 else 0, 'id': str(uuid.uuid1()),
+                                 'source_node': origen, 'target_node': destino},
+                        'classes': 'edge'})
+        if dirigida:
+            grados[origen][0] += 1
+            grados[destino][1] += 1
+        else:
+            grados[origen] += 1
+            grados[destino] += 1
+
+    if dirigida:
+        for etiqueta, (positivo, negativo) in grados.items():
+            nodos[etiqueta]['data']['positive_degree'] = positivo
+            nodos[etiqueta]['data']['negative_degree'] = negativo
+    return list(nodos.values()), aristas, grados
+
+def elementos_red(texto):
+    """
+        Esta función construye los elementos de Cytoscape de una red de transporte a partir del
+        texto de un archivo, en una sola pasada. Cada línea es un nodo
+        ('a,res_min,res_max,oferta_demanda') o un arco ('a,b,res_min,flujo,capacidad,costo');
+        los arcos pueden aparecer antes que sus nodos. Los nodos se buscan en un diccionario
+        por etiqueta, así que construir los elementos toma O(n+m).
+        Parámetros
+        ----------
+        texto: Texto del archivo
+        Regresa
+        -------
+        nodes: Lista de nodos de Cytoscape, con sus grados y restricciones
+        edges: Lista de arcos de Cytoscape
+        Si el archivo no es válido se lanza ArchivoInvalido con el motivo.
+    """
+    nodos = {}
+    arcos = []
+    for numero, campos in filas_archivo(texto):
+        if len(campos) == 4:
+            if campos[0] in nodos:
+                raise ArchivoInvalido("repetido", numero)
+            minimo, maximo, oferta = _numeros(campos[1:4], numero)
+            if minimo < 0 or maximo < 0:
+                raise ArchivoInvalido("restricciones", numero)
+            if minimo == math.inf or minimo > maximo:
+                raise ArchivoInvalido("restricciones_nodo", numero)
+            nodos[campos[0]] = _nodo(campos[0], positive_degree=0, negative_degree=0, min_restriction=minimo,
+                                     max_restriction=_restriccion(maximo), **{'supply/demand': oferta})
+        elif len(campos) == 6:
+            minimo, flujo, capacidad = _numeros(campos[2:5], numero)
+            if minimo < 0 or flujo < 0 or capacidad < 0:
+                raise ArchivoInvalido("restricciones", numero)
+            if not _es_numero(campos[5]) or not math.isfinite(float(campos[5])):
+                raise ArchivoInvalido("costo", numero)
+            if minimo > capacidad or flujo > capacidad:
+                raise ArchivoInvalido("restricciones_arco", numero)
+            arcos.append((numero, campos[0], campos[1], [minimo, flujo, _restriccion(capacidad), float(campos[5])]))
+        else:
+            raise ArchivoInvalido("formato", numero)
+
+    # Los arcos se agregan al final porque sus nodos pueden estar en líneas posteriores
+    aristas = []
+    for numero, origen, destino, restricciones in arcos:
+        if origen not in nodos or destino not in nodos:
+            raise ArchivoInvalido("inexistente", numero)
+        nodo_origen = nodos[origen]['data']
+        nodo_destino = nodos[destino]['data']
+        aristas.append({'data': {'source': nodo_origen['id'], 'target': nodo_destino['id'],
+                                 'restrictions': restricciones, 'id': str(uuid.uuid1()),
+                                 'source_node': origen, 'target_node': destino},
+                        'classes': 'edge'})
+        nodo_origen['positive_degree'] += 1
+        nodo_destino['negative_degree'] += 1
+    return list(nodos.values()), aristas
+
+def _nodo(etiqueta, **datos):
+    return {'data': {'id': str(uuid.uuid1()), 'label': etiqueta, **datos},
+            'position': {'x': random.uniform(0, 500), 'y': random.uniform(0, 500)},
+            'classes': 'node'}
+
+def _numeros(campos, numero):
+    """
+        Esta función convierte los campos a números. Si alguno no es un número (o es NaN) se
+        lanza ArchivoInvalido con el motivo 'restricciones'.
+    """
+    try:
+        valores = [float(campo) for campo in campos]
+    except ValueError:
+        raise ArchivoInvalido("restricciones", numero) from None
+    if any(math.isnan(valor) for valor in valores):
+        raise ArchivoInvalido("restricciones", numero)
+    return valores
+
+def _restriccion(valor):
+    # Las restricciones infinitas se muestran como 'Inf'
+    return 'Inf' if valor == math.inf else valor
+
+def _es_numero(campo):
+    try:
+        float(campo)
+        return True
+    except ValueError:
+        return False
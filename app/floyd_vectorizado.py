@@ -0,0 +1,163 @@
+import math
+import numpy as np
+
+# Valores especiales de la matriz de antecesores
+SIN_ARCO = -1 # No hay ruta conocida entre el par de nodos
+NODO = -2 # Elemento de la diagonal que todavía guarda al propio nodo
+
+# Número aproximado de celdas que se actualizan a la vez en cada pivote
+CELDAS_POR_BLOQUE = 1 << 22
+
+def floyd_warshall(compacta, orden=None, detener_en_ciclo=True):
+    """
+        Este método aplica el algoritmo de Floyd-Warshall sobre una GraficaCompacta usando
+        matrices de NumPy para las distancias y los antecesores.
+
+        Los resultados son los mismos que los de la versión con listas: entre varios arcos
+        paralelos se toma el primero de peso mínimo, los lazos se ignoran, y si algún elemento
+        de la diagonal mejora (ciclo negativo) el algoritmo se detiene en ese mismo punto.
+        Cada pivote se aplica a toda la matriz con operaciones vectorizadas; sólo cuando el
+        pivote puede cambiar su propio renglón o columna (hay un ciclo negativo en juego) se
+        recorre renglón por renglón para respetar el orden de la versión original.
+        Parámetros
+        ----------
+        compacta: Objeto de la clase GraficaCompacta
+        orden: Lista con los índices de los nodos en el orden de los renglones de la matriz
+        detener_en_ciclo: Si es True, el algoritmo se detiene en cuanto mejora la diagonal
+        Regresa
+        -------
+        distancias: Matriz n x n con las longitudes de las rutas más cortas
+        antecesores: Matriz n x n con el índice (en compacta.arcos) del último arco de cada ruta
+        ciclo: Renglón en el que mejoró la diagonal si el algoritmo se detuvo, o None
+    """
+    n = compacta.num_nodos
+    if orden is None:
+        orden = range(n)
+    orden = np.asarray(orden, dtype=np.int64)
+    posicion = np.empty(n, dtype=np.int64)
+    posicion[orden] = np.arange(n, dtype=np.int64)
+
+    distancias = np.full((n, n), math.inf)
+    antecesores = np.full((n, n), SIN_ARCO, dtype=np.int64)
+
+    # Para cada par de nodos se toma el primer arco de peso mínimo, ignorando los lazos
+    colas = posicion[compacta.colas]
+    cabezas = posicion[compacta.cabezas]
+    arcos = np.flatnonzero(colas != cabezas)
+    arcos = arcos[np.lexsort((arcos, compacta.pesos[arcos], cabezas[arcos], colas[arcos]))]
+    pares = colas[arcos] * n + cabezas[arcos]
+    primeros = np.ones(len(arcos), dtype=bool)
+    primeros[1:] = pares[1:] != pares[:-1]
+    arcos = arcos[primeros]
+    distancias[colas[arcos], cabezas[arcos]] = compacta.pesos[arcos]
+    antecesores[colas[arcos], cabezas[arcos]] = arcos
+
+    diagonal = np.arange(n)
+    distancias[diagonal, diagonal] = 0
+    antecesores[diagonal, diagonal] = NODO
+
+    # Los arreglos temporales de cada bloque se reservan una sola vez
+    bloque = max(1, min(n, CELDAS_POR_BLOQUE // max(n, 1)))
+    candidato_bloque = np.empty((bloque, n))
+    mejora_bloque = np.empty((bloque, n), dtype=bool)
+    for k in range(n):
+        columna_k = distancias[:, k].copy()
+        renglon_k = distancias[k].copy()
+        mejora_diagonal = detener_en_ciclo and bool(np.any(columna_k + renglon_k < distancias[diagonal, diagonal]))
+
+        if renglon_k[k] < 0 or mejora_diagonal:
+            ciclo = _pivote_por_renglones(distancias, antecesores, k, detener_en_ciclo)
+            if ciclo is not None:
+                return distancias, antecesores, ciclo
+            continue
+
+        # Si el pivote no cambia su renglón ni su columna, todas las celdas se pueden
+        # actualizar a la vez con el mismo resultado que en el orden original
+        antecesores_k = antecesores[k].copy()
+        for inicio in range(0, n, bloque):
+            fin = min(n, inicio + bloque)
+            candidato = candidato_bloque[:fin - inicio]
+            mejora = mejora_bloque[:fin - inicio]
+            np.add(columna_k[inicio:fin, None], renglon_k[None, :], out=candidato)
+            np.less(candidato, distancias[inicio:fin], out=mejora)
+            np.minimum(distancias[inicio:fin], candidato, out=distancias[inicio:fin])
+            np.copyto(antecesores[inicio:fin], antecesores_k, where=mejora)
+
+    return distancias, antecesores, None
+
+def _pivote_por_renglones(distancias, antecesores, k, detener_en_ciclo):
+    """
+        Este método aplica el pivote k renglón por renglón y, dentro de cada renglón, antes
+        y después de la columna k, que es el orden en el que la versión original lee los
+        valores que cambian durante el pivote.
+        Regresa
+        -------
+        El renglón en el que mejoró la diagonal si hay que detenerse, o None
+    """
+    n = len(distancias)
+    for i in range(n):
+        for inicio, fin in ((0, k), (k, k + 1), (k + 1, n)):
+            if inicio >= fin:
+                continue
+            candidato = distancias[i, k] + distancias[k, inicio:fin]
+            mejora = candidato < distancias[i, inicio:fin]
+            nuevos_antecesores = antecesores[k, inicio:fin].copy()
+
+            ciclo = detener_en_ciclo and inicio <= i < fin and mejora[i - inicio]
+            if ciclo:
+                # Sólo se actualizan las columnas anteriores a la diagonal y la diagonal
+                mejora[i - inicio + 1:] = False
+
+            np.copyto(distancias[i, inicio:fin], candidato, where=mejora)
+            np.copyto(antecesores[i, inicio:fin], nuevos_antecesores, where=mejora)
+            if ciclo:
+                return i
+    return None
+
+class MatrizFloyd:
+    """
+        Esta clase presenta las matrices de distancias y antecesores como la lista de listas
+        de la versión original, donde cada celda es [arco, longitud], [nodo, 0] en la diagonal
+        o ['-', inf] si no hay ruta. Las celdas se construyen cuando se consultan.
+    """
+    def __init__(self, distancias, antecesores, nodos, arcos):
+        self.distancias = distancias
+        self.antecesores = antecesores
+        self.nodos = nodos
+        self.arcos = arcos
+
+    def celda(self, i, j):
+        antecesor = self.antecesores[i, j]
+        if antecesor == NODO:
+            return [self.nodos[i], 0]
+        if antecesor == SIN_ARCO:
+            return ['-', math.inf]
+        return [self.arcos[antecesor], float(self.distancias[i, j])]
+
+    def __len__(self):
+        return len(self.nodos)
+
+    def __getitem__(self, i):
+        return RenglonFloyd(self, i)
+
+    def __iter__(self):
+        for i in range(len(self.nodos)):
+            yield RenglonFloyd(self, i)
+
+class RenglonFloyd:
+    """
+        Esta clase representa un renglón de una MatrizFloyd
+    """
+    def __init__(self, matriz, i):
+        self.matriz = matriz
+        self.i = i
+
+    def __len__(self):
+        return len(self.matriz)
+
+    def __getitem__(self, j):
+        return self.matriz.celda(self.i, j)
+
+    def __iter__(self):
+        for j in range(len(self.matriz)):
+            yield self.matriz.celda(self.i, j)
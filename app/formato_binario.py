@@ -0,0 +1,404 @@
+import math
+import mmap
+import struct
+from collections import deque
+import numpy as np
+from grafica_compacta import tabla_entrantes
+
+MAGICO = b"ARBIN\x00\x00\x00" # Primeros bytes de todos los archivos binarios
+VERSION = 2 # Versión del formato que se escribe (la 1 no guardaba el tipo de los nombres)
+GRAFICA, DIGRAFICA, RED = 0, 1, 2 # Tipos de estructura que puede guardar un archivo
+
+# Encabezado: mágico, versión, tipo, número de nodos, número de arcos, bytes de la tabla
+# de nombres y bytes de la tabla de Ids
+ENCABEZADO = struct.Struct("<8sIIqqqq")
+
+# Tipos de los nombres de los nodos y de los Ids de los arcos
+_ID_NINGUNO, _ID_CADENA, _ID_ENTERO, _ID_REAL = 0, 1, 2, 3
+
+def _secciones(num_nodos, num_arcos, bytes_nombres, bytes_ids, version=VERSION):
+    """
+        Esta función regresa las secciones del archivo que siguen al encabezado, en orden.
+        Cada sección empieza en un múltiplo de 8 bytes, para que los arreglos se puedan
+        leer directamente del archivo mapeado. La versión 1 no tiene la sección tipos_nombres.
+        Regresa
+        -------
+        Lista de (nombre, tipo de NumPy, número de elementos, posición en el archivo)
+    """
+    secciones = [
+        ("tipos_nombres", "u1", num_nodos),
+        ("offsets_nombres", "<i8", num_nodos + 1),
+        ("nombres", "u1", bytes_nombres),
+        ("res_min_nodos", "<f8", num_nodos),
+        ("res_max_nodos", "<f8", num_nodos),
+        ("oferta_demanda", "<f8", num_nodos),
+        ("offsets", "<i8", num_nodos + 1),
+        ("cabezas", "<i8", num_arcos),
+        ("pesos", "<f8", num_arcos),
+        ("capacidades", "<f8", num_arcos),
+        ("costos", "<f8", num_arcos),
+        ("flujos", "<f8", num_arcos),
+        ("res_min", "<f8", num_arcos),
+        ("tipos_ids", "u1", num_arcos),
+        ("offsets_ids", "<i8", num_arcos + 1),
+        ("ids", "u1", bytes_ids),
+    ]
+    if version < 2:
+        secciones.pop(0)
+    resultado = []
+    posicion = ENCABEZADO.size
+    for nombre, tipo, cantidad in secciones:
+        resultado.append((nombre, tipo, cantidad, posicion))
+        posicion = _alinear(posicion + cantidad * np.dtype(tipo).itemsize)
+    return resultado
+
+def _alinear(posicion):
+    return (posicion + 7) & ~7
+
+def _tabla_cadenas(cadenas):
+    """
+        Esta función codifica una lista de cadenas en UTF-8, una tras otra
+        Regresa
+        -------
+        offsets: La cadena i está en los bytes offsets[i]:offsets[i+1]
+        datos: Los bytes de todas las cadenas
+    """
+    codificadas = [cadena.encode("utf-8") for cadena in cadenas]
+    offsets = np.zeros(len(codificadas) + 1, dtype="<i8")
+    np.cumsum(np.fromiter(map(len, codificadas), dtype=np.int64, count=len(codificadas)), out=offsets[1:])
+    return offsets, b"".join(codificadas)
+
+def _atributo_nodos(nodos, nombre):
+    valores = (getattr(nodo, nombre, None) for nodo in nodos)
+    return np.fromiter((math.nan if valor is None else float(valor) for valor in valores),
+                       dtype="<f8", count=len(nodos))
+
+def _codificar_id(Id):
+    if Id is None:
+        return _ID_NINGUNO, ""
+    if isinstance(Id, bool) or not isinstance(Id, (int, float)):
+        return _ID_CADENA, str(Id)
+    if isinstance(Id, int):
+        return _ID_ENTERO, str(Id)
+    return _ID_REAL, repr(Id)
+
+def _codificar_nombre(nombre):
+    # Los nombres son las llaves de los nodos, así que sólo se aceptan los tipos que se
+    # recuperan sin cambios; cualquier otro cambiaría la llave al leer el archivo
+    if isinstance(nombre, bool) or not isinstance(nombre, (str, int, float)):
+        raise TypeError(f"El nodo {nombre!r} tiene un nombre de tipo {type(nombre).__name__}; "
+                        "sólo se pueden guardar nombres str, int o float")
+    return _codificar_id(nombre)
+
+def _decodificar_id(tipo, texto):
+    if tipo == _ID_NINGUNO:
+        return None
+    if tipo == _ID_ENTERO:
+        return int(texto)
+    if tipo == _ID_REAL:
+        return float(texto)
+    return texto
+
+def escribir_binario(compacta, archivo, tipo):
+    """
+        Esta función guarda la copia compacta (CSR) de una gráfica, digráfica o red en un
+        archivo binario: un encabezado con la versión del formato, la tabla de nombres de
+        los nodos y los arreglos del CSR y de los atributos de nodos y arcos. Los nombres y
+        los Ids se guardan como texto junto con su tipo, para recuperarlos sin cambios. Si
+        algún nombre no es str, int o float se lanza TypeError.
+        Parámetros
+        ----------
+        compacta: Objeto de la clase GraficaCompacta
+        archivo: Ruta del archivo
+        tipo: GRAFICA, DIGRAFICA o RED
+    """
+    codigos = [_codificar_nombre(nombre) for nombre in compacta.nombres]
+    tipos_nombres = np.fromiter((codigo[0] for codigo in codigos), dtype="u1", count=len(codigos))
+    offsets_nombres, nombres = _tabla_cadenas([codigo[1] for codigo in codigos])
+    codigos = [_codificar_id(getattr(arco, "Id", None)) for arco in compacta.arcos]
+    tipos_ids = np.fromiter((codigo[0] for codigo in codigos), dtype="u1", count=len(codigos))
+    offsets_ids, ids = _tabla_cadenas([codigo[1] for codigo in codigos])
+    del codigos
+
+    datos = {
+        "tipos_nombres": tipos_nombres,
+        "offsets_nombres": offsets_nombres,
+        "nombres": nombres,
+        "res_min_nodos": _atributo_nodos(compacta.nodos, "res_min"),
+        "res_max_nodos": _atributo_nodos(compacta.nodos, "res_max"),
+        "oferta_demanda": _atributo_nodos(compacta.nodos, "oferta_demanda"),
+        "offsets": compacta.offsets,
+        "cabezas": compacta.cabezas,
+        "pesos": compacta.pesos,
+        "capacidades": compacta.capacidades,
+        "costos": compacta.costos,
+        "flujos": compacta.flujos,
+        "res_min": compacta.res_min,
+        "tipos_ids": tipos_ids,
+        "offsets_ids": offsets_ids,
+        "ids": ids,
+    }
+    secciones = _secciones(compacta.num_nodos, compacta.num_arcos, len(nombres), len(ids))
+    with open(archivo, "wb") as f:
+        f.write(ENCABEZADO.pack(MAGICO, VERSION, tipo, compacta.num_nodos, compacta.num_arcos, len(nombres), len(ids)))
+        for nombre, tipo_arreglo, cantidad, posicion in secciones:
+            f.write(b"\x00" * (posicion - f.tell()))
+            valor = datos[nombre]
+            f.write(valor if isinstance(valor, bytes) else np.ascontiguousarray(valor, dtype=tipo_arreglo).tobytes())
+
+def abrir_binario(archivo):
+    """
+        Esta función abre un archivo escrito con escribir_binario. El archivo se mapea en
+        memoria, así que abrirlo no lee los arreglos: el sistema operativo carga las páginas
+        que se usan.
+        Parámetros
+        ----------
+        archivo: Ruta del archivo
+        Regresa
+        -------
+        Objeto de la clase GraficaMapeada
+    """
+    return GraficaMapeada(archivo)
+
+def orden_aristas(offsets, colas, cabezas, claves):
+    """
+        Esta función ordena las aristas de una gráfica guardada en CSR (en la que cada arista
+        aparece en la lista de sus dos extremos) para volver a agregarlas con agregar_arista
+        y obtener las mismas listas. La k-ésima copia de {a,b} en la lista de a se empareja con
+        la k-ésima copia en la lista de b con la misma clave, y las aristas se toman en un
+        orden en el que cada una es la siguiente pendiente en las listas de sus dos extremos.
+        Parámetros
+        ----------
+        offsets, colas, cabezas: Listas del CSR
+        claves: Lista (alineada con los arcos) de lo que deben tener igual las dos copias de
+                una arista, por ejemplo (peso, Id)
+        Regresa
+        -------
+        Lista con un arco por arista, el de la lista del extremo que se agrega primero
+    """
+    # Se empareja cada arco con su gemelo en la lista del otro extremo (los lazos aparecen
+    # una sola vez y son su propio gemelo)
+    gemelos = list(range(len(cabezas)))
+    pendientes = {}
+    for k, (i, j) in enumerate(zip(colas, cabezas)):
+        if i == j:
+            continue
+        espera = pendientes.get((j, i, claves[k]))
+        if espera:
+            gemelo = espera.popleft()
+            gemelos[k] = gemelo
+            gemelos[gemelo] = k
+        else:
+            pendientes.setdefault((i, j, claves[k]), deque()).append(k)
+
+    # siguiente[i] es el primer arco de la lista de i que no se ha tomado
+    siguiente = list(offsets[:-1])
+    fin = offsets[1:]
+    orden = []
+    por_revisar = list(range(len(siguiente)))
+    while por_revisar:
+        i = por_revisar.pop()
+        k = siguiente[i]
+        if k == fin[i]:
+            continue
+        j = cabezas[k]
+        if siguiente[j] != gemelos[k]:
+            continue
+        orden.append(k)
+        siguiente[i] += 1
+        if j != i:
+            siguiente[j] += 1
+        por_revisar.append(i)
+        por_revisar.append(j)
+
+    # Si las listas no vienen de agregar_arista (por ejemplo, si se eliminaron aristas de
+    # forma distinta en cada extremo) quedan aristas sin tomar; se agregan en su orden
+    for i in range(len(siguiente)):
+        for k in range(siguiente[i], fin[i]):
+            if gemelos[k] >= k:
+                orden.append(k)
+    return orden
+
+class GraficaMapeada:
+    """
+        Esta clase representa una gráfica, digráfica o red guardada en un archivo binario y
+        mapeada en memoria. Tiene los mismos arreglos que GraficaCompacta (offsets, cabezas,
+        colas, pesos, capacidades, costos, flujos, res_min), por lo que los algoritmos que
+        trabajan sobre la copia compacta también trabajan sobre ella, pero los arreglos son
+        vistas de sólo lectura sobre el archivo en lugar de copias.
+
+        A diferencia de GraficaCompacta, no hay objetos Nodo y Arco: los nombres de los nodos
+        y los Ids de los arcos se decodifican cuando se piden.
+    """
+    def __init__(self, archivo):
+        """
+            Este método mapea el archivo y revisa su encabezado
+            Parámetros
+            ----------
+            archivo: Ruta del archivo
+        """
+        with open(archivo, "rb") as f:
+            if not f.read(ENCABEZADO.size):
+                raise ValueError(f"{archivo} no es un archivo binario de gráfica")
+            self.__mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.__leer_encabezado(archivo)
+        except ValueError:
+            self.__mapa.close()
+            raise
+
+        self.dirigida = self.tipo != GRAFICA
+        self.offsets = self.__arreglo("offsets")
+        self.cabezas = self.__arreglo("cabezas")
+        self.pesos = self.__arreglo("pesos")
+        self.capacidades = self.__arreglo("capacidades")
+        self.costos = self.__arreglo("costos")
+        self.flujos = self.__arreglo("flujos")
+        self.res_min = self.__arreglo("res_min")
+        self.res_min_nodos = self.__arreglo("res_min_nodos")
+        self.res_max_nodos = self.__arreglo("res_max_nodos")
+        self.oferta_demanda = self.__arreglo("oferta_demanda")
+        self.__colas = None
+        self.__nombres = None
+        self.__indices = None
+        self.__offsets_entrada = None
+        self.__arcos_entrada = None
+
+    def __leer_encabezado(self, archivo):
+        """
+            Este método revisa el encabezado y calcula la posición de cada sección
+        """
+        if len(self.__mapa) < ENCABEZADO.size:
+            raise ValueError(f"{archivo} no es un archivo binario de gráfica")
+        magico, version, tipo, num_nodos, num_arcos, bytes_nombres, bytes_ids = ENCABEZADO.unpack_from(self.__mapa)
+        if magico != MAGICO:
+            raise ValueError(f"{archivo} no es un archivo binario de gráfica")
+        if not 1 <= version <= VERSION:
+            raise ValueError(f"{archivo} tiene la versión {version} del formato y sólo se pueden leer hasta la versión {VERSION}")
+        secciones = _secciones(num_nodos, num_arcos, bytes_nombres, bytes_ids, version)
+        nombre, tipo_arreglo, cantidad, posicion = secciones[-1]
+        if len(self.__mapa) < posicion + cantidad:
+            raise ValueError(f"{archivo} está incompleto")
+
+        self.version = version
+        self.tipo = tipo
+        self.num_nodos = num_nodos
+        self.num_arcos = num_arcos
+        self.__secciones = {nombre: (tipo_arreglo, cantidad, posicion) for nombre, tipo_arreglo, cantidad, posicion in secciones}
+
+    def __arreglo(self, nombre):
+        """
+            Este método regresa una sección del archivo como arreglo de NumPy, sin copiarla
+        """
+        tipo_arreglo, cantidad, posicion = self.__secciones[nombre]
+        return np.frombuffer(self.__mapa, dtype=tipo_arreglo, count=cantidad, offset=posicion)
+
+    @property
+    def colas(self):
+        """
+            Arreglo con el índice del nodo de origen de cada arco. No se guarda en el archivo
+            porque se obtiene de los offsets; se construye la primera vez que se pide.
+        """
+        if self.__colas is None:
+            self.__colas = np.repeat(np.arange(self.num_nodos, dtype=np.int64), np.diff(self.offsets))
+            self.__colas.flags.writeable = False
+        return self.__colas
+
+    @property
+    def nombres(self):
+        """
+            Lista con los nombres de los nodos, en el orden de los arreglos
+        """
+        if self.__nombres is None:
+            self.__nombres = self.__valores("nombres", range(self.num_nodos))
+        return self.__nombres
+
+    def nombre(self, i):
+        """
+            Este método regresa el nombre del nodo i sin decodificar toda la tabla de nombres
+        """
+        return self.__valores("nombres", (i,))[0]
+
+    def indice(self, nombre):
+        """
+            Este método regresa la posición del nodo con el nombre dado, o None si no existe
+        """
+        if self.__indices is None:
+            self.__indices = {nombre: i for i, nombre in enumerate(self.nombres)}
+        return self.__indices.get(nombre)
+
+    def Id(self, k):
+        """
+            Este método regresa el Id del arco k, o None si el arco no tiene Id
+        """
+        return self.__valores("ids", (k,))[0]
+
+    def ids(self):
+        """
+            Este método regresa la lista de los Ids de todos los arcos
+        """
+        return self.__valores("ids", range(self.num_arcos))
+
+    def salientes(self, i):
+        """
+            Este método regresa el rango de índices de los arcos salientes del nodo i
+        """
+        return range(self.offsets[i], self.offsets[i + 1])
+
+    def entrantes(self, i):
+        """
+            Este método regresa los índices de los arcos entrantes del nodo i. La tabla de
+            entrantes se construye la primera vez que se pide.
+        """
+        if self.__offsets_entrada is None:
+            self.__offsets_entrada, self.__arcos_entrada = tabla_entrantes(self.cabezas, self.num_nodos)
+        return self.__arcos_entrada[self.__offsets_entrada[i]:self.__offsets_entrada[i + 1]]
+
+    def grado(self, i):
+        """
+            Este método regresa el número de arcos salientes del nodo i
+        """
+        return int(self.offsets[i + 1] - self.offsets[i])
+
+    def cerrar(self):
+        """
+            Este método suelta el mapeo del archivo. Si todavía hay arreglos obtenidos de
+            este objeto en uso, el mapeo se cierra cuando se liberan.
+        """
+        self.offsets = self.cabezas = self.pesos = self.capacidades = self.costos = None
+        self.flujos = self.res_min = self.res_min_nodos = self.res_max_nodos = self.oferta_demanda = None
+        self.__colas = self.__offsets_entrada = self.__arcos_entrada = None
+        try:
+            self.__mapa.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def __valores(self, tabla, indices):
+        """
+            Este método decodifica los nombres o Ids con los índices dados y les regresa su tipo.
+            En la versión 1 del formato todos los nombres son cadenas.
+        """
+        textos = self.__cadenas(tabla, indices)
+        if "tipos_" + tabla not in self.__secciones:
+            return textos
+        tipos = self.__arreglo("tipos_" + tabla)
+        if len(indices) > 1:
+            tipos = tipos.tolist()
+        return [_decodificar_id(tipos[i], texto) for i, texto in zip(indices, textos)]
+
+    def __cadenas(self, tabla, indices):
+        """
+            Este método decodifica las cadenas de una tabla (nombres o Ids) con los índices dados
+        """
+        offsets = self.__arreglo("offsets_" + tabla)
+        if len(indices) > 1:
+            offsets = offsets.tolist()
+        inicio = self.__secciones[tabla][2]
+        datos = self.__mapa
+        return [datos[inicio + offsets[i]:inicio + offsets[i + 1]].decode("utf-8") for i in indices]
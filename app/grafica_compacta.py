@@ -0,0 +1,140 @@
+import math
+import numpy as np
+
+class GraficaCompacta:
+    """
+        Esta clase representa una copia congelada de una Grafica, Digrafica o Red en formato
+        CSR (compressed sparse row). Los arcos salientes del nodo i son los que están entre
+        offsets[i] y offsets[i+1]; cada arco guarda su destino, peso, capacidad, costo,
+        flujo y restricción mínima en arreglos de NumPy.
+
+        Los arcos se guardan en el mismo orden en el que aparecen en la estructura original,
+        por lo que los algoritmos que recorren la copia compacta eligen los mismos arcos que
+        los que recorren los diccionarios. Los objetos originales (Nodo, Arista, Arco) se
+        conservan en las listas nodos y arcos para poder regresar los resultados.
+    """
+    def __init__(self, nodos, salientes, dirigida=True):
+        """
+            Este método construye la copia compacta
+            Parámetros
+            ----------
+            nodos: Lista de los objetos nodo de la estructura original
+            salientes: Lista (alineada con nodos) de las listas de arcos salientes de cada nodo
+            dirigida: False si cada arista aparece en ambos sentidos (Grafica)
+        """
+        self.dirigida = dirigida
+        self.nodos = list(nodos)
+        self.nombres = [nodo.nombre for nodo in self.nodos]
+        # Índice nombre -> posición del nodo en los arreglos
+        self.indices = {nombre: i for i, nombre in enumerate(self.nombres)}
+        posicion = {nodo: i for i, nodo in enumerate(self.nodos)}
+
+        self.arcos = []
+        offsets = [0]
+        colas = []
+        cabezas = []
+        for i, lista in enumerate(salientes):
+            for arco in lista:
+                self.arcos.append(arco)
+                colas.append(i)
+                cabezas.append(posicion[arco.destino])
+            offsets.append(len(self.arcos))
+
+        self.num_nodos = len(self.nodos)
+        self.num_arcos = len(self.arcos)
+        self.ids_nodos = np.arange(self.num_nodos, dtype=np.int64)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.colas = np.array(colas, dtype=np.int64)
+        self.cabezas = np.array(cabezas, dtype=np.int64)
+        self.pesos = self.__atributo("peso")
+        self.capacidades = self.__atributo("capacidad")
+        self.costos = self.__atributo("costo")
+        self.flujos = self.__atributo("flujo")
+        self.res_min = self.__atributo("res_min")
+
+        # La copia es de sólo lectura; los algoritmos que necesitan modificar flujos
+        # trabajan sobre una copia de los arreglos
+        for arreglo in (self.ids_nodos, self.offsets, self.colas, self.cabezas, self.pesos,
+                        self.capacidades, self.costos, self.flujos, self.res_min):
+            arreglo.flags.writeable = False
+
+        self.__offsets_entrada = None
+        self.__arcos_entrada = None
+
+    def __atributo(self, nombre):
+        """
+            Este método construye el arreglo de un atributo numérico de los arcos. Los
+            arcos que no tienen el atributo (o lo tienen en None) se guardan como NaN.
+        """
+        valores = (getattr(arco, nombre, None) for arco in self.arcos)
+        return np.fromiter((math.nan if valor is None else float(valor) for valor in valores),
+                           dtype=np.float64, count=self.num_arcos)
+
+    def indice(self, nombre):
+        """
+            Este método regresa la posición del nodo con el nombre dado, o None si no existe
+        """
+        return self.indices.get(nombre)
+
+    def salientes(self, i):
+        """
+            Este método regresa el rango de índices de los arcos salientes del nodo i
+        """
+        return range(self.offsets[i], self.offsets[i + 1])
+
+    def entrantes(self, i):
+        """
+            Este método regresa los índices de los arcos entrantes del nodo i. La tabla de
+            entrantes (el CSR de la gráfica transpuesta) se construye la primera vez que se pide.
+        """
+        if self.__offsets_entrada is None:
+            self.__offsets_entrada, self.__arcos_entrada = tabla_entrantes(self.cabezas, self.num_nodos)
+        return self.__arcos_entrada[self.__offsets_entrada[i]:self.__offsets_entrada[i + 1]]
+
+    def grado(self, i):
+        """
+            Este método regresa el número de arcos salientes del nodo i
+        """
+        return int(self.offsets[i + 1] - self.offsets[i])
+
+    def objetos_nodos(self, indices):
+        """
+            Este método convierte una lista de índices de nodos en los objetos Nodo originales
+        """
+        return [self.nodos[i] for i in indices]
+
+    def objetos_arcos(self, indices):
+        """
+            Este método convierte una lista de índices de arcos en los objetos Arista/Arco
+            originales, que son los que esperan las páginas de Dash
+        """
+        return [self.arcos[i] for i in indices]
+
+    def escribir_flujos(self, flujos):
+        """
+            Este método copia un arreglo de flujos (alineado con los arcos) a los objetos Arco
+            originales
+        """
+        for arco, flujo in zip(self.arcos, flujos):
+            arco.flujo = float(flujo)
+
+def tabla_entrantes(cabezas, num_nodos):
+    """
+        Esta función construye la tabla de arcos entrantes (el CSR de la gráfica transpuesta)
+        a partir de los destinos de los arcos
+        Parámetros
+        ----------
+        cabezas: Arreglo con el índice del nodo destino de cada arco
+        num_nodos: Número de nodos
+        Regresa
+        -------
+        offsets: Los arcos que entran al nodo i están en arcos[offsets[i]:offsets[i+1]]
+        arcos: Índices de los arcos, agrupados por destino y en su orden original
+    """
+    arcos = np.argsort(cabezas, kind="stable")
+    conteo = np.bincount(cabezas, minlength=num_nodos)
+    offsets = np.zeros(num_nodos + 1, dtype=np.int64)
+    np.cumsum(conteo, out=offsets[1:])
+    arcos.flags.writeable = False
+    offsets.flags.writeable = False
+    return offsets, arcos
@@ -1,4 +1,4 @@
-import dash  # pip install dash
+import dash  # pip install dash==2.9 or higher (for dash.Patch)
 import dash_cytoscape as cyto  # pip install dash-cytoscape==0.2.0 or higher
 import dash_html_components as html
 import dash_core_components as dcc
@@ -11,9 +11,18 @@ from grafica import *
 import base64
 import digraph
 import uuid
+import copy
+from elementos_cytoscape import copia_para_resultados, componentes_a_json, parchar_elementos, parchar_lista, llave_fila, decodificar_archivo, elementos_grafica, ArchivoInvalido, LIMITE_ARCHIVO
+from almacen_sesiones import AlmacenSesiones, directorio_sesiones
 
 from main import app
 
+# ----- Server-side store with the graph of each session -----
+# The elements, the degrees table and the copy of the elements without results stay in the server,
+# so the browser only sends and receives the id of its session instead of the whole graph
+graph_store = AlmacenSesiones(lambda: {'elements': {'nodes': [], 'edges': []}, 'table': [], 'copy': None},
+                              directorio=directorio_sesiones("graph"))
+
 
 # ----- Dropdown menu for data structure selection -----
 data_structures = ['Graph', "Directed Graph"]
@@ -196,7 +205,7 @@ layout = html.Div(children=[
         id='nodes-info', data=[['a', 1]] # The first element is the first node name that we will use
     ),
     dcc.Store(
-        id='graph-copy', data=None
+        id='graph-session', data=None # Id of the session in the server-side store and revision of the elements
     ),
     
 
@@ -255,7 +264,7 @@ layout = html.Div(children=[
             dbc.Row([
                 dcc.Upload([
                     dbc.Button("Upload graph from file", className="mr-1", color="success"),
-                ], id="upload-graph-obj")
+                ], id="upload-graph-obj", max_size=LIMITE_ARCHIVO)
                 
             ], justify="center")
         ], md=6),
@@ -368,7 +377,7 @@ layout = html.Div(children=[
      Output("number-of-edges-label", "children"), Output('nodes-info', 'data'), 
      Output('upload-graph-obj', 'contents'), 
      Output('result-text', 'children'), Output('result-div', 'style'),
-     Output('graph-copy', 'data')],
+     Output('graph-session', 'data')],
 
     [Input("add-node-btn", "n_clicks"), Input("done-btn-edit-nodes-modal", "n_clicks"),
      Input("remove-nodes-btn", "n_clicks"), Input("edit-nodes-btn", "n_clicks"),
@@ -377,14 +386,63 @@ layout = html.Div(children=[
      Input('upload-graph-obj', 'contents'), Input('run-algorithm-btn', 'n_clicks'),
      Input('clear-result-btn', 'n_clicks')],
     
-    [State("graph", "elements"), State("nodes-degrees-table", "children"), 
-     State("number-of-nodes-label", "children"), State("edit-nodes-modal-body", "children"), 
+    [State("number-of-nodes-label", "children"), State("edit-nodes-modal-body", "children"), 
      State("graph", "selectedNodeData"), State("number-of-edges-label", "children"), 
      State("edit-edges-modal-body", "children"), State("graph", "selectedEdgeData"), 
      State('nodes-info', 'data'), State('select-algorithm-dropown', 'value'),
-     State('result-text', 'children'), State('result-div', 'style'), State('graph-copy', 'data')]
+     State('result-text', 'children'), State('result-div', 'style'), State('graph-session', 'data')]
 )
 def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
+    add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
+    run_algorithm_btn, clear_result_btn, number_of_nodes, edit_nodes_modal_body_childrens, selected_node_data, 
+    number_of_edges, edit_edges_modal_body_childrens, selected_edge_data, nodes_info, select_algorithm_dropdown, 
+    result_text_children, result_div_style, session_data):
+    if not dash.callback_context.triggered:
+        return dash.no_update
+
+    # The Store keeps the Id of the session and the revision of the elements the browser has
+    if not isinstance(session_data, dict):
+        session_data = {}
+
+    # Load a fresh copy of the graph of this session from the server-side store. Callbacks of the
+    # same session wait for each other, and nothing is kept unless the callback gets to guardar
+    with graph_store.abrir(session_data.get('id')) as (session_id, session):
+        # The callback changes the elements and the table in place, so keep what the browser has now
+        previous_elements, previous_table = copy.deepcopy((session['elements'], session['table']))
+        outputs = updateGraphElements(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
+            add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
+            run_algorithm_btn, clear_result_btn, session['elements'], session['table'], number_of_nodes, 
+            edit_nodes_modal_body_childrens, selected_node_data, number_of_edges, edit_edges_modal_body_childrens, 
+            selected_edge_data, nodes_info, select_algorithm_dropdown, result_text_children, result_div_style, session['copy'])
+        if outputs is dash.no_update:
+            return dash.no_update
+
+        # Save the new graph; the copy of the elements without results never leaves the server
+        graph_elements, nodes_degrees_table_children, *other_outputs, graph_copy = outputs
+        nodes_degrees_table = componentes_a_json(nodes_degrees_table_children)
+        # The browser has the stored elements only if it got the response that saved them
+        synced = 'revision' in session and session['revision'] == session_data.get('revision')
+        session['elements'] = graph_elements
+        session['table'] = nodes_degrees_table
+        session['copy'] = graph_copy
+        session['revision'] = session.get('revision', 0) + 1
+        graph_store.guardar(session_id, session)
+
+    # Send only the changes to the elements and the degree table. Everything is sent when the browser
+    # doesn't have the stored elements (a new session, one the store no longer had, or a response
+    # the browser dropped because a newer one was on its way)
+    if synced:
+        elements_output, table_output = dash.Patch(), dash.Patch()
+        if not parchar_elementos(elements_output, previous_elements, graph_elements):
+            elements_output = dash.no_update
+        if not parchar_lista(table_output, previous_table, nodes_degrees_table, llave_fila):
+            table_output = dash.no_update
+    else:
+        elements_output, table_output = graph_elements, nodes_degrees_table
+
+    return [elements_output, table_output, *other_outputs, {'id': session_id, 'revision': session['revision']}]
+
+def updateGraphElements(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
     add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
     run_algorithm_btn, clear_result_btn, graph_elements, nodes_degrees_table_children, number_of_nodes, 
     edit_nodes_modal_body_childrens, selected_node_data, number_of_edges, edit_edges_modal_body_childrens, 
@@ -400,7 +458,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ----- Add node case -----
         if btn_triggered == "add-node-btn":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             # Getting an unique initial name
             while True:
@@ -458,7 +516,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ----- Edit nodes case -----
         elif btn_triggered == "done-btn-edit-nodes-modal":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             for children in edit_nodes_modal_body_childrens:
                 # Getting the new label
@@ -521,7 +579,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ---- Edit nodes button alert handle -----
         elif btn_triggered == "edit-nodes-btn":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if not selected_node_data:
@@ -531,7 +589,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ----- Remove nodes case ------
         elif btn_triggered == "remove-nodes-btn":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if selected_node_data:
@@ -577,7 +635,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ----- Add Edge case -----
         elif btn_triggered == "add-edge-btn":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             # When no node is selected
@@ -646,7 +704,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ----- Edit edges case -----
         elif btn_triggered == "done-btn-edit-edges-modal":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             for c in edit_edges_modal_body_childrens:
                 # Getting the info of the edges
@@ -686,7 +744,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ---- Edit edges button alert handle -----
         elif btn_triggered == "edit-edges-btn":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if not selected_edge_data:
@@ -698,7 +756,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ----- Remove edges case -----
         elif btn_triggered == "remove-edges-btn":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if not selected_edge_data:
@@ -736,130 +794,25 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
     
         # ----- Upload Graph Case -----
         elif btn_triggered == 'upload-graph-obj':
-            # Read the file and convert it to list of elements
-            content_type, content_string = upload_graph_contents.split(',')
-            graph = [x.replace(" ", "").split(",") for x in base64.b64decode(content_string).decode('ascii').strip().split("\n") if x] 
-            print(graph)
-
+            # Read the file (plain or gzip-compressed text) and build the elements in a single pass
             alert = None
-            # Validate the data format
-            for element in graph:
-                # Just accept edges (a,b) or single nodes (a)
-                if len(element) > 3:
-                    alert = 7
-                    break
-                # validate if  weight is a number in case the element is an edge
-                if len(element) == 3:
-                    try:
-                        float(element[2])
-                    except:
-                        alert = 7
-                        break
+            try:
+                new_nodes, new_edges, nodes_degrees = elementos_grafica(decodificar_archivo(upload_graph_contents))
+            except ArchivoInvalido as error:
+                # The file is too large, or it doesn't have the expected format
+                alert = 9 if error.motivo == "tamano" else 7
 
-            
             # If file format is ok, then we proceed to create the graph in the interface
             if not alert:
-                # Resetting all variables
-                new_nodes = []
-                new_edges = []
-                number_of_edges = 0
-                number_of_nodes = 0
-                data_info = ['a', 1]
-
-                # To store nodes degrees and then create the table
-                nodes_degrees = {}
-
-                # Check if the elements are nodes or edges and add it to UI and data structure
-                for element in graph:
-                    element_splitted = element
-                    # When it's a single node
-                    if len(element_splitted) == 1:
-                        # Check if node name is already in use
-                        for node in new_nodes:
-                            if element_splitted[0] == node['data']['label']:
-                                continue
-                        
-                        # If node doesn't exist, then add it to the new nodes
-                        node = {'data': {'id': str(uuid.uuid1()), 'label': element_splitted[0]},
-                                         'position': {'x':random.uniform(0,500),'y':random.uniform(0,500)},
-                                         'classes':'node'}
-                        new_nodes.append(node)
-
-                        # Adding the node to the degrees dict
-                        nodes_degrees[element_splitted[0]] = 0
-                        number_of_nodes += 1
-
-                    # When it's an edge
-                    else:
-                        # To store nodes ids
-                        node1_id = None
-                        node2_id = None
-
-                        # Check if node1 name is already in use
-                        node_already_exists = False
-                        for node in new_nodes:
-                            if node['data']['label'] == element_splitted[0]:
-                                node_already_exists = True
-                                node1_id = node['data']['id']
-                                break
-                        
-                        # If node 1 doesn't exists, then add it to the new nodes
-                        if not node_already_exists:
-                            node1_id = str(uuid.uuid1())
-                            node = {'data': {'id': node1_id, 'label': element_splitted[0]},
-                                    'position': {'x':random.uniform(0,500),'y':random.uniform(0,500)},
-                                    'classes':'node'}
-                            new_nodes.append(node)
-                            number_of_nodes += 1
-
-                            # Adding it to the degrees dict
-                            nodes_degrees[element_splitted[0]] = 0
-                        
-                        # Check if node2 name is already in use
-                        node_already_exists = False
-                        for node in new_nodes:
-                            if node['data']['label'] == element_splitted[1]:
-                                node_already_exists = True
-                                node2_id = node['data']['id']
-                                break
-                        
-                        # If node 1 doesn't exists, then add it to the new nodes
-                        if not node_already_exists:
-                            node2_id = str(uuid.uuid1())
-                            node = {'data': {'id': node2_id, 'label': element_splitted[1]},
-                                    'position': {'x':random.uniform(0,500),'y':random.uniform(0,500)},
-                                    'classes':'node'}
-                            new_nodes.append(node)
-                            number_of_nodes += 1
-
-                            # Adding it to the degrees dict
-                            nodes_degrees[element_splitted[1]] = 0
-                        
-                        # After nodes managing, add the edge between them
-                        edge_id = str(uuid.uuid1())
-                        try:
-                            weight = element_splitted[2]
-                        except:
-                            weight = 0
-
-                        edge = {'data': { 'source': node1_id, 
-                                'target': node2_id, 'weight': weight, 'id':edge_id, 
-                                'source_node':element_splitted[0], 'target_node':element_splitted[1]},
-                                'classes':'edge'}
-                        new_edges.append(edge)
-                        number_of_edges += 1
-
-                        # Update the edge nodes degrees
-                        nodes_degrees[element_splitted[0]] += 1
-                        nodes_degrees[element_splitted[1]] += 1
-                
                 # Updating the graph elements
                 graph_elements['nodes'] = new_nodes
                 graph_elements['edges'] = new_edges
+                number_of_nodes = len(new_nodes)
+                number_of_edges = len(new_edges)
 
                 # Creating the table
                 nodes_degrees_table_children = []
-                for node in nodes_degrees .items():   
+                for node in nodes_degrees.items():   
                     nodes_degrees_table_children.append(html.Tr(
                         [
                             html.Td(node[0], style={"text-align":"center"}), 
@@ -870,12 +823,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
             upload_graph_contents = ""
 
             print("READ GRAPH CASE")
-            print("Nodes")
-            for n in graph_elements['nodes']:
-                print(n)
-            print("\n\nEdges")
-            for e in graph_elements['edges']:
-                print(e)
+            print(len(graph_elements['nodes']), "nodes,", len(graph_elements['edges']), "edges")
             print("------------------------------\n")
 
             return graph_elements, nodes_degrees_table_children, number_of_nodes, alert, number_of_edges, nodes_info, "",result_text_children, result_div_style, None
@@ -884,9 +832,11 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         # ************** RUN ALGORITHMS LOGIC *******************
         elif btn_triggered == 'run-algorithm-btn':
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
 
-            graph_elements_copy = copy.deepcopy(graph_elements)
+            # The original elements are kept to clear the result later; only the copy is painted
+            graph_elements_copy = graph_elements
+            graph_elements = copia_para_resultados(graph_elements)
             alert = None
             if len(graph_elements['nodes']) == 0 and len(graph_elements['edges']) == 0:
                 alert = 8
@@ -894,15 +844,13 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
             if not alert:    
                 result_div_style = {'display':''}
 
-                # Creat a Grafica object
-                g = Grafica()
-                # Adding all nodes
-                for node in graph_elements['nodes']:
-                    g.agregar_nodo(node['data']['label'])
-                # Adding all edges
-                for edge in graph_elements['edges']:
-                    g.agregar_arista(edge['data']['source_node'], edge['data']['target_node'],
-                                    edge['data']['id'], edge['data']['weight'])
+                # Creat a Grafica object with all nodes and edges in a single pass
+                edges = [edge['data'] for edge in graph_elements['edges']]
+                g = Grafica.desde_arreglos([edge['source_node'] for edge in edges],
+                                           [edge['target_node'] for edge in edges],
+                                           pesos=[edge['weight'] for edge in edges],
+                                           ids=[edge['id'] for edge in edges],
+                                           nodos=[node['data']['label'] for node in graph_elements['nodes']])
                 
                 # ----- ALGORITHM TO RUN -----
                 # Check if the graph is bipartite
@@ -1106,7 +1054,7 @@ def updateGraph(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_b
         elif btn_triggered == 'clear-result-btn':
             alert = None
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             result_text_children = []
             result_div_style = {'display':'None'}
@@ -1236,4 +1184,7 @@ def manageAlert(alert_info):
     elif alert_info == 8:
         text = "Error. No graph. Please, create or upload a graph and try again"
         show = True
+    elif alert_info == 9:
+        text = "Error. The file is too large. Please, upload a smaller (or gzip-compressed) file"
+        show = True
     return text, show
\ No newline at end of file
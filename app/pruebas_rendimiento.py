@@ -0,0 +1,533 @@
+import contextlib
+import io
+import math
+import random
+import sys
+import time
+from digrafica import *
+from grafica import *
+from red import *
+from estructuras_datos import Cola, Etiquetas, UnionBusqueda
+
+# Pruebas de rendimiento de los algoritmos. Cada prueba genera gráficas aleatorias
+# parecidas a una red de carreteras (una malla con algunos atajos) y compara los
+# tiempos de la implementación actual contra la versión anterior del algoritmo.
+
+def generar_malla(lado, atajos=0, semilla=0):
+    """
+        Este método genera los arcos de una malla de lado x lado nodos con pesos aleatorios,
+        más algunos atajos entre nodos elegidos al azar.
+        Regresa
+        -------
+        Lista de tuplas (origen, destino, peso)
+    """
+    aleatorio = random.Random(semilla)
+    arcos = []
+    for i in range(lado):
+        for j in range(lado):
+            nodo = i * lado + j
+            if j + 1 < lado:
+                arcos.append((nodo, nodo + 1, aleatorio.randint(1, 100)))
+                arcos.append((nodo + 1, nodo, aleatorio.randint(1, 100)))
+            if i + 1 < lado:
+                arcos.append((nodo, nodo + lado, aleatorio.randint(1, 100)))
+                arcos.append((nodo + lado, nodo, aleatorio.randint(1, 100)))
+    for _ in range(atajos):
+        arcos.append((aleatorio.randrange(lado * lado), aleatorio.randrange(lado * lado), aleatorio.randint(50, 500)))
+    return arcos
+
+def dijkstra_lista(adyacencia, inicial):
+    """
+        Versión anterior de Dijkstra: el siguiente nodo se elige con min() sobre la lista de
+        nodos marcados temporalmente, lo que cuesta O(n) por iteración.
+    """
+    longitudes = {inicial: 0}
+    definitivos = set()
+    X = [inicial]
+    while X:
+        x = min(X, key=lambda nodo: longitudes[nodo])
+        X.remove(x)
+        definitivos.add(x)
+        for v, peso in adyacencia.get(x, []):
+            if v in definitivos:
+                continue
+            if v not in longitudes:
+                longitudes[v] = longitudes[x] + peso
+                X.append(v)
+            elif longitudes[x] + peso < longitudes[v]:
+                longitudes[v] = longitudes[x] + peso
+    return longitudes
+
+def floyd_listas(nodos, arcos):
+    """
+        Versión anterior de Floyd-Warshall: triple ciclo de Python sobre una matriz de listas.
+    """
+    posicion = {nodo: i for i, nodo in enumerate(nodos)}
+    n = len(nodos)
+    matriz = [[0 if i == j else math.inf for j in range(n)] for i in range(n)]
+    for origen, destino, peso in arcos:
+        i, j = posicion[origen], posicion[destino]
+        if i != j and peso < matriz[i][j]:
+            matriz[i][j] = peso
+    for k in range(n):
+        for i in range(n):
+            for j in range(n):
+                if matriz[i][k] + matriz[k][j] < matriz[i][j]:
+                    matriz[i][j] = matriz[i][k] + matriz[k][j]
+    return matriz
+
+def union_busqueda_lista(n, pares):
+    """
+        Versión anterior de unión-búsqueda: la búsqueda sigue a los padres sin comprimir el
+        camino y la unión cuelga siempre la raíz del primer elemento de la del segundo.
+        Regresa
+        -------
+        Número de uniones que juntaron conjuntos distintos
+    """
+    padre = list(range(n))
+    def busqueda(v):
+        while v != padre[v]:
+            v = padre[v]
+        return v
+    uniones = 0
+    for u, v in pares:
+        raiz_u, raiz_v = busqueda(u), busqueda(v)
+        if raiz_u != raiz_v:
+            padre[raiz_u] = raiz_v
+            uniones += 1
+    return uniones
+
+def adyacencia_aleatoria(n, grado=4, semilla=0):
+    """
+        Este método genera listas de adyacencia de una gráfica aleatoria con n nodos y unas
+        n * grado / 2 aristas, unida por un camino para que sea conexa
+    """
+    aleatorio = random.Random(semilla)
+    adyacencia = [[] for _ in range(n)]
+    for u in range(1, n):
+        v = aleatorio.randrange(u)
+        adyacencia[u].append(v)
+        adyacencia[v].append(u)
+    for _ in range(n * (grado - 2) // 2):
+        u, v = aleatorio.randrange(n), aleatorio.randrange(n)
+        adyacencia[u].append(v)
+        adyacencia[v].append(u)
+    return adyacencia
+
+def bfs_lista(adyacencia, inicial):
+    """
+        Versión anterior de la búsqueda a lo ancho: la cola es una lista y cada desencolado
+        recorre toda la lista con pop(0)
+        Regresa
+        -------
+        Orden en el que se visitan los nodos
+    """
+    visitados = [False] * len(adyacencia)
+    visitados[inicial] = True
+    cola = [inicial]
+    orden = []
+    while cola:
+        u = cola.pop(0)
+        orden.append(u)
+        for v in adyacencia[u]:
+            if not visitados[v]:
+                visitados[v] = True
+                cola.append(v)
+    return orden
+
+def bfs_cola(adyacencia, inicial):
+    """
+        Búsqueda a lo ancho con la Cola de estructuras_datos
+        Regresa
+        -------
+        Orden en el que se visitan los nodos
+    """
+    visitados = [False] * len(adyacencia)
+    visitados[inicial] = True
+    cola = Cola()
+    cola.encolar(inicial)
+    orden = []
+    while not cola.es_vacia():
+        u = cola.desencolar()
+        orden.append(u)
+        for v in adyacencia[u]:
+            if not visitados[v]:
+                visitados[v] = True
+                cola.encolar(v)
+    return orden
+
+def cronometrar(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return time.perf_counter() - inicio, resultado
+
+def prueba_dijkstra(lados=(20, 40, 80, 160)):
+    print("Dijkstra (Digrafica)")
+    print(f"{'nodos':>8} {'arcos':>8} {'lista (s)':>10} {'montículo (s)':>14} {'aceleración':>12}")
+    for lado in lados:
+        arcos = generar_malla(lado, atajos=lado * 2)
+        d = Digrafica()
+        adyacencia = {}
+        for origen, destino, peso in arcos:
+            d.agregar_arco(origen, destino, peso=peso)
+            adyacencia.setdefault(origen, []).append((destino, peso))
+
+        tiempo_lista, longitudes = cronometrar(dijkstra_lista, adyacencia, 0)
+        etiquetas = Etiquetas()
+        tiempo_monticulo, arborescencia = cronometrar(d.dijkstra, 0, None, etiquetas)
+        # Ambas versiones deben encontrar las mismas longitudes
+        for arco in arborescencia:
+            assert etiquetas[arco.destino]["longitud_ruta"] == longitudes[arco.destino.nombre]
+        print(f"{d.obtener_numero_nodos():>8} {d.obtener_numero_arcos():>8} {tiempo_lista:>10.4f} {tiempo_monticulo:>14.4f} {tiempo_lista / tiempo_monticulo:>11.1f}x")
+    print()
+
+def prueba_dijkstra_grafica(lados=(20, 40, 80, 160)):
+    print("Dijkstra (Grafica)")
+    print(f"{'nodos':>8} {'aristas':>8} {'montículo (s)':>14}")
+    for lado in lados:
+        g = Grafica()
+        for origen, destino, peso in generar_malla(lado):
+            if origen < destino:
+                g.agregar_arista(origen, destino, peso=peso)
+        tiempo, Y = cronometrar(g.dijkstra, 0)
+        assert len(Y) == lado * lado
+        print(f"{lado * lado:>8} {g.obtener_numero_aristas():>8} {tiempo:>14.4f}")
+    print()
+
+def prueba_floyd(lados=(8, 12, 16, 32), lado_maximo_listas=16):
+    print("Floyd-Warshall (Digrafica)")
+    print(f"{'nodos':>8} {'arcos':>8} {'listas (s)':>11} {'NumPy (s)':>10} {'aceleración':>12}")
+    for lado in lados:
+        arcos = generar_malla(lado, atajos=lado * 2)
+        d = Digrafica()
+        for origen, destino, peso in arcos:
+            d.agregar_arco(origen, destino, peso=peso)
+
+        tiempo_numpy, (_, matriz) = cronometrar(d.floyd, 0)
+        # La versión con listas sólo se mide en las digráficas pequeñas porque tarda O(n³) en Python
+        if lado <= lado_maximo_listas:
+            nodos = list(range(lado * lado))
+            tiempo_listas, distancias = cronometrar(floyd_listas, nodos, arcos)
+            for i in range(len(nodos)):
+                for j in range(len(nodos)):
+                    assert matriz[i][j][1] == distancias[i][j]
+            columna = f"{tiempo_listas:>11.4f} {tiempo_numpy:>10.4f} {tiempo_listas / tiempo_numpy:>11.1f}x"
+        else:
+            columna = f"{'-':>11} {tiempo_numpy:>10.4f} {'-':>12}"
+        print(f"{d.obtener_numero_nodos():>8} {d.obtener_numero_arcos():>8} {columna}")
+    print()
+
+def prueba_simplex(lados=(10, 30, 70, 100), semilla=0):
+    print("Método simplex (Red)")
+    print(f"{'nodos':>8} {'arcos':>8} {'simplex (s)':>12} {'costo':>12}")
+    for lado in lados:
+        aleatorio = random.Random(semilla)
+        r = Red()
+        for origen, destino, costo in generar_malla(lado, atajos=lado * 2):
+            r.agregar_arco(origen, destino, 0, 0, aleatorio.randint(20, 60), costo)
+        # Algunos nodos de la malla envían flujo a otros nodos elegidos al azar
+        for _ in range(lado):
+            origen, destino = aleatorio.sample(range(lado * lado), 2)
+            cantidad = aleatorio.randint(1, 10)
+            r.buscar_nodo(origen).oferta_demanda += cantidad
+            r.buscar_nodo(destino).oferta_demanda -= cantidad
+
+        tiempo, costo = cronometrar(r.metodo_simplex)
+        print(f"{r.obtener_numero_nodos():>8} {r.obtener_numero_arcos():>8} {tiempo:>12.4f} {costo:>12}")
+    print()
+
+def prueba_simplex_cuello(cantidades=(10, 100, 1000)):
+    print("Método simplex con un arco sin capacidad como cuello de botella (Red)")
+    print(f"{'nodos':>8} {'arcos':>8} {'simplex (s)':>12} {'costo':>12}")
+    for cantidad in cantidades:
+        # Todas las ofertas (de 1 unidad cada una) pasan por el arco h -> k, que no tiene
+        # capacidad; su flujo es la oferta total, mucho mayor que la oferta más grande
+        r = Red()
+        for i in range(cantidad):
+            r.agregar_nodo(f"o{i}", 0, math.inf, 1)
+            r.agregar_nodo(f"d{i}", 0, math.inf, -1)
+            r.agregar_arco(f"o{i}", "h", 0, 0, math.inf, 0)
+            r.agregar_arco("k", f"d{i}", 0, 0, math.inf, 0)
+        r.agregar_arco("h", "k", 0, 0, math.inf, 0)
+
+        tiempo, costo = cronometrar(r.metodo_simplex)
+        cuello = next(arco for arco in r.arcos() if arco.origen.nombre == "h" and arco.destino.nombre == "k")
+        assert costo == 0 and cuello.flujo == cantidad
+        print(f"{r.obtener_numero_nodos():>8} {r.obtener_numero_arcos():>8} {tiempo:>12.4f} {costo:>12}")
+    print()
+
+def red_malla(lado, semilla=0):
+    """
+        Este método genera una red de transporte sobre una malla, con costos aleatorios
+    """
+    aleatorio = random.Random(semilla)
+    r = Red()
+    for origen, destino, costo in generar_malla(lado, atajos=lado * 2, semilla=semilla):
+        r.agregar_arco(origen, destino, 0, 0, aleatorio.randint(5, 20), costo)
+    return r
+
+def prueba_flujo_costo_minimo(lados=(4, 6, 8, 30, 70), lado_maximo_primal=8):
+    print("Flujo de costo mínimo (Red)")
+    print(f"{'nodos':>8} {'arcos':>8} {'primal (s)':>11} {'rutas sucesivas (s)':>20} {'costo':>10}")
+    for lado in lados:
+        fuentes, sumideros = [0], [lado * lado - 1]
+        limite_flujo = 10
+
+        r = red_malla(lado)
+        tiempo, costo = cronometrar(r.flujo_costo_minimo, fuentes, sumideros, limite_flujo)
+        # El algoritmo primal sólo se mide en las redes pequeñas porque imprime la red y
+        # cancela los ciclos negativos uno por uno
+        if lado <= lado_maximo_primal:
+            r = red_malla(lado)
+            with contextlib.redirect_stdout(io.StringIO()):
+                tiempo_primal, costo_primal = cronometrar(r.algoritmo_primal, fuentes, sumideros, limite_flujo)
+            assert costo_primal == costo
+            columna = f"{tiempo_primal:>11.4f}"
+        else:
+            columna = f"{'-':>11}"
+        print(f"{r.obtener_numero_nodos():>8} {r.obtener_numero_arcos():>8} {columna} {tiempo:>20.4f} {costo:>10}")
+    print()
+
+def prueba_flujo_maximo(lados=(6, 10, 20, 40, 70), lado_maximo_fulkerson=10):
+    print("Flujo máximo (Red)")
+    print(f"{'nodos':>8} {'arcos':>8} {'fulkerson (s)':>14} {'dinic (s)':>10} {'empuje (s)':>11} {'flujo':>8}")
+    for lado in lados:
+        fuentes, sumideros = [0, lado - 1], [lado * lado - 1, lado * (lado - 1)]
+        tiempos = []
+        flujos = set()
+        for algoritmo, ancho in (("fulkerson", 14), ("dinic", 10), ("empuje_reetiquetado", 11)):
+            # Ford-Fulkerson sólo se mide en las redes pequeñas porque su búsqueda es recursiva
+            if algoritmo == "fulkerson" and lado > lado_maximo_fulkerson:
+                tiempos.append(f"{'-':>{ancho}}")
+                continue
+            r = red_malla(lado)
+            with contextlib.redirect_stdout(io.StringIO()):
+                tiempo, flujo = cronometrar(r.flujo_maximo, fuentes, sumideros, None, None, algoritmo)
+            flujos.add(flujo)
+            tiempos.append(f"{tiempo:>{ancho}.4f}")
+        # Los tres algoritmos deben encontrar el mismo flujo máximo
+        assert len(flujos) == 1
+        print(f"{r.obtener_numero_nodos():>8} {r.obtener_numero_arcos():>8} {' '.join(tiempos)} {flujo:>8}")
+    print()
+
+def prueba_flujo_restricciones_minimas():
+    print("Flujo máximo con restricciones mínimas y límite de flujo (Red)")
+    print(f"{'límite':>8} {'fulkerson':>10} {'dinic':>10} {'empuje':>10} {'primal':>10} {'rutas sucesivas':>16}")
+    # El arco a -> b pide al menos 5 unidades, así que con un límite menor no hay flujo
+    # factible: los tres algoritmos deben regresar None sin cambiar los flujos de la red
+    for limite_flujo in (3, 7):
+        resultados = []
+        for algoritmo in ("fulkerson", "dinic", "empuje_reetiquetado", "primal", "rutas sucesivas"):
+            r = Red()
+            r.agregar_arco('a', 'b', 5, 0, 10, 1)
+            r.agregar_arco('b', 'c', 0, 0, 10, 1)
+            with contextlib.redirect_stdout(io.StringIO()):
+                if algoritmo == "primal":
+                    resultado = r.algoritmo_primal(['a'], ['c'], limite_flujo)
+                elif algoritmo == "rutas sucesivas":
+                    resultado = r.flujo_costo_minimo(['a'], ['c'], limite_flujo)
+                else:
+                    resultado = r.flujo_maximo(['a'], ['c'], limite_flujo, None, algoritmo)
+            flujos = [arco.flujo for arco in r.arcos()]
+            if resultado is None:
+                assert flujos == [0, 0]
+            else:
+                assert all(flujo == limite_flujo for flujo in flujos)
+            resultados.append(resultado)
+        # El flujo máximo es el límite y el costo es 2 por unidad
+        assert resultados == ([None] * 5 if limite_flujo < 5 else [limite_flujo] * 3 + [2 * limite_flujo] * 2)
+        print(f"{limite_flujo:>8} " + " ".join(f"{str(resultado):>{ancho}}" for resultado, ancho in zip(resultados, (10, 10, 10, 10, 16))))
+    print()
+
+def prueba_union_busqueda(tamanos=(1000, 5000, 20000, 1000000), tamano_maximo_lista=5000):
+    print("Unión-búsqueda")
+    print(f"{'elementos':>10} {'lista (s)':>10} {'rango (s)':>10}")
+    for n in tamanos:
+        # Caso adverso para la versión anterior: cada unión cuelga la cadena ya formada de
+        # un elemento nuevo, y luego se pregunta por el elemento más profundo
+        pares = [(i, i + 1) for i in range(n - 1)] + [(0, n - 1)] * n
+        tiempo, uniones = cronometrar(lambda: UnionBusqueda(range(n)).union_varios(pares))
+        if n <= tamano_maximo_lista:
+            tiempo_lista, uniones_lista = cronometrar(union_busqueda_lista, n, pares)
+            assert uniones_lista == uniones
+            columna = f"{tiempo_lista:>10.4f}"
+        else:
+            columna = f"{'-':>10}"
+        print(f"{n:>10} {columna} {tiempo:>10.4f}")
+    print()
+
+def prueba_cola(tamanos=(10000, 100000, 300000, 1000000), tamano_maximo_lista=300000):
+    print("Búsqueda a lo ancho (Cola)")
+    print(f"{'nodos':>10} {'lista (s)':>10} {'deque (s)':>10} {'µs por nodo':>12}")
+    for n in tamanos:
+        adyacencia = adyacencia_aleatoria(n)
+        tiempo, orden = cronometrar(bfs_cola, adyacencia, 0)
+        assert len(orden) == n
+        # Con la lista la cola llega a tener una fracción de todos los nodos, así que cada
+        # pop(0) cuesta O(n) y el recorrido O(n²); sólo se mide en las gráficas pequeñas
+        if n <= tamano_maximo_lista:
+            tiempo_lista, orden_lista = cronometrar(bfs_lista, adyacencia, 0)
+            assert orden_lista == orden
+            columna = f"{tiempo_lista:>10.4f}"
+        else:
+            columna = f"{'-':>10}"
+        # El tiempo por nodo de la versión con deque se mantiene casi constante
+        print(f"{n:>10} {columna} {tiempo:>10.4f} {tiempo / n * 1e6:>12.3f}")
+    print()
+
+def grafica_completa(n, semilla=0):
+    """
+        Este método genera una gráfica completa con pesos aleatorios
+    """
+    aleatorio = random.Random(semilla)
+    g = Grafica()
+    for u in range(n):
+        for v in range(u + 1, n):
+            g.agregar_arista(u, v, peso=aleatorio.randint(1, 100))
+    return g
+
+def prueba_prim(lados=(20, 40, 80), completas=(50, 100, 200, 400)):
+    print("Prim (Grafica)")
+    print(f"{'nodos':>8} {'aristas':>8} {'montículo (s)':>14} {'densa (s)':>10} {'más rápida':>11}")
+    graficas = []
+    for lado in lados:
+        g = Grafica()
+        for origen, destino, peso in generar_malla(lado, atajos=lado * 2):
+            if origen < destino:
+                g.agregar_arista(origen, destino, peso=peso)
+        graficas.append(g)
+    graficas += [grafica_completa(n) for n in completas]
+    for g in graficas:
+        tiempo_monticulo, bosque_monticulo = cronometrar(g.algoritmo_prim, "monticulo")
+        tiempo_denso, bosque_denso = cronometrar(g.algoritmo_prim, "densa")
+        # Ambas versiones deben escoger las mismas aristas
+        assert bosque_monticulo == bosque_denso
+        rapida = "densa" if tiempo_denso < tiempo_monticulo else "monticulo"
+        print(f"{g.obtener_numero_nodos():>8} {g.obtener_numero_aristas():>8} {tiempo_monticulo:>14.4f} {tiempo_denso:>10.4f} {rapida:>11}")
+    print()
+
+def prueba_paseo_euler(tamanos=(1000, 10000, 100000), semilla=0):
+    print("Paseo de Euler (Grafica)")
+    print(f"{'nodos':>8} {'aristas':>8} {'Hierholzer (s)':>15}")
+    for n in tamanos:
+        # Un ciclo con todos los nodos más aristas dobles al azar: todos los grados son pares
+        aleatorio = random.Random(semilla)
+        g = Grafica()
+        for u in range(n):
+            g.agregar_arista(u, (u + 1) % n)
+        for _ in range(n):
+            u, v = aleatorio.randrange(n), aleatorio.randrange(n)
+            g.agregar_arista(u, v)
+            g.agregar_arista(u, v)
+        tiempo, paseo = cronometrar(g.paseo_euler)
+        assert len(paseo) == g.obtener_numero_aristas() + 1 and paseo[0] == paseo[-1]
+        print(f"{g.obtener_numero_nodos():>8} {g.obtener_numero_aristas():>8} {tiempo:>15.4f}")
+    print()
+
+def prueba_busquedas(lados=(30, 100, 300)):
+    print("Búsquedas (Grafica)")
+    print(f"{'nodos':>8} {'aristas':>8} {'conexa (s)':>11} {'bipartita (s)':>14} {'profundidad (s)':>16} {'ancho (s)':>10} {'componentes (s)':>16}")
+    for lado in lados:
+        # Dos mallas separadas, para que haya más de una componente
+        g = Grafica()
+        for desplazamiento in (0, lado * lado):
+            for origen, destino, peso in generar_malla(lado):
+                if origen < destino:
+                    g.agregar_arista(origen + desplazamiento, destino + desplazamiento, peso=peso)
+        tiempo_conexa, conexa = cronometrar(g.es_conexa)
+        tiempo_bipartita, (particion_1, particion_2) = cronometrar(g.es_bipartita)
+        tiempo_profundidad, bosque_profundidad = cronometrar(g.busqueda_a_profundidad)
+        tiempo_ancho, bosque_ancho = cronometrar(g.busqueda_a_lo_ancho)
+        tiempo_componentes, componentes = cronometrar(g.componentes_conexas)
+        assert not conexa and len(particion_1) + len(particion_2) == 2 * lado * lado
+        assert len(bosque_profundidad) == len(bosque_ancho) == len(componentes) == 2
+        print(f"{g.obtener_numero_nodos():>8} {g.obtener_numero_aristas():>8} {tiempo_conexa:>11.4f} {tiempo_bipartita:>14.4f} {tiempo_profundidad:>16.4f} {tiempo_ancho:>10.4f} {tiempo_componentes:>16.4f}")
+    print()
+
+@contextlib.contextmanager
+def limite_recursion(limite=1000):
+    """
+        Este administrador de contexto pone el límite de recursión de Python (por omisión, el
+        de una instalación nueva) y al salir regresa el anterior
+    """
+    anterior = sys.getrecursionlimit()
+    sys.setrecursionlimit(limite)
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(anterior)
+
+def prueba_cadenas_profundas(n=1000000):
+    print("Recorridos sobre caminos de n nodos con el límite de recursión por omisión")
+    print(f"{'estructura':>14} {'recorrido':>26} {'tiempo (s)':>11}")
+    # Si algún recorrido volviera a ser recursivo, en un camino de n nodos pasaría del límite
+    # de recursión y la prueba fallaría con RecursionError
+    origenes, destinos = range(n - 1), range(1, n)
+    with limite_recursion():
+        # Unión-búsqueda: unir los elementos en el orden del camino y buscar todos
+        u = UnionBusqueda(range(n))
+        u.union_varios(zip(origenes, destinos))
+        tiempo, representantes = cronometrar(u.busqueda_varios, range(n))
+        assert u.num_componentes == 1 and len(set(representantes)) == 1
+        print(f"{'UnionBusqueda':>14} {'busqueda':>26} {tiempo:>11.4f}")
+        del u, representantes
+
+        # Gráfica: búsquedas sobre el camino 0 - 1 - ... - n-1
+        g = Grafica.desde_arreglos(origenes, destinos)
+        for nombre, busqueda in (("es_conexa", g.es_conexa), ("es_bipartita", g.es_bipartita),
+                                 ("busqueda_a_profundidad", g.busqueda_a_profundidad),
+                                 ("busqueda_a_lo_ancho", g.busqueda_a_lo_ancho),
+                                 ("componentes_conexas", g.componentes_conexas)):
+            tiempo, resultado = cronometrar(busqueda)
+            assert resultado
+            print(f"{'Grafica':>14} {nombre:>26} {tiempo:>11.4f}")
+        del g
+
+        # Digráfica: árbol de rutas más cortas del camino 0 -> 1 -> ... -> n-1 y dfs sobre su
+        # arborescencia, que es con la que dijkstra_general corrige las longitudes. (Con
+        # general=True el árbol no se mide aquí: dijkstra_general arma la ruta hacia cada nodo,
+        # que en un camino suman n^2 / 2 arcos.)
+        d = Digrafica.desde_arreglos(origenes, destinos, pesos=[1] * (n - 1))
+        tiempo, arbol = cronometrar(d.arbol_rutas_cortas, 0)
+        assert arbol[n - 1][0] == n - 1
+        print(f"{'Digrafica':>14} {'arbol_rutas_cortas':>26} {tiempo:>11.4f}")
+        arborescencia = [arbol[i][1] for i in range(1, n)]
+        etiquetas = Etiquetas()
+        for i in range(n):
+            etiquetas[d.buscar_nodo(i)] = {"longitud_ruta": arbol[i][0]}
+        visitados = []
+        tiempo, _ = cronometrar(d.dfs, d.buscar_nodo(0), visitados, arborescencia, -1, etiquetas)
+        assert len(visitados) == n and etiquetas[d.buscar_nodo(n - 1)]["longitud_ruta"] == n - 2
+        print(f"{'Digrafica':>14} {'dfs':>26} {tiempo:>11.4f}")
+        del d, arbol, arborescencia, etiquetas, visitados
+
+        # Red: cadena aumentante de la fuente al sumidero a lo largo de todo el camino, y el
+        # ciclo que cierra el arco n-1 -> 0 con los arcos del camino como arcos básicos
+        r = Red.desde_arreglos(origenes, destinos, capacidades=[1] * (n - 1))
+        fuente, sumidero = r.buscar_nodo(0), r.buscar_nodo(n - 1)
+        cadena = []
+        tiempo, _ = cronometrar(r.dfs, fuente, fuente, sumidero, cadena, [])
+        assert len(cadena) == n - 1
+        print(f"{'Red':>14} {'dfs':>26} {tiempo:>11.4f}")
+        cierre = r.agregar_arco(n - 1, 0, 0, 0, 1, 0)
+        ciclo = []
+        tiempo, _ = cronometrar(r.dfs_ciclos, fuente, cierre, ciclo, [], cadena)
+        assert len(ciclo) == n - 1
+        print(f"{'Red':>14} {'dfs_ciclos':>26} {tiempo:>11.4f}")
+    print()
+
+if __name__ == "__main__":
+    prueba_dijkstra()
+    prueba_dijkstra_grafica()
+    prueba_floyd()
+    prueba_simplex()
+    prueba_simplex_cuello()
+    prueba_flujo_costo_minimo()
+    prueba_flujo_maximo()
+    prueba_flujo_restricciones_minimas()
+    prueba_union_busqueda()
+    prueba_cola()
+    prueba_prim()
+    prueba_paseo_euler()
+    prueba_busquedas()
+    prueba_cadenas_profundas()
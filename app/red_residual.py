@@ -0,0 +1,418 @@
+import math
+from estructuras_datos import *
+
+class RedResidual:
+    """
+        Esta clase representa la red marginal (residual) de una red de transporte.
+
+        Cada arco de la red original tiene un par fijo de arcos marginales: el arco 2k va en
+        el mismo sentido que el arco original k, con capacidad (capacidad - flujo) y el mismo
+        costo, y el arco 2k+1 va en sentido contrario, con capacidad (flujo - restricción
+        mínima) y el costo negativo. El par de un arco marginal e es e ^ 1.
+
+        Cuando el flujo cambia sólo se actualizan las capacidades del par; los arcos con
+        capacidad 0 siguen en la estructura pero se ignoran en los recorridos, de modo que
+        no se crean ni se eliminan arcos durante el algoritmo.
+    """
+    def __init__(self, arcos, origenes=None):
+        """
+            Este método construye la red marginal
+            Parámetros
+            ----------
+            arcos: Lista de los arcos de la red original
+            origenes: Lista (alineada con arcos) con el nodo del que sale cada arco, para los
+                      arcos de una VistaRed; por omisión se usa arco.origen
+        """
+        self.arcos = list(arcos) # Arcos de la red original
+        self.nodos = [] # Nodos de la red original
+        self.indices = {} # Índice nodo -> posición en la lista de nodos
+        self.colas = [] # Nodo de origen de cada arco marginal
+        self.cabezas = [] # Nodo destino de cada arco marginal
+        self.costos = [] # Costo de cada arco marginal
+        self.capacidades = [] # Capacidad de cada arco marginal
+        self.salientes = [] # Arcos marginales que salen de cada nodo
+
+        if origenes is None:
+            origenes = [arco.origen for arco in self.arcos]
+        for arco, origen in zip(self.arcos, origenes):
+            u = self.__indice(origen)
+            v = self.__indice(arco.destino)
+            # arco marginal en el mismo sentido que el arco original
+            self.salientes[u].append(len(self.colas))
+            self.colas.append(u)
+            self.cabezas.append(v)
+            self.costos.append(arco.costo)
+            self.capacidades.append(arco.capacidad - arco.flujo)
+            # arco marginal en sentido contrario al arco original
+            self.salientes[v].append(len(self.colas))
+            self.colas.append(v)
+            self.cabezas.append(u)
+            self.costos.append(-arco.costo)
+            self.capacidades.append(arco.flujo - arco.res_min)
+
+    def __indice(self, nodo):
+        if nodo not in self.indices:
+            self.indices[nodo] = len(self.nodos)
+            self.nodos.append(nodo)
+            self.salientes.append([])
+        return self.indices[nodo]
+
+    def arco_original(self, e):
+        """
+            Este método regresa el arco de la red original relacionado con el arco marginal e
+        """
+        return self.arcos[e >> 1]
+
+    def empujar(self, e, delta):
+        """
+            Este método envía delta unidades de flujo por el arco marginal e. Se actualizan
+            las capacidades del par de arcos marginales y el flujo del arco original.
+        """
+        self.capacidades[e] -= delta
+        self.capacidades[e ^ 1] += delta
+        if e & 1:
+            self.arcos[e >> 1].flujo -= delta
+        else:
+            self.arcos[e >> 1].flujo += delta
+
+    def buscar_ciclo_negativo(self):
+        """
+            Este método busca un ciclo de costo negativo en la red marginal con el algoritmo
+            de Bellman-Ford basado en una cola. Todos los nodos empiezan con distancia 0, como
+            si hubiera una fuente ficticia unida a todos ellos, así que se encuentra cualquier
+            ciclo negativo. Cuando la ruta hacia un nodo llega a tener tantos arcos como nodos
+            hay en la red, se recorren sus antecesores para recuperar el ciclo.
+            Regresa
+            -------
+            Lista con los arcos marginales del ciclo en el orden en el que se recorren, o una
+            lista vacía si no hay ciclos negativos
+        """
+        num_nodos = len(self.nodos)
+        distancia = [0] * num_nodos
+        antecesor = [None] * num_nodos
+        arcos_en_ruta = [0] * num_nodos
+        en_cola = [True] * num_nodos
+        cola = Cola()
+        for u in range(num_nodos):
+            cola.encolar(u)
+
+        while not cola.es_vacia():
+            u = cola.desencolar()
+            en_cola[u] = False
+            for e in self.salientes[u]:
+                if self.capacidades[e] <= 0:
+                    continue
+                v = self.cabezas[e]
+                if distancia[u] + self.costos[e] < distancia[v]:
+                    distancia[v] = distancia[u] + self.costos[e]
+                    antecesor[v] = e
+                    arcos_en_ruta[v] = arcos_en_ruta[u] + 1
+                    # Una ruta con n arcos repite algún nodo, así que puede haber un ciclo negativo
+                    # entre los antecesores de v
+                    if arcos_en_ruta[v] >= num_nodos:
+                        ciclo = self.__recuperar_ciclo(v, antecesor, num_nodos)
+                        if ciclo:
+                            return ciclo
+                    if not en_cola[v]:
+                        cola.encolar(v)
+                        en_cola[v] = True
+        return []
+
+    def __recuperar_ciclo(self, nodo, antecesor, num_nodos):
+        """
+            Este método recupera el ciclo que forman los antecesores a partir de un nodo
+            Regresa
+            -------
+            Lista con los arcos marginales del ciclo, o una lista vacía si los antecesores no
+            forman un ciclo
+        """
+        # Después de retroceder n arcos se llega a un nodo que está dentro del ciclo
+        for _ in range(num_nodos):
+            if antecesor[nodo] is None:
+                return []
+            nodo = self.colas[antecesor[nodo]]
+
+        ciclo = []
+        actual = nodo
+        while True:
+            e = antecesor[actual]
+            ciclo.append(e)
+            actual = self.colas[e]
+            if actual == nodo:
+                break
+        ciclo.reverse()
+        return ciclo
+
+    def eliminacion_ciclos_negativos(self):
+        """
+            Este método elimina los ciclos negativos de la red marginal enviando flujo por
+            ellos, con lo que el costo del flujo de la red original se reduce hasta ser mínimo.
+            Los flujos se actualizan directamente en los arcos de la red original.
+        """
+        while True:
+            ciclo = self.buscar_ciclo_negativo()
+            # si no hay ciclos negativos, se acaba el algoritmo
+            if not ciclo:
+                break
+            # el delta es la capacidad más pequeña de los arcos del ciclo
+            delta = min(self.capacidades[e] for e in ciclo)
+            for e in ciclo:
+                self.empujar(e, delta)
+
+    def dinic(self, fuente, sumidero, limite=math.inf):
+        """
+            Este método aumenta el flujo desde el fuente hasta el sumidero con el algoritmo de
+            Dinic. En cada fase se calculan los niveles de los nodos con una búsqueda a lo
+            ancho desde el fuente y se envía un flujo bloqueante por los arcos marginales que
+            avanzan un nivel, con una búsqueda a lo profundo iterativa en la que cada nodo
+            recuerda el siguiente arco que le falta revisar.
+            Parámetros
+            ----------
+            fuente: Nodo fuente de la red original
+            sumidero: Nodo sumidero de la red original
+            limite: Cantidad máxima de flujo que se quiere enviar
+            Regresa
+            -------
+            La cantidad de flujo que se envió
+        """
+        s = self.indices.get(fuente)
+        t = self.indices.get(sumidero)
+        if s is None or t is None or s == t:
+            return 0
+
+        total = 0
+        while total < limite:
+            nivel = self.__niveles(s)
+            if nivel[t] < 0:
+                break
+            siguiente_arco = [0] * len(self.nodos)
+            while total < limite:
+                ruta = self.__ruta_bloqueante(s, t, nivel, siguiente_arco)
+                if not ruta:
+                    break
+                delta = min(limite - total, min(self.capacidades[e] for e in ruta))
+                for e in ruta:
+                    self.empujar(e, delta)
+                total += delta
+                # Si la ruta no tiene límite de capacidad, el flujo máximo es infinito
+                if delta == math.inf:
+                    return total
+        return total
+
+    def __niveles(self, s):
+        """
+            Este método calcula el nivel de cada nodo (número de arcos marginales desde el
+            fuente) con una búsqueda a lo ancho. Los nodos no alcanzables tienen nivel -1
+        """
+        nivel = [-1] * len(self.nodos)
+        nivel[s] = 0
+        cola = Cola()
+        cola.encolar(s)
+        while not cola.es_vacia():
+            u = cola.desencolar()
+            for e in self.salientes[u]:
+                v = self.cabezas[e]
+                if self.capacidades[e] > 0 and nivel[v] < 0:
+                    nivel[v] = nivel[u] + 1
+                    cola.encolar(v)
+        return nivel
+
+    def __ruta_bloqueante(self, s, t, nivel, siguiente_arco):
+        """
+            Este método busca una ruta del fuente al sumidero en la gráfica de niveles
+            Regresa
+            -------
+            Lista de arcos marginales de la ruta, o una lista vacía si ya no hay rutas
+        """
+        ruta = []
+        u = s
+        while u != t:
+            salientes = self.salientes[u]
+            while siguiente_arco[u] < len(salientes):
+                e = salientes[siguiente_arco[u]]
+                v = self.cabezas[e]
+                if self.capacidades[e] > 0 and nivel[v] == nivel[u] + 1:
+                    break
+                siguiente_arco[u] += 1
+            else:
+                # El nodo ya no lleva al sumidero en esta fase: se descarta y se retrocede
+                nivel[u] = -1
+                if not ruta:
+                    return []
+                u = self.colas[ruta.pop()]
+                siguiente_arco[u] += 1
+                continue
+            ruta.append(e)
+            u = v
+        return ruta
+
+    def empuje_reetiquetado(self, fuente, sumidero, limite=math.inf):
+        """
+            Este método aumenta el flujo desde el fuente hasta el sumidero con el algoritmo de
+            empuje y reetiquetado, descargando siempre el nodo activo de mayor altura. Las
+            alturas iniciales son las distancias hacia el sumidero, y cuando ningún nodo queda
+            en una altura menor al número de nodos (un hueco), los nodos que están arriba del
+            hueco se suben de una vez porque ya no pueden llegar al sumidero.
+
+            El exceso inicial se pone en el fuente por medio de un nodo auxiliar con un arco de
+            capacidad igual al límite; el exceso que no llega al sumidero regresa a ese nodo,
+            así que al final se tiene un flujo y no sólo un preflujo.
+            Parámetros
+            ----------
+            fuente: Nodo fuente de la red original
+            sumidero: Nodo sumidero de la red original
+            limite: Cantidad máxima de flujo que se quiere enviar
+            Regresa
+            -------
+            La cantidad de flujo que se envió
+        """
+        s = self.indices.get(fuente)
+        t = self.indices.get(sumidero)
+        if s is None or t is None or s == t:
+            return 0
+
+        # Con una ruta de capacidad infinita el exceso no tendría cota; ese caso lo resuelve Dinic
+        if self.__hay_ruta_infinita(s, t):
+            return self.dinic(fuente, sumidero, limite)
+        # Un arco con flujo fuera de sus límites tiene capacidad marginal negativa; durante el
+        # algoritmo se toma como 0 y al final se suma el cambio de flujo
+        sin_negativas = [max(0, c) for c in self.capacidades]
+        cota = sum(sin_negativas[e] for e in self.salientes[s])
+        if cota == math.inf:
+            cota = sum(c for c in sin_negativas if c != math.inf)
+        exceso_inicial = min(limite, cota)
+        if exceso_inicial <= 0:
+            return 0
+
+        num_nodos = len(self.nodos)
+        num_arcos = len(self.colas)
+        auxiliar = num_nodos
+        capacidades_iniciales = self.capacidades
+        self.capacidades = list(sin_negativas)
+        n = num_nodos + 1
+        self.salientes.append([num_arcos])
+        self.salientes[s].append(num_arcos + 1)
+        self.colas += [auxiliar, s]
+        self.cabezas += [s, auxiliar]
+        self.costos += [0, 0]
+        self.capacidades += [0, exceso_inicial]
+
+        try:
+            altura = self.__alturas_iniciales(t, n)
+            altura[auxiliar] = n
+            exceso = [0] * n
+            exceso[s] = exceso_inicial
+            siguiente_arco = [0] * n
+            # Número de nodos en cada altura (para detectar huecos) y nodos activos por altura
+            cuenta = [0] * (2 * n + 2)
+            for u in range(num_nodos):
+                cuenta[altura[u]] += 1
+            activos = [[] for _ in range(2 * n + 2)]
+            es_activo = [False] * n
+            es_activo[t] = es_activo[auxiliar] = True # nunca se descargan
+            activos[altura[s]].append(s)
+            es_activo[s] = True
+            mayor = altura[s]
+
+            while mayor >= 0:
+                if not activos[mayor]:
+                    mayor -= 1
+                    continue
+                u = activos[mayor].pop()
+                # Las entradas de nodos que cambiaron de altura por un hueco se ignoran
+                if altura[u] != mayor:
+                    continue
+                es_activo[u] = False
+
+                # Se descarga u
+                salientes = self.salientes[u]
+                while exceso[u] > 0:
+                    if siguiente_arco[u] == len(salientes):
+                        # Se reetiqueta u con la menor altura que le permite empujar
+                        anterior = altura[u]
+                        altura[u] = 1 + min(altura[self.cabezas[e]] for e in salientes if self.capacidades[e] > 0)
+                        siguiente_arco[u] = 0
+                        cuenta[anterior] -= 1
+                        cuenta[altura[u]] += 1
+                        if anterior < n and cuenta[anterior] == 0:
+                            self.__cerrar_hueco(anterior, altura, cuenta, activos, es_activo, n, auxiliar)
+                        continue
+                    e = salientes[siguiente_arco[u]]
+                    v = self.cabezas[e]
+                    if self.capacidades[e] > 0 and altura[u] == altura[v] + 1:
+                        delta = min(exceso[u], self.capacidades[e])
+                        self.capacidades[e] -= delta
+                        self.capacidades[e ^ 1] += delta
+                        exceso[u] -= delta
+                        exceso[v] += delta
+                        if not es_activo[v]:
+                            es_activo[v] = True
+                            activos[altura[v]].append(v)
+                            mayor = max(mayor, altura[v])
+                    else:
+                        siguiente_arco[u] += 1
+                mayor = max(mayor, altura[u])
+            total = exceso[t]
+        finally:
+            # Se quita el nodo auxiliar y se escriben los flujos en los arcos originales
+            del self.colas[num_arcos:], self.cabezas[num_arcos:], self.costos[num_arcos:], self.capacidades[num_arcos:]
+            del self.salientes[num_nodos:]
+            self.salientes[s].pop()
+            for e in range(num_arcos):
+                cambio = self.capacidades[e] - sin_negativas[e]
+                self.capacidades[e] = capacidades_iniciales[e] + cambio
+                if e & 1 and cambio:
+                    self.arcos[e >> 1].flujo += cambio
+        return total
+
+    def __hay_ruta_infinita(self, s, t):
+        """
+            Este método revisa si hay una ruta del fuente al sumidero formada sólo por arcos
+            marginales de capacidad infinita
+        """
+        visitados = [False] * len(self.nodos)
+        visitados[s] = True
+        pila = Pila()
+        pila.apilar(s)
+        while not pila.es_vacia():
+            u = pila.desapilar()
+            for e in self.salientes[u]:
+                v = self.cabezas[e]
+                if self.capacidades[e] == math.inf and not visitados[v]:
+                    if v == t:
+                        return True
+                    visitados[v] = True
+                    pila.apilar(v)
+        return False
+
+    def __alturas_iniciales(self, t, n):
+        """
+            Este método calcula las alturas iniciales: la distancia de cada nodo hacia el
+            sumidero, o n si el nodo no llega al sumidero
+        """
+        altura = [n] * n
+        altura[t] = 0
+        cola = Cola()
+        cola.encolar(t)
+        while not cola.es_vacia():
+            v = cola.desencolar()
+            for e in self.salientes[v]:
+                # el arco e ^ 1 va de u hacia v
+                u = self.cabezas[e]
+                if self.capacidades[e ^ 1] > 0 and altura[u] == n:
+                    altura[u] = altura[v] + 1
+                    cola.encolar(u)
+        return altura
+
+    def __cerrar_hueco(self, hueco, altura, cuenta, activos, es_activo, n, auxiliar):
+        """
+            Este método sube arriba del nodo auxiliar a los nodos que están sobre un hueco
+        """
+        for u in range(n):
+            if u != auxiliar and hueco < altura[u] < n + 1:
+                cuenta[altura[u]] -= 1
+                altura[u] = n + 1
+                cuenta[n + 1] += 1
+                if es_activo[u]:
+                    activos[n + 1].append(u)
+
@@ -0,0 +1,214 @@
+import heapq
+import math
+from estructuras_datos import *
+
+class RutasCortasSucesivas:
+    """
+        Esta clase resuelve el problema de flujo de costo mínimo con el algoritmo de rutas más
+        cortas sucesivas sobre listas indexadas por número de nodo y de arco.
+
+        Como en RedResidual, cada arco k tiene un par fijo de arcos marginales: 2k en el
+        sentido del arco y 2k+1 en sentido contrario. Los nodos tienen potenciales (como en el
+        algoritmo de Johnson) con los que el costo reducido c(u,v) + p(u) - p(v) de los arcos
+        marginales con capacidad nunca es negativo, así que cada ruta más corta se encuentra
+        con Dijkstra y un montículo en lugar de Bellman-Ford. Sólo los potenciales iniciales se
+        calculan con Bellman-Ford, por si hay arcos de costo negativo y capacidad infinita.
+
+        Las restricciones mínimas de los arcos se satisfacen desde el principio y el exceso que
+        dejan en los nodos se envía desde una fuente auxiliar hacia un sumidero auxiliar junto
+        con el flujo pedido. Los arcos de costo negativo y capacidad finita empiezan saturados.
+    """
+    def __init__(self, num_nodos):
+        """
+            Parámetros
+            ----------
+            num_nodos: Número de nodos. Los nodos son los enteros 0, ..., num_nodos - 1
+        """
+        self.num_nodos = num_nodos
+        self.colas = [] # Nodo de origen de cada arco marginal
+        self.cabezas = [] # Nodo destino de cada arco marginal
+        self.costos = [] # Costo de cada arco marginal
+        self.capacidades = [] # Capacidad de cada arco marginal
+        self.salientes = [[] for _ in range(num_nodos)] # Arcos marginales que salen de cada nodo
+        self.res_min = [] # Restricción mínima de cada arco
+        self.flujos_iniciales = [] # Flujo con el que empieza cada arco
+
+    def agregar_arco(self, u, v, res_min=0, capacidad=math.inf, costo=0):
+        """
+            Este método agrega el arco (u, v) y sus dos arcos marginales
+            Regresa
+            -------
+            El número del arco
+        """
+        # Los arcos de costo negativo empiezan saturados, así sus arcos marginales no tienen
+        # costo negativo (salvo que su capacidad sea infinita)
+        flujo = capacidad if costo < 0 and capacidad != math.inf else res_min
+        self.res_min.append(res_min)
+        self.flujos_iniciales.append(flujo)
+        self.__agregar_par(u, v, capacidad - flujo, flujo - res_min, costo)
+        return len(self.res_min) - 1
+
+    def __agregar_par(self, u, v, capacidad, capacidad_contraria, costo):
+        self.salientes[u].append(len(self.colas))
+        self.colas.append(u)
+        self.cabezas.append(v)
+        self.costos.append(costo)
+        self.capacidades.append(capacidad)
+        self.salientes[v].append(len(self.colas))
+        self.colas.append(v)
+        self.cabezas.append(u)
+        self.costos.append(-costo)
+        self.capacidades.append(capacidad_contraria)
+
+    def flujo(self, k):
+        """
+            Este método regresa el flujo del arco k
+        """
+        return self.res_min[k] + self.capacidades[2 * k + 1]
+
+    def resolver(self, fuente, sumidero, cantidad):
+        """
+            Este método envía la cantidad de flujo pedida desde el fuente hasta el sumidero con
+            el menor costo posible, respetando las restricciones mínimas de los arcos
+            Parámetros
+            ----------
+            fuente: Nodo fuente
+            sumidero: Nodo sumidero
+            cantidad: Cantidad de flujo que se quiere enviar
+            Regresa
+            -------
+            True si se encontró el flujo, False si las restricciones no se pueden satisfacer o
+            el costo no tiene cota (hay un ciclo negativo de capacidad infinita)
+        """
+        num_arcos = len(self.colas)
+        num_nodos = self.num_nodos
+
+        # Exceso que dejan en cada nodo los flujos iniciales
+        exceso = [0] * num_nodos
+        for k, flujo in enumerate(self.flujos_iniciales):
+            exceso[self.cabezas[2 * k]] += flujo
+            exceso[self.colas[2 * k]] -= flujo
+
+        # Fuente y sumidero auxiliares: el flujo pedido va del fuente al sumidero, y cada nodo
+        # con exceso positivo (negativo) lo recibe de (envía al) nodo auxiliar correspondiente
+        fuente_auxiliar = num_nodos
+        sumidero_auxiliar = num_nodos + 1
+        self.salientes.append([])
+        self.salientes.append([])
+        self.__agregar_par(fuente_auxiliar, fuente, cantidad, 0, 0)
+        self.__agregar_par(sumidero, sumidero_auxiliar, cantidad, 0, 0)
+        total = cantidad
+        for nodo, e in enumerate(exceso):
+            if e > 0:
+                self.__agregar_par(fuente_auxiliar, nodo, e, 0, 0)
+                total += e
+            elif e < 0:
+                self.__agregar_par(nodo, sumidero_auxiliar, -e, 0, 0)
+
+        try:
+            potenciales = self.__potenciales_iniciales(fuente_auxiliar)
+            if potenciales is None:
+                return False
+
+            enviado = 0
+            while enviado < total:
+                ruta = self.__ruta_mas_corta(fuente_auxiliar, sumidero_auxiliar, potenciales)
+                if ruta is None:
+                    return False
+                delta = min(total - enviado, min(self.capacidades[e] for e in ruta))
+                for e in ruta:
+                    self.capacidades[e] -= delta
+                    self.capacidades[e ^ 1] += delta
+                enviado += delta
+            return True
+        finally:
+            # Se quitan los arcos y nodos auxiliares
+            del self.colas[num_arcos:], self.cabezas[num_arcos:], self.costos[num_arcos:], self.capacidades[num_arcos:]
+            del self.salientes[num_nodos:]
+            for nodo in range(num_nodos):
+                while self.salientes[nodo] and self.salientes[nodo][-1] >= num_arcos:
+                    self.salientes[nodo].pop()
+
+    def __potenciales_iniciales(self, fuente):
+        """
+            Este método calcula los potenciales iniciales con el algoritmo de Bellman-Ford
+            basado en una cola, desde el fuente auxiliar
+            Regresa
+            -------
+            Lista de potenciales, o None si hay un ciclo negativo
+        """
+        num_nodos = len(self.salientes)
+        distancia = [math.inf] * num_nodos
+        arcos_en_ruta = [0] * num_nodos
+        en_cola = [False] * num_nodos
+        distancia[fuente] = 0
+        cola = Cola()
+        cola.encolar(fuente)
+        en_cola[fuente] = True
+        while not cola.es_vacia():
+            u = cola.desencolar()
+            en_cola[u] = False
+            for e in self.salientes[u]:
+                if self.capacidades[e] <= 0:
+                    continue
+                v = self.cabezas[e]
+                if distancia[u] + self.costos[e] < distancia[v]:
+                    distancia[v] = distancia[u] + self.costos[e]
+                    arcos_en_ruta[v] = arcos_en_ruta[u] + 1
+                    if arcos_en_ruta[v] >= num_nodos:
+                        return None
+                    if not en_cola[v]:
+                        cola.encolar(v)
+                        en_cola[v] = True
+        # Los nodos que no se alcanzan desde el fuente no se alcanzarán después
+        return [0 if d == math.inf else d for d in distancia]
+
+    def __ruta_mas_corta(self, fuente, sumidero, potenciales):
+        """
+            Este método busca la ruta más corta con Dijkstra sobre los costos reducidos y
+            actualiza los potenciales
+            Regresa
+            -------
+            Lista de arcos marginales de la ruta, o None si el sumidero no se alcanza
+        """
+        num_nodos = len(self.salientes)
+        distancia = [math.inf] * num_nodos
+        antecesor = [None] * num_nodos
+        definitivo = [False] * num_nodos
+        distancia[fuente] = 0
+        monticulo = [(0, fuente)]
+        while monticulo:
+            d, u = heapq.heappop(monticulo)
+            if definitivo[u]:
+                continue
+            definitivo[u] = True
+            if u == sumidero:
+                break
+            potencial_u = potenciales[u]
+            for e in self.salientes[u]:
+                if self.capacidades[e] <= 0:
+                    continue
+                v = self.cabezas[e]
+                nueva = d + self.costos[e] + potencial_u - potenciales[v]
+                if nueva < distancia[v]:
+                    distancia[v] = nueva
+                    antecesor[v] = e
+                    heapq.heappush(monticulo, (nueva, v))
+
+        if not definitivo[sumidero]:
+            return None
+
+        # Los nodos que no quedaron definitivos se actualizan con la distancia al sumidero, así
+        # los costos reducidos siguen sin ser negativos
+        d_sumidero = distancia[sumidero]
+        for v in range(num_nodos):
+            potenciales[v] += distancia[v] if definitivo[v] else d_sumidero
+
+        ruta = []
+        v = sumidero
+        while v != fuente:
+            e = antecesor[v]
+            ruta.append(e)
+            v = self.colas[e]
+        ruta.reverse()
+        return ruta
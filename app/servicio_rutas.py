@@ -0,0 +1,136 @@
+import threading
+from collections import OrderedDict
+
+class ServicioRutas:
+    """
+        Esta clase resuelve consultas de rutas más cortas sobre digráficas y guarda los
+        árboles de rutas más cortas que va calculando.
+
+        Las consultas se reciben en lote como pares (origen, destino). Para cada origen
+        distinto se calcula un solo árbol, del que se recuperan las rutas hacia todos sus
+        destinos. Los árboles se guardan con la llave (huella de la digráfica, origen, método),
+        de modo que si la digráfica se vuelve a construir sin cambios (como sucede en cada
+        callback de Dash) los árboles ya calculados se reutilizan. Cuando se llena la
+        capacidad se descarta el árbol que lleva más tiempo sin usarse.
+
+        Un mismo servicio se comparte entre los hilos del servidor, así que los árboles
+        guardados y los contadores sólo se tocan con el candado tomado. Los árboles se calculan
+        sin el candado, para que una consulta larga no detenga a las demás sesiones.
+
+        Los arcos de las rutas que se regresan pertenecen a la digráfica con la que se calculó
+        el árbol; tienen los mismos nombres, pesos e Ids que los de cualquier digráfica con la
+        misma huella.
+    """
+    def __init__(self, capacidad=128):
+        """
+            Parámetros
+            ----------
+            capacidad: Número máximo de árboles guardados
+        """
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self.__arboles = OrderedDict()
+        self.__candado = threading.Lock()
+
+    def arbol(self, digrafica, origen, general=False, huella=None):
+        """
+            Este método regresa el árbol de rutas más cortas desde un origen, calculándolo
+            solamente si no está guardado
+            Parámetros
+            ----------
+            digrafica: Objeto de la clase Digrafica
+            origen: Nombre del nodo origen
+            general: True para usar dijkstra_general (admite pesos negativos)
+            huella: Huella de la digráfica, si ya se conoce
+            Regresa
+            -------
+            El resultado de Digrafica.arbol_rutas_cortas
+        """
+        if huella is None:
+            huella = digrafica.huella()
+        llave = (huella, origen, general)
+
+        with self.__candado:
+            arbol = self.__arboles.get(llave)
+            if arbol is not None:
+                self.aciertos += 1
+                self.__arboles.move_to_end(llave)
+                return arbol
+            self.fallos += 1
+
+        # Si otro hilo calcula el mismo árbol al mismo tiempo, se guarda el último
+        arbol = digrafica.arbol_rutas_cortas(origen, general)
+        with self.__candado:
+            self.__arboles[llave] = arbol
+            self.__arboles.move_to_end(llave)
+            while len(self.__arboles) > self.capacidad:
+                self.__arboles.popitem(last=False)
+        return arbol
+
+    def consultar(self, digrafica, pares, general=False):
+        """
+            Este método resuelve un lote de consultas de rutas más cortas
+            Parámetros
+            ----------
+            digrafica: Objeto de la clase Digrafica
+            pares: Lista de tuplas (origen, destino) con nombres de nodos
+            general: True para usar dijkstra_general (admite pesos negativos)
+            Regresa
+            -------
+            Lista alineada con pares. Cada elemento es la lista de arcos de la ruta más corta,
+            una lista vacía si no hay ruta, o la lista del ciclo negativo (que empieza con
+            'ciclo') si se encontró uno desde ese origen.
+        """
+        for origen, destino in pares:
+            for nombre in (origen, destino):
+                if not digrafica.buscar_nodo(nombre):
+                    raise ValueError(f"Error. El nodo {nombre} no existe en la digráfica")
+
+        # La huella se calcula una sola vez para todo el lote
+        huella = digrafica.huella()
+        arboles = {}
+        resultados = []
+        for origen, destino in pares:
+            if origen not in arboles:
+                arboles[origen] = self.arbol(digrafica, origen, general, huella)
+            resultados.append(self.recuperar_ruta(arboles[origen], destino))
+        return resultados
+
+    def recuperar_ruta(self, arbol, destino):
+        """
+            Este método recupera la ruta hacia un destino a partir de un árbol de rutas más cortas
+            Regresa
+            -------
+            Lista de arcos desde la raíz hasta el destino, lista vacía si el destino no es
+            alcanzable (o es la raíz), o el ciclo negativo si el árbol no existe
+        """
+        # Si en lugar de árbol se encontró un ciclo negativo, éste es la respuesta
+        if isinstance(arbol, list):
+            return arbol
+        if destino not in arbol:
+            return []
+
+        ruta = []
+        arco = arbol[destino][1]
+        while arco is not None:
+            ruta.append(arco)
+            arco = arbol[arco.origen.nombre][1]
+        ruta.reverse()
+        return ruta
+
+    def longitud(self, arbol, destino):
+        """
+            Este método regresa la longitud de la ruta más corta hacia un destino, o None si
+            no es alcanzable
+        """
+        if isinstance(arbol, list) or destino not in arbol:
+            return None
+        return arbol[destino][0]
+
+    def vaciar(self):
+        """
+            Este método descarta todos los árboles guardados
+        """
+        with self.__candado:
+            self.__arboles.clear()
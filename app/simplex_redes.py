@@ -0,0 +1,320 @@
+import math
+
+class SimplexRedes:
+    """
+        Esta clase implementa el método simplex para redes (problema de transbordo de costo
+        mínimo) sobre listas indexadas por número de nodo y de arco.
+
+        El árbol de expansión de la solución básica se guarda con los arreglos padre, arco
+        hacia el padre, tamaño del subárbol e hilo (recorrido en profundidad: siguiente,
+        anterior y último descendiente), y los nodos tienen potenciales tales que el costo
+        reducido de los arcos del árbol es 0. Con esto cada pivote cuesta lo que mide el ciclo
+        y el subárbol que se mueve, en lugar de buscar ciclos con DFS para cada arco.
+
+        El arco que entra se elige por bloques: se revisan los costos reducidos de un bloque de
+        unos sqrt(m) arcos y se toma el más negativo; si el bloque no tiene candidatos se pasa
+        al siguiente. La solución inicial usa un nodo raíz ficticio unido a cada nodo con un
+        arco de costo muy grande (gran M), con el árbol fuertemente factible.
+    """
+    def __init__(self, ofertas, colas, cabezas, res_min, capacidades, costos):
+        """
+            Parámetros
+            ----------
+            ofertas: Oferta (positiva) o demanda (negativa) de cada nodo
+            colas: Nodo de origen de cada arco
+            cabezas: Nodo destino de cada arco
+            res_min: Restricción mínima de cada arco
+            capacidades: Capacidad de cada arco (puede ser math.inf)
+            costos: Costo de cada arco
+        """
+        self.n = len(ofertas)
+        self.m = len(colas)
+        self.res_min = list(res_min)
+        n, m = self.n, self.m
+        raiz = n
+
+        # Las restricciones mínimas se satisfacen desde el principio: x = res_min + x'
+        ofertas = list(ofertas)
+        for i in range(m):
+            if self.res_min[i]:
+                ofertas[colas[i]] -= self.res_min[i]
+                ofertas[cabezas[i]] += self.res_min[i]
+
+        # El costo de los arcos ficticios (gran M) tiene que ser mayor que el de cualquier camino,
+        # y la capacidad que sustituye a math.inf mayor que el flujo de cualquier arco en una
+        # solución básica, que no pasa de la oferta total más las capacidades finitas
+        finitas = sum(c - l for c, l in zip(capacidades, self.res_min) if c != math.inf)
+        self.infinito = 3 * sum(abs(c) for c in costos) or 1
+        self.capacidad_infinita = sum(b for b in ofertas if b > 0) + finitas + 1
+
+        self.colas = list(colas)
+        self.cabezas = list(cabezas)
+        self.costos = list(costos)
+        self.capacidades = [self.capacidad_infinita if c == math.inf else c - l for c, l in zip(capacidades, self.res_min)]
+        self.flujos = [0] * m
+
+        # Arcos ficticios m..m+n-1 entre cada nodo y la raíz. Los nodos con oferta (o sin
+        # oferta ni demanda) mandan su flujo hacia la raíz y los de demanda lo reciben de ella
+        self.potenciales = [0] * (n + 1)
+        for i, b in enumerate(ofertas):
+            if b >= 0:
+                self.colas.append(i)
+                self.cabezas.append(raiz)
+                self.potenciales[i] = self.infinito
+            else:
+                self.colas.append(raiz)
+                self.cabezas.append(i)
+                self.potenciales[i] = -self.infinito
+            self.costos.append(self.infinito)
+            self.capacidades.append(self.capacidad_infinita)
+            self.flujos.append(abs(b))
+
+        # Árbol inicial: todos los nodos son hijos de la raíz
+        self.padre = [raiz] * n + [None]
+        self.arco_padre = list(range(m, m + n)) + [None]
+        self.tamano = [1] * n + [n + 1]
+        self.siguiente = list(range(1, n + 1)) + [0]
+        self.anterior = [raiz] + list(range(n))
+        self.ultimo = list(range(n)) + [n - 1 if n else raiz]
+
+    def costo_reducido(self, i):
+        """
+            Costo reducido del arco i en el sentido en el que puede cambiar su flujo
+        """
+        c = self.costos[i] - self.potenciales[self.colas[i]] + self.potenciales[self.cabezas[i]]
+        return c if self.flujos[i] == 0 else -c
+
+    def __arcos_entrantes(self):
+        """
+            Generador de arcos que entran a la base, elegidos por bloques
+        """
+        m = self.m
+        if m == 0:
+            return
+        tamano_bloque = int(math.ceil(math.sqrt(m)))
+        num_bloques = (m + tamano_bloque - 1) // tamano_bloque
+        bloques_sin_candidato = 0
+        inicio = 0
+        while bloques_sin_candidato < num_bloques:
+            fin = inicio + tamano_bloque
+            if fin <= m:
+                arcos = range(inicio, fin)
+            else:
+                fin -= m
+                arcos = list(range(inicio, m)) + list(range(fin))
+            inicio = fin
+
+            mejor = None
+            mejor_costo = 0
+            for i in arcos:
+                # Los arcos sin capacidad (restricción mínima igual a la capacidad) nunca cambian
+                # su flujo, así que no pueden entrar a la base
+                if self.capacidades[i] == 0:
+                    continue
+                c = self.costo_reducido(i)
+                if c < mejor_costo:
+                    mejor, mejor_costo = i, c
+
+            if mejor is None:
+                bloques_sin_candidato += 1
+            else:
+                bloques_sin_candidato = 0
+                # p es el nodo por el que el ciclo entra al arco y q por el que sale
+                if self.flujos[mejor] == 0:
+                    yield mejor, self.colas[mejor], self.cabezas[mejor]
+                else:
+                    yield mejor, self.cabezas[mejor], self.colas[mejor]
+
+    def __apice(self, p, q):
+        """
+            Ancestro común más cercano de p y q en el árbol
+        """
+        tamano_p = self.tamano[p]
+        tamano_q = self.tamano[q]
+        while True:
+            while tamano_p < tamano_q:
+                p = self.padre[p]
+                tamano_p = self.tamano[p]
+            while tamano_p > tamano_q:
+                q = self.padre[q]
+                tamano_q = self.tamano[q]
+            if tamano_p == tamano_q:
+                if p != q:
+                    p = self.padre[p]
+                    tamano_p = self.tamano[p]
+                    q = self.padre[q]
+                    tamano_q = self.tamano[q]
+                else:
+                    return p
+
+    def __camino(self, p, w):
+        """
+            Nodos y arcos del camino en el árbol desde p hasta su ancestro w
+        """
+        nodos = [p]
+        arcos = []
+        while p != w:
+            arcos.append(self.arco_padre[p])
+            p = self.padre[p]
+            nodos.append(p)
+        return nodos, arcos
+
+    def __ciclo(self, i, p, q):
+        """
+            Ciclo que forma el arco i (recorrido de p a q) con el árbol. Regresa la lista de
+            nodos y la de arcos, de modo que el arco k se recorre desde el nodo k
+        """
+        w = self.__apice(p, q)
+        nodos, arcos = self.__camino(p, w)
+        nodos.reverse()
+        arcos.reverse()
+        if arcos != [i]:
+            arcos.append(i)
+        nodos_q, arcos_q = self.__camino(q, w)
+        del nodos_q[-1]
+        return nodos + nodos_q, arcos + arcos_q
+
+    def __capacidad_residual(self, i, p):
+        return self.capacidades[i] - self.flujos[i] if self.colas[i] == p else self.flujos[i]
+
+    def __subarbol(self, p):
+        yield p
+        ultimo = self.ultimo[p]
+        while p != ultimo:
+            p = self.siguiente[p]
+            yield p
+
+    def __quitar_arco(self, s, t):
+        """
+            Quita del árbol el arco entre s y su hijo t
+        """
+        tamano_t = self.tamano[t]
+        anterior_t = self.anterior[t]
+        ultimo_t = self.ultimo[t]
+        siguiente_ultimo_t = self.siguiente[ultimo_t]
+        self.padre[t] = None
+        self.arco_padre[t] = None
+        # El subárbol de t se separa del hilo
+        self.siguiente[anterior_t] = siguiente_ultimo_t
+        self.anterior[siguiente_ultimo_t] = anterior_t
+        self.siguiente[ultimo_t] = t
+        self.anterior[t] = ultimo_t
+        # Se actualizan los tamaños y últimos descendientes de los ancestros de t
+        while s is not None:
+            self.tamano[s] -= tamano_t
+            if self.ultimo[s] == ultimo_t:
+                self.ultimo[s] = anterior_t
+            s = self.padre[s]
+
+    def __hacer_raiz(self, q):
+        """
+            Reorganiza el subárbol separado para que q sea su raíz
+        """
+        ancestros = []
+        while q is not None:
+            ancestros.append(q)
+            q = self.padre[q]
+        ancestros.reverse()
+        for p, q in zip(ancestros, ancestros[1:]):
+            tamano_p = self.tamano[p]
+            ultimo_p = self.ultimo[p]
+            anterior_q = self.anterior[q]
+            ultimo_q = self.ultimo[q]
+            siguiente_ultimo_q = self.siguiente[ultimo_q]
+            # p se vuelve hijo de q
+            self.padre[p] = q
+            self.padre[q] = None
+            self.arco_padre[p] = self.arco_padre[q]
+            self.arco_padre[q] = None
+            self.tamano[p] = tamano_p - self.tamano[q]
+            self.tamano[q] = tamano_p
+            # El subárbol de q se separa del hilo
+            self.siguiente[anterior_q] = siguiente_ultimo_q
+            self.anterior[siguiente_ultimo_q] = anterior_q
+            self.siguiente[ultimo_q] = q
+            self.anterior[q] = ultimo_q
+            if ultimo_p == ultimo_q:
+                self.ultimo[p] = anterior_q
+                ultimo_p = anterior_q
+            # Lo que queda del subárbol de p se pone como subárbol de q en el hilo
+            self.anterior[p] = ultimo_q
+            self.siguiente[ultimo_q] = p
+            self.siguiente[ultimo_p] = q
+            self.anterior[q] = ultimo_p
+            self.ultimo[q] = ultimo_p
+
+    def __agregar_arco(self, i, p, q):
+        """
+            Agrega el arco i al árbol haciendo a q (raíz de su subárbol) hijo de p
+        """
+        ultimo_p = self.ultimo[p]
+        siguiente_ultimo_p = self.siguiente[ultimo_p]
+        tamano_q = self.tamano[q]
+        ultimo_q = self.ultimo[q]
+        self.padre[q] = p
+        self.arco_padre[q] = i
+        # El subárbol de q se inserta en el hilo después del último descendiente de p
+        self.siguiente[ultimo_p] = q
+        self.anterior[q] = ultimo_p
+        self.anterior[siguiente_ultimo_p] = ultimo_q
+        self.siguiente[ultimo_q] = siguiente_ultimo_p
+        # Se actualizan los tamaños y últimos descendientes de los nuevos ancestros de q
+        while p is not None:
+            self.tamano[p] += tamano_q
+            if self.ultimo[p] == ultimo_p:
+                self.ultimo[p] = ultimo_q
+            p = self.padre[p]
+
+    def __actualizar_potenciales(self, i, p, q):
+        """
+            Ajusta los potenciales del subárbol de q para que el arco i tenga costo reducido 0
+        """
+        if q == self.cabezas[i]:
+            d = self.potenciales[p] - self.costos[i] - self.potenciales[q]
+        else:
+            d = self.potenciales[p] + self.costos[i] - self.potenciales[q]
+        for nodo in self.__subarbol(q):
+            self.potenciales[nodo] += d
+
+    def resolver(self):
+        """
+            Este método aplica el método simplex hasta que ningún arco mejora la solución
+            Regresa
+            -------
+            True si existe un flujo que satisface las ofertas y demandas, False si no
+        """
+        for i, p, q in self.__arcos_entrantes():
+            nodos, arcos = self.__ciclo(i, p, q)
+            # El arco que sale es el primero con la menor capacidad residual, recorriendo el
+            # ciclo desde el final para conservar el árbol fuertemente factible
+            j, s = min(zip(reversed(arcos), reversed(nodos)), key=lambda arco_nodo: self.__capacidad_residual(*arco_nodo))
+            t = self.cabezas[j] if self.colas[j] == s else self.colas[j]
+
+            delta = self.__capacidad_residual(j, s)
+            if delta:
+                for k, nodo in zip(arcos, nodos):
+                    if self.colas[k] == nodo:
+                        self.flujos[k] += delta
+                    else:
+                        self.flujos[k] -= delta
+
+            if i != j:
+                if self.padre[t] != s:
+                    # s tiene que ser el padre de t
+                    s, t = t, s
+                if arcos.index(i) > arcos.index(j):
+                    # q tiene que estar en el subárbol de t
+                    p, q = q, p
+                self.__quitar_arco(s, t)
+                self.__hacer_raiz(q)
+                self.__agregar_arco(i, p, q)
+                self.__actualizar_potenciales(i, p, q)
+
+        # Si algún arco ficticio conserva flujo, no hay solución factible
+        return all(abs(self.flujos[i]) <= 1e-9 for i in range(self.m, self.m + self.n))
+
+    def flujos_finales(self):
+        """
+            Flujos de los arcos originales, incluyendo sus restricciones mínimas
+        """
+        return [self.flujos[i] + self.res_min[i] for i in range(self.m)]
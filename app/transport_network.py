@@ -1,4 +1,4 @@
-import dash  # pip install dash
+import dash  # pip install dash==2.9 or higher (for dash.Patch)
 import dash_cytoscape as cyto  # pip install dash-cytoscape==0.2.0 or higher
 import dash_html_components as html
 import dash_core_components as dcc
@@ -10,13 +10,34 @@ import random
 from red import *
 import base64
 import uuid
+import copy
+from elementos_cytoscape import copia_para_resultados, componentes_a_json, parchar_elementos, parchar_lista, llave_fila, decodificar_archivo, elementos_red, ArchivoInvalido, LIMITE_ARCHIVO
+from almacen_sesiones import AlmacenSesiones, directorio_sesiones
 
 from main import app
 
+# ----- Server-side store with the transport network of each session -----
+# The elements, the degrees table and the copy of the elements without results stay in the server,
+# so the browser only sends and receives the id of its session instead of the whole network
+network_store = AlmacenSesiones(lambda: {'elements': {'nodes': [], 'edges': []}, 'table': [], 'copy': None},
+                                directorio=directorio_sesiones("network"))
+
 # ----- Dropdown menu for algorithm selection -----
+# Maximum flow algorithms and the engine each one uses in Red.flujo_maximo
+max_flow_algorithms = {"Find maximum flow using Ford-Fulkerson algorithm": "fulkerson",
+                       "Find maximum flow using Dinic algorithm": "dinic",
+                       "Find maximum flow using Push-Relabel algorithm": "empuje_reetiquetado"}
+
+# Alert shown for each reason an uploaded file can be rejected
+upload_alerts = {"formato": 7, "restricciones": 8, "restricciones_nodo": 9, "restricciones_arco": 10,
+                 "repetido": 11, "inexistente": 12, "costo": 13, "tamano": 18}
+
 algorithms = ["Find maximum flow using Ford-Fulkerson algorithm", 
+              "Find maximum flow using Dinic algorithm",
+              "Find maximum flow using Push-Relabel algorithm",
               "Find minimum-cost flow using Primal algorithm",
               "Find minimum-cost flow using Dual algorithm",
+              "Find minimum-cost flow using Successive Shortest Paths algorithm",
               "Find total minimum-cost flow using Simplex algorithm"]
 
 select_algorithm_dropdown = dcc.Dropdown(
@@ -219,7 +240,7 @@ layout = html.Div(children=[
     ),
 
     dcc.Store(
-        id='network-copy', data=None
+        id='network-session', data=None # Id of the session in the server-side store and revision of the elements
     ),
  
     # 1- No nodes selected when edit node button is clicked
@@ -285,7 +306,7 @@ layout = html.Div(children=[
             dbc.Row([
                 dcc.Upload([
                     dbc.Button("Upload transport network from file", className="mr-1", color="success"),
-                ], id="upload-network-obj")
+                ], id="upload-network-obj", max_size=LIMITE_ARCHIVO)
                 
             ], justify="center")
         ], md=6),
@@ -413,7 +434,7 @@ layout = html.Div(children=[
      Output("number-of-edges-label-network", "children"), Output('nodes-info-network', 'data'), 
      Output('upload-network-obj', 'contents'),
      Output('result-text-network', 'children'), Output('result-div-network', 'style'),
-     Output('network-copy', 'data')],
+     Output('network-session', 'data')],
 
     [Input("add-node-btn-network", "n_clicks"), Input("done-btn-edit-nodes-modal-network", "n_clicks"),
      Input("remove-nodes-btn-network", "n_clicks"), Input("edit-nodes-btn-network", "n_clicks"),
@@ -422,15 +443,66 @@ layout = html.Div(children=[
      Input('upload-network-obj', 'contents'), Input('run-algorithm-btn-network', 'n_clicks'),
      Input('clear-result-btn-network', 'n_clicks'), Input("done-btn-select-source-and-sink-nodes-modal", "n_clicks")],
     
-    [State("network", "elements"), State("nodes-degrees-table-network", "children"), 
-     State("number-of-nodes-label-network", "children"), State("edit-nodes-modal-body-network", "children"), 
+    [State("number-of-nodes-label-network", "children"), State("edit-nodes-modal-body-network", "children"), 
      State("network", "selectedNodeData"), State("number-of-edges-label-network", "children"), 
      State("edit-edges-modal-body-network", "children"), State("network", "selectedEdgeData"), 
      State('nodes-info-network', 'data'), State('select-algorithm-dropown-network', 'value'),
      State('result-text-network', 'children'), State('result-div-network', 'style'),
-     State('network-copy', 'data'), State("select-source-and-sink-nodes-modal-body", "children")]
+     State('network-session', 'data'), State("select-source-and-sink-nodes-modal-body", "children")]
 )
 def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
+    add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
+    run_algorithm_btn, clear_result_btn, done_btn_select_source_and_sink_nodes, number_of_nodes, 
+    edit_nodes_modal_body_childrens, selected_node_data, number_of_edges, edit_edges_modal_body_childrens, 
+    selected_edge_data, nodes_info, select_algorithm_dropdown, result_text_children, result_div_style,
+    session_data, select_source_and_sink_nodes_modal_body_children):
+    if not dash.callback_context.triggered:
+        return dash.no_update
+
+    # The Store keeps the Id of the session and the revision of the elements the browser has
+    if not isinstance(session_data, dict):
+        session_data = {}
+
+    # Load a fresh copy of the network of this session from the server-side store. Callbacks of the
+    # same session wait for each other, and nothing is kept unless the callback gets to guardar
+    with network_store.abrir(session_data.get('id')) as (session_id, session):
+        # The callback changes the elements and the table in place, so keep what the browser has now
+        previous_elements, previous_table = copy.deepcopy((session['elements'], session['table']))
+        outputs = updateNetworkElements(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
+            add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
+            run_algorithm_btn, clear_result_btn, done_btn_select_source_and_sink_nodes, session['elements'], 
+            session['table'], number_of_nodes, edit_nodes_modal_body_childrens, selected_node_data, number_of_edges, 
+            edit_edges_modal_body_childrens, selected_edge_data, nodes_info, select_algorithm_dropdown, 
+            result_text_children, result_div_style, session['copy'], select_source_and_sink_nodes_modal_body_children)
+        if outputs is dash.no_update:
+            return dash.no_update
+
+        # Save the new network; the copy of the elements without results never leaves the server
+        graph_elements, nodes_degrees_table_children, *other_outputs, graph_copy = outputs
+        nodes_degrees_table = componentes_a_json(nodes_degrees_table_children)
+        # The browser has the stored elements only if it got the response that saved them
+        synced = 'revision' in session and session['revision'] == session_data.get('revision')
+        session['elements'] = graph_elements
+        session['table'] = nodes_degrees_table
+        session['copy'] = graph_copy
+        session['revision'] = session.get('revision', 0) + 1
+        network_store.guardar(session_id, session)
+
+    # Send only the changes to the elements and the degree table. Everything is sent when the browser
+    # doesn't have the stored elements (a new session, one the store no longer had, or a response
+    # the browser dropped because a newer one was on its way)
+    if synced:
+        elements_output, table_output = dash.Patch(), dash.Patch()
+        if not parchar_elementos(elements_output, previous_elements, graph_elements):
+            elements_output = dash.no_update
+        if not parchar_lista(table_output, previous_table, nodes_degrees_table, llave_fila):
+            table_output = dash.no_update
+    else:
+        elements_output, table_output = graph_elements, nodes_degrees_table
+
+    return [elements_output, table_output, *other_outputs, {'id': session_id, 'revision': session['revision']}]
+
+def updateNetworkElements(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes_btn, edit_nodes_btn,
     add_edge_btn, done_btn_edit_edges_modal, edit_edges_btn, remove_edges_btn, upload_graph_contents,
     run_algorithm_btn, clear_result_btn, done_btn_select_source_and_sink_nodes, graph_elements, nodes_degrees_table_children, number_of_nodes, 
     edit_nodes_modal_body_childrens, selected_node_data, number_of_edges, edit_edges_modal_body_childrens, 
@@ -446,7 +518,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Add node case -----
         if btn_triggered == "add-node-btn-network":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
 
             # Getting an unique initial name
@@ -511,7 +583,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Edit nodes case -----
         elif btn_triggered == "done-btn-edit-nodes-modal-network":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
 
             # Excluding the H3 elements
@@ -668,7 +740,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ---- Edit nodes button alert handle -----
         elif btn_triggered == "edit-nodes-btn-network":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             print("Selected node data")
@@ -681,7 +753,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Remove nodes case ------
         elif btn_triggered == "remove-nodes-btn-network":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if selected_node_data:
@@ -729,7 +801,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Add Edge case -----
         elif btn_triggered == "add-edge-btn-network":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             # When no node is selected
@@ -811,7 +883,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Edit edges case -----
         elif btn_triggered == "done-btn-edit-edges-modal-network":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             radio_buttons = [c for c in edit_edges_modal_body_childrens if edit_edges_modal_body_childrens.index(c) % 2 == 0]
             edit_edges_modal_body_childrens = [c for c in edit_edges_modal_body_childrens if c not in radio_buttons]
@@ -1008,7 +1080,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ---- Edit edges button alert handle -----
         elif btn_triggered == "edit-edges-btn-network":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if not selected_edge_data:
@@ -1020,7 +1092,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Remove edges case -----
         elif btn_triggered == "remove-edges-btn-network":
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             alert = None
             if not selected_edge_data:
@@ -1060,213 +1132,41 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         # ----- Upload Graph Case -----
         elif btn_triggered == 'upload-network-obj':
             nodes_info = [['a',1]]
-            # Read the file and convert it to list of elements
-            content_type, content_string = upload_graph_contents.split(',')
-            graph = [x.replace(" ", "").split(",") for x in base64.b64decode(content_string).decode('ascii').strip().split("\n") if x] 
-            print(graph)
-
+            # Read the file (plain or gzip-compressed text) and build the elements in a single pass,
+            # validating each node and edge as it's read
             alert = None
-            nodes = [e for e in graph if len(e) == 4]
-            edges = [e for e in graph if len(e) == 6]
-
-            # Validate non repetitions in nodes labels
-            labels = []
-            for n in nodes:
-                if n[0] not in labels:
-                    labels.append(n[0])
-                else:
-                    # Repetition in nodes label
-                    alert = 11
-                    break
-            # Validate if each node of an edge exists
-            if not alert:
-                for e in edges:
-                    if e[0] not in labels or e[1] not in labels:
-                        # Edge with nonexistent node
-                        alert = 12
-                        break
-
-            # Validate the data format
-            if not alert:
-                for element in graph:
-                    # Just accept edges: [a,b,min_res,flow,capacity,cost]
-                    # or nodes: [a,min_res,max_res, cost]
-                    if len(element) != 6 and len(element) != 4: 
-                        alert = 7
-                        break
-
-                    # Nodes validation
-                    if len(element) == 4:
-                        # Validate if node restrictions are non negative numbers
-                        try:
-                            for i in range(1,3):
-                                element[i] = float(element[i])
-                                if element[i] < 0:
-                                    raise Exception()
-                        except:
-                            # Restrictions aren't numbers or are negative numbers
-                            alert = 8 
-                            break
-                        # Validate min restriction. As max_restriction just need to be greater than min_restriction,
-                        # this case will also validate max_restriction
-                        if element[1] == math.inf or element[1] > element[2]:
-                            # Inconsistent node restrictions
-                            alert = 9 
-                            break
-
-                    # Edges validation
-                    if len(element) == 6:
-                        # Validate if node restrictions (min_restriction, flow, max_restriction)are non negative numbers
-                        try:
-                            for i in range(2,5):
-                                element[i] = float(element[i])
-                                if element[i] < 0:
-                                    raise Exception()
-                        except:
-                            # Restrictions aren't numbers or are negative numbers
-                            alert = 8 
-                            break
-
-                        # Validate if cost is not infinite
-                        try:
-                            element[5] = float(element[5])
-                            if element[i] == math.inf:
-                                raise Exception()
-                        except:
-                            # Invalid cost.
-                            alert = 13
-                            break
-
-                        # Validate min_restriction
-                        if element[2] > element[4]:
-                            # Inconsistent edges restrictions
-                            alert = 10
-                            break
-                        
-                        # Validate new flow
-                        if element[3] > element[4]:
-                            alert = 10
-                            break
-                        
-                        # Validate new capacity
-                        if element[4] < element[2] or element[4] < element[3]:
-                            alert = 10
-                            break
-
-                        # *********** Cost need no validation since it is independent **********
+            try:
+                new_nodes, new_edges = elementos_red(decodificar_archivo(upload_graph_contents))
+            except ArchivoInvalido as error:
+                alert = upload_alerts[error.motivo]
 
-            
             # If file format is ok, then we proceed to create the graph in the interface
             if not alert:
-                # Resetting all variables
-                new_nodes = []
-                new_edges = []
-                number_of_edges = 0
-                number_of_nodes = 0
-                data_info = ['a', 1]
-
-                # To store nodes degrees and then create the table
-                nodes_degrees = {}
-
-                # Check if the elements are nodes or edges and add it to UI and data structure
-                for element in graph:
-                    element_splitted = element
-                    # When it's a node
-                    if len(element_splitted) == 4:
-                        # Check if max restriction is Inf to store it as string
-                        if element_splitted[2] == math.inf:
-                            element_splitted[2] = 'Inf'
-
-                        # Add it to the new nodes
-                        node = {'data': {'id': str(uuid.uuid1()), 'label': element_splitted[0], 'positive_degree':0, 'negative_degree':0,
-                                'min_restriction':element_splitted[1], 'max_restriction':element_splitted[2],
-                                'supply/demand':element_splitted[3]},
-                                'position': {'x':random.uniform(0,500),'y':random.uniform(0,500)},
-                                'classes':'node'}
-
-                        new_nodes.append(node)
-
-                        # Adding the node to the degrees dict
-                        nodes_degrees[element_splitted[0]] = {'positive_degree':0, 'negative_degree':0, 
-                                                              'min_restriction':element_splitted[1],
-                                                              'max_restriction':element_splitted[2],
-                                                              'supply/demand':element_splitted[3]}
-                        number_of_nodes += 1
-
-                    # When it's an edge
-                    else:
-                        # To store nodes ids
-                        node1_id = None
-                        node2_id = None
-                        
-                        # add the edge between the nodes
-
-                        # Find the node1 id
-                        for n in new_nodes:
-                            if n['data']['label'] == element_splitted[0]:
-                                node1_id = n['data']['id']
-                                break
-                        
-                        # Find the node2 id
-                        for n in new_nodes:
-                            if n['data']['label'] == element_splitted[1]:
-                                node2_id = n['data']['id']
-                                break
-
-                        # Create the edge
-                        edge_id = str(uuid.uuid1())
-                        # Getting min restriction
-                        min_restriction = element_splitted[2]
-                        # Getting flow
-                        flow = element_splitted[3]
-                        # Getting cost
-                        cost = element_splitted[5]
-                        # Getting max restriction
-                        if element_splitted[4] == math.inf:
-                            max_restriction = "Inf"
-                        else:
-                            max_restriction = element_splitted[4]
-                        
-                        edge = {'data': { 'source': node1_id, 
-                                'target': node2_id, 'restrictions': [min_restriction,flow,max_restriction,cost], 
-                                'id':edge_id, 'source_node':element_splitted[0], 
-                                'target_node':element_splitted[1]},
-                                'classes':'edge'}
-
-                        new_edges.append(edge)
-                        number_of_edges += 1
-
-                        # Update the edge nodes degrees
-                        nodes_degrees[element_splitted[0]]['positive_degree'] += 1
-                        nodes_degrees[element_splitted[1]]['negative_degree'] += 1
-                
                 # Updating the graph elements
                 graph_elements['nodes'] = new_nodes
                 graph_elements['edges'] = new_edges
+                number_of_nodes = len(new_nodes)
+                number_of_edges = len(new_edges)
 
                 # Creating the table
                 nodes_degrees_table_children = []
-                for node in nodes_degrees .items():   
+                for node in new_nodes:
+                    node = node['data']
                     nodes_degrees_table_children.append(html.Tr(
                         [
-                            html.Td(node[0], style={"text-align":"center", "width":"16.6%"}), 
-                            html.Td(node[1]['positive_degree'],  style={"text-align":"center", "width":"16.6%"}),
-                            html.Td(node[1]['negative_degree'],  style={"text-align":"center", "width":"16.6%"}),
-                            html.Td(node[1]['min_restriction'],  style={"text-align":"center", "width":"16.6%"}),
-                            html.Td(node[1]['max_restriction'],  style={"text-align":"center", "width":"16.6%"}),
-                            html.Td(node[1]['supply/demand'],  style={"text-align":"center", "width":"16.6%"}),
+                            html.Td(node['label'], style={"text-align":"center", "width":"16.6%"}), 
+                            html.Td(node['positive_degree'],  style={"text-align":"center", "width":"16.6%"}),
+                            html.Td(node['negative_degree'],  style={"text-align":"center", "width":"16.6%"}),
+                            html.Td(node['min_restriction'],  style={"text-align":"center", "width":"16.6%"}),
+                            html.Td(node['max_restriction'],  style={"text-align":"center", "width":"16.6%"}),
+                            html.Td(node['supply/demand'],  style={"text-align":"center", "width":"16.6%"}),
                         ], className="table-primary"))
             
             # Clean the upload content so we can upload a diferent file
             upload_graph_contents = ""
 
             print("READ GRAPH CASE")
-            print("Nodes")
-            for n in graph_elements['nodes']:
-                print(n)
-            print("\n\nEdges")
-            for e in graph_elements['edges']:
-                print(e)
+            print(len(graph_elements['nodes']), "nodes,", len(graph_elements['edges']), "edges")
             print("------------------------------\n")
 
             return graph_elements, nodes_degrees_table_children, number_of_nodes, alert, number_of_edges, nodes_info, "",result_text_children, result_div_style, None
@@ -1275,9 +1175,11 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         elif btn_triggered == 'done-btn-select-source-and-sink-nodes-modal':
             
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
 
-            graph_elements_copy = copy.deepcopy(graph_elements)
+            # The original elements are kept to clear the result later; only the copy is painted
+            graph_elements_copy = graph_elements
+            graph_elements = copia_para_resultados(graph_elements)
             alert = None
 
             # Read sources and sinks nodes
@@ -1311,30 +1213,33 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
                 alert = 16
 
             # Alert if target flow is needed and it is incorrect or unexistent
-            if (target_flow == None and select_algorithm_dropdown != "Find maximum flow using Ford-Fulkerson algorithm"
+            if (target_flow == None and select_algorithm_dropdown not in max_flow_algorithms
                 and select_algorithm_dropdown != "Find total minimum-cost flow using Simplex algorithm"):
                 # Target flow is needed 
                 alert = 17
                 
             if not alert:    
                 result_div_style = {'display':''}
-                # Creat a red object
-                g = Red()
-                # Adding all nodes
-                for node in graph_elements['nodes']:
-                    g.agregar_nodo(node['data']['label'],node['data']['min_restriction'],node['data']['max_restriction'],node['data']['supply/demand'])
-                # Adding all edges
-                for edge in graph_elements['edges']:
-                    g.agregar_arco(edge['data']['source_node'], edge['data']['target_node'],
-                                   edge['data']['restrictions'][0],edge['data']['restrictions'][1],
-                                   edge['data']['restrictions'][2], edge['data']['restrictions'][3],
-                                   edge['data']['id'])
+                # Creat a red object with all nodes and edges in a single pass
+                nodes = [node['data'] for node in graph_elements['nodes']]
+                edges = [edge['data'] for edge in graph_elements['edges']]
+                g = Red.desde_arreglos([edge['source_node'] for edge in edges],
+                                       [edge['target_node'] for edge in edges],
+                                       res_min=[edge['restrictions'][0] for edge in edges],
+                                       flujos=[edge['restrictions'][1] for edge in edges],
+                                       capacidades=[edge['restrictions'][2] for edge in edges],
+                                       costos=[edge['restrictions'][3] for edge in edges],
+                                       ids=[edge['id'] for edge in edges],
+                                       nodos=[node['label'] for node in nodes],
+                                       res_min_nodos=[node['min_restriction'] for node in nodes],
+                                       res_max_nodos=[node['max_restriction'] for node in nodes],
+                                       oferta_demanda=[node['supply/demand'] for node in nodes])
                 
                 # ----- ALGORITHM TO RUN -----
-                # Ford-Fulkerson
-                if select_algorithm_dropdown == "Find maximum flow using Ford-Fulkerson algorithm":
+                # Maximum flow (Ford-Fulkerson, Dinic or Push-Relabel)
+                if select_algorithm_dropdown in max_flow_algorithms:
                     # Getting result
-                    max_flow = g.flujo_maximo(sources, sinks)
+                    max_flow = g.flujo_maximo(sources, sinks, algoritmo=max_flow_algorithms[select_algorithm_dropdown])
                     edges = g.arcos()
                     print(type(max_flow))
                     
@@ -1380,9 +1285,13 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
                         txt = f"Current restrictions could not be satisfied. The problem has no solution."
                         result_text_children = html.P([txt])
                 
-                elif select_algorithm_dropdown == "Find minimum-cost flow using Primal algorithm":
+                elif select_algorithm_dropdown in ("Find minimum-cost flow using Primal algorithm",
+                                                   "Find minimum-cost flow using Successive Shortest Paths algorithm"):
                     # Getting the cost
-                    cost = g.algoritmo_primal(sources, sinks, target_flow)
+                    if select_algorithm_dropdown == "Find minimum-cost flow using Primal algorithm":
+                        cost = g.algoritmo_primal(sources, sinks, target_flow)
+                    else:
+                        cost = g.flujo_costo_minimo(sources, sinks, target_flow)
 
                     # If not cost, do nothing but write the result
                     if not cost:
@@ -1509,7 +1418,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         elif btn_triggered == "run-algorithm-btn-network":
             print("Algoritmo a correr:", select_algorithm_dropdown)
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
 
             alert = None
@@ -1523,7 +1432,7 @@ def updateNetwork(add_node_btn_n_clicks, done_btn_edit_nodes_modal, remove_nodes
         elif btn_triggered == 'clear-result-btn-network':
             alert = None
             if graph_copy:
-                graph_elements = copy.deepcopy(graph_copy)
+                graph_elements = graph_copy
                 graph_copy = None
             result_text_children = []
             result_div_style = {'display':'None'}
@@ -1716,7 +1625,7 @@ def toggleModal(run_algorithm_btn, cancel_btn_select_source_and_sink_nodes_modal
                         ], style={"padding-left":"1em"})
                     )
                 
-                if select_algorithm_dropdown != "Find maximum flow using Ford-Fulkerson algorithm":
+                if select_algorithm_dropdown not in max_flow_algorithms:
                     node_forms.append(
                         dbc.Form(
                             [
@@ -1795,4 +1704,7 @@ def manageAlert(alert_info):
     elif alert_info == 17:
         text = "Error. Incorrect target flow. Please, check it and try again"
         show = True
+    elif alert_info == 18:
+        text = "Error. The file is too large. Please, upload a smaller (or gzip-compressed) file"
+        show = True
     return text, show
\ No newline at end of file
@@ -0,0 +1,221 @@
+import math
+from estructuras_datos import *
+
+class VistaRed:
+    """
+        Esta clase es una vista de una red de transporte. Sobre ella los algoritmos de flujo
+        hacen las transformaciones que necesitan (super fuente y super sumidero, partición de
+        los nodos con restricciones, fuente y sumidero ficticios) sin agregar ni eliminar
+        nodos y arcos de la red.
+
+        Los nodos y arcos que se agregan a la vista son ficticios: son objetos Nodo y Arco
+        que sólo aparecen en las listas de la vista. Al particionar un nodo, sus arcos
+        salientes no se eliminan ni se vuelven a crear; la vista sólo reasigna su origen al
+        nodo de salida, por lo que los algoritmos toman el origen de un arco con origen() en
+        lugar de arco.origen. Las listas de salientes y entrantes de la red se comparten, y
+        sólo se copian las de los nodos que la vista cambia.
+
+        Los cambios hechos en la vista se deshacen con instantanea() y restaurar(), igual
+        que en la red.
+    """
+    def __init__(self, red, buscar_nodo, clase_nodo, clase_arco):
+        """
+            Este método construye la vista
+            Parámetros
+            ----------
+            red: Diccionario de la red (nodo -> {"entrantes": [...], "salientes": [...]})
+            buscar_nodo: Función que busca un nodo de la red por su nombre
+            clase_nodo: Clase con la que se crean los nodos ficticios
+            clase_arco: Clase con la que se crean los arcos ficticios
+        """
+        self.__red = red
+        self.__buscar_nodo = buscar_nodo
+        self.__clase_nodo = clase_nodo
+        self.__clase_arco = clase_arco
+        self.__ficticios = {} # Índice nombre -> nodo ficticio
+        self.__salientes = {} # Listas de salientes que la vista cambió
+        self.__entrantes = {} # Listas de entrantes que la vista cambió
+        self.__origenes = {} # Origen en la vista de los arcos reasignados por una partición
+        self.__particiones = {} # Nodo particionado -> nodo de salida
+        self.__bitacora = Bitacora() # Cambios que se pueden deshacer con restaurar()
+
+    def buscar_nodo(self, nombre):
+        """
+            Este método busca un nodo de la vista (ficticio o de la red) por su nombre
+            Regresa
+            -------
+            El nodo, o False si no existe
+        """
+        nodo = self.__ficticios.get(nombre)
+        if nodo is None:
+            return self.__buscar_nodo(nombre)
+        return nodo
+
+    def nodos(self):
+        """
+            Este método regresa la lista de nodos de la vista: los de la red y después los
+            ficticios, en el orden en el que se agregaron
+        """
+        return list(self.__red) + list(self.__ficticios.values())
+
+    def salientes(self, nodo):
+        """
+            Este método regresa la lista de arcos que salen del nodo en la vista
+        """
+        lista = self.__salientes.get(nodo)
+        if lista is None:
+            return self.__red[nodo]["salientes"]
+        return lista
+
+    def entrantes(self, nodo):
+        """
+            Este método regresa la lista de arcos que entran al nodo en la vista
+        """
+        lista = self.__entrantes.get(nodo)
+        if lista is None:
+            return self.__red[nodo]["entrantes"]
+        return lista
+
+    def arcos(self):
+        """
+            Este método regresa la lista de arcos de la vista, recorriendo los salientes de
+            cada nodo
+        """
+        return [arco for nodo in self.nodos() for arco in self.salientes(nodo)]
+
+    def origen(self, arco):
+        """
+            Este método regresa el nodo del que sale el arco en la vista. Es arco.origen,
+            salvo para los arcos que salen de un nodo particionado.
+        """
+        return self.__origenes.get(arco, arco.origen)
+
+    def particion(self, nodo):
+        """
+            Este método regresa el nodo de salida de un nodo particionado, o None si el nodo
+            no está particionado
+        """
+        return self.__particiones.get(nodo)
+
+    def agregar_nodo(self, nombre, res_min=0, res_max=math.inf):
+        """
+            Este método agrega un nodo ficticio a la vista
+            Parámetros
+            ----------
+            nombre: Nombre del nodo
+            res_min: Restricción mínima del nodo
+            res_max: Restricción máxima del nodo
+            Regresa
+            -------
+            El nodo ficticio
+        """
+        nodo = self.__clase_nodo(nombre, float(res_min), float(res_max))
+        self.__ficticios[nombre] = nodo
+        self.__salientes[nodo] = []
+        self.__entrantes[nodo] = []
+        self.__bitacora.anotar(self.__deshacer_agregar_nodo, nodo)
+        return nodo
+
+    def agregar_arco(self, origen, destino, res_min=0, flujo=0, capacidad=0, costo=0):
+        """
+            Este método agrega un arco ficticio a la vista
+            Parámetros
+            ----------
+            origen: Nodo de origen (de la red o ficticio)
+            destino: Nodo destino (de la red o ficticio)
+            res_min: Restricción mínima del arco
+            flujo: Flujo del arco
+            capacidad: Capacidad del arco
+            costo: Costo del arco
+            Regresa
+            -------
+            El arco ficticio
+        """
+        arco = self.__clase_arco(origen, destino, float(res_min), float(flujo), float(capacidad), float(costo))
+        copia_salientes = self.__copiar_lista(self.__salientes, origen, "salientes")
+        copia_entrantes = self.__copiar_lista(self.__entrantes, destino, "entrantes")
+        self.__salientes[origen].append(arco)
+        self.__entrantes[destino].append(arco)
+        self.__bitacora.anotar(self.__deshacer_agregar_arco, arco, copia_salientes, copia_entrantes)
+        return arco
+
+    def particionar(self, nodo):
+        """
+            Este método particiona un nodo con restricciones: se agrega un nodo ficticio de
+            salida (con el nombre del nodo seguido de '"'), los arcos que salen del nodo pasan
+            a salir del nodo de salida y se agrega un arco del nodo al nodo de salida con las
+            restricciones del nodo. El flujo de ese arco es el que ya sale del nodo.
+            Parámetros
+            ----------
+            nodo: Nodo que se particiona
+            Regresa
+            -------
+            El arco ficticio entre el nodo y su nodo de salida
+        """
+        salida = self.agregar_nodo(nodo.nombre + '"')
+        movidos = self.salientes(nodo)
+        salientes_anterior = self.__salientes.get(nodo)
+        self.__salientes[salida] = list(movidos)
+        self.__salientes[nodo] = []
+        for arco in movidos:
+            self.__origenes[arco] = salida
+        self.__particiones[nodo] = salida
+        self.__bitacora.anotar(self.__deshacer_particionar, nodo, salida, salientes_anterior)
+        return self.agregar_arco(nodo, salida, nodo.res_min, sum(arco.flujo for arco in movidos), nodo.res_max, 0)
+
+    def instantanea(self):
+        """
+            Este método toma una instantánea de la vista, a la que se puede regresar con
+            restaurar()
+            Regresa
+            -------
+            La instantánea, que se le pasa a restaurar()
+        """
+        return self.__bitacora.instantanea()
+
+    def restaurar(self, instantanea):
+        """
+            Este método quita los nodos, arcos y particiones agregados a la vista después de
+            tomar la instantánea. Los flujos de los arcos de la red no cambian.
+            Parámetros
+            ----------
+            instantanea: Instantánea regresada por instantanea()
+        """
+        self.__bitacora.restaurar(instantanea)
+
+    def __copiar_lista(self, listas, nodo, tipo):
+        """
+            Este método copia la lista de arcos de un nodo de la red la primera vez que la
+            vista la cambia
+            Regresa
+            -------
+            True si se copió la lista
+        """
+        if nodo in listas:
+            return False
+        listas[nodo] = list(self.__red[nodo][tipo])
+        return True
+
+    def __deshacer_agregar_nodo(self, nodo):
+        del self.__ficticios[nodo.nombre]
+        del self.__salientes[nodo]
+        del self.__entrantes[nodo]
+
+    def __deshacer_agregar_arco(self, arco, copia_salientes, copia_entrantes):
+        if copia_salientes:
+            del self.__salientes[arco.origen]
+        else:
+            self.__salientes[arco.origen].pop()
+        if copia_entrantes:
+            del self.__entrantes[arco.destino]
+        else:
+            self.__entrantes[arco.destino].pop()
+
+    def __deshacer_particionar(self, nodo, salida, salientes_anterior):
+        for arco in self.__salientes[salida]:
+            del self.__origenes[arco]
+        del self.__particiones[nodo]
+        if salientes_anterior is None:
+            del self.__salientes[nodo]
+        else:
+            self.__salientes[nodo] = salientes_anterior
@@ -1,8 +1,9 @@
-import copy
+import heapq
 import operator
 import math
 from typing import MappingView
 from estructuras_datos import *
+from lector_aristas import leer_registros
 
 class Arco:
     """
@@ -36,8 +37,12 @@ class Digrafica:
     """
     def __init__(self):
         self.__digrafica = {} # Estructura donde se va a guardar la gráfica
+        self.__nodos = {} # Índice nombre -> nodo para búsquedas en tiempo constante
+        self.__arcos = {} # Índice (origen, destino) -> arcos entre ese par de nodos
+        self.__arcos_id = {} # Índice Id -> arco
         self.__num_nodos = 0 # Contador de nodos
         self.__num_arcos = 0 # Contador de arcos
+        self.__bitacora = Bitacora() # Cambios que se pueden deshacer con restaurar()
 
     def buscar_nodo(self, nombre):
         """
@@ -50,10 +55,7 @@ class Digrafica:
             True si el nodo se encuentra en la digráfica.
             None si el nodo no se encuentra en la digráfica. 
         """
-        for nodo in self.__digrafica:
-            if nodo.nombre == nombre:
-                return nodo
-        return False 
+        return self.__nodos.get(nombre, False)
 
     def agregar_nodo(self, nombre):
         """
@@ -74,9 +76,11 @@ class Digrafica:
         # con dos listas vacías, la lista de nodos "entrantes" y la lista de nodos "salientes"
         nodo = Nodo(nombre, etiqueta=None)
         self.__digrafica[nodo] = {"entrantes":[], "salientes":[]}
+        self.__nodos[nombre] = nodo
 
         # El número de nodos en la digráfica se incrementa y se regresa True
         self.__num_nodos += 1
+        self.__bitacora.anotar(self.__deshacer_agregar_nodo, nodo)
         return True
 
     def agregar_arco(self, a, b, peso=None, Id=None):
@@ -87,6 +91,10 @@ class Digrafica:
             a: Nodo de origen.
             b: Nodo destino.
             peso: Peso del arco.
+            Id: Identificador del arco.
+            Regresa
+            -------
+            El objeto de la clase Arco que se agregó.
         """
         # Se agregan los nodos a y b (Esto porque le damos la opción al usuario de 
         # agregar arcos directamente sin la necesidad de que los nodos ya existan
@@ -111,14 +119,23 @@ class Digrafica:
         self.__digrafica[nodo_b]["entrantes"].append(arco)
         nodo_b.grado_negativo += 1
 
+        # El arco se registra en los índices por par de nodos y por Id
+        self.__arcos.setdefault((nodo_a, nodo_b), []).append(arco)
+        id_anterior = None
+        if Id is not None:
+            id_anterior = self.__arcos_id.get(Id)
+            self.__arcos_id[Id] = arco
+
         # El contador de arcos se incrementa
         self.__num_arcos += 1
+        self.__bitacora.anotar(self.__deshacer_agregar_arco, arco, id_anterior)
         
-        return True
+        return arco
 
     def leer_digrafica(self, archivo):
         """
-            Este método lee una digráfica desde un archivo
+            Este método lee una digráfica desde un archivo. El archivo se lee por bloques y
+            cada línea se agrega en cuanto se lee, así que no se guarda completo en memoria.
             Parámetros
             ----------
             archivo: Ruta del archivo de texto en donde se encuentra la información
@@ -126,19 +143,14 @@ class Digrafica:
                      a -> Para agregar el nodo a
                      a,b -> Para agregar el arco (a,b)
                      a,b,5 -> Para agregar el arco (a,b) con peso 5
+                     Las líneas vacías se ignoran; si una línea no tiene este formato se
+                     lanza ValueError con el número de línea.
         """
-        file1 = open(archivo, 'r') 
-        Lines = file1.readlines() 
-
-        for line in Lines:
-            line = line.strip().split(",")
-            length = len(line)
-            if length == 1:
-                self.agregar_nodo(line[0])
-            elif length == 2:
-                self.agregar_arco(line[0], line[1])
-            elif length == 3:
-                self.agregar_arco(line[0], line[1], float(line[2]))
+        for campos in leer_registros(archivo, {1: 1, 2: 2, 3: 2}):
+            if len(campos) == 1:
+                self.agregar_nodo(campos[0])
+            else:
+                self.agregar_arco(*campos)
 
     def buscar_arco(self, a, b, peso=None):
         """
@@ -162,33 +174,45 @@ class Digrafica:
         if not nodo_a:
             return False
         
-        # Si el nodo de origen sí existe, entonces se busca el arco en sus salientes
-        
+        # Si el nodo de origen sí existe, entonces se toman únicamente los arcos que
+        # van de a hacia b desde el índice por par de nodos
+        arcos = self.__arcos.get((nodo_a, self.buscar_nodo(b)), [])
+
         if peso == None:
             peso_minimo = math.inf
             arco_minimo = None
-            for arco in self.__digrafica[nodo_a]["salientes"]:
-                # Si no se ha especificado un peso, entonces solamente se compara el 
-                # nombre del nodo destino y buscamos el de peso menor
-                if arco.destino.nombre == b and arco.peso < peso_minimo:
+            for arco in arcos:
+                # Si no se ha especificado un peso, entonces buscamos el de peso menor
+                if arco.peso < peso_minimo:
                         arco_minimo = arco
                         peso_minimo = arco.peso
       
             return arco_minimo
               
         else:
-            for arco in self.__digrafica[nodo_a]["salientes"]:
-                # Si el peso se ha especificado, entonces se compara el nombre del nodo 
-                # destino y el peso del arco
-                if arco.destino.nombre == b and arco.peso == peso:
+            for arco in arcos:
+                # Si el peso se ha especificado, entonces se compara el peso del arco
+                if arco.peso == peso:
                     return arco
         
         # Si se recorrieron todos los salientes del nodo de origen y no se encontró
         # el arco buscado, entonces se regresa False
         return False
+
+    def buscar_arco_id(self, Id):
+        """
+            Este método busca un arco por su identificador
+            Parámetros
+            ----------
+            Id: Identificador del arco a buscar.
+            Regresa
+            -------
+            arco: Si existe, el objeto de la clase Arco con ese Id.
+            False: Si el arco no existe.
+        """
+        return self.__arcos_id.get(Id, False)
     
-    
-    def eliminar_arco(self, a, b, peso=None):
+    def eliminar_arco(self, a=None, b=None, peso=None, obj_arco=None):
         """
             Este método elimina un arco de la digráfica
             Parámetros
@@ -196,6 +220,8 @@ class Digrafica:
             a: Nodo de origen del arco
             b: Nodo destino del arco
             peso (None por default): peso del arco
+            obj_arco (None por default): Objeto del arco a eliminar. Si se proporciona,
+                                         no se busca el arco por sus atributos.
             Regresa
             -------
             True: Si el arco pudo eliminarse (si existía)
@@ -203,24 +229,33 @@ class Digrafica:
         """    
 
         # Se busca el arco
-        arco = self.buscar_arco(a, b, peso)
+        if not obj_arco:
+            arco = self.buscar_arco(a, b, peso)
+        else:
+            arco = obj_arco
 
         # Si existe el arco, entonces se procede a elminarlo
         if arco:
             # El arco se elimina de los salientes del nodo de origen y el peso positivo
             # de éste se decrementa
             nodo_origen = arco.origen
-            self.__digrafica[nodo_origen]["salientes"].remove(arco)
+            i = self.__digrafica[nodo_origen]["salientes"].index(arco)
+            del self.__digrafica[nodo_origen]["salientes"][i]
             nodo_origen.grado_positivo -= 1
 
             # El arco se elimina de los entrantes del nodo destino y el peso negativo
             # de éste se decrementa
             nodo_destino = arco.destino
-            self.__digrafica[nodo_destino]["entrantes"].remove(arco)
+            j = self.__digrafica[nodo_destino]["entrantes"].index(arco)
+            del self.__digrafica[nodo_destino]["entrantes"][j]
             nodo_destino.grado_negativo -= 1
 
+            # El arco se elimina de los índices
+            k, quito_id = self.__quitar_de_indices(arco)
+
             # Se decrementa el número de arcos de la digráfica
             self.__num_arcos -= 1
+            self.__bitacora.anotar(self.__deshacer_eliminar_arco, arco, i, j, k, quito_id)
 
             # Se regresa True para indicar que el arco se pudo eliminar
             return True
@@ -247,22 +282,49 @@ class Digrafica:
             # Se eliminan todos los arcos salientes
             while self.__digrafica[nodo]["salientes"]:
                 arco = self.__digrafica[nodo]["salientes"][0]
-                self.eliminar_arco(arco.origen.nombre, arco.destino.nombre)
+                self.eliminar_arco(obj_arco=arco)
             
             # Se eliminan todos los arcos entrantes
             while self.__digrafica[nodo]["entrantes"]:
                 arco = self.__digrafica[nodo]["entrantes"][0]
-                self.eliminar_arco(arco.origen.nombre, arco.destino.nombre)
+                self.eliminar_arco(obj_arco=arco)
 
             # Cuando todos los arcos incidentes en el nodo se hayan eliminado procedemos a 
             # eliminar el nodo de la digráfica y decrementamos el contador de nodos
+            if self.__bitacora.instantaneas:
+                self.__bitacora.anotar(self.__deshacer_eliminar_nodo, nodo, self.__posicion_nodo(nodo))
             self.__digrafica.pop(nodo)
+            self.__nodos.pop(nodo.nombre)
             self.__num_nodos -= 1
 
             return True
         else:
             return False
     
+    def __quitar_de_indices(self, arco):
+        """
+            Este método quita un arco de los índices por par de nodos y por Id
+            Parámetros
+            ----------
+            arco: Objeto del arco que se va a quitar
+            Regresa
+            -------
+            La posición que tenía el arco entre los arcos de su par de nodos, y True si se
+            quitó su Id del índice
+        """
+        llave = (arco.origen, arco.destino)
+        arcos = self.__arcos[llave]
+        k = arcos.index(arco)
+        del arcos[k]
+        if not arcos:
+            self.__arcos.pop(llave)
+
+        # Sólo se quita el Id si apunta a este mismo arco
+        if arco.Id is not None and self.__arcos_id.get(arco.Id) is arco:
+            self.__arcos_id.pop(arco.Id)
+            return k, True
+        return k, False
+
     def obtener_grado(self, nombre, tipo="positivo"):
         """
             Este método obtiene el grado positivo de un nodo de la gráfica
@@ -324,12 +386,12 @@ class Digrafica:
             # Se eliminan todos los arcos salientes
             while self.__digrafica[nodo]["salientes"]:
                 arco = self.__digrafica[nodo]["salientes"][0]
-                self.eliminar_arco(arco.origen.nombre, arco.destino.nombre)
+                self.eliminar_arco(obj_arco=arco)
             
             # Se eliminan todos los arcos entrantes
             while self.__digrafica[nodo]["entrantes"]:
                 arco = self.__digrafica[nodo]["entrantes"][0]
-                self.eliminar_arco(arco.origen.nombre, arco.destino.nombre)
+                self.eliminar_arco(obj_arco=arco)
             
             # Se regresa True
             return True
@@ -341,48 +403,136 @@ class Digrafica:
         """
             Este método limpia la gráfica
         """
+        self.__bitacora.anotar(self.__deshacer_vaciar_grafica, self.__digrafica, self.__nodos, self.__arcos,
+                               self.__arcos_id, self.__num_nodos, self.__num_arcos)
         self.__digrafica = {}
+        self.__nodos = {}
+        self.__arcos = {}
+        self.__arcos_id = {}
         self.__num_nodos = 0
         self.__num_arcos = 0
     
 
     def copiar(self):
         """
-            Este método realiza una copia de la gráfica
+            Este método realiza una copia de la digráfica. Los nodos y arcos se copian uno por uno
+            (sólo sus atributos y referencias), en lugar de pasar por copy.deepcopy
             Regresa
             -------
-            Objeto de la clase Digráfica que representa la copia del objeto actual.
+            Objeto de la clase Digrafica que representa la copia del objeto actual.
         """
-        return copy.deepcopy(self)
-    
-    def __limpiar_etiquetas(self, tipo):
+        copia = Digrafica()
+        nodos = {nodo: copia_superficial(nodo) for nodo in self.__digrafica}
+        arcos = {}
+        for entrada in self.__digrafica.values():
+            for arco in entrada["salientes"]:
+                nuevo = copia_superficial(arco)
+                nuevo.origen = nodos[arco.origen]
+                nuevo.destino = nodos[arco.destino]
+                arcos[arco] = nuevo
+        for nodo, entrada in self.__digrafica.items():
+            copia.__digrafica[nodos[nodo]] = {"entrantes": [arcos[arco] for arco in entrada["entrantes"]],
+                                        "salientes": [arcos[arco] for arco in entrada["salientes"]]}
+        copia.__nodos = {nombre: nodos[nodo] for nombre, nodo in self.__nodos.items()}
+        copia.__arcos = {(nodos[a], nodos[b]): [arcos[arco] for arco in lista]
+                         for (a, b), lista in self.__arcos.items()}
+        copia.__arcos_id = {Id: arcos[arco] for Id, arco in self.__arcos_id.items()}
+        copia.__num_nodos = self.__num_nodos
+        copia.__num_arcos = self.__num_arcos
+        return copia
+
+    def instantanea(self):
+        """
+            Este método toma una instantánea de la digráfica, que se puede recuperar después con
+            restaurar(). No se copia nada: a partir de aquí cada cambio anota cómo deshacerse,
+            así que tomar y restaurar la instantánea cuesta lo mismo que los cambios hechos
+            Regresa
+            -------
+            La instantánea, que se le pasa a restaurar() o a confirmar()
+        """
+        return self.__bitacora.instantanea()
+
+    def restaurar(self, instantanea):
         """
-            Este método limpia las etiquetas de los nodos y/o aristas de la gráfica
+            Este método deshace los cambios (nodos, arcos) hechos después de tomar la
+            instantánea y la cierra, junto con las que se tomaron después de ella. Los atributos
+            que se cambian directamente en los objetos (como el peso de un arco) no se deshacen
             Parámetros
             ----------
-            tipo: Tipo del objeto del que deseamos eliminar las etiquetas
-                - "nodos": Para limpiar las etiquetas de los nodos
-                - "arcos": Para limpiar las etiquetas de los arcos
-                - "todo": Para limpiar las etiquetas de todos los arcos y aristas
+            instantanea: Instantánea regresada por instantanea()
         """
-        if tipo == "nodos":
-            for nodo in self.__digrafica:
-                nodo.etiqueta = None
-        elif tipo == "aristas":
-            for nodo in self.__digrafica:
-                for arco in self.__digrafica[nodo]["entrantes"]:
-                    arco.etiqueta = None
-                for arco in self.__digrafica[nodo]["salientes"]:
-                    arco.etiqueta = None
-        elif tipo == "todo":
-            for nodo in self.__digrafica:
-                for arco in self.__digrafica[nodo]["entrantes"]:
-                    arco.etiqueta = None
-                for arco in self.__digrafica[nodo]["salientes"]:
-                    arco.etiqueta = None
+        self.__bitacora.restaurar(instantanea)
+
+    def confirmar(self, instantanea):
+        """
+            Este método cierra la instantánea conservando los cambios
+            Parámetros
+            ----------
+            instantanea: Instantánea regresada por instantanea()
+        """
+        self.__bitacora.confirmar(instantanea)
+
+    def __posicion_nodo(self, nodo):
+        """
+            Este método regresa la posición del nodo en el orden de la digráfica. Casi siempre
+            se eliminan los últimos nodos agregados, así que primero se revisa el último
+        """
+        if next(reversed(self.__digrafica)) is nodo:
+            return len(self.__digrafica) - 1
+        return list(self.__digrafica).index(nodo)
+
+    def __deshacer_agregar_nodo(self, nodo):
+        self.__digrafica.pop(nodo)
+        self.__nodos.pop(nodo.nombre)
+        self.__num_nodos -= 1
+
+    def __deshacer_agregar_arco(self, arco, id_anterior):
+        self.__digrafica[arco.origen]["salientes"].pop()
+        arco.origen.grado_positivo -= 1
+        self.__digrafica[arco.destino]["entrantes"].pop()
+        arco.destino.grado_negativo -= 1
+        llave = (arco.origen, arco.destino)
+        self.__arcos[llave].pop()
+        if not self.__arcos[llave]:
+            self.__arcos.pop(llave)
+        if arco.Id is not None:
+            if id_anterior is None:
+                self.__arcos_id.pop(arco.Id)
+            else:
+                self.__arcos_id[arco.Id] = id_anterior
+        self.__num_arcos -= 1
+
+    def __deshacer_eliminar_arco(self, arco, i, j, k, quito_id):
+        self.__digrafica[arco.origen]["salientes"].insert(i, arco)
+        arco.origen.grado_positivo += 1
+        self.__digrafica[arco.destino]["entrantes"].insert(j, arco)
+        arco.destino.grado_negativo += 1
+        self.__arcos.setdefault((arco.origen, arco.destino), []).insert(k, arco)
+        if quito_id:
+            self.__arcos_id[arco.Id] = arco
+        self.__num_arcos += 1
+
+    def __deshacer_eliminar_nodo(self, nodo, posicion):
+        # El nodo regresa a su lugar en el orden de la digráfica, que es el orden en el que lo
+        # recorren los algoritmos
+        entrada = {"entrantes": [], "salientes": []}
+        if posicion == len(self.__digrafica):
+            self.__digrafica[nodo] = entrada
         else:
-            raise ValueError(f"Error en el tipo dado ({tipo}). Valores aceptados: 'nodos', 'aristas', 'todos'")
+            elementos = list(self.__digrafica.items())
+            elementos.insert(posicion, (nodo, entrada))
+            self.__digrafica = dict(elementos)
+        self.__nodos[nodo.nombre] = nodo
+        self.__num_nodos += 1
 
+    def __deshacer_vaciar_grafica(self, digrafica, nodos, arcos, arcos_id, num_nodos, num_arcos):
+        self.__digrafica = digrafica
+        self.__nodos = nodos
+        self.__arcos = arcos
+        self.__arcos_id = arcos_id
+        self.__num_nodos = num_nodos
+        self.__num_arcos = num_arcos
+    
     def __str__(self):
         """
             Este método imprime la digráfica
@@ -411,25 +561,44 @@ class Digrafica:
         return resultado 
     
 
-    def __recuperar_ruta(self, nodo_actual, nodo_inicial):
+    def __recuperar_ruta(self, nodo_actual, nodo_inicial, etiquetas):
         # Comenzamos la recuperación de la ruta en el nodo actual
         ruta = []
-        arista_antecesor = nodo_actual.etiqueta["antecesor"]
+        arista_antecesor = etiquetas[nodo_actual]["antecesor"]
         # Recuperamos arcos mientras el nodo actual no sea el nodo inicial
         while arista_antecesor != nodo_inicial:
             # Tomamos el antecesor del nodo actual mediante su etiqueta
-            #antecesor = nodo_actual.etiqueta["antecesor"]
+            #antecesor = etiquetas[nodo_actual]["antecesor"]
             # Se busca el objeto Arco que va desde el antecesor hasta el nodo actual y 
             # se agrega al principio de la lista, así terminaremos con la ruta ya ordenada
             ruta.insert(0, arista_antecesor)
             # Se actualiza el nodo actual
-            arista_antecesor = arista_antecesor.origen.etiqueta["antecesor"]
+            arista_antecesor = etiquetas[arista_antecesor.origen]["antecesor"]
         # Una vez que alcancemos el nodo inicial en la recuperación de la ruta, ésta
         # se regresa
         return ruta
 
 
-    def dijkstra(self, nodo_inicial, nodo_final=None):
+    def dijkstra(self, nodo_inicial, nodo_final=None, etiquetas=None):
+        """
+            Este método encuentra las rutas más cortas desde el nodo inicial con el algoritmo de
+            Dijkstra. Las etiquetas de los nodos (tipo, antecesor, longitud de la ruta y orden)
+            se guardan en un contexto de la ejecución, no en los nodos, así que la digráfica no
+            cambia.
+            Parámetros
+            ----------
+            nodo_inicial: Nombre del nodo inicial
+            nodo_final: Si se especifica, se regresa sólo la ruta hasta este nodo
+            etiquetas: Objeto de la clase Etiquetas donde se guardan las etiquetas, para
+                       consultarlas después (por ejemplo, las longitudes de las rutas). Si no se
+                       da, se usa uno nuevo
+            Regresa
+            -------
+            La lista de arcos de la ruta hasta el nodo final (vacía si no existe), o la lista de
+            arcos antecesores de los nodos alcanzados si no se especificó nodo final
+        """
+        if etiquetas is None:
+            etiquetas = Etiquetas()
         # Se obtienen los nodos inicial y final
         a = self.buscar_nodo(nodo_inicial)
         if not a:
@@ -444,19 +613,26 @@ class Digrafica:
 
         # el nodo inicial se etiqueta como temporal, como antecesor de él mismo y con una longitud
         # de ruta de 0, además se agrega a la lista de nodos etiquetados temporalmente
-        a.etiqueta = {"tipo_etiqueta":"temporal", "antecesor":a, "longitud_ruta":0}
-        X = [a]
+        # X es un montículo binario de tuplas (longitud, orden, nodo). Cuando la etiqueta de un
+        # nodo mejora se agrega una nueva entrada en lugar de actualizar la anterior, y las
+        # entradas viejas se descartan al sacarlas (eliminación perezosa). El orden es el de la
+        # primera vez que se etiquetó el nodo, así los empates se resuelven igual que con la lista
+        etiquetas[a] = {"tipo_etiqueta":"temporal", "antecesor":a, "longitud_ruta":0, "orden":0}
+        X = [(0, 0, a)]
+        orden = 1
 
         # El algoritmo continúa hasta que se acaben los nodos etiquetados temporalmente
         # o encontremos la ruta más corta hasta el nodo final z
         while X:
             # Se obtiene el nodo en X con la longitud de ruta más pequeña
-            x = min(X, key=lambda nodo: nodo.etiqueta["longitud_ruta"])
+            longitud, _, x = heapq.heappop(X)
 
-            # x se elimina del conjunto de vértices marcados temporalmente y se marca de forma
-            # definitiva
-            X.remove(x)
-            x.etiqueta["tipo_etiqueta"] = "definitiva"
+            # Si el nodo ya es definitivo o la entrada es vieja, entonces se descarta
+            if etiquetas[x]["tipo_etiqueta"] == "definitiva" or longitud != etiquetas[x]["longitud_ruta"]:
+                continue
+
+            # x se marca de forma definitiva
+            etiquetas[x]["tipo_etiqueta"] = "definitiva"
 
             # Si x = z recuperamos la ruta y la regresamos. En caso de no especificar el nodo final
             # el algoritmo va a continuar hasta agotar la lista de nodos etiquetados temporalmente
@@ -464,7 +640,7 @@ class Digrafica:
             # En este último caso esta condición también nos sirve ya que z siempre será None y
             # x nunca será None por lo tanto, siempre x != z
             if x == z:
-                return self.__recuperar_ruta(x, a)
+                return self.__recuperar_ruta(x, a, etiquetas)
             
             # Si x != z, entonces se iteran los salientes de x:
             for arco in self.__digrafica[x]["salientes"]:
@@ -473,18 +649,20 @@ class Digrafica:
                 # Si no tiene etiqueta, entonces se marca como temporal, con antecesor = x y
                 # longitud de L(x) + w(arco). Además, se agrega a la lista de nodos etiquetados
                 # temporalmente
-                if not v.etiqueta:
-                    v.etiqueta = {"tipo_etiqueta":"temporal", "antecesor":arco, "longitud_ruta":x.etiqueta["longitud_ruta"] + arco.peso}
-                    X.append(v)
+                if not etiquetas[v]:
+                    etiquetas[v] = {"tipo_etiqueta":"temporal", "antecesor":arco, "longitud_ruta":etiquetas[x]["longitud_ruta"] + arco.peso, "orden":orden}
+                    heapq.heappush(X, (etiquetas[v]["longitud_ruta"], orden, v))
+                    orden += 1
 
                 # Si v tiene etiqueta temporal, entonces se revisa si la ruta desde x es mejor que
                 # la que ya tenía
-                elif v.etiqueta["tipo_etiqueta"] == "temporal":
+                elif etiquetas[v]["tipo_etiqueta"] == "temporal":
                     # Si la longitud de la ruta viniendo desde x mejora la etiqueta de v, entonces
                     # se actualiza esta longitud y su antecesor ahora será X.
-                    if x.etiqueta["longitud_ruta"] + arco.peso < v.etiqueta["longitud_ruta"]:
-                        v.etiqueta["longitud_ruta"] = x.etiqueta["longitud_ruta"] + arco.peso 
-                        v.etiqueta["antecesor"] = arco
+                    if etiquetas[x]["longitud_ruta"] + arco.peso < etiquetas[v]["longitud_ruta"]:
+                        etiquetas[v]["longitud_ruta"] = etiquetas[x]["longitud_ruta"] + arco.peso 
+                        etiquetas[v]["antecesor"] = arco
+                        heapq.heappush(X, (etiquetas[v]["longitud_ruta"], etiquetas[v]["orden"], v))
         
         # Si llegamos hasta este punto y el usuario había especificado un nodo final, entonces
         # significa que no existe una ruta desde el nodo inicial hasta el nodo final, por lo tanto
@@ -493,17 +671,22 @@ class Digrafica:
         if nodo_final:
             return []
         else:
+            # La unión de las rutas más cortas es exactamente el conjunto de arcos antecesores
+            # de los nodos alcanzados, así que no es necesario recuperar cada ruta
             rutas = []
             for nodo in self.__digrafica:
                 # Buscaremos rutas siempre y cuando el nodo tenga etiqueta, de lo contrario
                 # no fue marcado por el algoritmo ya que no existe algúna trayectoria desde el
                 # vértice inicial hasta este nodo
-                if nodo != a and nodo.etiqueta:
-                    rutas =list(set().union(rutas,self.__recuperar_ruta(nodo, a)))
+                if nodo != a and etiquetas[nodo]:
+                    rutas.append(etiquetas[nodo]["antecesor"])
             return rutas
 
 
-    def dijkstra_general(self, nodo_inicial, nodo_final=None):
+    def dijkstra_general(self, nodo_inicial, nodo_final=None, etiquetas=None):
+        # Las etiquetas de los nodos se guardan en el contexto de esta ejecución (ver dijkstra)
+        if etiquetas is None:
+            etiquetas = Etiquetas()
         # Se buscan los dos nodos
         nodo_inicial = self.buscar_nodo(nodo_inicial)
         n_final = self.buscar_nodo(nodo_final)
@@ -513,7 +696,7 @@ class Digrafica:
             raise ValueError(f"Error. El nodo final {nodo_final} no existe en la digráfica" )
         
         # Se encuentra la arborescencia temporal con dijkstra normal
-        arborescencia = self.dijkstra(nodo_inicial.nombre, None)
+        arborescencia = self.dijkstra(nodo_inicial.nombre, None, etiquetas)
         
         # Obtenemos las aristas sin usar
         aristas_sin_usar = []
@@ -523,7 +706,7 @@ class Digrafica:
                 # únicamente tomaremos en cuenta los arcos cuyos extremos tengan etiqueta porque
                 # en caso contrario, significa que no existe ruta desde el vértice inicial hasta
                 # el nodo sin etiqueta
-                if arco not in arborescencia and arco.origen.etiqueta and arco.destino.etiqueta:
+                if arco not in arborescencia and etiquetas[arco.origen] and etiquetas[arco.destino]:
                     aristas_sin_usar.append(arco)
            
       
@@ -533,10 +716,10 @@ class Digrafica:
             a = aristas_sin_usar[i]
           
             # Comparamos si la arista sin usar mejora la arborescencia
-            if a.origen.etiqueta["longitud_ruta"] + a.peso < a.destino.etiqueta["longitud_ruta"]:
+            if etiquetas[a.origen]["longitud_ruta"] + a.peso < etiquetas[a.destino]["longitud_ruta"]:
                 
                 # Si la arista sin usar mejora la ruta, primero checamos si no forma un ciclo negativo
-                arista_antecesor = a.origen.etiqueta["antecesor"] 
+                arista_antecesor = etiquetas[a.origen]["antecesor"] 
                 # lista donde guardaremos las aristas del ciclo, en caso de que se encuentre uno              
                 ciclo = []
                 # elemento para identificar si se regresa un ciclo
@@ -552,16 +735,16 @@ class Digrafica:
                     # If que revisa si los nodos del arista son ancestros
                     if arista_antecesor ==  a :
                         # calculamos la longitud del ciclo
-                        longitud_ciclo = a.origen.etiqueta["longitud_ruta"] + a.peso - a.destino.etiqueta["longitud_ruta"]
+                        longitud_ciclo = etiquetas[a.origen]["longitud_ruta"] + a.peso - etiquetas[a.destino]["longitud_ruta"]
                         # agreamos la longitud del ciclo como último elemento de la lista
                         ciclo.append(longitud_ciclo)
                         return ciclo
      
                     
-                    arista_antecesor = arista_antecesor.origen.etiqueta["antecesor"]
+                    arista_antecesor = etiquetas[arista_antecesor.origen]["antecesor"]
                 
                 if(a.destino == nodo_inicial):
-                        longitud_ciclo = a.origen.etiqueta["longitud_ruta"] + a.peso - a.destino.etiqueta["longitud_ruta"]
+                        longitud_ciclo = etiquetas[a.origen]["longitud_ruta"] + a.peso - etiquetas[a.destino]["longitud_ruta"]
                         ciclo.append(longitud_ciclo)
                         return ciclo
                 # Si no se formó ningún ciclo negativo, entonces eliminamos la nueva arista de 
@@ -569,21 +752,21 @@ class Digrafica:
                 # mejorada se elimina de la arborescencia y se agrega a las aristas sin usar.
                 aristas_sin_usar.remove(a)
                 arborescencia.append(a)
-                aristas_sin_usar.append(a.destino.etiqueta["antecesor"])
+                aristas_sin_usar.append(etiquetas[a.destino]["antecesor"])
                 print(a.destino.nombre)
-                arborescencia.remove(a.destino.etiqueta["antecesor"])
+                arborescencia.remove(etiquetas[a.destino]["antecesor"])
 
                 # Se actualiza el antecesor del destino de la nueva arista
-                a.destino.etiqueta["antecesor"] = a
+                etiquetas[a.destino]["antecesor"] = a
 
                 # Se calcula el valor con el cuál se van a actualizar las etiquetas de los 
                 # descendientes del nodo actualizado
-                delta = a.origen.etiqueta["longitud_ruta"] + a.peso - a.destino.etiqueta["longitud_ruta"]
+                delta = etiquetas[a.origen]["longitud_ruta"] + a.peso - etiquetas[a.destino]["longitud_ruta"]
 
                 # Se ejecuta una búsqueda a profundidad para actualizar a los descendientes
                 visitados = []
   
-                self.dfs(a.destino,visitados, arborescencia, delta)
+                self.dfs(a.destino, visitados, arborescencia, delta, etiquetas)
                 
                 # Como ahora existe una nueva arista sin usar, entonces volvemos a recorrer la
                 # lista de aristas sin usar desde el principio
@@ -597,23 +780,36 @@ class Digrafica:
         # hacia dicho nodo final. En caso contrario se regresa la arborescencia completa
 
         if n_final:
-            if not n_final.etiqueta:
+            if not etiquetas[n_final]:
                 return []
             else:
-                return self.__recuperar_ruta(n_final, nodo_inicial)
+                return self.__recuperar_ruta(n_final, nodo_inicial, etiquetas)
 
         return arborescencia
 
 
 
 
-    def dfs(self, node,visited, arborescencia, delta):
-        if node not in visited:
-            visited.append(node) 
-            node.etiqueta["longitud_ruta"] += delta
-            for saliente in self.__digrafica[node]["salientes"]:   
-               if saliente in arborescencia:  
-                   self.dfs(saliente.destino,visited,arborescencia,delta) 
+    def dfs(self, node, visited, arborescencia, delta, etiquetas):
+        """
+            Este método suma delta a la longitud de la ruta de node y de todos sus descendientes
+            en la arborescencia, recorriéndolos con una pila en lugar de recursión. Las
+            longitudes están en etiquetas, el contexto de la ejecución de dijkstra_general
+        """
+        en_arborescencia = set(arborescencia)
+        marcados = set(visited)
+        pila = Pila()
+        pila.apilar(node)
+        while not pila.es_vacia():
+            node = pila.desapilar()
+            if node in marcados:
+                continue
+            marcados.add(node)
+            visited.append(node)
+            etiquetas[node]["longitud_ruta"] += delta
+            for saliente in self.__digrafica[node]["salientes"]:
+                if saliente in en_arborescencia:
+                    pila.apilar(saliente.destino)
     
     def genera_matriz(self,nodos): 
         # Lista de listas donde guardaremos los elementos de la matriz
@@ -1,34 +1,59 @@
+from collections import deque
+
 class Cola:
     """ Representa a una cola, con operaciones de encolar y desencolar.
         El primero en ser encolado es también el primero en ser desencolado.
+        Los elementos se guardan en un deque, así que encolar y desencolar
+        cuestan tiempo constante. Si se da una capacidad, la cola no admite
+        más elementos que esa cantidad.
     """
 
-    def __init__(self):
-        """ Crea una cola vacía. """
-        # La cola vacía se representa por una lista vacía
-        self.items=[]
+    def __init__(self, capacidad=None):
+        """ Crea una cola vacía, con capacidad máxima opcional. """
+        self.items = deque()
+        self.capacidad = capacidad
+
+    def __len__(self):
+        return len(self.items)
 
     def imprimir_cola(self):
-        for i in range(len(self.items)):
-            print(self.items[i])
+        for x in self.items:
+            print(x)
 
     def encolar(self, x):
-        """ Agrega el elemento x como último de la cola. """
+        """ Agrega el elemento x como último de la cola. Si la cola está
+        llena, levanta ValueError. """
+        if self.capacidad is not None and len(self.items) >= self.capacidad:
+            raise ValueError("La cola está llena")
         self.items.append(x)
+
+    def encolar_varios(self, elementos):
+        """ Agrega los elementos dados al final de la cola, en orden. Si no
+        caben todos, no se agrega ninguno y se levanta ValueError. """
+        if self.capacidad is not None:
+            elementos = list(elementos)
+            if len(self.items) + len(elementos) > self.capacidad:
+                raise ValueError("La cola está llena")
+        self.items.extend(elementos)
+
     def es_vacia(self):
         """ Devuelve True si la cola esta vacía, False si no."""
-        return self.items == []
+        return not self.items
+
+    def esta_llena(self):
+        """ Devuelve True si la cola tiene capacidad y ya está llena. """
+        return self.capacidad is not None and len(self.items) >= self.capacidad
       
     def desencolar(self):
         """ Elimina el primer elemento de la cola y devuelve su
         valor. Si la cola está vacía, levanta ValueError. """
         try:
-            return self.items.pop(0)
-        except:
+            return self.items.popleft()
+        except IndexError:
             raise ValueError("La cola está vacía")
     
     def vaciar(self):
-        self.items = []
+        self.items.clear()
         
 
 #----------------------------------------------------------------
@@ -40,6 +65,9 @@ class Pila:
         """ Crea una pila vacía. """
         # La pila vacía se representa con una lista vacía
         self.items=[]
+
+    def __len__(self):
+        return len(self.items)
         
     def apilar(self, x):
         """ Agrega el elemento x a la pila. """
@@ -47,29 +75,206 @@ class Pila:
         self.items.append(x)
 
     def es_vacia(self):
-    	return self.items == []
+        """ Devuelve True si la pila esta vacía, False si no."""
+        return not self.items
 
     def desapilar(self):
-        """ Elimina el primer elemento de la cola y devuelve su
-        valor. Si la cola está vacía, levanta ValueError. """
+        """ Elimina el último elemento de la pila y devuelve su
+        valor. Si la pila está vacía, levanta ValueError. """
         try:
             return self.items.pop()
-        except:
-            raise ValueError("La cola está vacía")
+        except IndexError:
+            raise ValueError("La pila está vacía")
     
     def vaciar(self):
-        self.items = []
+        self.items.clear()
+#----------------------------------------------------------------
+class Etiquetas:
+    """ Contexto de una ejecución de un algoritmo: guarda las etiquetas que
+        el algoritmo le pone a los nodos y arcos en un diccionario propio, en
+        lugar de escribirlas en los objetos de la gráfica. Así la gráfica no
+        cambia durante las consultas, dos ejecuciones sobre la misma gráfica
+        no se estorban, y no hay que limpiar las etiquetas al terminar: basta
+        con descartar el contexto. Un objeto sin etiqueta tiene etiqueta None.
+    """
+
+    def __init__(self):
+        """ Crea un contexto sin etiquetas. """
+        self.__etiquetas = {}
+
+    def __len__(self):
+        return len(self.__etiquetas)
+
+    def __contains__(self, objeto):
+        return objeto in self.__etiquetas
+
+    def __getitem__(self, objeto):
+        """ Devuelve la etiqueta del objeto, o None si no tiene. """
+        return self.__etiquetas.get(objeto)
+
+    def __setitem__(self, objeto, etiqueta):
+        """ Le pone una etiqueta al objeto. """
+        self.__etiquetas[objeto] = etiqueta
+
+    def quitar(self, objeto):
+        """ Le quita la etiqueta al objeto, si tiene. """
+        self.__etiquetas.pop(objeto, None)
+
+    def vaciar(self):
+        self.__etiquetas.clear()
+#----------------------------------------------------------------
+class Bitacora:
+    """ Bitácora de cambios de una estructura, para poder deshacerlos. Cada
+        cambio anota la operación que lo deshace, pero sólo mientras hay
+        alguna instantánea abierta; sin instantáneas no se guarda nada.
+        Tomar una instantánea sólo recuerda la altura de la pila de
+        operaciones, y restaurarla deshace en orden inverso los cambios
+        posteriores. Así ambas cuestan lo que miden los cambios, no lo que
+        mide la estructura. Las instantáneas se anidan: cerrar una cierra
+        también las que se tomaron después de ella.
+    """
+
+    def __init__(self):
+        """ Crea una bitácora sin instantáneas abiertas. """
+        self.operaciones = []
+        self.instantaneas = []
+
+    def __len__(self):
+        return len(self.operaciones)
+
+    def anotar(self, deshacer, *argumentos):
+        """ Anota la función (y sus argumentos) que deshace un cambio. """
+        if self.instantaneas:
+            self.operaciones.append((deshacer, argumentos))
+
+    def instantanea(self):
+        """ Abre una instantánea y la devuelve. """
+        self.instantaneas.append(len(self.operaciones))
+        return len(self.operaciones)
+
+    def restaurar(self, instantanea):
+        """ Deshace los cambios posteriores a la instantánea y la cierra. """
+        self.__cerrar(instantanea)
+        while len(self.operaciones) > instantanea:
+            deshacer, argumentos = self.operaciones.pop()
+            deshacer(*argumentos)
+        if not self.instantaneas:
+            self.operaciones.clear()
+
+    def confirmar(self, instantanea):
+        """ Cierra la instantánea conservando los cambios. """
+        self.__cerrar(instantanea)
+        if not self.instantaneas:
+            self.operaciones.clear()
+
+    def __cerrar(self, instantanea):
+        if instantanea not in self.instantaneas:
+            raise ValueError("La instantánea no está abierta")
+        while self.instantaneas[-1] != instantanea:
+            self.instantaneas.pop()
+        self.instantaneas.pop()
+
+def copia_superficial(objeto):
+    """ Copia un objeto (Nodo, Arista, Arco...) con los mismos atributos,
+        sin copiar los objetos a los que apuntan. Es lo que hace copy.copy,
+        pero sin pasar por __reduce_ex__.
+    """
+    copia = object.__new__(type(objeto))
+    copia.__dict__.update(objeto.__dict__)
+    return copia
 #----------------------------------------------------------------
 class UnionBusqueda:
-    def __init__(self, vertices):
-        self.__items = {}
+    """ Representa una estructura de conjuntos disjuntos (unión-búsqueda).
+        Cada elemento recibe un identificador entero y los padres, rangos y
+        tamaños se guardan en listas. La búsqueda recorre los padres
+        reduciendo el camino a la mitad y la unión cuelga la raíz de menor
+        rango de la de mayor rango, así que cada operación cuesta tiempo
+        casi constante.
+    """
+
+    def __init__(self, vertices=()):
+        """ Crea un conjunto por cada elemento de vertices. """
+        self.__ids = {} # Identificador entero de cada elemento
+        self.__elementos = [] # Elemento de cada identificador
+        self.__padre = []
+        self.__rango = []
+        self.__tamano = []
+        self.num_componentes = 0
         for v in vertices:
-            self.__items[v] = v
-    
+            self.agregar(v)
+
+    def agregar(self, v):
+        """ Agrega el elemento v en un conjunto propio. Devuelve False si
+        ya estaba en la estructura. """
+        if v in self.__ids:
+            return False
+        i = len(self.__elementos)
+        self.__ids[v] = i
+        self.__elementos.append(v)
+        self.__padre.append(i)
+        self.__rango.append(0)
+        self.__tamano.append(1)
+        self.num_componentes += 1
+        return True
+
+    def __len__(self):
+        return len(self.__elementos)
+
+    def __raiz(self, i):
+        """ Devuelve el identificador de la raíz del conjunto de i. Cada
+        nodo del camino pasa a apuntar a su abuelo. """
+        padre = self.__padre
+        while padre[i] != i:
+            padre[i] = padre[padre[i]]
+            i = padre[i]
+        return i
+
     def busqueda(self, v):
-        if (v == self.__items[v]):
-            return v
-        return self.busqueda(self.__items[v])
-    
+        """ Devuelve el representante del conjunto de v. """
+        return self.__elementos[self.__raiz(self.__ids[v])]
+
     def union(self, u, v):
-        self.__items[self.busqueda(u)] = self.busqueda(v)
\ No newline at end of file
+        """ Une los conjuntos de u y v. Devuelve True si estaban separados
+        y False si ya eran el mismo conjunto. """
+        i = self.__raiz(self.__ids[u])
+        j = self.__raiz(self.__ids[v])
+        if i == j:
+            return False
+        if self.__rango[i] < self.__rango[j]:
+            i, j = j, i
+        self.__padre[j] = i
+        self.__tamano[i] += self.__tamano[j]
+        if self.__rango[i] == self.__rango[j]:
+            self.__rango[i] += 1
+        self.num_componentes -= 1
+        return True
+
+    def mismo_conjunto(self, u, v):
+        """ Devuelve True si u y v están en el mismo conjunto. """
+        return self.__raiz(self.__ids[u]) == self.__raiz(self.__ids[v])
+
+    def busqueda_varios(self, elementos):
+        """ Devuelve la lista de representantes de los elementos dados. """
+        ids = self.__ids
+        return [self.__elementos[self.__raiz(ids[v])] for v in elementos]
+
+    def union_varios(self, pares):
+        """ Une los conjuntos de cada par (u, v). Devuelve el número de
+        uniones que juntaron conjuntos distintos. """
+        uniones = 0
+        for u, v in pares:
+            if self.union(u, v):
+                uniones += 1
+        return uniones
+
+    def tamano(self, v):
+        """ Devuelve el número de elementos del conjunto de v. """
+        return self.__tamano[self.__raiz(self.__ids[v])]
+
+    def componentes(self):
+        """ Devuelve una lista con los conjuntos, cada uno como lista de
+        elementos en el orden en el que se agregaron. """
+        conjuntos = {}
+        for i, v in enumerate(self.__elementos):
+            conjuntos.setdefault(self.__raiz(i), []).append(v)
+        return list(conjuntos.values())
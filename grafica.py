@@ -1,7 +1,8 @@
-import copy
+import heapq
 import operator
 import math
 from estructuras_datos import *
+from lector_aristas import leer_registros
 
 class Arista:
     """
@@ -34,8 +35,10 @@ class Grafica:
     """
     def __init__(self):
         self.__grafica = {} # Estructura donde se va a guardar la gráfica
+        self.__nodos = {} # Índice nombre -> nodo para búsquedas en tiempo constante
         self.__num_nodos = 0 # Contador de nodos
         self.__num_aristas = 0 # Contador de aristas
+        self.__bitacora = Bitacora() # Cambios que se pueden deshacer con restaurar()
 
     """
         Este método busca un nodo en la gráfica.
@@ -46,10 +49,7 @@ class Grafica:
         None si el nodo no se encuentra en la gráfica. 
     """
     def buscar_nodo(self, nombre):
-        for nodo in self.__grafica:
-            if nodo.nombre == nombre:
-                return nodo
-        return False 
+        return self.__nodos.get(nombre, False)
 
     """
         Este método agrega un nodo a la gráfica.
@@ -65,7 +65,9 @@ class Grafica:
 
         nodo = Nodo(nombre, etiqueta=None)
         self.__grafica[nodo] = []
+        self.__nodos[nombre] = nodo
         self.__num_nodos += 1
+        self.__bitacora.anotar(self.__deshacer_agregar_nodo, nodo)
         return True 
 
     """
@@ -103,6 +105,7 @@ class Grafica:
 
         # El contador de aristas se incrementa
         self.__num_aristas += 1
+        self.__bitacora.anotar(self.__deshacer_agregar_arista, nodo_a, nodo_b)
         
         return True
 
@@ -117,6 +120,7 @@ class Grafica:
             self.__grafica[nodo_a].append( Arista(nodo_a, nodo_b, peso) )    
             nodo_a.grado += 1
             self.__num_aristas += 1
+            self.__bitacora.anotar(self.__deshacer_agregar_arista_digrafica, nodo_a)
             return True
         
         return False
@@ -124,32 +128,40 @@ class Grafica:
         Este método lee una gráfica desde un archivo
     """
     def leer_grafica(self, archivo):
-        file1 = open(archivo, 'r') 
-        Lines = file1.readlines() 
-
-        for line in Lines:
-            line = line.strip().split(",")
-            length = len(line)
-            if length == 1:
-                self.agregar_nodo(line[0])
-            elif length == 2:
-                self.agregar_arista(line[0], line[1])
-            elif length == 3:
-                self.agregar_arista(line[0], line[1], line[2])
+        """
+            Este método lee una gráfica desde un archivo. El archivo se lee por bloques y
+            cada línea se agrega en cuanto se lee, así que no se guarda completo en memoria.
+            Parámetros
+            ----------
+            archivo: Ruta del archivo de texto en donde se encuentra la información
+                     de la gráfica de la siguiente manera y separado con Enters:
+                     a -> Para agregar el nodo a
+                     a,b -> Para agregar la arista {a,b}
+                     a,b,5 -> Para agregar la arista {a,b} con peso 5
+                     Las líneas vacías se ignoran; si una línea no tiene este formato se
+                     lanza ValueError con el número de línea.
+        """
+        for campos in leer_registros(archivo, {1: 1, 2: 2, 3: 2}):
+            if len(campos) == 1:
+                self.agregar_nodo(campos[0])
+            else:
+                self.agregar_arista(*campos)
 
     def leer_digrafica(self, archivo):
-        file1 = open(archivo, 'r') 
-        Lines = file1.readlines() 
-
-        for line in Lines:
-            line = line.strip().split(",")
-            length = len(line)
-            if length == 1:
-                self.agregar_nodo(line[0])
-            elif length == 2:
-                self.agregar_arista(line[0], line[1])
-            elif length == 3:
-                self.agregar_arista_digrafica(line[0], line[1], line[2])
+        """
+            Este método lee una digráfica desde un archivo, guardando cada arco sólo en los
+            salientes de su origen. Las líneas con dos campos se agregan como aristas.
+            Parámetros
+            ----------
+            archivo: Ruta del archivo de texto, con el mismo formato que en leer_grafica
+        """
+        for campos in leer_registros(archivo, {1: 1, 2: 2, 3: 2}):
+            if len(campos) == 1:
+                self.agregar_nodo(campos[0])
+            elif len(campos) == 2:
+                self.agregar_arista(*campos)
+            else:
+                self.agregar_arista_digrafica(*campos)
     """
         Este método busca una arista. En caso de que un nodo
         tenga varias aristas sin etiqueta hacia otro mismo nodo,
@@ -199,7 +211,8 @@ class Grafica:
                     if arista.destino.nombre == b and arista.peso == peso:
                         arista1 = arista
                         break
-            self.__grafica[nodo_a].remove(arista1)
+            i = self.__grafica[nodo_a].index(arista1)
+            del self.__grafica[nodo_a][i]
 
             # Si no se trata de un lazo, entonces se busca el nodo b para eliminar la arista b,a
             # y el grado de ambos nodos se decrementa en 1
@@ -215,13 +228,16 @@ class Grafica:
                             arista2 = arista
                             break
                 
-                self.__grafica[nodo_b].remove(arista2)
+                j = self.__grafica[nodo_b].index(arista2)
+                del self.__grafica[nodo_b][j]
                 nodo_a.grado -= 1
                 nodo_b.grado -= 1
+                self.__bitacora.anotar(self.__deshacer_eliminar_arista, nodo_a, i, arista1, nodo_b, j, arista2)
             # Si se trata de un lazo, entonces no es necesario eliminar la arista b,a (pues es la misma)
             # simplemente se decrementa el grado de a en 2
             else:
                 nodo_a.grado -= 2
+                self.__bitacora.anotar(self.__deshacer_eliminar_arista, nodo_a, i, arista1)
 
             # Sea cual sea el caso, el número de aristas se decrementa en 1
             self.__num_aristas -= 1
@@ -249,7 +265,10 @@ class Grafica:
     
             # Cuando todas las aristas del nodo se hayan eliminado procedemos a 
             # eliminar el nodo de la gráfica y decrementamos el contador de nodos
+            if self.__bitacora.instantaneas:
+                self.__bitacora.anotar(self.__deshacer_eliminar_nodo, nodo, self.__posicion_nodo(nodo))
             self.__grafica.pop(nodo)
+            self.__nodos.pop(nodo.nombre)
             self.__num_nodos -= 1
             return True
         else:
@@ -311,7 +330,10 @@ class Grafica:
         Este método limpia la gráfica
     """
     def vaciar_grafica(self):
+        self.__bitacora.anotar(self.__deshacer_vaciar_grafica, self.__grafica, self.__nodos,
+                               self.__num_nodos, self.__num_aristas)
         self.__grafica = {}
+        self.__nodos = {}
         self.__num_nodos = 0
         self.__num_aristas = 0
     
@@ -322,72 +344,227 @@ class Grafica:
     """
 
     def copiar(self):
-        return copy.deepcopy(self)
+        """
+            Este método realiza una copia de la gráfica. Los nodos y aristas se copian uno por
+            uno (sólo sus atributos y referencias), en lugar de pasar por copy.deepcopy
+            Regresa
+            -------
+            Objeto de la clase Grafica que representa la copia del objeto actual.
+        """
+        copia = Grafica()
+        nodos = {nodo: copia_superficial(nodo) for nodo in self.__grafica}
+        for nodo, aristas in self.__grafica.items():
+            nuevas = []
+            for arista in aristas:
+                # Las aristas de agregar_arista_digrafica pueden apuntar a un nodo que ya se
+                # eliminó de la gráfica; ese nodo también se copia
+                for extremo in (arista.origen, arista.destino):
+                    if extremo not in nodos:
+                        nodos[extremo] = copia_superficial(extremo)
+                nueva = copia_superficial(arista)
+                nueva.origen = nodos[arista.origen]
+                nueva.destino = nodos[arista.destino]
+                nuevas.append(nueva)
+            copia.__grafica[nodos[nodo]] = nuevas
+        copia.__nodos = {nombre: nodos[nodo] for nombre, nodo in self.__nodos.items()}
+        copia.__num_nodos = self.__num_nodos
+        copia.__num_aristas = self.__num_aristas
+        return copia
+
+    def instantanea(self):
+        """
+            Este método toma una instantánea de la gráfica, que se puede recuperar después con
+            restaurar(). No se copia nada: a partir de aquí cada cambio anota cómo deshacerse,
+            así que tomar y restaurar la instantánea cuesta lo mismo que los cambios hechos
+            Regresa
+            -------
+            La instantánea, que se le pasa a restaurar() o a confirmar()
+        """
+        return self.__bitacora.instantanea()
+
+    def restaurar(self, instantanea):
+        """
+            Este método deshace los cambios (nodos y aristas) hechos después de tomar
+            la instantánea y la cierra, junto con las que se tomaron después de ella. Los
+            atributos que se cambian directamente en los objetos (como el peso de una arista)
+            no se deshacen
+            Parámetros
+            ----------
+            instantanea: Instantánea regresada por instantanea()
+        """
+        self.__bitacora.restaurar(instantanea)
+
+    def confirmar(self, instantanea):
+        """
+            Este método cierra la instantánea conservando los cambios
+            Parámetros
+            ----------
+            instantanea: Instantánea regresada por instantanea()
+        """
+        self.__bitacora.confirmar(instantanea)
+
+    def __posicion_nodo(self, nodo):
+        """
+            Este método regresa la posición del nodo en el orden de la gráfica. Casi siempre
+            se eliminan los últimos nodos agregados, así que primero se revisa el último
+        """
+        if next(reversed(self.__grafica)) is nodo:
+            return len(self.__grafica) - 1
+        return list(self.__grafica).index(nodo)
+
+    def __deshacer_agregar_nodo(self, nodo):
+        self.__grafica.pop(nodo)
+        self.__nodos.pop(nodo.nombre)
+        self.__num_nodos -= 1
+
+    def __deshacer_agregar_arista(self, nodo_a, nodo_b):
+        self.__grafica[nodo_a].pop()
+        if nodo_a is not nodo_b:
+            self.__grafica[nodo_b].pop()
+        nodo_a.grado -= 1
+        nodo_b.grado -= 1
+        self.__num_aristas -= 1
+
+    def __deshacer_agregar_arista_digrafica(self, nodo_a):
+        self.__grafica[nodo_a].pop()
+        nodo_a.grado -= 1
+        self.__num_aristas -= 1
+
+    def __deshacer_eliminar_arista(self, nodo_a, i, arista1, nodo_b=None, j=None, arista2=None):
+        self.__grafica[nodo_a].insert(i, arista1)
+        if nodo_b is None:
+            nodo_a.grado += 2
+        else:
+            self.__grafica[nodo_b].insert(j, arista2)
+            nodo_a.grado += 1
+            nodo_b.grado += 1
+        self.__num_aristas += 1
+
+    def __deshacer_eliminar_nodo(self, nodo, posicion):
+        # El nodo regresa a su lugar en el orden de la gráfica, que es el orden en el que lo
+        # recorren los algoritmos
+        if posicion == len(self.__grafica):
+            self.__grafica[nodo] = []
+        else:
+            elementos = list(self.__grafica.items())
+            elementos.insert(posicion, (nodo, []))
+            self.__grafica = dict(elementos)
+        self.__nodos[nodo.nombre] = nodo
+        self.__num_nodos += 1
+
+    def __deshacer_vaciar_grafica(self, grafica, nodos, num_nodos, num_aristas):
+        self.__grafica = grafica
+        self.__nodos = nodos
+        self.__num_nodos = num_nodos
+        self.__num_aristas = num_aristas
     
-    def __limpiar_etiquetas(self, tipo):
-        if tipo == "nodos":
-            for nodo in self.__grafica:
-                nodo.etiqueta = None
-        elif tipo == "aristas":
-            for nodo in self.__grafica:
-                for arista in self.__grafica[nodo]:
-                    arista.etiqueta = None
-        elif tipo == "todo":
-            for nodo in self.__grafica:
-                nodo.etiqueta = None
-                for arista in self.__grafica[nodo]:
-                    arista.etiqueta = None
+    def __indices(self):
+        """
+            Este método numera los nodos en el orden de la gráfica, para marcarlos en arreglos
+            de bytes
+            Regresa
+            -------
+            Diccionario nodo -> número
+        """
+        return {nodo: i for i, nodo in enumerate(self.__grafica)}
+
+    def __recorrer(self, raiz, indices, visitados, profundidad=False):
+        """
+            Este método es el núcleo de las búsquedas de la gráfica: recorre los nodos que se
+            alcanzan desde raiz y que no están marcados en visitados, y los marca. La búsqueda a
+            lo ancho usa una cola de nodos; la búsqueda a profundidad usa una pila de iteradores
+            sobre las listas de aristas, que sirven como cursores, así que cada arista se revisa
+            una sola vez.
+            Parámetros
+            ----------
+            raiz: Nodo en el que empieza el recorrido
+            indices: Diccionario nodo -> número, como el que regresa __indices
+            visitados: bytearray indexado con los números de los nodos; 1 si ya se visitó
+            profundidad: True para buscar a profundidad, False para buscar a lo ancho
+            Regresa
+            -------
+            Lista con las aristas del árbol de expansión, en el orden en el que se descubrieron
+            sus destinos
+        """
+        visitados[indices[raiz]] = 1
+        arbol = []
+        if profundidad:
+            pila = Pila()
+            pila.apilar(iter(self.__grafica[raiz]))
+            while not pila.es_vacia():
+                aristas = pila.desapilar()
+                for arista in aristas:
+                    w = indices[arista.destino]
+                    if not visitados[w]:
+                        visitados[w] = 1
+                        arbol.append(arista)
+                        # Se guarda el cursor del nodo actual y se sigue desde w
+                        pila.apilar(aristas)
+                        pila.apilar(iter(self.__grafica[arista.destino]))
+                        break
         else:
-            raise ValueError(f"Error en el tipo dado ({tipo}). Valores aceptados: 'nodos', 'aristas', 'todos'")
+            cola = Cola()
+            cola.encolar(raiz)
+            while not cola.es_vacia():
+                for arista in self.__grafica[cola.desencolar()]:
+                    w = indices[arista.destino]
+                    if not visitados[w]:
+                        visitados[w] = 1
+                        arbol.append(arista)
+                        cola.encolar(arista.destino)
+        return arbol
+
+    def __bosque(self, profundidad):
+        """
+            Este método encuentra un bosque de expansión con un árbol por componente. Cada
+            componente empieza en el último nodo que falta por visitar, y las componentes de un
+            solo nodo se representan con una lista que tiene al nodo
+        """
+        indices = self.__indices()
+        visitados = bytearray(len(indices))
+        bosque = []
+        for nodo in reversed(indices):
+            if not visitados[indices[nodo]]:
+                arbol = self.__recorrer(nodo, indices, visitados, profundidad)
+                bosque.append(arbol if arbol else [nodo])
+        return bosque
             
     
     def es_bipartita(self):
-        # Cola auxiliar del algoritmo
-        cola = Cola()
-        
+        """
+            Este método busca una bipartición de la componente del primer nodo con una búsqueda
+            a lo ancho: el primer nodo va a la partición 1 y cada nodo descubierto va a la
+            partición contraria a la del nodo desde el que se descubrió
+            Regresa
+            -------
+            Las dos particiones, o None, None si la componente no es bipartita
+        """
+        indices = self.__indices()
+        visitados = bytearray(len(indices))
+        # Partición (1 o 2) de cada nodo
+        particiones = bytearray(len(indices))
+
         # Se obtiene el primer nodo de la gráfica
         nodo_inicial = list(self.__grafica.keys())[0]
-
-        # Lista en donde se almacenarán las particiones. Se agrega el primer nodo
-        # automáticamente a la partición 1
-        nodo_inicial.etiqueta = 1
+        particiones[indices[nodo_inicial]] = 1
         particion_1 = [nodo_inicial]
         particion_2 = []
-        
-        # Se encola el primer nodo
-        cola.encolar(nodo_inicial)
-
-        # El algoritmo continúa mientras la cola no esté vacía. Si se termina exitosamente, 
-        # entonces la gráfica es bipartita, de lo contrario terminará antes.
-        while not cola.es_vacia():
-            # Se desencola un vértice 
-            nodo_actual = cola.desencolar()
-            # Se decide hacia qué partición enviar a sus vecinos de acuerdo a la etiqueta
-            # que el nodo desencolado tenga
-            if nodo_actual.etiqueta == 1:
-                etiqueta = 2
+        for arista in self.__recorrer(nodo_inicial, indices, visitados):
+            w = indices[arista.destino]
+            particiones[w] = 3 - particiones[indices[arista.origen]]
+            if particiones[w] == 1:
+                particion_1.append(arista.destino)
             else:
-                etiqueta = 1
-            # Se  agregan a la partición contraria  todos los vértices vecinos que no tengan
-            # etiqueta. Si cumplen con esta condición, se encolan.
-            # En caso de que tengan etiqueta y sea la misma que la del nodo actual, entonces
-            # la gráfica no es bipartita
-            for arista in self.__grafica[nodo_actual]:
-                nodo_vecino = arista.destino
-                if not nodo_vecino.etiqueta:
-                    nodo_vecino.etiqueta = etiqueta
-                    if etiqueta == 1:
-                        particion_1.append(nodo_vecino)
-                    else:
-                        particion_2.append(nodo_vecino)
-                        
-                    cola.encolar(nodo_vecino)
-                else:
-                    if nodo_vecino.etiqueta == nodo_actual.etiqueta:
-                        self.__limpiar_etiquetas("nodos")
-                        return None, None
-        
-        self.__limpiar_etiquetas("nodos")
+                particion_2.append(arista.destino)
+
+        # La componente es bipartita si ninguna de sus aristas une a dos nodos de la misma partición
+        for nodo in self.__grafica:
+            if not visitados[indices[nodo]]:
+                continue
+            particion = particiones[indices[nodo]]
+            for arista in self.__grafica[nodo]:
+                if particiones[indices[arista.destino]] == particion:
+                    return None, None
         return particion_1, particion_2
 
     def diccionario(self):
@@ -395,29 +572,34 @@ class Grafica:
     
     def es_conexa(self):
         """
-            Este método hace una búsqueda a lo profundo en cada nodo
-            para saber si la gráfica es conexa
-        """
-
-        # Algoritmo de búsqueda
-        visitados = []
-        pila = Pila()
-        pila.apilar(list(self.__grafica.items())[0][0])
-        while not pila.es_vacia():
-            nodo_actual = pila.desapilar()
-            for arista in self.__grafica[nodo_actual]:
-                nodo_adyacente = arista.destino
-                if nodo_adyacente not in visitados:
-                    pila.apilar(nodo_adyacente)
-            if nodo_actual not in visitados:
-                visitados.append(nodo_actual)
-
-        # Si la gráfica es conexa, entonces todos los nodos deberían
-        # estar presentes en la lista de visitados
-        if len(visitados) == self.__num_nodos:
+            Este método hace una búsqueda desde el primer nodo para saber si la gráfica es
+            conexa
+        """
+        if not self.__grafica:
             return True
-        else: 
-            return False
+        indices = self.__indices()
+        visitados = bytearray(len(indices))
+        self.__recorrer(next(iter(indices)), indices, visitados)
+
+        # Si la gráfica es conexa, entonces la búsqueda debió visitar todos los nodos
+        return visitados.count(0) == 0
+
+    def componentes_conexas(self):
+        """
+            Este método encuentra las componentes conexas de la gráfica
+            Regresa
+            -------
+            Lista de componentes, en el orden de su primer nodo en la gráfica. Cada componente
+            es la lista de sus nodos en el orden en el que los visita una búsqueda a lo ancho
+        """
+        indices = self.__indices()
+        visitados = bytearray(len(indices))
+        componentes = []
+        for nodo in indices:
+            if not visitados[indices[nodo]]:
+                arbol = self.__recorrer(nodo, indices, visitados)
+                componentes.append([nodo] + [arista.destino for arista in arbol])
+        return componentes
     
     def imprimir_aristas(self):
         aristas = []
@@ -428,99 +610,90 @@ class Grafica:
         print(aristas)        
 
     def paseo_euler(self):
+        """
+            Este método encuentra un paseo de Euler con el algoritmo de Hierholzer, sin copiar
+            ni modificar la gráfica. Cada nodo tiene un cursor que indica la siguiente arista de
+            su lista por revisar, y las aristas usadas se marcan en un arreglo de bytes, así que
+            cada arista se revisa a lo más dos veces (una desde cada extremo).
+            Regresa
+            -------
+            Lista con los nombres de los nodos del paseo. Si hay dos nodos de grado impar el
+            paseo es abierto y los une; si no, es cerrado y empieza en el primer nodo.
+            False si la gráfica no es conexa, False si no tiene paseo de Euler
+        """
         if not self.es_conexa():
             return False
 
-        nodos_iniciales = []
-        copia = self.copiar().diccionario()
-        
         # Se cuentan los nodos con grado impar
-        for nodo in self.__grafica:
-            if nodo.grado % 2 != 0:
-                nodos_iniciales.append(nodo)
-                
+        nodos_iniciales = [nodo for nodo in self.__grafica if nodo.grado % 2 != 0]
         if len(nodos_iniciales) > 0 and len(nodos_iniciales) != 2:
-        	return False
-        
-        # Cola y pila del algoritmo
-        cola = Cola()
-        pila = Pila()
-        
-        # Si existen nodos iniciales, los tomamos (Paseo abierto desde vp a vc)
+            return False
+
+        # Si existen nodos iniciales, los tomamos (Paseo abierto). Si no, tomamos por default
+        # el primer nodo (Paseo cerrado)
         if nodos_iniciales:
-            vp = nodos_iniciales[0]
-            vc = nodos_iniciales[1]
-            
-            
+            inicio = nodos_iniciales[1]
         else:
-            vp = vc = list(self.__grafica.keys())[0]
-        
-        # Si no, tomamos por default el primer nodo (Paseo cerrado)
-        cola.encolar(vc)
-        pila.apilar(vp)
-       
-        while vp.grado>0 and vc.grado>0:
-            # Si vc tiene aristas...
-           
-            if self.__grafica[vc]:
-                # ... se elige cualquier arista (vc,w) tal que el grado de w no sea 1...
-                arista_a_eliminar = None
-                contador = 0
-                for arista in self.__grafica[vc]:
-                    contador+=1
-                    if arista.destino.grado != 1 :
-                        
-                        arista_a_eliminar = arista
-                        w = arista_a_eliminar.destino
-                        self.eliminar_arista(vc.nombre, w.nombre)
-
-                        # si un nodo queda con grado cero, lo eliminamos
-                        if(vc.grado == 0):
-                            self.eliminar_nodo(vc.nombre)
-                        
-                        # revisamos que el arco a eliminar no sea puente
-                        # si solo hay un arco disponible, lo borramos aunque sea puente
-                        if self.es_conexa() or vc.grado == contador:
-                            break
-                        else:
-                            # en caso de que el arco sea puente, lo volvemos a agregar a la grafica
-                            self.agregar_arista(vc.nombre, w.nombre)
-                
-                # ... si tal arista existe, eliminar (vc,w) de la gráfica y agregar w a la cola.
-                # Hacer vc = w
-                if arista_a_eliminar:
-                    cola.encolar(w)
-                    vc = w
+            inicio = next(iter(self.__grafica), None)
+            if inicio is None:
+                return []
 
-            
-            # Si vp tiene grado 1, elegir la única arista (vp, k), eliminar (vp, k) de la gráfica y
-            # agregar ka a la pila. Hacer vp = k
-            if vp.grado == 1:
-                arista_a_eliminar = self.__grafica[vp][0]
-                k = arista_a_eliminar.destino
-                self.eliminar_arista(vp.nombre, k.nombre)
-                # si el nodo queda con grado cero, lo eliminamos
-                if(vp.grado == 0):
-                            self.eliminar_nodo(vp.nombre)
-                pila.apilar(k)
-                vp = k
-        
-        # ---------- RECUPERAMOS EL PASEO ----------
-        pila.desapilar() # Ignoramos el primero de la pila
-        paseo = []
+        numeros = self.__numerar_aristas()
+        usadas = bytearray(self.__num_aristas)
+        cursores = {nodo: 0 for nodo in self.__grafica}
 
-        # Se desencolan todos los vértices de la cola
-        while(not cola.es_vacia()):
-            paseo.append(cola.desencolar().nombre)
-        
-        # Se desapilan todos los vértices de la pila
-        while not pila.es_vacia():
-            paseo.append(pila.desapilar().nombre)
-        
-        # Restauramos la gráfica
-        self.__grafica = copia
+        # Se avanza por aristas sin usar mientras se pueda; cuando un nodo ya no tiene aristas
+        # libres, se saca de la pila y se agrega al paseo (en orden inverso)
+        pila = [inicio]
+        paseo = []
+        while pila:
+            nodo_actual = pila[-1]
+            aristas = self.__grafica[nodo_actual]
+            numeros_actual = numeros[nodo_actual]
+            i = cursores[nodo_actual]
+            while i < len(aristas) and usadas[numeros_actual[i]]:
+                i += 1
+            if i < len(aristas):
+                usadas[numeros_actual[i]] = 1
+                cursores[nodo_actual] = i + 1
+                pila.append(aristas[i].destino)
+            else:
+                cursores[nodo_actual] = i
+                paseo.append(pila.pop().nombre)
 
+        paseo.reverse()
         return paseo
+
+    def __numerar_aristas(self):
+        """
+            Este método numera las aristas de la gráfica. Cada arista que no es lazo aparece en
+            la lista de sus dos extremos y las dos apariciones reciben el mismo número. Entre
+            aristas paralelas da igual cómo se emparejen, porque unen a los mismos nodos.
+            Regresa
+            -------
+            Diccionario con la lista de números de las aristas de cada nodo, en el mismo orden
+            que su lista de aristas
+        """
+        numeros = {}
+        pendientes = {}
+        contador = 0
+        for nodo in self.__grafica:
+            numeros_nodo = []
+            for arista in self.__grafica[nodo]:
+                gemelas = pendientes.get((arista.destino, nodo))
+                if gemelas:
+                    numeros_nodo.append(gemelas.pop())
+                else:
+                    numeros_nodo.append(contador)
+                    if arista.destino is not nodo:
+                        clave = (nodo, arista.destino)
+                        if clave in pendientes:
+                            pendientes[clave].append(contador)
+                        else:
+                            pendientes[clave] = [contador]
+                    contador += 1
+            numeros[nodo] = numeros_nodo
+        return numeros
     
 
     """
@@ -533,85 +706,7 @@ class Grafica:
                 de expansión se representan con una tupla.
     """
     def busqueda_a_profundidad(self):
-        # Lista en donde se almacenarán los árboles de expansión para cada
-        # componente de la gráfica
-        bosque = [] 
-
-        # Lista de los nodos que no han sido etiquetados por el algoritmo
-        nodos_sin_etiqueta = [nodo for nodo in self.__grafica]
-
-        # Pila auxiliar del algoritmo
-        pila = Pila()
-        
-
-        # Mientras existan nodos sin etiquetar se efectuará el algoritmo de 
-        # búsqueda
-        while True:
-            # ----- ALGORITMO DE BÚSQUEDA A PROFUNDIDAD -----
-            
-            arbol = []
-
-            # Se toma el primer vértice y se etiqueta
-            v = nodos_sin_etiqueta.pop()
-            v.etiqueta = 1
-
-
-            # Mientras falte algún nodo por etiquetar en la gráfica, el algoritmo de búsqueda 
-            # continúa          
-            while nodos_sin_etiqueta:
-                # Se busca alguna arista válida de v, es decir, que su destino no esté etiquetado
-                arista = None
-                for a in self.__grafica[v]:
-                    if not a.destino.etiqueta:
-                        arista = a 
-                        break
-                
-                # Si existe alguna arista válida, entonces se marca la arista y el otro
-                # extremo; además se apila v y se hace v = w. Luego, se repite el algoritmo
-                # hasta este punto
-                if arista:
-                    # Se obtiene w
-                    w = arista.destino
-                    # Se etiqueta la arista válida de v a w
-                    arista.etiqueta = 1
-                    # Se añade la arista al árbol. También necesitamos guardar el nodo de origen
-                    # (en este caso, v) para identificar más rápido la arista en el árbol
-                    arbol.append(arista)
-                    # También se etiqueta la misma arista válida pero de w a v
-                    arista.etiqueta = 1
-                    # Se etiqueta w y se saca de los nodos sin etiqueta
-                    w.etiqueta = 1
-                    nodos_sin_etiqueta.remove(w)
-                    # Se apila v
-                    pila.apilar(v)
-                    # Se hace v = w
-                    v = w
-                    continue
-                # Si no existen aristas válidas y la pila tiene elementos, entonces
-                # se desapila un elemento y se repite el algoritmo hasta este punto
-                if not pila.es_vacia():
-                    v = pila.desapilar()
-                # Si la pila ya está vacía, continuar con la siguiente parte del algoritmo
-                else:
-                    break
-            
-            # Si el árbol de expansión no contiene aristas, significa que la componente actual está
-            # formada de un solo vértice (v)
-            if len(arbol) == 0:
-                arbol.append(v)
-            
-            # Se añade el árbol al bosque
-            bosque.append(arbol)
-
-            # Si todos los nodos están etiquetados, entonces se termina
-            if not nodos_sin_etiqueta:
-                break
-            
-        
-        # Se limpian las etiquetas del árbol y se regresa el bosque
-        self.__limpiar_etiquetas("todo")
-
-        return bosque
+        return self.__bosque(profundidad=True)
 
 
     """
@@ -624,84 +719,20 @@ class Grafica:
                 de expansión se representan con una tupla.
     """
     def busqueda_a_lo_ancho(self):
-        # Lista en donde se almacenarán los árboles de expansión para cada
-        # componente de la gráfica
-        bosque = [] 
-
-        # Lista de los nodos que no han sido etiquetados por el algoritmo
-        nodos_sin_etiqueta = [nodo for nodo in self.__grafica if not nodo.etiqueta]
-
-
-        # Cola auxiliar del algoritmo
-        cola = Cola()
-
-
-        # Mientras existan nodos sin etiquetar se efectuará el algoritmo de 
-        # búsqueda
-        while True:
-            # ----- ALGORITMO DE BÚSQUEDA A LO ANCHO -----
-            
-            # Árbol en donde vamos a guardar el árbol de mínima expansión para la componente
-            # actual
-            arbol = []
-
-            # Se elige un vértice no etiquetado, se etiqueta y se encola
-            v = nodos_sin_etiqueta.pop()
-            v.etiqueta = 1
-            cola.encolar(v)
-
-            # El algoritmo continúa mientras la cola no esté vacía y 
-            # haya vértices sin marcar
-            while not cola.es_vacia() and nodos_sin_etiqueta:
-                # Se desencola un vértice t
-                t = cola.desencolar()
-
-                # Se marcan todas las aristas de t tal que su otro extremo w
-                # no esté marcado; además, se encola a w
-                for arista in self.__grafica[t]:
-                    w = arista.destino
-                    if not w.etiqueta:
-                        # Se etiqueta el nodo
-                        w.etiqueta = 1
-                        # Se etiqueta la arista de v a w (arista) y también en sentido contrario
-                        # (de w a v)
-                        arista.etiqueta = 1
-                        arista.etiqueta = 1
-                        # Se añade la arista al árbol junto con su origen
-                        arbol.append(arista)
-                        # Se encola w y como ya está marcado, entonces se elimina de la lista de 
-                        # nodos sin marcar
-                        nodos_sin_etiqueta.remove(w)
-                        cola.encolar(w)
-            
-            # Si el árbol de expansión no contiene aristas, significa que la componente actual está
-            # formada de un solo vértice (v)
-            if len(arbol) == 0:
-                arbol.append(v)
-            
-            # Se añade el árbol al bosque
-            bosque.append(arbol)
-
-            # Si todos los nodos están etiquetados, entonces se termina
-            if not nodos_sin_etiqueta:
-                break
-
-            cola.vaciar()
-        
-        # Se limpian las etiquetas del árbol y se regresa el bosque
-        self.__limpiar_etiquetas("todo")
-
-        return bosque
+        return self.__bosque(profundidad=False)
 
     def algoritmo_kruskal(self):
+        # Las aristas que ya se tomaron (en cualquiera de sus dos sentidos) se etiquetan en el
+        # contexto de esta ejecución
+        etiquetas = Etiquetas()
     	# Introducir todas las aristas a una lista
         aristas = []
         for nodo in self.__grafica:
             for arista in self.__grafica[nodo]:
-                if not arista.etiqueta:
+                if not etiquetas[arista]:
                     aristas.append(arista)
-                    arista.etiqueta = 1
-                    self.buscar_arista(arista.destino.nombre, nodo.nombre, arista.peso).etiqueta = 1
+                    etiquetas[arista] = 1
+                    etiquetas[self.buscar_arista(arista.destino.nombre, nodo.nombre, arista.peso)] = 1
 
         
         # Ordenar las aristas de mayor a menor de acuerdo a su peso
@@ -714,125 +745,210 @@ class Grafica:
         # Arreglo en donde se almacenarán las aristas del árbol de mínima expansión
         arbol = [] 
         
-        # El algoritmo se ejecuta hasta que el número de aristas del árbol
-        # sea igual al númer de vértices - 1, además, deben existir aristas
-        # no seleccionadas en caso de que la gráfica no sea conexa
-        num_nodos = self.obtener_numero_nodos()
-        while len(arbol) < num_nodos - 1 and aristas:
+        # El algoritmo se ejecuta hasta que todos los nodos queden en una sola
+        # componente (el árbol tiene número de vértices - 1 aristas), además,
+        # deben existir aristas no seleccionadas en caso de que la gráfica no sea conexa
+        while unionBusqueda.num_componentes > 1 and aristas:
             # Obtenemos una arista
             arista = aristas.pop()
-            # Se busca el padre de cada arista. Si tienen padres distintos, 
-            # entonces no se formará un ciclo y por lo tanto se agregan al árbol
-            # y se unen
-            if unionBusqueda.busqueda(arista.origen) != unionBusqueda.busqueda(arista.destino):
-                arbol.append(arista)                                
-                unionBusqueda.union(arista.origen, arista.destino)
+            # Si los extremos de la arista están en componentes distintas,
+            # entonces no se formará un ciclo y por lo tanto se unen y la
+            # arista se agrega al árbol
+            if unionBusqueda.union(arista.origen, arista.destino):
+                arbol.append(arista)
         
         
         arbol.sort(key=lambda a:float(a.peso))
-        self.__limpiar_etiquetas("aristas")
         return arbol
     
-    def algoritmo_prim(self):
-        # Se obtienen todos los nodos sin etiqueta
-        nodos_sin_etiqueta = [n for n in self.__grafica]
-        # Se inicializa el bosque vacío
+    def algoritmo_prim(self, variante=None):
+        """
+            Este método encuentra un bosque de mínima expansión con el algoritmo de Prim: un
+            árbol por cada componente, con sus aristas ordenadas por peso.
+            Parámetros
+            ----------
+            variante: "monticulo" para usar un montículo binario, O(m log n), o "densa" para
+                      usar arreglos indexados por nodo, O(n²). Si no se especifica, se elige
+                      según la densidad de la gráfica
+            Regresa
+            -------
+            Lista con los árboles de mínima expansión de cada componente
+        """
+        nodos = list(self.__grafica)
+        if variante is None:
+            # Con muchas aristas, revisar todos los nodos en cada paso es más barato que
+            # mantener el montículo
+            n = max(len(nodos), 2)
+            variante = "densa" if self.__num_aristas * math.log2(n) >= n * n else "monticulo"
+        if variante == "monticulo":
+            bosque = self.__prim_monticulo(nodos)
+        elif variante == "densa":
+            bosque = self.__prim_denso(nodos)
+        else:
+            raise ValueError(f"Error en la variante dada ({variante}). Valores aceptados: 'monticulo', 'densa'")
+
+        # Cuando ya no existe arista válida entonces hemos terminado de encontrar el árbol de
+        # mínima expansión en la componente actual, por lo tanto, éste se ordena por peso.
+        for arbol in bosque:
+            arbol.sort(key=lambda a:float(a.peso))
+        return bosque
+
+    def __prim_monticulo(self, nodos):
+        """
+            Algoritmo de Prim con un montículo binario de aristas candidatas. Como en dijkstra,
+            una arista sólo se agrega al montículo si mejora el peso conocido de su destino, y
+            las entradas cuyo destino ya está en el árbol se descartan al sacarlas.
+
+            Entre aristas del mismo peso se escoge la primera que se encontró, recorriendo los
+            nodos en el orden en el que se marcaron, igual que la versión que revisaba todas las
+            aristas de los nodos marcados en cada paso.
+        """
         bosque = []
+        etiquetas = Etiquetas()
 
         # Se buscarán árboles de mínima expansión mientras existan nodos sin etiqueta. Esto para
         # encontrar lo árboles de todas las componentes en caso de que la gráfica no sea conexa
-        while nodos_sin_etiqueta:
-            # Se inicializa la lista de nodos marcados
-            nodos_marcados = []
+        for nodo_inicial in reversed(nodos):
+            if etiquetas[nodo_inicial]:
+                continue
+            etiquetas[nodo_inicial] = 1
+            arbol = []
+            # X tiene tuplas (peso, orden, arista); el orden sirve para desempatar
+            X = []
+            orden = 0
+            # Peso de la arista más ligera conocida hacia cada nodo sin etiqueta
+            pesos = {}
+            x = nodo_inicial
+            while True:
+                # Se agregan las aristas del nodo recién marcado
+                for arista in self.__grafica[x]:
+                    peso = float(arista.peso)
+                    v = arista.destino
+                    if not etiquetas[v] and peso < pesos.get(v, math.inf):
+                        pesos[v] = peso
+                        heapq.heappush(X, (peso, orden, arista))
+                    orden += 1
+
+                # Se descartan las entradas viejas
+                while X and etiquetas[X[0][2].destino]:
+                    heapq.heappop(X)
+                if not X:
+                    break
 
-            # Se obtiene un nodo inicial y se agrega a la lista de nodos marcados
-            nodo_inicial = nodos_sin_etiqueta.pop()
-            nodo_inicial.etiqueta = 1
-            nodos_marcados.append(nodo_inicial)
+                # La arista mínima se agrega al árbol y su destino se marca
+                _, _, arista_minima = heapq.heappop(X)
+                arbol.append(arista_minima)
+                x = arista_minima.destino
+                etiquetas[x] = 1
+            bosque.append(arbol)
 
-            # Se inicializa el árbol de la componente actual
-            arbol = []
+        return bosque
 
-            # El algoritmo debe ejecutarse mientras exista una arista válida
-            while True:
+    def __prim_denso(self, nodos):
+        """
+            Algoritmo de Prim con arreglos indexados por nodo: para cada nodo sin marcar se
+            guarda la arista más ligera que lo une al árbol, y en cada paso se revisan todos los
+            nodos. Escoge las mismas aristas que __prim_monticulo.
+        """
+        n = len(nodos)
+        indices = {nodo: i for i, nodo in enumerate(nodos)}
+        marcados = [False] * n
+        pesos = [math.inf] * n
+        ordenes = [0] * n
+        aristas_minimas = [None] * n
+        orden = 0
+        bosque = []
 
-                # Se inicializan las variables 
-                peso_minimo = math.inf 
-                arista_minima = None
-
-                # Se recorren todas las aristas que iniciden en los nodos marcados, es decir, 
-                # los que ya están dentro del árbol de expansión
-                for nodo in nodos_marcados:
-                    for arista in self.__grafica[nodo]:
-                        # Si el peso de la arista es menor que el peso mínimo actual y el destino
-                        # no tiene etiqueta, entonces esta arista es un candidato a arista mínima
-                        if float(arista.peso) < peso_minimo and not arista.destino.etiqueta:
-                            arista_minima = arista
-                            peso_minimo = float(arista.peso)
-                
-                # Si al final existe una arista mínima se agrega al árbol
-                if arista_minima:
-                    arbol.append(arista_minima)
-                    # Se agrega el nodo destino de la arista mínima a la lista de nodos marcados
-                    arista_minima.destino.etiqueta = 1
-                    nodos_marcados.append(arista_minima.destino)
-                    # El nodo destino de la arista mínima se elimina de la lista de nodos sin etiqueta
-                    nodos_sin_etiqueta.remove(arista_minima.destino)
-                else:
-                    break
-            
-            # Cuando ya no existe arista válida entonces hemos terminado de encontrar el árbol de
-            # mínima expansión en la componente actual, por lo tanto, éste se agrega al bosque.
-            arbol.sort(key=lambda a:float(a.peso))
+        for inicial in reversed(range(n)):
+            if marcados[inicial]:
+                continue
+            arbol = []
+            u = inicial
+            while u is not None:
+                marcados[u] = True
+                # Se actualizan las aristas más ligeras con las del nodo recién marcado
+                for arista in self.__grafica[nodos[u]]:
+                    peso = float(arista.peso)
+                    v = indices[arista.destino]
+                    if not marcados[v] and peso < pesos[v]:
+                        pesos[v] = peso
+                        ordenes[v] = orden
+                        aristas_minimas[v] = arista
+                    orden += 1
+
+                # Se escoge el nodo sin marcar más cercano al árbol
+                u = None
+                for v in range(n):
+                    if not marcados[v] and aristas_minimas[v] is not None:
+                        if u is None or pesos[v] < pesos[u] or (pesos[v] == pesos[u] and ordenes[v] < ordenes[u]):
+                            u = v
+                if u is not None:
+                    arbol.append(aristas_minimas[u])
             bosque.append(arbol)
-        
-        self.__limpiar_etiquetas("nodos")
+
         return bosque
 
-    def dijkstra(self, origen, destino):
-        X = []
-        
-        self.agregar_arista_digrafica(origen,origen,0)
-        v = self.buscar_arista(origen,origen,0)
-        X.append([v,0])
+    def dijkstra(self, origen, destino=None):
+        """
+            Este método encuentra las rutas más cortas desde el nodo origen hacia todos los
+            demás nodos de la gráfica.
+            Parámetros
+            ----------
+            origen: Nombre del nodo origen
+            destino: Si se especifica, el algoritmo se detiene en cuanto este nodo se marca
+                     de forma permanente
+            Regresa
+            -------
+            Lista de pares [arista, longitud] en el orden en el que se marcaron los nodos de
+            forma permanente; la arista es la última arista de la ruta más corta hacia su destino.
+            El primer par es un lazo (que no se agrega a la gráfica) en el origen con longitud 0.
+            False si algún nodo no se puede alcanzar desde el origen.
+        """
+        nodo_origen = self.buscar_nodo(origen)
+        if not nodo_origen:
+            raise ValueError(f"Error. El nodo {origen} no existe en la gráfica")
+
+        # X es un montículo binario con los nodos marcados temporalmente como tuplas
+        # (longitud, orden, arista). Cuando una etiqueta mejora se agrega una nueva entrada y
+        # las entradas viejas se descartan al sacarlas, porque su destino ya es permanente.
+        # El orden sirve para desempatar sin comparar aristas.
+        X = [(0, 0, Arista(nodo_origen, nodo_origen, None, 0))]
+        orden = 1
+        # Longitud de la mejor ruta conocida hacia cada nodo marcado temporalmente
+        longitudes = {nodo_origen: 0}
+        # Los nodos marcados de forma permanente se etiquetan en el contexto de esta ejecución
+        etiquetas = Etiquetas()
         Y = []
-        minimo = -math.inf
-        
-        while(X):
-            # ordenamos los aristas marcados temporalmente por peso
-            X.sort(key=lambda x:float(x[1]), reverse=False)
-            #agarramos el elemento de la lista con los aristas etiquetados temporalmente
-            x = X[0]
-            # lo sacamos de la lista de marcados temporal
-            X.remove(X[0])
-            # le ponemos etiqueta a la aristas
-            x[0].destino.etiqueta="1"
-            # lo agregamos a la lista de marcados permanentes
-            Y.append(x)
-            
-            booleano=False
-   
+
+        while X:
+            # Tomamos la arista con la longitud más pequeña
+            longitud, _, arista_minima = heapq.heappop(X)
+            x = arista_minima.destino
+            # Si su destino ya está marcado de forma permanente, la entrada es vieja
+            if etiquetas[x] == "1":
+                continue
+
+            # El nodo se marca de forma permanente y se agrega a la lista de marcados permanentes
+            etiquetas[x] = "1"
+            Y.append([arista_minima, longitud])
+            if destino is not None and x.nombre == destino:
+                break
+
             # recorremos los aristas del nodo recien marcado de forma permanente
-            for arista in self.__grafica[x[0].destino]: 
-                booleano=False
-                # checamos si el nodo destino de la arista está marcado permanentemente
-                if(arista.destino.etiqueta != "1"):      
-                    for nodo in X: # recorremos los nodos marcados temporalmente
-                        # checamos si el nodo destino del arista recorrido ya está marcado temporalmente
-                        if(nodo[0].destino == arista.destino): 
-                            booleano=True
-                            # comparamos pesos entre la etiqueta actual del nodo y la posible nueva etiqueta
-                            if(nodo[1] > float(arista.peso)+x[1]):  
-                                # actualizamos la etiqueta                      
-                                nodo[0]=arista                                    
-                                nodo[1]=float(arista.peso)+x[1] 
-                    # si el nodo destino del arista no  estaba marcado, lo marcamos con etiqueta temporal.                                                              
-                    if booleano==False:    
-                        X.append([arista,float(arista.peso)+x[1]])
+            for arista in self.__grafica[x]:
+                v = arista.destino
+                if etiquetas[v] == "1":
+                    continue
+                # si el nodo no estaba marcado o la nueva ruta es mejor, actualizamos su etiqueta temporal
+                nueva_longitud = float(arista.peso) + longitud
+                if v not in longitudes or nueva_longitud < longitudes[v]:
+                    longitudes[v] = nueva_longitud
+                    heapq.heappush(X, (nueva_longitud, orden, arista))
+                    orden += 1
 
         # revisamos si todos nodos fueron marcados permanentemente
-        if(len(Y)==len(self.__grafica)):
-            # regresamos la lista con las etiquetas permanentes encontradass
+        if destino is not None or len(Y) == len(self.__grafica):
+            # regresamos la lista con las etiquetas permanentes encontradas
             return Y
         else:
             return False
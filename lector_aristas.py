@@ -0,0 +1,70 @@
+TAM_BLOQUE = 1 << 20 # Número de caracteres que se leen del archivo a la vez
+
+def leer_registros(archivo, nombres_por_campos, tam_bloque=TAM_BLOQUE):
+    """
+        Esta función lee un archivo de nodos y aristas (o arcos) línea por línea y revisa el
+        formato de cada línea. Cada número de campos válido dice cuántos de los primeros
+        campos son nombres de nodos; el resto de los campos se convierten a números. Las
+        líneas vacías se ignoran.
+
+        El archivo se lee por bloques de tamaño fijo, así que sólo se guarda en memoria un
+        bloque a la vez (en lugar de todo el archivo, como con readlines()).
+        Parámetros
+        ----------
+        archivo: Ruta del archivo
+        nombres_por_campos: Diccionario número de campos -> número de nombres al inicio de
+                            la línea, por ejemplo {1: 1, 2: 2, 3: 2} para "a", "a,b" y "a,b,5"
+        tam_bloque: Número de caracteres que se leen a la vez
+        Regresa
+        -------
+        Un generador con la lista de campos de cada línea, con los números ya convertidos.
+        Si una línea no tiene el formato, se lanza ValueError con el número de línea.
+    """
+    numero_linea = 0
+    for lineas in _bloques(archivo, tam_bloque):
+        for linea in lineas:
+            numero_linea += 1
+            campos = linea.strip().split(",")
+            num_nombres = nombres_por_campos.get(len(campos))
+            if num_nombres is None:
+                if campos == [""]:
+                    continue
+                validos = [str(n) for n in sorted(nombres_por_campos)]
+                validos = ", ".join(validos[:-1]) + " o " + validos[-1] if len(validos) > 1 else validos[0]
+                raise ValueError(f"Error en la línea {numero_linea} de {archivo}: tiene {len(campos)} campos y se esperaban {validos}")
+            if "" in campos[:num_nombres]:
+                if campos == [""]:
+                    continue
+                raise ValueError(f"Error en la línea {numero_linea} de {archivo}: el nombre del nodo está vacío")
+            if len(campos) > num_nombres:
+                try:
+                    campos[num_nombres:] = map(float, campos[num_nombres:])
+                except ValueError:
+                    malo = next(campo for campo in campos[num_nombres:] if not _es_numero(campo))
+                    raise ValueError(f"Error en la línea {numero_linea} de {archivo}: '{malo}' no es un número") from None
+            yield campos
+
+def _bloques(archivo, tam_bloque):
+    """
+        Esta función lee el archivo por bloques y regresa, por cada bloque, la lista de sus
+        líneas completas. La última línea de un bloque puede estar incompleta, así que se
+        guarda para completarla con el siguiente.
+    """
+    resto = ""
+    with open(archivo, 'r') as f:
+        while True:
+            bloque = f.read(tam_bloque)
+            if not bloque:
+                break
+            lineas = (resto + bloque).split("\n")
+            resto = lineas.pop()
+            yield lineas
+    if resto:
+        yield [resto]
+
+def _es_numero(campo):
+    try:
+        float(campo)
+        return True
+    except ValueError:
+        return False
@@ -1,11 +1,11 @@
-import copy
 import operator
 import math
 from typing import MappingView
 from digrafica import *
 from estructuras_datos import *
-import sys
-sys.setrecursionlimit(5000)
+from lector_aristas import leer_registros
+from red_residual import RedResidual
+from vista_red import VistaRed
 
 class Arco:
     """
@@ -44,8 +44,12 @@ class Red:
     """
     def __init__(self):
         self.__red = {} # Estructura donde se va a guardar la gráfica
+        self.__nodos = {} # Índice nombre -> nodo para búsquedas en tiempo constante
+        self.__arcos = {} # Índice (origen, destino) -> arcos entre ese par de nodos
+        self.__arcos_id = {} # Índice Id -> arco
         self.__num_nodos = 0 # Contador de nodos
         self.__num_arcos = 0 # Contador de arcos
+        self.__bitacora = Bitacora() # Cambios que se pueden deshacer con restaurar()
 
     def buscar_nodo(self, nombre):
         """
@@ -58,10 +62,7 @@ class Red:
             True si el nodo se encuentra en la digráfica.
             None si el nodo no se encuentra en la digráfica. 
         """
-        for nodo in self.__red:
-            if nodo.nombre == nombre:
-                return nodo
-        return False 
+        return self.__nodos.get(nombre, False)
     
     def agregar_nodo(self, nombre, res_min=0, res_max=math.inf, oferta_demanda=0):
         """
@@ -82,9 +83,11 @@ class Red:
             # con dos listas vacías, la lista de nodos "entrantes" y la lista de nodos "salientes"
             nodo = Nodo(nombre, float(res_min), float(res_max), float(oferta_demanda))
             self.__red[nodo] = {"entrantes":[], "salientes":[]}
+            self.__nodos[nombre] = nodo
 
             # El número de nodos en la digráfica se incrementa y se regresa True
             self.__num_nodos += 1
+            self.__bitacora.anotar(self.__deshacer_agregar_nodo, nodo)
         return nodo
     
     def agregar_arco(self, a, b, res_min=0, flujo=0, capacidad=0,costo=0, Id=None):
@@ -97,6 +100,11 @@ class Red:
             res_min: restricción mínima del arco.
             flujo: Flujo del arco
             capacidad: Capacidad del arco
+            costo: Costo del arco
+            Id: Identificador del arco
+            Regresa
+            -------
+            El objeto de la clase Arco que se agregó.
         """
         # Se agregan los nodos a y b (Esto porque le damos la opción al usuario de 
         # agregar arcos directamente sin la necesidad de que los nodos ya existan
@@ -117,40 +125,43 @@ class Red:
         self.__red[nodo_b]["entrantes"].append(arco)
         nodo_b.grado_negativo += 1
 
+        # El arco se registra en los índices por par de nodos y por Id
+        self.__arcos.setdefault((nodo_a, nodo_b), []).append(arco)
+        id_anterior = None
+        if Id is not None:
+            id_anterior = self.__arcos_id.get(Id)
+            self.__arcos_id[Id] = arco
+
         # El contador de arcos se incrementa
         self.__num_arcos += 1
+        self.__bitacora.anotar(self.__deshacer_agregar_arco, arco, id_anterior)
         
-        return True
+        return arco
     
     def leer_red(self, archivo):
         """
-            Este método lee una digráfica desde un archivo
+            Este método lee una red desde un archivo. El archivo se lee por bloques y cada
+            línea se agrega en cuanto se lee, así que no se guarda completo en memoria.
             Parámetros
             ----------
             archivo: Ruta del archivo de texto en donde se encuentra la información
-                     de la digráfica de la siguiente manera y separado con Enters:
+                     de la red de la siguiente manera y separado con Enters:
                      a -> Para agregar el nodo a
                      a,b -> Para agregar el arco (a,b)
-                     a,b,5 -> Para agregar el arco (a,b) con peso 5
+                     a,0,10 -> Para agregar el nodo a con restricciones mínima 0 y máxima 10
+                     a,0,10,5 -> Lo mismo, con oferta o demanda 5
+                     a,b,0,0,7 -> Para agregar el arco (a,b) con restricción mínima 0, flujo 0
+                                  y capacidad 7
+                     a,b,0,0,7,3 -> Lo mismo, con costo 3
+                     Las líneas vacías se ignoran; si una línea no tiene este formato se
+                     lanza ValueError con el número de línea.
         """
-        file1 = open(archivo, 'r') 
-        Lines = file1.readlines() 
-
-        for line in Lines:
-            line = line.strip().split(",")
-            length = len(line)
-            if length == 1:
-                self.agregar_nodo(line[0])
-            elif length == 2:
-                self.agregar_arco(line[0], line[1])
-            elif length == 3:
-                self.agregar_nodo(line[0], float(line[1]), float(line[2]))
-            elif length == 4:
-                self.agregar_nodo(line[0], float(line[1]), float(line[2]), float(line[3]))
-            elif length == 5:
-                self.agregar_arco(line[0], line[1], float(line[2]), float(line[3]), float(line[4]))
-            elif length == 6:
-                self.agregar_arco(line[0], line[1], float(line[2]), float(line[3]), float(line[4]),float(line[5]))
+        # las líneas de nodos tienen un nombre y las de arcos dos
+        for campos in leer_registros(archivo, {1: 1, 2: 2, 3: 1, 4: 1, 5: 2, 6: 2}):
+            if len(campos) in (1, 3, 4):
+                self.agregar_nodo(*campos)
+            else:
+                self.agregar_arco(*campos)
 
     def buscar_arco(self, a, b, res_min=0, flujo=0, capacidad=0):
         """
@@ -174,13 +185,27 @@ class Red:
         if not nodo_a:
             return False
         
-        for arco in self.__red[nodo_a]['salientes']:
-            if arco.destino.nombre == b and arco.res_min == res_min and arco.flujo == flujo and arco.capacidad == capacidad:
+        # Sólo se revisan los arcos que van de a hacia b, tomados del índice por par de nodos
+        for arco in self.__arcos.get((nodo_a, self.buscar_nodo(b)), []):
+            if arco.res_min == res_min and arco.flujo == flujo and arco.capacidad == capacidad:
                 return arco
         
-        # Si se recorrieron todos los salientes del nodo de origen y no se encontró
+        # Si se recorrieron todos los arcos entre ambos nodos y no se encontró
         # el arco buscado, entonces se regresa False
         return False
+
+    def buscar_arco_id(self, Id):
+        """
+            Este método busca un arco por su identificador
+            Parámetros
+            ----------
+            Id: Identificador del arco a buscar.
+            Regresa
+            -------
+            arco: Si existe, el objeto de la clase Arco con ese Id.
+            False: Si el arco no existe.
+        """
+        return self.__arcos_id.get(Id, False)
     
     def eliminar_arco(self, a=None, b=None, res_min=0, flujo=0, capacidad=0, obj_arco=None):
         """
@@ -207,17 +232,23 @@ class Red:
             # El arco se elimina de los salientes del nodo de origen y el peso positivo
             # de éste se decrementa
             nodo_origen = arco.origen
-            self.__red[nodo_origen]["salientes"].remove(arco)
+            i = self.__red[nodo_origen]["salientes"].index(arco)
+            del self.__red[nodo_origen]["salientes"][i]
             nodo_origen.grado_positivo -= 1
 
             # El arco se elimina de los entrantes del nodo destino y el peso negativo
             # de éste se decrementa
             nodo_destino = arco.destino
-            self.__red[nodo_destino]["entrantes"].remove(arco)
+            j = self.__red[nodo_destino]["entrantes"].index(arco)
+            del self.__red[nodo_destino]["entrantes"][j]
             nodo_destino.grado_negativo -= 1
 
+            # El arco se elimina de los índices
+            k, quito_id = self.__quitar_de_indices(arco)
+
             # Se decrementa el número de arcos de la digráfica
             self.__num_arcos -= 1
+            self.__bitacora.anotar(self.__deshacer_eliminar_arco, arco, i, j, k, quito_id)
 
             # Se regresa True para indicar que el arco se pudo eliminar
             return True
@@ -245,13 +276,40 @@ class Red:
 
             # Cuando todos los arcos incidentes en el nodo se hayan eliminado procedemos a 
             # eliminar el nodo de la digráfica y decrementamos el contador de nodos
+            if self.__bitacora.instantaneas:
+                self.__bitacora.anotar(self.__deshacer_eliminar_nodo, nodo, self.__posicion_nodo(nodo))
             self.__red.pop(nodo)
+            self.__nodos.pop(nodo.nombre)
             self.__num_nodos -= 1
 
             return True
         else:
             return False
     
+    def __quitar_de_indices(self, arco):
+        """
+            Este método quita un arco de los índices por par de nodos y por Id
+            Parámetros
+            ----------
+            arco: Objeto del arco que se va a quitar
+            Regresa
+            -------
+            La posición que tenía el arco entre los arcos de su par de nodos, y True si se
+            quitó su Id del índice
+        """
+        llave = (arco.origen, arco.destino)
+        arcos = self.__arcos[llave]
+        k = arcos.index(arco)
+        del arcos[k]
+        if not arcos:
+            self.__arcos.pop(llave)
+
+        # Sólo se quita el Id si apunta a este mismo arco
+        if arco.Id is not None and self.__arcos_id.get(arco.Id) is arco:
+            self.__arcos_id.pop(arco.Id)
+            return k, True
+        return k, False
+
     def obtener_grado(self, nombre, tipo="positivo"):
         """
             Este método obtiene el grado positivo de un nodo de la gráfica
@@ -330,59 +388,153 @@ class Red:
         """
             Este método limpia la gráfica
         """
-        self.__digrafica = {}
+        self.__bitacora.anotar(self.__deshacer_vaciar_grafica, self.__red, self.__nodos, self.__arcos,
+                               self.__arcos_id, self.__num_nodos, self.__num_arcos)
+        self.__red = {}
+        self.__nodos = {}
+        self.__arcos = {}
+        self.__arcos_id = {}
         self.__num_nodos = 0
         self.__num_arcos = 0
     
 
     def copiar(self):
         """
-            Este método realiza una copia de la gráfica
+            Este método realiza una copia de la red. Los nodos y arcos se copian uno por uno
+            (sólo sus atributos y referencias), en lugar de pasar por copy.deepcopy
             Regresa
             -------
-            Objeto de la clase Digráfica que representa la copia del objeto actual.
+            Objeto de la clase Red que representa la copia del objeto actual.
         """
-        return copy.deepcopy(self)
-    
-    def __limpiar_etiquetas(self, tipo):
+        copia = Red()
+        nodos = {nodo: copia_superficial(nodo) for nodo in self.__red}
+        arcos = {}
+        for entrada in self.__red.values():
+            for arco in entrada["salientes"]:
+                nuevo = copia_superficial(arco)
+                nuevo.origen = nodos[arco.origen]
+                nuevo.destino = nodos[arco.destino]
+                arcos[arco] = nuevo
+        for nodo, entrada in self.__red.items():
+            copia.__red[nodos[nodo]] = {"entrantes": [arcos[arco] for arco in entrada["entrantes"]],
+                                        "salientes": [arcos[arco] for arco in entrada["salientes"]]}
+        copia.__nodos = {nombre: nodos[nodo] for nombre, nodo in self.__nodos.items()}
+        copia.__arcos = {(nodos[a], nodos[b]): [arcos[arco] for arco in lista]
+                         for (a, b), lista in self.__arcos.items()}
+        copia.__arcos_id = {Id: arcos[arco] for Id, arco in self.__arcos_id.items()}
+        copia.__num_nodos = self.__num_nodos
+        copia.__num_arcos = self.__num_arcos
+        return copia
+
+    def instantanea(self):
+        """
+            Este método toma una instantánea de la red, que se puede recuperar después con
+            restaurar(). No se copia nada: a partir de aquí cada cambio anota cómo deshacerse,
+            así que tomar y restaurar la instantánea cuesta lo mismo que los cambios hechos
+            Regresa
+            -------
+            La instantánea, que se le pasa a restaurar() o a confirmar()
+        """
+        return self.__bitacora.instantanea()
+
+    def restaurar(self, instantanea):
         """
-            Este método limpia las etiquetas de los nodos y/o aristas de la gráfica
+            Este método deshace los cambios (nodos, arcos) hechos después de tomar la
+            instantánea y la cierra, junto con las que se tomaron después de ella. Los atributos
+            que se cambian directamente en los objetos (como el flujo que escriben los
+            algoritmos) no se deshacen
             Parámetros
             ----------
-            tipo: Tipo del objeto del que deseamos eliminar las etiquetas
-                - "nodos": Para limpiar las etiquetas de los nodos
-                - "arcos": Para limpiar las etiquetas de los arcos
-                - "todo": Para limpiar las etiquetas de todos los arcos y aristas
+            instantanea: Instantánea regresada por instantanea()
         """
-        if tipo == "nodos":
-            for nodo in self.__red:
-                nodo.etiqueta = None
-        elif tipo == "aristas":
-            for nodo in self.__red:
-                for arco in self.__red[nodo]["entrantes"]:
-                    arco.etiqueta = None
-                for arco in self.__digrafica[nodo]["salientes"]:
-                    arco.etiqueta = None
-        elif tipo == "todo":
-            for nodo in self.__red:
-                for arco in self.__red[nodo]["entrantes"]:
-                    arco.etiqueta = None
-                for arco in self.__red[nodo]["salientes"]:
-                    arco.etiqueta = None
-        else:
-            raise ValueError(f"Error en el tipo dado ({tipo}). Valores aceptados: 'nodos', 'aristas', 'todos'")
+        self.__bitacora.restaurar(instantanea)
 
+    def confirmar(self, instantanea):
+        """
+            Este método cierra la instantánea conservando los cambios
+            Parámetros
+            ----------
+            instantanea: Instantánea regresada por instantanea()
+        """
+        self.__bitacora.confirmar(instantanea)
+
+    def __posicion_nodo(self, nodo):
+        """
+            Este método regresa la posición del nodo en el orden de la red. Casi siempre
+            se eliminan los últimos nodos agregados, así que primero se revisa el último
+        """
+        if next(reversed(self.__red)) is nodo:
+            return len(self.__red) - 1
+        return list(self.__red).index(nodo)
+
+    def __deshacer_agregar_nodo(self, nodo):
+        self.__red.pop(nodo)
+        self.__nodos.pop(nodo.nombre)
+        self.__num_nodos -= 1
+
+    def __deshacer_agregar_arco(self, arco, id_anterior):
+        self.__red[arco.origen]["salientes"].pop()
+        arco.origen.grado_positivo -= 1
+        self.__red[arco.destino]["entrantes"].pop()
+        arco.destino.grado_negativo -= 1
+        llave = (arco.origen, arco.destino)
+        self.__arcos[llave].pop()
+        if not self.__arcos[llave]:
+            self.__arcos.pop(llave)
+        if arco.Id is not None:
+            if id_anterior is None:
+                self.__arcos_id.pop(arco.Id)
+            else:
+                self.__arcos_id[arco.Id] = id_anterior
+        self.__num_arcos -= 1
+
+    def __deshacer_eliminar_arco(self, arco, i, j, k, quito_id):
+        self.__red[arco.origen]["salientes"].insert(i, arco)
+        arco.origen.grado_positivo += 1
+        self.__red[arco.destino]["entrantes"].insert(j, arco)
+        arco.destino.grado_negativo += 1
+        self.__arcos.setdefault((arco.origen, arco.destino), []).insert(k, arco)
+        if quito_id:
+            self.__arcos_id[arco.Id] = arco
+        self.__num_arcos += 1
+
+    def __deshacer_eliminar_nodo(self, nodo, posicion):
+        # El nodo regresa a su lugar en el orden de la red, que es el orden en el que lo
+        # recorren los algoritmos
+        entrada = {"entrantes": [], "salientes": []}
+        if posicion == len(self.__red):
+            self.__red[nodo] = entrada
+        else:
+            elementos = list(self.__red.items())
+            elementos.insert(posicion, (nodo, entrada))
+            self.__red = dict(elementos)
+        self.__nodos[nodo.nombre] = nodo
+        self.__num_nodos += 1
+
+    def __deshacer_vaciar_grafica(self, red, nodos, arcos, arcos_id, num_nodos, num_arcos):
+        self.__red = red
+        self.__nodos = nodos
+        self.__arcos = arcos
+        self.__arcos_id = arcos_id
+        self.__num_nodos = num_nodos
+        self.__num_arcos = num_arcos
+    
     def imprimir_arcos(self): 
         for nodo in self.__red:
             for arco in self.__red[nodo]["salientes"]:
                 print("(",arco.origen.nombre,', ',arco.destino.nombre,', ',arco.res_min,', ',arco.flujo,', ',arco.capacidad,", ",arco.costo,')')
 
-    def fulkerson(self,fuente,sumidero,limite_flujo,sumideros):
+    def fulkerson(self,fuente,sumidero,limite_flujo,sumideros,vista=None):
+            if vista is None:
+                vista = self.vista()
             arcos_visitados = []
             cadena = []
+            # sentido en el que cada arco de la cadena aumentante se recorre, en el contexto de
+            # esta ejecución
+            sentidos = Etiquetas()
            
             # buscamos cadenas aumentantes con busqueda a lo profundo
-            self.dfs(fuente,fuente,sumidero,cadena,arcos_visitados)
+            self.dfs(fuente,fuente,sumidero,cadena,arcos_visitados,sentidos,vista)
             bool = False
             # ciclo donde actualizaremos el flujo de las cadenas aumentantes, mientras existan estas cadenas
             while True:
@@ -390,39 +542,32 @@ class Red:
 
                 # calculamos el flujo con el que actualizarmos el flujo de la cadena aumentante
                 for arco in cadena:       
-                    if(arco.etiqueta == "sentidoPropio"):
+                    if(sentidos[arco] == "sentidoPropio"):
                          # caso donde el arco va en sentido propio
                         if((arco.capacidad - arco.flujo) < flujo_cadena):
                             flujo_cadena = arco.capacidad - arco.flujo
                     else:
                         # caso donde el arco va en sentido impropio
-                        if(arco.etiqueta == "sentidoImpropio"):
+                        if(sentidos[arco] == "sentidoImpropio"):
                             if(arco.flujo - arco.res_min < flujo_cadena):
                                 flujo_cadena = arco.flujo - arco.res_min
 
-                if (sumidero.nombre != "sumideroFicticio"):
-                    flujo_actual = 0
-                    for nodo in sumideros:
-                        for arco in self.__red[self.buscar_nodo(nodo)]["entrantes"]:
-                            flujo_actual += arco.flujo
+                if (sumidero.nombre != "SumideroFicticio"):
+                    flujo_actual = self.__flujo_sumideros(vista, sumideros)
                             
-                        for arco in self.__red[self.buscar_nodo(nodo)]["salientes"]:
-                            if(arco.destino.nombre != "Z-"):
-                                flujo_actual -= arco.flujo
-                           
                     if(limite_flujo): 
                         if(flujo_cadena+flujo_actual > limite_flujo):
                             bool = True
-                            flujo_cadena =   flujo_cadena - ((flujo_cadena+flujo_actual) - limite_flujo )
+                            flujo_cadena = limite_flujo - flujo_actual
                     
                 # actualizamos el flujo de los arcos de la cadena aumentante
                 for arco in cadena:
                     # caso donde el arco va en sentido propio, sumamos flujo
-                    if(arco.etiqueta == "sentidoPropio"):
+                    if(sentidos[arco] == "sentidoPropio"):
                         arco.flujo += flujo_cadena
 
                     # caso donde el arco va en sentido impropio, restamos flujo
-                    if(arco.etiqueta == "sentidoImpropio"):
+                    if(sentidos[arco] == "sentidoImpropio"):
                         arco.flujo -= flujo_cadena
 
                 if(bool == True):
@@ -430,328 +575,364 @@ class Red:
 
                 cadena= []
                 arcos_visitados = []
-                # reseteamos las etiquetas de los nodos
-                for nodo in self.__red:
-                    nodo.etiqueta = None
                 # buscamos una nueva cadena aumentante
-                self.dfs(fuente,fuente,sumidero,cadena,arcos_visitados)
+                self.dfs(fuente,fuente,sumidero,cadena,arcos_visitados,sentidos,vista)
 
                 # si ya no hay cadenas aumentantes, nos detenemos
                 if not cadena:
                     break
 
-    def flujo_maximo(self,fuentes,sumideros,limite_flujo = None,Dual = None):
-        
-        # revisaremos cuantos nodos fuentes y sumideros hay 
-        # si hay mas de un sumireo o mas de un nodo fuente, crearemos un super fuente o un super sumidero
+    def aumentar_flujo(self, fuente, sumidero, limite_flujo, sumideros, algoritmo="fulkerson", vista=None):
+        """
+            Este método aumenta el flujo desde el fuente hasta el sumidero con el algoritmo
+            elegido. Con limite_flujo, el flujo que reciben los sumideros no pasa de ese límite
+            (la fase en la que se satisfacen las restricciones mínimas no tiene límite)
+            Parámetros
+            ----------
+            fuente: Nodo fuente
+            sumidero: Nodo sumidero
+            limite_flujo: Flujo máximo que pueden recibir los sumideros, o None
+            sumideros: Lista con los nombres de los sumideros de la red
+            algoritmo: "fulkerson", "dinic" o "empuje_reetiquetado"
+            vista: VistaRed en la que se aumenta el flujo; por omisión, una vista de la red
+        """
+        if vista is None:
+            vista = self.vista()
+        if algoritmo == "fulkerson":
+            self.fulkerson(fuente, sumidero, limite_flujo, sumideros, vista)
+            return
+        if algoritmo not in ("dinic", "empuje_reetiquetado"):
+            raise ValueError(f"Error en el algoritmo dado ({algoritmo}). Valores aceptados: 'fulkerson', 'dinic', 'empuje_reetiquetado'")
+
+        limite = math.inf
+        if limite_flujo and sumidero.nombre != "SumideroFicticio":
+            # el límite se aplica al flujo que ya reciben los sumideros
+            limite = max(0, limite_flujo - self.__flujo_sumideros(vista, sumideros))
+
+        arcos = vista.arcos()
+        red_marginal = RedResidual(arcos, [vista.origen(arco) for arco in arcos])
+        if algoritmo == "dinic":
+            red_marginal.dinic(fuente, sumidero, limite)
+        else:
+            red_marginal.empuje_reetiquetado(fuente, sumidero, limite)
+
+    def __flujo_sumideros(self, vista, sumideros):
+        """
+            Este método calcula el flujo que reciben los sumideros en la vista. Si un sumidero
+            está particionado por tener restricciones, se cuentan sus dos partes; el flujo que
+            los sumideros mandan al super sumidero no se descuenta.
+            Parámetros
+            ----------
+            vista: VistaRed en la que se calcula el flujo
+            sumideros: Lista con los nombres de los sumideros
+            Regresa
+            -------
+            El flujo que reciben los sumideros
+        """
+        nodos_sumideros = []
+        for nombre in sumideros:
+            nodo = vista.buscar_nodo(nombre)
+            for parte in (nodo, vista.particion(nodo)):
+                if parte and parte not in nodos_sumideros:
+                    nodos_sumideros.append(parte)
+        flujo = 0
+        for nodo in nodos_sumideros:
+            for arco in vista.entrantes(nodo):
+                flujo += arco.flujo
+            for arco in vista.salientes(nodo):
+                if(arco.destino.nombre != "Z-"):
+                    flujo -= arco.flujo
+        return flujo
+
+    def vista(self):
+        """
+            Este método regresa una vista de la red, en la que los algoritmos de flujo agregan
+            nodos y arcos ficticios y particionan nodos sin modificar la red
+            Regresa
+            -------
+            Objeto de la clase VistaRed
+        """
+        return VistaRed(self.__red, self.buscar_nodo, Nodo, Arco)
+
+    def __vista_flujo(self, fuentes, sumideros):
+        """
+            Este método construye la vista en la que trabajan los algoritmos de flujo. Si hay
+            más de un fuente o más de un sumidero, se agrega a la vista un super fuente ('A+')
+            o un super sumidero ('Z-') unido a ellos con arcos de capacidad infinita.
+            Parámetros
+            ----------
+            fuentes: Lista con los nombres de los nodos fuente
+            sumideros: Lista con los nombres de los nodos sumidero
+            Regresa
+            -------
+            La vista, el nodo fuente y el nodo sumidero
+        """
+        vista = self.vista()
         if len(fuentes) > 1:
-            self.agregar_nodo('A+')
-            fuente = self.buscar_nodo('A+')
-            for nodo in fuentes:
-                self.agregar_arco(fuente.nombre, nodo,0,0,math.inf)
+            fuente = vista.agregar_nodo('A+')
+            for nombre in fuentes:
+                vista.agregar_arco(fuente, vista.buscar_nodo(nombre), 0, 0, math.inf)
+        else:
+            fuente = vista.buscar_nodo(fuentes[0])
 
         if len(sumideros) > 1:
-            self.agregar_nodo('Z-')
-            sumidero = self.buscar_nodo('Z-')
-            for nodo in sumideros:
-                self.agregar_arco(nodo, sumidero.nombre,0,0,math.inf)
-
-        # si solo hay un sumidero o un solo fuente, los definimos
-        if(len(fuentes)==1 ):
-            fuente = self.buscar_nodo(fuentes[0])
-        if(len(sumideros)==1 ):
-            sumidero = self.buscar_nodo(sumideros[0])
-
-        # revisaremos el caso donde hay restricciones en uno o mas nodos
-        nodos_ficticios = []
-        lista_nodos = []
-        # lista con los nodos originales de la lista
-        for nodo in self.__red:
-            lista_nodos.append(nodo)
-        
-      
-        # iteramos los nodos para revisar si tienen restricciones
-        for nodo in lista_nodos:
-            if nodo.res_min > 0 or nodo.res_max != math.inf:
-                # si el nodo tiene restricción, agregamos un nodo ficticio
-                self.agregar_nodo(nodo.nombre+ '"')
-                # metemos el nodo ficticio creado en una lista
-                nodos_ficticios.append(nodo)
-
-                # creamos una lista de los arcos salientes del nodo que tiene restricciones
-                lista_arcos = []
-                for arco in self.__red[nodo]["salientes"]:
-                    lista_arcos.append(arco)
+            sumidero = vista.agregar_nodo('Z-')
+            for nombre in sumideros:
+                vista.agregar_arco(vista.buscar_nodo(nombre), sumidero, 0, 0, math.inf)
+        else:
+            sumidero = vista.buscar_nodo(sumideros[0])
+        return vista, fuente, sumidero
 
-                # creamos un arco ficticio entre el nodo con restricciones y en nuevo nodo ficticio creado
-                self.agregar_arco(nodo.nombre, nodo.nombre+ '"',nodo.res_min,0,nodo.res_max)
+    def flujo_maximo(self,fuentes,sumideros,limite_flujo = None,Dual = None,algoritmo = "fulkerson"):
+        """
+            Este método calcula el flujo máximo desde los fuentes hasta los sumideros. El super
+            fuente, el super sumidero, la partición de los nodos con restricciones y los nodos
+            ficticios de las restricciones mínimas se hacen en una VistaRed, así que la red
+            sólo cambia en los flujos de sus arcos, aunque el algoritmo se interrumpa.
+            Parámetros
+            ----------
+            fuentes: Lista con los nombres de los nodos fuente
+            sumideros: Lista con los nombres de los nodos sumidero
+            limite_flujo: Flujo máximo que pueden recibir los sumideros, o None
+            Dual: Si es verdadero, sólo se satisfacen las restricciones mínimas
+            algoritmo: "fulkerson", "dinic" o "empuje_reetiquetado"
+            Regresa
+            -------
+            El flujo que reciben los sumideros, o None si las restricciones mínimas no se
+            pueden satisfacer o al satisfacerlas se pasa de limite_flujo. Si regresa None, los
+            flujos de los arcos no cambian.
+        """
+        vista, fuente, sumidero = self.__vista_flujo(fuentes, sumideros)
+        return self.__flujo_maximo(vista, fuente, sumidero, sumideros, limite_flujo, Dual, algoritmo)
+
+    def __flujo_maximo(self, vista, fuente, sumidero, sumideros, limite_flujo, Dual, algoritmo):
+        # las particiones y los nodos ficticios sólo existen en la vista mientras dura el
+        # algoritmo; al terminar (o si el algoritmo se interrumpe) la vista se restaura
+        instantanea = vista.instantanea()
+        # si no hay flujo factible, los flujos de los arcos se regresan a como estaban
+        flujos = self.__flujos(vista)
+        try:
+            # iteramos los nodos para revisar si tienen restricciones
+            for nodo in vista.nodos():
+                if nodo.res_min > 0 or nodo.res_max != math.inf:
+                    # si el nodo tiene restricción, lo particionamos: sus arcos salientes pasan
+                    # a salir de un nodo ficticio, unido al nodo por un arco con sus restricciones
+                    vista.particionar(nodo)
+
+            # revisamos los arcos que tienen restriccion y los metemos a una lista
+            arcos_con_restriccion = [arco for arco in vista.arcos() if arco.res_min > 0]
+
+            # caso donde existen arcos con restriccion; si no se pueden satisfacer todas las
+            # restricciones mínimas, no hay flujo factible
+            if(len(arcos_con_restriccion)> 0):
+                if not self.__satisfacer_restricciones_minimas(vista, fuente, sumidero, arcos_con_restriccion, limite_flujo, sumideros, algoritmo):
+                    self.__restaurar_flujos(flujos)
+                    return None
 
-                for arco in lista_arcos:   
-                    # los arcos salientes del nodo con restricciones ahora serán los arcos salientes del nuevo nodo ficticio           
-                    self.agregar_arco(nodo.nombre+ '"', arco.destino.nombre,arco.res_min,arco.flujo,arco.capacidad,arco.costo)
-                    # eliminamos momentaneamente los arcos salientes del nodo que tiene restricciones
-                    self.eliminar_arco(nodo.nombre,arco.destino.nombre,arco.res_min,arco.flujo,arco.capacidad)
+            if(limite_flujo or Dual):
+                flujo_actual = self.__flujo_sumideros(vista, sumideros)
+                if(Dual):
+                    return flujo_actual
+                if(flujo_actual > limite_flujo):
+                    # el flujo factible que se encontró pasa del límite: regresamos el exceso del
+                    # sumidero al fuente sin bajar de las restricciones mínimas, igual con cualquier algoritmo
+                    arcos = vista.arcos()
+                    RedResidual(arcos, [vista.origen(arco) for arco in arcos]).dinic(sumidero, fuente, flujo_actual - limite_flujo)
+                    flujo_actual = self.__flujo_sumideros(vista, sumideros)
+                if(flujo_actual > limite_flujo):
+                    self.__restaurar_flujos(flujos)
+                    return None
 
-        # revisamos los arcos que tienen restriccion y los metemos a una lista
-        arcos_con_restriccion = []            
-        for nodo in self.__red:
-            for arco in self.__red[nodo]["salientes"]:
-                if(arco.res_min > 0):
-                    arcos_con_restriccion.append(arco)
+            # aumentamos el flujo en la red con el algoritmo elegido
+            self.aumentar_flujo(fuente,sumidero,limite_flujo,sumideros,algoritmo,vista)
+        finally:
+            vista.restaurar(instantanea)
 
-        # caso donde existen arcos con restriccion
-        if(len(arcos_con_restriccion)> 0):
-            
-            # lista donde guardaremos las restricciones de los arcos con restriccion minima
-            restricciones_minimas = []
-           
-            # para cada arco con restriccion, creamos un arco ficticio desde el origen de ese arco hacia un sumidero ficticio
-            # tambien creamos un arco ficticio desde un fuente ficticio hacia el nodo destino del arco con restricción
-            for arco in arcos_con_restriccion:
-                restricciones_minimas.append(arco.res_min)
-                # creamos los arcos ficticios para los arcos que tiene restricción
-                self.agregar_arco(arco.origen.nombre, "SumideroFicticio",0,0,arco.res_min)
-                self.agregar_arco("FuenteFicticio", arco.destino.nombre,0,0,arco.res_min)
+        # calculamos el flujo final que reciben los sumideros
+        flujo_final = self.__flujo_sumideros(vista, sumideros)
+        return flujo_final
 
-                # actualizamos la capacidad y restricción minima del arco provisionalmente, para que todo los arcos tengan restricción minima de 0
+    def __flujos(self, vista):
+        """
+            Este método guarda el flujo de cada arco de la vista, para regresarlo con
+            __restaurar_flujos si el algoritmo no encuentra un flujo factible
+        """
+        return [(arco, arco.flujo) for arco in vista.arcos()]
+
+    def __restaurar_flujos(self, flujos):
+        for arco, flujo in flujos:
+            arco.flujo = flujo
+
+    def __satisfacer_restricciones_minimas(self, vista, fuente, sumidero, arcos_con_restriccion, limite_flujo, sumideros, algoritmo):
+        """
+            Este método manda por los arcos con restricción mínima el flujo que piden. Para cada
+            arco se agregan a la vista un arco desde su origen hasta un sumidero ficticio y uno
+            desde un fuente ficticio hasta su destino, con capacidad igual a la restricción, y
+            se aumenta el flujo del fuente ficticio al sumidero ficticio. Los nodos y arcos
+            ficticios se quitan de la vista al terminar, y las restricciones y capacidades de
+            los arcos se recuperan aunque el algoritmo se interrumpa.
+            Regresa
+            -------
+            True si todos los arcos recibieron el flujo que piden sus restricciones mínimas
+        """
+        instantanea = vista.instantanea()
+        sumideroFicticio = vista.agregar_nodo("SumideroFicticio")
+        fuenteFicticio = vista.agregar_nodo("FuenteFicticio")
+        arcos_sumideroFicticio = []
+        for arco in arcos_con_restriccion:
+            # creamos los arcos ficticios para los arcos que tiene restricción
+            arcos_sumideroFicticio.append(vista.agregar_arco(vista.origen(arco), sumideroFicticio, 0, 0, arco.res_min))
+            vista.agregar_arco(fuenteFicticio, arco.destino, 0, 0, arco.res_min)
+
+        # agregamos dos arcos ficticios que conecten al nodo fuente y al nodo sumidero con capacidad infinita
+        vista.agregar_arco(fuente, sumidero, 0, 0, math.inf)
+        vista.agregar_arco(sumidero, fuente, 0, 0, math.inf)
+
+        restricciones_minimas = [arco.res_min for arco in arcos_con_restriccion]
+        try:
+            # actualizamos la capacidad y restricción minima de los arcos provisionalmente,
+            # para que todos los arcos tengan restricción minima de 0
+            for arco in arcos_con_restriccion:
                 arco.capacidad = arco.capacidad - arco.res_min
                 arco.res_min = 0
-            
-            # agreamos dos arcos ficticiones que conecten al nodo fuente y al nodo sumidero con capacidad infinita
-            self.agregar_arco(fuente.nombre, sumidero.nombre,0,0,math.inf)
-            self.agregar_arco(sumidero.nombre, fuente.nombre,0,0,math.inf)
-
-            # guardamos los arcos ficticios en una lista para eliminarlos después
-            arcos_fuente_sumidero = []
-            arcos_fuente_sumidero.append(self.buscar_arco(fuente.nombre, sumidero.nombre,0,0,math.inf))
-            arcos_fuente_sumidero.append(self.buscar_arco(sumidero.nombre, fuente.nombre,0,0,math.inf))
-            
-            # buscamos los nodos fuete y sumidero ficticios creados para el caso donde hay arcos con restricciones
-            fuenteFicticio = self.buscar_nodo("FuenteFicticio")
-            sumideroFicticio = self.buscar_nodo("SumideroFicticio")
-            
-            # aplicamos ford fulkerson a la red, con los nodos fuente y sumidero ficticios
-            self.fulkerson(fuenteFicticio,sumideroFicticio,limite_flujo,sumideros)
-            
 
-            
+            # aumentamos el flujo en la red, con los nodos fuente y sumidero ficticios
+            self.aumentar_flujo(fuenteFicticio,sumideroFicticio,limite_flujo,sumideros,algoritmo,vista)
+        finally:
             # regresamos a la normalidad los arcos que tenian reestriccion minima
-            arcos_sumideroFicticio = []
-            for arco in self.__red[sumideroFicticio]['entrantes']:
-                arcos_sumideroFicticio.append(arco)
-            for arco in arcos_con_restriccion:
-                res_min = restricciones_minimas.pop(0)
-                # recuperamos la restriccion y capacidad originales de los arcos
+            for arco, res_min, arco_ficticio in zip(arcos_con_restriccion, restricciones_minimas, arcos_sumideroFicticio):
                 arco.res_min = res_min
-                arco.flujo += arcos_sumideroFicticio.pop(0).flujo
+                arco.flujo += arco_ficticio.flujo
                 arco.capacidad = arco.capacidad + res_min
-            # eliminamos los nodos ficticios creados para el caso donde hay arcos con reestriccion minima
-            self.eliminar_nodo(fuenteFicticio.nombre)
-            self.eliminar_nodo(sumideroFicticio.nombre)
-          
+            vista.restaurar(instantanea)
 
-           
-            for arco in arcos_fuente_sumidero:
-                self.eliminar_arco(arco.origen.nombre,arco.destino.nombre,arco.res_min,arco.flujo,arco.capacidad)
-            
-      
-        if(limite_flujo or Dual):
-           
-            flujo_actual = 0
-            for nodo in sumideros:
-                for arco in self.__red[self.buscar_nodo(nodo)]["entrantes"]:
-                    flujo_actual += arco.flujo
-                    
-                for arco in self.__red[self.buscar_nodo(nodo)]["salientes"]:
-                    if(arco.destino.nombre != "Z-"):
-                        flujo_actual -= arco.flujo
-            if(Dual):
-               
-                # regresamos los nodos con reestriccion particionados a la normalidad
-                for nodo in nodos_ficticios:
-                    nodo_ficticio = self.buscar_nodo(nodo.nombre+ '"')
-                    lista_arcos_ficticios = []
-                    for arco in self.__red[nodo_ficticio]["salientes"]:
-                        lista_arcos_ficticios.append(arco)
-                    
-                    for arco in lista_arcos_ficticios:
-                        self.agregar_arco(nodo.nombre, arco.destino.nombre,arco.res_min,arco.flujo,arco.capacidad,arco.costo)
-                    self.eliminar_nodo(nodo.nombre+ '"')
-                costo = 0
-                for nodo in self.__red:
-                    for arco in self.__red[nodo]["salientes"]:
-                        costo += arco.flujo * arco.costo
-              
-                return flujo_actual
-            if(limite_flujo):
-                
-                if(flujo_actual > limite_flujo and limite_flujo):
-                    
-                    if(len(fuentes)>1):
-                       
-                        self.eliminar_nodo('A+')
-                    if(len(sumideros)>1):
-                        self.eliminar_nodo('Z-')
-                    
-                    return None
-        # aplicamos for fulkerson a la red
-        self.fulkerson(fuente,sumidero,limite_flujo,sumideros)
-       
+        # las restricciones se satisfacen si se saturaron todos los arcos al sumidero ficticio
+        return all(arco_ficticio.flujo >= res_min for res_min, arco_ficticio in zip(restricciones_minimas, arcos_sumideroFicticio))
 
-        # regresamos los nodos con reestriccion particionados a la normalidad
-        for nodo in nodos_ficticios:
-            nodo_ficticio = self.buscar_nodo(nodo.nombre+ '"')
-            lista_arcos_ficticios = []
-            for arco in self.__red[nodo_ficticio]["salientes"]:
-                lista_arcos_ficticios.append(arco)
-            
-            for arco in lista_arcos_ficticios:
-                self.agregar_arco(nodo.nombre, arco.destino.nombre,arco.res_min,arco.flujo,arco.capacidad,arco.costo)
-            self.eliminar_nodo(nodo.nombre+ '"')
-
-        # eliminamos los nodos super fuente y super sumidero en caso de que fueran requeridos
-        # para el caso donde hay mas de un sumidero o mas de una fuente        
-        if(len(fuentes)>1):
-            self.eliminar_nodo('A+')
-        if(len(sumideros)>1):
-            self.eliminar_nodo('Z-')
-
-        
-        # calculamos el flujo final que reciben los sumideros
-        flujo_final = 0
-        for nodo in sumideros:
-            for arco in self.__red[self.buscar_nodo(nodo)]["entrantes"]:
-                flujo_final += arco.flujo
-            for arco in self.__red[self.buscar_nodo(nodo)]["salientes"]:
-                flujo_final -= arco.flujo
-
-        return flujo_final
-
-    def dfs(self, node,fuente, sumidero, cadena,arcos_visitados):
-        bool = False
-        node.etiqueta = "marcado"
-        for saliente in self.__red[node]["salientes"]: 
-            if(saliente.flujo < saliente.capacidad and saliente not in arcos_visitados and saliente.destino.etiqueta != "marcado"): 
-      
-                bool = True
-                arcos_visitados.append(saliente)
-                cadena.append(saliente) 
-                saliente.etiqueta = "sentidoPropio"
-                if(saliente.destino == sumidero):
-
-                    return cadena
-                self.dfs(saliente.destino,fuente,sumidero,cadena,arcos_visitados)
-                break
-
-        if(bool == False):
-            for entrante in self.__red[node]["entrantes"]: 
-                if(entrante.flujo > 0 and entrante.flujo > entrante.res_min and entrante not in arcos_visitados and entrante.origen.etiqueta != "marcado"): 
-                    bool = True
-                    arcos_visitados.append(entrante)
-                    cadena.append(entrante) 
-                    entrante.etiqueta = "sentidoImpropio"
-                    if(entrante.origen == sumidero):
+    def dfs(self, node,fuente, sumidero, cadena,arcos_visitados,sentidos=None,vista=None):
+        """
+            Este método busca una cadena aumentante desde node hasta el sumidero con una
+            búsqueda a lo profundo. Avanza por arcos no saturados en sentido propio o por arcos
+            con flujo mayor a su restricción mínima en sentido impropio; si un nodo ya no tiene
+            por dónde avanzar, se quita el último arco de la cadena y se regresa al nodo anterior.
+            La búsqueda usa un ciclo en lugar de recursión, así que la cadena puede ser tan larga
+            como la red.
+            Parámetros
+            ----------
+            node: Nodo desde el que se busca
+            fuente: Nodo fuente
+            sumidero: Nodo sumidero
+            cadena: Lista donde se guardan los arcos de la cadena aumentante
+            arcos_visitados: Lista de arcos que ya se recorrieron
+            sentidos: Objeto de la clase Etiquetas donde se guarda el sentido ("sentidoPropio" o
+                      "sentidoImpropio") en el que se recorre cada arco de la cadena
+            vista: VistaRed en la que se busca la cadena; por omisión, una vista de la red
+            Regresa
+            -------
+            La cadena si se llegó al sumidero, None si no hay cadena aumentante
+        """
+        if sentidos is None:
+            sentidos = Etiquetas()
+        if vista is None:
+            vista = self.vista()
+        visitados = set(arcos_visitados)
+        # nodos de la cadena actual
+        marcados = set()
+        while True:
+            marcados.add(node)
+            siguiente = None
+            for saliente in vista.salientes(node):
+                if(saliente.flujo < saliente.capacidad and saliente not in visitados and saliente.destino not in marcados):
+                    visitados.add(saliente)
+                    arcos_visitados.append(saliente)
+                    cadena.append(saliente)
+                    sentidos[saliente] = "sentidoPropio"
+                    if(saliente.destino == sumidero):
                         return cadena
-                    self.dfs(entrante.origen,fuente,sumidero,cadena,arcos_visitados)
+                    siguiente = saliente.destino
                     break
-        
-        
 
-        if(bool == False):     
-            if(len(cadena)>=1):
-                if(cadena[len(cadena)-1].etiqueta == "sentidoPropio"):      
-                    nodo = cadena[len(cadena)-1].origen
-                    cadena.pop(len(cadena)-1)
-                    node.etiqueta = None
-                    self.dfs(nodo,fuente,sumidero,cadena,arcos_visitados)
+            if siguiente is None:
+                for entrante in vista.entrantes(node):
+                    if(entrante.flujo > 0 and entrante.flujo > entrante.res_min and entrante not in visitados and vista.origen(entrante) not in marcados):
+                        visitados.add(entrante)
+                        arcos_visitados.append(entrante)
+                        cadena.append(entrante)
+                        sentidos[entrante] = "sentidoImpropio"
+                        if(vista.origen(entrante) == sumidero):
+                            return cadena
+                        siguiente = vista.origen(entrante)
+                        break
+
+            if siguiente is None:
+                # no hay por dónde avanzar: regresamos al nodo anterior de la cadena
+                if not cadena:
                     return None
-                elif(cadena[len(cadena)-1].etiqueta == "sentidoImpropio"):
-                    nodo = cadena[len(cadena)-1].destino
-                    cadena.pop(len(cadena)-1)
-                    node.etiqueta = None
-                    self.dfs(nodo,fuente,sumidero,cadena,arcos_visitados)
+                if(sentidos[cadena[-1]] == "sentidoPropio"):
+                    siguiente = vista.origen(cadena[-1])
+                elif(sentidos[cadena[-1]] == "sentidoImpropio"):
+                    siguiente = cadena[-1].destino
+                else:
                     return None
+                cadena.pop()
+                marcados.discard(node)
+            node = siguiente
         
       
         
     def algoritmo_primal(self,fuentes,sumideros,limite_flujo):
+        vista, fuente, sumidero = self.__vista_flujo(fuentes, sumideros)
+        return self.__algoritmo_primal(vista, fuente, sumidero, sumideros, limite_flujo)
+
+    def __algoritmo_primal(self, vista, fuente, sumidero, sumideros, limite_flujo):
         # aplicamos for fulkerson con el limite de flujo deseado
-        flujo = self.flujo_maximo(fuentes,sumideros,limite_flujo)
+        flujos = self.__flujos(vista)
+        flujo = self.__flujo_maximo(vista, fuente, sumidero, sumideros, limite_flujo, None, "fulkerson")
         
         
         if(flujo):
-            # regresamos falso si no se satisface el flujo deseado
+            # regresamos falso, sin cambiar los flujos, si no se satisface el flujo deseado
             if flujo < limite_flujo:
+                self.__restaurar_flujos(flujos)
                 return None
 
             costo = 0
-            # lista de arcos de la red original
-            
             # caso donde existen nodos con restricciones
-            # crearemos un nodo ficticio que particione el nodo con restricciones
-            nodos_con_restriccion = []
-            nodos_red = []
-            for nodo in self.__red:
-                nodos_red.append(nodo)
-            for nodo in nodos_red:
-                if (nodo.res_min > 0 or nodo.res_max != math.inf):
-                    nodos_con_restriccion.append(nodo)
-                    self.agregar_nodo(nodo.nombre+ '"')
-                    # creamos una lista de los arcos salientes del nodo que tiene restricciones
-                    lista_arcos = []
-                    for arco in self.__red[nodo]["salientes"]:
-                        lista_arcos.append(arco)
-
-                    # creamos un arco ficticio entre el nodo con restricciones y en nuevo nodo ficticio creado
-                    self.agregar_arco(nodo.nombre, nodo.nombre+ '"',nodo.res_min,0,nodo.res_max,0)
-                    arcoNuevo = self.buscar_arco(nodo.nombre, nodo.nombre+ '"',nodo.res_min,0,nodo.res_max)
-                    for arco in lista_arcos:   
-                        # los arcos salientes del nodo con restricciones ahora serán los arcos salientes del nuevo nodo ficticio           
-                        self.agregar_arco(nodo.nombre+ '"', arco.destino.nombre,arco.res_min,arco.flujo,arco.capacidad,arco.costo)
-                        # eliminamos momentaneamente los arcos salientes del nodo que tiene restricciones
-                        self.eliminar_arco(nodo.nombre,arco.destino.nombre,arco.res_min,arco.flujo,arco.capacidad)
-                        arcoNuevo.flujo += arco.flujo
-            arcos_red_original = []
-            
-            #calculamos el costo inicial, en base al primer flujo factible encontrado por ford fulkerson
-            for nodo in self.__red:
-                for arco in self.__red[nodo]["salientes"]:
-                    arcos_red_original.append(arco)
+            # particionamos en la vista los nodos con restricciones; el arco entre las dos
+            # partes lleva el flujo que ya pasa por el nodo
+            instantanea = vista.instantanea()
+            try:
+                for nodo in vista.nodos():
+                    if (nodo.res_min > 0 or nodo.res_max != math.inf):
+                        vista.particionar(nodo)
+
+                #calculamos el costo inicial, en base al primer flujo factible encontrado por ford fulkerson
+                arcos_red_original = vista.arcos()
+                for arco in arcos_red_original:
                     costo += arco.flujo * arco.costo
-            print("Costo inicial: ",costo)        
-         
-            #Creamos la red marginal
-            red_marginal = Red()
+                print("Costo inicial: ",costo)        
+             
+                # Creamos la red marginal en base a los arcos de la vista. Cada arco tiene
+                # un par fijo de arcos marginales cuyas capacidades se actualizan al cambiar el flujo
+                red_marginal = RedResidual(arcos_red_original, [vista.origen(arco) for arco in arcos_red_original])
+                
+                # aplicamos el algoritmo usando la red marginal
+                red_marginal.eliminacion_ciclos_negativos()
+            finally:
+                # regresamos los nodos con reestricciones a la normalidad
+                vista.restaurar(instantanea)
            
-            # creamos la red marginal en base a los arcos de la re original
-            red_marginal.crear_red_marginal(arcos_red_original)
-            
-            # aplicamos el algoritmo usando la red marginal
-            red_marginal.eliminacion_ciclos_negativos()
-
-            # regresamos los nodos con reestricciones a la normalidad
-            for nodo in nodos_con_restriccion:
-                nodo_ficticio = self.buscar_nodo(nodo.nombre+ '"')
-                lista_arcos_ficticios = []
-                for arco in self.__red[nodo_ficticio]["salientes"]:
-                    lista_arcos_ficticios.append(arco)
-                # recuperamos los arcos que tenia el nodo antes de particionarlo
-                for arco in lista_arcos_ficticios:
-                    self.agregar_arco(nodo.nombre, arco.destino.nombre,arco.res_min,arco.flujo,arco.capacidad,arco.costo)
-                # eliminamos el nodo ficticio creado para la partición
-                self.eliminar_nodo(nodo.nombre+ '"')
-
             #calculamos el costo final
             costo = 0
             for nodo in self.__red:
                 for arco in self.__red[nodo]["salientes"]:
-                    arcos_red_original.append(arco)
                     costo += arco.flujo * arco.costo
            
-
+            
             return costo
         else:
             # caso donde no hay un flujo inicial factible en base al flujo deseado
+            self.__restaurar_flujos(flujos)
             return None
              
             
@@ -763,9 +944,8 @@ class Red:
             if(arco.capacidad > arco.flujo):
                 # agregamos el arco a la red marginal
                 # la capacidad en este caso será la capacidad del arco menos el flujo, y el costo será el mismo del arco orignal 
-                self.agregar_arco(arco.origen.nombre,arco.destino.nombre,0,0,arco.capacidad - arco.flujo,arco.costo)
+                arcoNuevo = self.agregar_arco(arco.origen.nombre,arco.destino.nombre,0,0,arco.capacidad - arco.flujo,arco.costo)
                 # etiquetaremos el nuevo arco de la red marginal con el arco relacionado de la red original
-                arcoNuevo = self.buscar_arco(arco.origen.nombre,arco.destino.nombre,0,0,arco.capacidad - arco.flujo)
                 arcoNuevo.etiqueta = arco
             
             # revisamos si el flujo del arco de la red original es mayor a la restricción minima
@@ -773,207 +953,38 @@ class Red:
             if(arco.res_min < arco.flujo):
                 # agregamos el arco a la red marginal
                 # la capacidad en este caso será el flujo del arco menos la restricción minima y el costo será el mismo del arco orignal pero negativo
-                self.agregar_arco(arco.destino.nombre,arco.origen.nombre,0,0,arco.flujo - arco.res_min,-arco.costo)
+                arcoNuevo = self.agregar_arco(arco.destino.nombre,arco.origen.nombre,0,0,arco.flujo - arco.res_min,-arco.costo)
                 # etiquetaremos el nuevo arco de la red marginal con el arco relacionado de la red original
-                arcoNuevo = self.buscar_arco(arco.destino.nombre,arco.origen.nombre,0,0,arco.flujo - arco.res_min)
-                arcoNuevo.etiqueta = arco
-    
-    def eliminacion_ciclos_negativos(self):
-        # creamos el objeto dígrafica que usaremos para aplicar el algoritmo de rutas mas cortas (Floyd)
-        # para encontrar ciclos negativos en la red marginal
-        d = Digrafica()
-        # creamos los arcos de la digrafica tomando los mismos arcos que hay en la red marginal 
-            # tomamos el costo de los arcos de la red marginal como peso de los arcos de la digrafica
-        nodos_con_restriccion = []
-        for nodo in self.__red:
-            for arco in self.__red[nodo]["salientes"]:
-                d.agregar_arco(arco.origen.nombre,arco.destino.nombre,arco.costo)
-                # etiquetamos los arcos de la digrafica con los arcos relacionados correspondientes a la red marginal
-                arcoNuevo = d.buscar_arco(arco.origen.nombre,arco.destino.nombre,arco.costo)
                 arcoNuevo.etiqueta = arco
-
     
-
-        # hacemos las iteraciones del algoritmo mientras haya ciclos negativos en la red marginal
-        while(True):
-            
-            # aplicamos el algoritmo de floyd para encontrar ciclos negativos
-            ciclo = d.floyd("a")
-
-            # en caso de encontrar algun ciclo negativo, seguimos con el algoritmo
-            if ciclo[len(ciclo)-1][0] == 'ciclo':
-                # iniciamos el delta con valor infinito
-                delta = math.inf
-                # variable auxiliar para saber si los objetos de la lista ciclos son arcos o no
-                tipo = type(ciclo[0][0])
-                # recorremos el ciclo
-                for arco in ciclo:
-                    # revisamos que el elemento del ciclo sea un objeto arco de de la clase digrafica            
-                    if(type(arco[0]) == tipo):
-                        capacidad_arco_red_marginal = arco[0].etiqueta.capacidad
-                        # comparamos las capacidades de los arcos del ciclo para buscar la mas pequeña y obtener el delta
-                        if(capacidad_arco_red_marginal< delta):
-                            delta = capacidad_arco_red_marginal
-                
-                # recorremos los arcos del ciclo para actualizar el flujo de la red original 
-                # los arcos del ciclo tiene como etiqueta sus arcos relacionados en la red marginal y los arcos de la red marginal
-                # tienen como etiqueta los arcos relacionados en la red original
-                for arco in ciclo:
-                    # revisamos que el elemento sea un arco de de la clase digrafica            
-                    if(type(arco[0]) == tipo):
-                        # nodo orgien del arco relacionado de la red original
-                        origen_arco_red_original = arco[0].etiqueta.etiqueta.origen.nombre
-                        # para acceder a los arcos de la red original desde los arcos de la lista ciclo acccedemos a la etiqueta de la etiqueta
-                        # si el arco del ciclo va en el mismo sentido a su arco relacionado en la red original, sumamos delta
-                        if(origen_arco_red_original == arco[0].origen.nombre):
-                            arco[0].etiqueta.etiqueta.flujo += delta
-                            
-                        else:
-                             # si el arco del ciclo va en el sentido contrario a su arco relacionado en la red original, restamos delta
-                            arco[0].etiqueta.etiqueta.flujo -= delta
-
-                # ciclo para actualizar los arcos de la red marginal y eliminar los que no cumplan los requisitos
-                # accederemos a los arcos de la red marginal y red orignal desde las etiquetas de los arcos del ciclo encontrado en la digrafica
-                for arco in ciclo:
-                    # revisamos que el elemento sea un arco de de la clase digrafica            
-                    if(type(arco[0]) == tipo):
-                        # definimos las variables donde guardaremos los elementos de los arcos de las redes con respecto a las etiquetas de los aros del ciclo
-                        origen_arco_red_marginal = arco[0].etiqueta.origen.nombre
-                        destino_arco_red_marginal = arco[0].etiqueta.destino.nombre
-                        origen_arco_red_original = arco[0].etiqueta.etiqueta.origen.nombre
-                        flujo_arco_red_original = arco[0].etiqueta.etiqueta.flujo
-                        capacidad_arco_red_marginal = arco[0].etiqueta.capacidad
-                        capacidad_arco_red_orginal = arco[0].etiqueta.etiqueta.capacidad
-                        res_min_arco_red_original = arco[0].etiqueta.etiqueta.res_min
-                        costo_arco_red_marginal = arco[0].etiqueta.costo
-                        # caso para los arcos de la red marginal que van en el mismo sentido que su arco correspondiente en la red original
-                        if(origen_arco_red_marginal == origen_arco_red_original):
-                            # revisamos que se cumpla la condición de que la capacidad sea mayor al flujo
-                            if(flujo_arco_red_original < capacidad_arco_red_orginal):
-                                # si cumplen la condición, actualizamos la capacidad
-                                arco[0].etiqueta.capacidad = capacidad_arco_red_orginal- flujo_arco_red_original
-                            else:
-                                # si no cumplen la condición eliminamos el arco de la red marginal
-                                self.eliminar_arco(origen_arco_red_marginal,destino_arco_red_marginal,0,0,arco[0].etiqueta.capacidad)
-                                # eliminamos el arco de la digrafica tambien
-                                d.eliminar_arco(origen_arco_red_marginal,destino_arco_red_marginal,costo_arco_red_marginal)
-                        else:
-                         # caso para los arcos de la red marginal que van en sentido contrario que su arco correspondiente en la red original
-                            # revisamos que se cumpla la condición de que el flujo sea mayor a la restricción minima
-                            if(flujo_arco_red_original > res_min_arco_red_original):
-                                 # si cumplen la condición, actualizamos la capacidad
-                                arco[0].etiqueta.capacidad = flujo_arco_red_original - res_min_arco_red_original
-                            else:
-                                # si no cumplen la condición eliminamos el arco de la red marginal
-                                self.eliminar_arco(origen_arco_red_marginal,destino_arco_red_marginal,0,0,arco[0].etiqueta.capacidad)
-                                d.eliminar_arco(origen_arco_red_marginal,destino_arco_red_marginal,costo_arco_red_marginal)
-
-                # ciclo para agregar los arcos que cumplan las condiciones a la red marginal
-                for arco in ciclo:
-                    if(type(arco[0]) == tipo):
-                        # definimos las variables donde guardaremos los elementos de los arcos de las redes con respecto a las etiquetas de los aros del ciclo
-                        origen_arco_red_original = arco[0].etiqueta.etiqueta.origen.nombre
-                        destino_arco_red_original = arco[0].etiqueta.etiqueta.destino.nombre
-                        flujo_arco_red_original = arco[0].etiqueta.etiqueta.flujo
-                        costo_arco_original = arco[0].etiqueta.etiqueta.costo
-                        capacidad_arco_red_orginal = arco[0].etiqueta.etiqueta.capacidad
-                        res_min_arco_red_original = arco[0].etiqueta.etiqueta.res_min
-                        arco_red_original = arco[0].etiqueta.etiqueta
-                        
-                        # caso para los arcos de la red marginal que van en el mismo sentido que su arco correspondiente en la red original
-                        # revisamos que se cumpla la condición de que la capacidad sea mayor al flujo
-                        if(flujo_arco_red_original < capacidad_arco_red_orginal):
-                            # booleano para saber si se cumplen las condiciones para agregar el arco a la red marginal
-                            bool = False
-
-                            # recorremos los arcos de la red marginal y revisamos si el arco correspondiente ya existe
-                            for nodo in self.__red:
-                                for arco_red in self.__red[nodo]["salientes"]:
-                                    # si el arco en el sentido correspondiente ya existe, el booleano será verdadero
-                                    if arco_red.origen.nombre == origen_arco_red_original and arco_red.destino.nombre == destino_arco_red_original and arco_red.etiqueta == arco_red_original:
-                                        bool = True
-                             # si el arco no existe, lo agregamos ya que si cumple los requisitos para estar en la red marginal
-                            if bool == False:
-                                self.agregar_arco(origen_arco_red_original,destino_arco_red_original,0,0,capacidad_arco_red_orginal - flujo_arco_red_original,costo_arco_original)
-                                # agregamos el arco a la digrafica también
-                                d.agregar_arco(origen_arco_red_original,destino_arco_red_original,costo_arco_original)
-                                # etiquetamos al nuevo arco de la red marginal con su arco relacionado con respecto a la red original
-                                arcoNuevo = self.buscar_arco(origen_arco_red_original,destino_arco_red_original,0,0, capacidad_arco_red_orginal - flujo_arco_red_original)
-                                arcoNuevo.etiqueta = arco_red_original
-                                # etiquetamos al nuevo arco de digrafica con su arco relacionado con respecto a la red marginal
-                                arcoNuevoDigrafica = d.buscar_arco(origen_arco_red_original,destino_arco_red_original,costo_arco_original)
-                                arcoNuevoDigrafica.etiqueta = arcoNuevo
-
-                        # caso para los arcos de la red marginal que van en sentido contrario que su arco correspondiente en la red original
-                        # revisamos que se cumpla la condición de que el flujo sea mayor a la restricción minima
-                        if(flujo_arco_red_original > res_min_arco_red_original):
-                            # booleano para saber si se cumplen las condiciones para agregar el arco a la red marginal
-                            bool = False
-                            # recorremos los arcos de la red marginal y revisamos si el arco correspondiente ya existe
-                            for nodo in self.__red:
-                                for arco_red in self.__red[nodo]["salientes"]:
-                                    # si el arco en el sentido correspondiente ya existe, el booleano será verdadero
-                                    if arco_red.destino.nombre == origen_arco_red_original and arco_red.origen.nombre == destino_arco_red_original and arco_red.etiqueta == arco_red_original:
-                                        bool = True
-                            # si el arco no existe, lo agregamos ya que si cumple los requisitos para estar en la red marginal
-                            if bool == False:
-                                self.agregar_arco(destino_arco_red_original,origen_arco_red_original,0,0,flujo_arco_red_original - res_min_arco_red_original, -costo_arco_original) 
-                                # agregamos el arco a la digrafica también
-                                d.agregar_arco(destino_arco_red_original,origen_arco_red_original, -costo_arco_original) 
-                                # etiquetamos al nuevo arco de la red marginal con su arco relacionado con respecto a la red original
-                                arcoNuevo = self.buscar_arco(destino_arco_red_original,origen_arco_red_original,0,0,flujo_arco_red_original - res_min_arco_red_original)
-                                arcoNuevo.etiqueta = arco_red_original
-                                # etiquetamos al nuevo arco de digrafica con su arco relacionado con respecto a la red marginal
-                                arcoNuevoDigrafica = d.buscar_arco(destino_arco_red_original,origen_arco_red_original, -costo_arco_original)
-                                arcoNuevoDigrafica.etiqueta = arcoNuevo
-
-            else: 
-                # si no hay ciclos negativos, rompemos el while y se acaba el algoritmo              
-                break        
-                
-            
     def algoritmo_dual(self,fuentes,sumideros,limite_flujo):
+        # el super fuente y el super sumidero, si se necesitan, sólo existen en la vista
+        vista, fuente, sumidero = self.__vista_flujo(fuentes, sumideros)
+
         # aplicamos for fulkerson con el limite de flujo deseado
-  
-        flujo = self.flujo_maximo(fuentes,sumideros,None,True)
+        flujos = self.__flujos(vista)
+        flujo = self.__flujo_maximo(vista, fuente, sumidero, sumideros, None, True, "fulkerson")
       
 
-        # revisamos si nos excedemos del limite de flujo
-        if (flujo > limite_flujo):
-            if(len(fuentes)>1):
-                self.eliminar_nodo('A+')
-            if(len(sumideros)>1):
-                self.eliminar_nodo('Z-')
+        # revisamos si no hay flujo factible o si nos excedemos del limite de flujo
+        if (flujo is None or flujo > limite_flujo):
+            self.__restaurar_flujos(flujos)
             return None
 
-        # revisamos si hay más de un fuente o sumidero
-        fuente = []
-        sumidero = []
-        if(len(fuentes)>1):
-            fuente.append("A+")
-        else:
-            fuente = fuentes
-        if(len(sumideros)>1):
-            sumidero.append("Z-")
-        else:
-            sumidero = sumideros
-
         # aplicamos el algoritmo primal para obtener el flujo de menor costo
         if(flujo>0):
-            self.algoritmo_primal(fuente,sumidero,flujo)
+            self.__algoritmo_primal(vista, fuente, sumidero, [sumidero.nombre], flujo)
         
         costo = 0
 
         
-        # lista de arcos de la red original
-        arcos_red_original = []
+        # lista de arcos de la vista (la red original más los arcos del super fuente y del super sumidero)
+        arcos_red_original = vista.arcos()
   
     
         #calculamos el costo inicial, en base al primer flujo factible encontrado por ford fulkerson
-        for nodo in self.__red:
-            for arco in self.__red[nodo]["salientes"]:
-                arcos_red_original.append(arco)
-                costo += arco.flujo * arco.costo
+        for arco in arcos_red_original:
+            costo += arco.flujo * arco.costo
         print("Costo inicial: ",costo)
 
         #Creamos la red marginal
@@ -982,34 +993,25 @@ class Red:
         # creamos la red marginal en base a los arcos de la re original
         red_marginal.crear_red_marginal(arcos_red_original)
 
-        salientes_sumideros = []
-        entrantes_sumideros = []
-        for nodo in sumidero:
-            for arco in self.__red[self.buscar_nodo(nodo)]["salientes"]:
-                salientes_sumideros.append(arco)
-            for arco in self.__red[self.buscar_nodo(nodo)]["entrantes"]:
-                entrantes_sumideros.append(arco)
+        salientes_sumideros = list(vista.salientes(sumidero))
+        entrantes_sumideros = list(vista.entrantes(sumidero))
 
         
      
         # aplicamos el algoritmo usando la red marginal
-        bool = red_marginal.rutas_cortas(fuente,sumidero,salientes_sumideros,entrantes_sumideros,limite_flujo)
+        bool = red_marginal.rutas_cortas([fuente.nombre],[sumidero.nombre],salientes_sumideros,entrantes_sumideros,limite_flujo)
         
-        # regresamos none si no se encuentra una solución
+        # regresamos none si no se encuentra una solución, con los flujos como estaban
         if not bool:
+            self.__restaurar_flujos(flujos)
             return None
-        
-        if(len(fuentes)>1):
-            self.eliminar_nodo('A+')
-        if(len(sumideros)>1):
-            self.eliminar_nodo('Z-')
 
         #calculamos e imprimimos el costo final
         costo = 0
         for nodo in self.__red:
             for arco in self.__red[nodo]["salientes"]:
                 costo += arco.flujo * arco.costo
-
+        
         return costo
 
 
@@ -1022,9 +1024,8 @@ class Red:
         print("ciclo2")
         for nodo in self.__red:
             for arco in self.__red[nodo]["salientes"]:
-                d.agregar_arco(arco.origen.nombre,arco.destino.nombre,arco.costo)
+                arcoNuevo = d.agregar_arco(arco.origen.nombre,arco.destino.nombre,arco.costo)
                 # etiquetamos los arcos de la digrafica con los arcos relacionados correspondientes a la red marginal
-                arcoNuevo = d.buscar_arco(arco.origen.nombre,arco.destino.nombre,arco.costo)
                 arcoNuevo.etiqueta = arco
         print("ciclo")
         # hacemos las iteraciones del algoritmo mientras haya ciclos negativos en la red marginal
@@ -1108,9 +1109,9 @@ class Red:
                                 arco.etiqueta.capacidad = capacidad_arco_red_orginal- flujo_arco_red_original
                             else:
                                 # si no cumplen la condición eliminamos el arco de la red marginal
-                                self.eliminar_arco(origen_arco_red_marginal,destino_arco_red_marginal,0,0,arco.etiqueta.capacidad)
+                                self.eliminar_arco(obj_arco=arco.etiqueta)
                                 # eliminamos el arco de la digrafica tambien
-                                d.eliminar_arco(origen_arco_red_marginal,destino_arco_red_marginal,costo_arco_red_marginal)
+                                d.eliminar_arco(obj_arco=arco)
                         else:
                          # caso para los arcos de la red marginal que van en sentido contrario que su arco correspondiente en la red original
                             # revisamos que se cumpla la condición de que el flujo sea mayor a la restricción minima
@@ -1119,8 +1120,8 @@ class Red:
                                 arco.etiqueta.capacidad = flujo_arco_red_original - res_min_arco_red_original
                             else:
                                 # si no cumplen la condición eliminamos el arco de la red marginal
-                                self.eliminar_arco(origen_arco_red_marginal,destino_arco_red_marginal,0,0,arco.etiqueta.capacidad)
-                                d.eliminar_arco(origen_arco_red_marginal,destino_arco_red_marginal,costo_arco_red_marginal)
+                                self.eliminar_arco(obj_arco=arco.etiqueta)
+                                d.eliminar_arco(obj_arco=arco)
 
                 # ciclo para agregar los arcos que cumplan las condiciones a la red marginal
                 for arco in ruta:
@@ -1148,14 +1149,12 @@ class Red:
                                         bool = True
                              # si el arco no existe, lo agregamos ya que si cumple los requisitos para estar en la red marginal
                             if bool == False:
-                                self.agregar_arco(origen_arco_red_original,destino_arco_red_original,0,0,capacidad_arco_red_orginal - flujo_arco_red_original,costo_arco_original)
+                                arcoNuevo = self.agregar_arco(origen_arco_red_original,destino_arco_red_original,0,0,capacidad_arco_red_orginal - flujo_arco_red_original,costo_arco_original)
                                 # agregamos el arco a la digrafica también
-                                d.agregar_arco(origen_arco_red_original,destino_arco_red_original,costo_arco_original)
+                                arcoNuevoDigrafica = d.agregar_arco(origen_arco_red_original,destino_arco_red_original,costo_arco_original)
                                 # etiquetamos al nuevo arco de la red marginal con su arco relacionado con respecto a la red original
-                                arcoNuevo = self.buscar_arco(origen_arco_red_original,destino_arco_red_original,0,0, capacidad_arco_red_orginal - flujo_arco_red_original)
                                 arcoNuevo.etiqueta = arco_red_original
                                 # etiquetamos al nuevo arco de digrafica con su arco relacionado con respecto a la red marginal
-                                arcoNuevoDigrafica = d.buscar_arco(origen_arco_red_original,destino_arco_red_original,costo_arco_original)
                                 arcoNuevoDigrafica.etiqueta = arcoNuevo
 
                         # caso para los arcos de la red marginal que van en sentido contrario que su arco correspondiente en la red original
@@ -1171,14 +1170,12 @@ class Red:
                                         bool = True
                             # si el arco no existe, lo agregamos ya que si cumple los requisitos para estar en la red marginal
                             if bool == False:
-                                self.agregar_arco(destino_arco_red_original,origen_arco_red_original,0,0,flujo_arco_red_original - res_min_arco_red_original, -costo_arco_original) 
+                                arcoNuevo = self.agregar_arco(destino_arco_red_original,origen_arco_red_original,0,0,flujo_arco_red_original - res_min_arco_red_original, -costo_arco_original) 
                                 # agregamos el arco a la digrafica también
-                                d.agregar_arco(destino_arco_red_original,origen_arco_red_original, -costo_arco_original) 
+                                arcoNuevoDigrafica = d.agregar_arco(destino_arco_red_original,origen_arco_red_original, -costo_arco_original) 
                                 # etiquetamos al nuevo arco de la red marginal con su arco relacionado con respecto a la red original
-                                arcoNuevo = self.buscar_arco(destino_arco_red_original,origen_arco_red_original,0,0,flujo_arco_red_original - res_min_arco_red_original)
                                 arcoNuevo.etiqueta = arco_red_original
                                 # etiquetamos al nuevo arco de digrafica con su arco relacionado con respecto a la red marginal
-                                arcoNuevoDigrafica = d.buscar_arco(destino_arco_red_original,origen_arco_red_original, -costo_arco_original)
                                 arcoNuevoDigrafica.etiqueta = arcoNuevo
                
             else: 
@@ -1276,6 +1273,9 @@ class Red:
                 if arco not in arcos_basicos:
                     arco_no_basicos.append(arco)
     
+        # sentido en el que se recorre cada arco de los ciclos, en el contexto de esta ejecución
+        sentidos = Etiquetas()
+
         # ciclo con el que realizaremos las iteraciones buscando los ciclos ya actualizando los flujos de los arcos
         while(True):
 
@@ -1297,19 +1297,19 @@ class Red:
 
                 # buscamos ciclos a partir de los arcos no saturados
                 if(arco.capacidad - arco.flujo > 0):
-                    self.dfs_ciclos(arco.destino,arco,ciclo,visitados,arcos_basicos)
+                    self.dfs_ciclos(arco.destino,arco,ciclo,visitados,arcos_basicos,sentidos)
                 
                 # revisammos si encontramos un ciclo y calculamos su peso
                 if(ciclo):
                     # agregamos el arco iterado que posiblemente se unirá a la solución
                     ciclo.append(arco)
                     # lo etiquetamos con sentido propio
-                    arco.etiqueta = "sentidoPropio"
+                    sentidos[arco] = "sentidoPropio"
  
                     # recorremos las aristas del ciclo para calcular el peso del ciclo
                     for arista in ciclo:
                         # caso donde las aristas van en sentido del ciclo (restamos el costo de la arista)
-                        if(arista.etiqueta== "sentidoPropio"):
+                        if(sentidos[arista] == "sentidoPropio"):
                                 w += -(arista.costo)
 
                         else: 
@@ -1333,10 +1333,10 @@ class Red:
                 # iniciamos el delta con un valor muy grande
                 delta = math.inf
                 # recuperamos el ciclo de peso más grande a partir del arco que agregaremos a la solución
-                self.dfs_ciclos(nuevo_arco_solucion.destino,nuevo_arco_solucion,ciclo_max,visitados,arcos_basicos)
+                self.dfs_ciclos(nuevo_arco_solucion.destino,nuevo_arco_solucion,ciclo_max,visitados,arcos_basicos,sentidos)
                 # agreamos el arco que se unirá a la solución al ciclo
                 ciclo_max.append(nuevo_arco_solucion)
-                nuevo_arco_solucion.etiqueta = "sentidoPropio"
+                sentidos[nuevo_arco_solucion] = "sentidoPropio"
 
                 # recorremos las aristas del ciclo de peso amyor para calcular el delta
                 # buscaremos los maximos y minimos de flujo que le podemos sumar o restar a los flujos de los arcos del ciclo       
@@ -1344,7 +1344,7 @@ class Red:
 
                     # caso donde los arcos van en sentido propio del ciclo 
                     # solo tomamos en cuenta arcos con flujo mayor a 0 para obtener el delta
-                    if(arista.etiqueta== "sentidoPropio" and arista.flujo >0 ):
+                    if(sentidos[arista] == "sentidoPropio" and arista.flujo >0 ):
                         if(arista.capacidad != math.inf):
                             # caso donde el flujo es mayor que diferencia entre la capacidad del arco y su flujo
                             if(arista.capacidad - arista.flujo < arista.flujo):
@@ -1381,7 +1381,7 @@ class Red:
                 # actualizamos el flujo de los arcos del ciclo de acuerdo al delta obtenido
                 for arco in ciclo_max:
                     # caso para los arcos que van en sentido del ciclo
-                    if(arco.etiqueta== "sentidoPropio"):
+                    if(sentidos[arco] == "sentidoPropio"):
                         arco.flujo+=delta
                     else:
                     # caso donde los arcos van en sentido contrario al ciclo
@@ -1430,46 +1430,62 @@ class Red:
     
 
     # función para encontrar ciclos (metodo simplex)
-    def dfs_ciclos(self, node,arco,ciclo,arcos_visitados,arcos_basicos):
-        bool = False
-        node.etiqueta = "marcado"
-        for saliente in self.__red[node]["salientes"]: 
-            if(saliente in arcos_basicos and saliente not in arcos_visitados and (saliente.capacidad - saliente.flujo)>0): 
-                bool = True
-                arcos_visitados.append(saliente)
-                ciclo.append(saliente) 
-                saliente.etiqueta = "sentidoPropio"
-                if(saliente.destino == arco.origen):
-                    return ciclo
-
-                self.dfs_ciclos(saliente.destino,arco,ciclo,arcos_visitados,arcos_basicos)
-                break
-
-        if(bool == False):
-            for entrante in self.__red[node]["entrantes"]: 
-                if(entrante in arcos_basicos and entrante not in arcos_visitados and ( entrante.flujo - entrante.res_min)>0 and (entrante.capacidad - entrante.flujo)>0): 
-                    bool = True
-                    arcos_visitados.append(entrante)
-                    ciclo.append(entrante) 
-                    entrante.etiqueta = "sentidoImpropio"
-                    if(entrante.origen == arco.origen):
+    def dfs_ciclos(self, node,arco,ciclo,arcos_visitados,arcos_basicos,sentidos=None):
+        """
+            Este método busca con una búsqueda a lo profundo el ciclo que forma un arco con los
+            arcos básicos, desde node hasta el origen del arco. Igual que dfs, usa un ciclo en
+            lugar de recursión.
+            Parámetros
+            ----------
+            node: Nodo desde el que se busca
+            arco: Arco que cierra el ciclo
+            ciclo: Lista donde se guardan los arcos del ciclo
+            arcos_visitados: Lista de arcos que ya se recorrieron
+            arcos_basicos: Lista de arcos de la solución básica
+            sentidos: Objeto de la clase Etiquetas donde se guarda el sentido ("sentidoPropio" o
+                      "sentidoImpropio") en el que se recorre cada arco del ciclo
+            Regresa
+            -------
+            El ciclo si se encontró, None en caso contrario
+        """
+        if sentidos is None:
+            sentidos = Etiquetas()
+        visitados = set(arcos_visitados)
+        basicos = set(arcos_basicos)
+        while True:
+            siguiente = None
+            for saliente in self.__red[node]["salientes"]:
+                if(saliente in basicos and saliente not in visitados and (saliente.capacidad - saliente.flujo)>0):
+                    visitados.add(saliente)
+                    arcos_visitados.append(saliente)
+                    ciclo.append(saliente)
+                    sentidos[saliente] = "sentidoPropio"
+                    if(saliente.destino == arco.origen):
                         return ciclo
-                    self.dfs_ciclos(entrante.origen,arco,ciclo,arcos_visitados,arcos_basicos)
+                    siguiente = saliente.destino
                     break
-        
-        
 
-        if(bool == False):     
-            if(len(ciclo)>=1):
-                if(ciclo[len(ciclo)-1].etiqueta == "sentidoPropio"):      
-                    nodo = ciclo[len(ciclo)-1].origen
-                    ciclo.pop(len(ciclo)-1)
-                    node.etiqueta = None
-                    self.dfs_ciclos(nodo,arco,ciclo,arcos_visitados,arcos_basicos)
+            if siguiente is None:
+                for entrante in self.__red[node]["entrantes"]:
+                    if(entrante in basicos and entrante not in visitados and ( entrante.flujo - entrante.res_min)>0 and (entrante.capacidad - entrante.flujo)>0):
+                        visitados.add(entrante)
+                        arcos_visitados.append(entrante)
+                        ciclo.append(entrante)
+                        sentidos[entrante] = "sentidoImpropio"
+                        if(entrante.origen == arco.origen):
+                            return ciclo
+                        siguiente = entrante.origen
+                        break
+
+            if siguiente is None:
+                # no hay por dónde avanzar: regresamos al nodo anterior del ciclo
+                if not ciclo:
+                    return None
+                if(sentidos[ciclo[-1]] == "sentidoPropio"):
+                    siguiente = ciclo[-1].origen
+                elif(sentidos[ciclo[-1]] == "sentidoImpropio"):
+                    siguiente = ciclo[-1].destino
+                else:
                     return None
-                elif(ciclo[len(ciclo)-1].etiqueta == "sentidoImpropio"):
-                    nodo = ciclo[len(ciclo)-1].destino
-                    ciclo.pop(len(ciclo)-1)
-                    node.etiqueta = None
-                    self.dfs_ciclos(nodo,arco,ciclo,arcos_visitados,arcos_basicos)
-                    return None
\ No newline at end of file
+                ciclo.pop()
+            node = siguiente